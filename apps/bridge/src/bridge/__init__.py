@@ -1,3 +1,8 @@
 """ATL Bridge — Discord–IRC–XMPP multi-presence bridge with Portal identity."""
 
+import time as _time
+
 __version__ = "0.1.0"
+
+# When the package was first imported; ``bridge --profile-startup`` reports import time from here.
+IMPORT_STARTED = _time.perf_counter()
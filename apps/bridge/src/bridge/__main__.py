@@ -1,26 +1,43 @@
-"""Bridge entrypoint. Loads config, starts gateway; adapters register in later phases."""
+"""Bridge entrypoint. Loads config, starts gateway; adapters register in later phases.
+
+Adapters are imported and constructed only for protocols that have config
+(Discord token, IRC mappings, XMPP component credentials plus MUC mappings),
+so a disabled protocol never loads its client library.
+
+With ``--processes`` each configured adapter runs in its own child process
+(``--adapter NAME --bus-socket PATH``), connected to the relay in this process
+through a :class:`BusHub`; a child that exits is restarted.
+"""
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import functools
+import importlib
+import json
 import logging
 import os
+import queue
+import shutil
 import signal
 import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections.abc import Callable, Coroutine, Iterator
 from pathlib import Path
 from typing import Any, Protocol
 
 from loguru import logger
 
-from bridge import __version__
-from bridge.adapters.discord import DiscordAdapter
-from bridge.adapters.irc import IRCAdapter
-from bridge.adapters.xmpp import XMPPAdapter
+from bridge import IMPORT_STARTED, __version__
 from bridge.config import Config, cfg, load_config_with_env
-from bridge.events import config_reload
-from bridge.gateway import Bus, ChannelRouter, Relay
-from bridge.gateway.msgid_resolver import DefaultMessageIDResolver
+from bridge.events import MessageOut, config_reload
+from bridge.gateway import Bus, BusHub, ChannelRouter, IPCBus, Relay
+from bridge.gateway.msgid_resolver import DefaultMessageIDResolver, MessageIDResolver, RemoteMessageIDResolver
 from bridge.gateway.relay import rebuild_content_filters
 from bridge.identity import DevIdentityResolver, IdentityResolver, PortalClient, PortalIdentityResolver
 
@@ -32,23 +49,73 @@ class Adapter(Protocol):
     async def stop(self) -> None: ...
 
 
+class _StartupProfile:
+    """``--profile-startup``: time each startup phase and the first relayed message.
+
+    Registered on the bus as an event target; the first ``MessageOut`` logs the
+    time from package import to first relay.
+    """
+
+    def __init__(self, started: float = IMPORT_STARTED) -> None:
+        self._started = started
+        self.phases: list[tuple[str, float]] = []
+        self.first_relay: float | None = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases.append((name, seconds))
+
+    def report(self) -> None:
+        for name, seconds in self.phases:
+            logger.info("startup profile: {:<24} {:8.1f} ms", name, seconds * 1000)
+        logger.info("startup profile: {:<24} {:8.1f} ms", "total", (time.perf_counter() - self._started) * 1000)
+
+    def accept_event(self, source: str, evt: object) -> bool:
+        return self.first_relay is None and isinstance(evt, MessageOut)
+
+    def push_event(self, source: str, evt: object) -> None:
+        self.first_relay = time.perf_counter() - self._started
+        logger.info("startup profile: {:<24} {:8.1f} ms", "time to first relay", self.first_relay * 1000)
+
+
 # Third-party libraries to intercept and route through loguru
 _INTERCEPTED_LIBRARIES = ["pydle", "pydle.client", "pydle.connection", "pydle.features.ircv3.cap"]
 
 
-def _intercept_logging(level: str) -> None:
-    """Route third-party library logs to loguru. Sets pydle to level for protocol debugging."""
+# Logging profiles: "dev" is human-readable colored text; "production" is JSON
+# lines written by a background thread with per-call-site sampling of INFO.
+LOG_PROFILES = ("dev", "production")
+
+# Production profile: max INFO-or-lower records per call site per second.
+_DEFAULT_LOG_SAMPLE_RATE = 5.0
+_INFO_LEVEL_NO = 20
+
+_LEVEL_MAP = {
+    "DEBUG": "DEBUG",
+    "INFO": "INFO",
+    "WARNING": "WARNING",
+    "ERROR": "ERROR",
+    "CRITICAL": "CRITICAL",
+}
+
+
+def _intercept_logging(level: str, profile: str = "dev") -> None:
+    """Route third-party library logs to loguru. Sets pydle to level for protocol debugging.
+
+    The production profile skips the per-record ``logger.patch`` and brace escaping:
+    records are logged through a logger pre-bound to the component prefix.
+    """
 
     class InterceptHandler(logging.Handler):
         def emit(self, record: logging.LogRecord) -> None:
-            level_map = {
-                "DEBUG": "DEBUG",
-                "INFO": "INFO",
-                "WARNING": "WARNING",
-                "ERROR": "ERROR",
-                "CRITICAL": "CRITICAL",
-            }
-            log_level = level_map.get(record.levelname, record.levelname)
+            log_level = _LEVEL_MAP.get(record.levelname, record.levelname)
             try:
                 log_level = logger.level(log_level).name
             except ValueError:
@@ -62,10 +129,24 @@ def _intercept_logging(level: str) -> None:
                 ),
             ).opt(exception=record.exc_info).log(log_level, msg)
 
-    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    class FastInterceptHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            # No args are passed to .log(), so loguru never str.format()s the message.
+            # _patcher_add_prefix copies the stdlib call site from _intercepted_record.
+            _intercepted_record.value = record
+            try:
+                _bound_logger(record.name).opt(exception=record.exc_info).log(
+                    _LEVEL_MAP.get(record.levelname, record.levelno),
+                    record.getMessage(),
+                )
+            finally:
+                _intercepted_record.value = None
+
+    handler_cls = FastInterceptHandler if profile == "production" else InterceptHandler
+    logging.basicConfig(handlers=[handler_cls()], level=0, force=True)
     for lib in _INTERCEPTED_LIBRARIES:
         lib_logger = logging.getLogger(lib)
-        lib_logger.handlers = [InterceptHandler()]
+        lib_logger.handlers = [handler_cls()]
         lib_logger.propagate = False
         lib_logger.setLevel(level)
 
@@ -89,6 +170,7 @@ def _intercept_logging(level: str) -> None:
         logging.getLogger(noisy).setLevel(logging.WARNING)
 
 
+@functools.lru_cache(maxsize=256)
 def _prefix_for_logger_name(name: str) -> str:
     """Map logger name to a component prefix for log output."""
     if name.startswith("pydle"):
@@ -112,10 +194,26 @@ def _prefix_for_logger_name(name: str) -> str:
     return "[Bridge]"
 
 
+@functools.lru_cache(maxsize=256)
+def _bound_logger(name: str) -> Any:
+    """Loguru logger bound to the prefix and stdlib logger name of an intercepted library."""
+    return logger.bind(prefix=_prefix_for_logger_name(name), logger_name=name)
+
+
+# stdlib record being forwarded by FastInterceptHandler on this thread (None otherwise).
+_intercepted_record = threading.local()
+
+
 def _patcher_add_prefix(record: dict[str, Any]) -> None:
-    """Loguru patcher: set prefix based on logger name for consistent log filtering."""
-    record.setdefault("extra", {})
-    record["extra"]["prefix"] = _prefix_for_logger_name(record.get("name", ""))
+    """Loguru patcher: set prefix based on logger name for consistent log filtering.
+    A prefix already bound on the record (intercepted stdlib loggers) is kept, and
+    records forwarded by FastInterceptHandler get the library's own call site."""
+    source = getattr(_intercepted_record, "value", None)
+    if source is not None:
+        record.update(name=source.name, function=source.funcName, line=source.lineno)
+    extra = record.setdefault("extra", {})
+    if "prefix" not in extra:
+        extra["prefix"] = _prefix_for_logger_name(record.get("name") or "")
 
 
 def _safe_message_filter(record: Any) -> bool:
@@ -127,9 +225,168 @@ def _safe_message_filter(record: Any) -> bool:
     return True
 
 
-def setup_logging(verbose: bool = False) -> None:
+class _CallSiteSampler:
+    """Loguru filter: rate-limit INFO-and-below records per call site.
+
+    Each (module, function, line) gets ``rate`` records per second (token bucket,
+    burst = rate). Dropped records are counted and reported on the next record that
+    passes as ``extra["suppressed"]``. WARNING and above are never sampled.
+    """
+
+    def __init__(self, rate: float = _DEFAULT_LOG_SAMPLE_RATE) -> None:
+        self._rate = rate
+        # call site -> [tokens, last_refill, suppressed]
+        self._sites: dict[tuple[Any, Any, Any], list[float]] = {}
+
+    def __call__(self, record: Any) -> bool:
+        if record["level"].no > _INFO_LEVEL_NO or self._rate <= 0:
+            return True
+        key = (record["name"], record["function"], record["line"])
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None:
+            site = self._sites[key] = [self._rate, now, 0]
+        else:
+            site[0] = min(self._rate, site[0] + (now - site[1]) * self._rate)
+            site[1] = now
+        if site[0] < 1.0:
+            site[2] += 1
+            return False
+        site[0] -= 1.0
+        if site[2]:
+            record["extra"]["suppressed"] = int(site[2])
+            site[2] = 0
+        return True
+
+
+def _log_sample_rate() -> float:
+    """Read LOG_SAMPLE_RATE (records/s per call site; 0 disables sampling)."""
+    raw = os.environ.get("LOG_SAMPLE_RATE", "")
+    try:
+        return float(raw) if raw else _DEFAULT_LOG_SAMPLE_RATE
+    except ValueError:
+        return _DEFAULT_LOG_SAMPLE_RATE
+
+
+def _resolve_log_profile(profile: str | None) -> str:
+    """Explicit profile wins, then LOG_PROFILE env; unknown values fall back to dev."""
+    value = (profile or os.environ.get("LOG_PROFILE") or "dev").lower()
+    return value if value in LOG_PROFILES else "dev"
+
+
+def _serialize_log_record(record: dict[str, Any]) -> str:
+    """One JSON line for *record*, in loguru's ``serialize=True`` layout."""
+    exception = record["exception"]
+    text = record["message"]
+    if exception is not None:
+        if exception.traceback is not None:
+            text += "\n" + "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+        exception = {
+            "type": None if exception.type is None else exception.type.__name__,
+            "value": exception.value,
+            "traceback": bool(exception.traceback),
+        }
+    level, file, process, thread = record["level"], record["file"], record["process"], record["thread"]
+    serializable = {
+        "text": text,
+        "record": {
+            "elapsed": {"repr": record["elapsed"], "seconds": record["elapsed"].total_seconds()},
+            "exception": exception,
+            "extra": record["extra"],
+            "file": {"name": file.name, "path": file.path},
+            "function": record["function"],
+            "level": {"icon": level.icon, "name": level.name, "no": level.no},
+            "line": record["line"],
+            "message": record["message"],
+            "module": record["module"],
+            "name": record["name"],
+            "process": {"id": process.id, "name": process.name},
+            "thread": {"id": thread.id, "name": thread.name},
+            "time": {"repr": record["time"], "timestamp": record["time"].timestamp()},
+        },
+    }
+    return json.dumps(serializable, default=str, ensure_ascii=False) + "\n"
+
+
+# Production log sink: the writer thread polls the queue every _LOG_WRITE_INTERVAL
+# seconds and writes when it stops growing, holding records at most _LOG_MAX_DELAY.
+_LOG_WRITE_INTERVAL = 0.02
+_LOG_MAX_DELAY = 1.0
+
+
+class _JSONLineWriter:
+    """Production log sink: records are serialized and written by a worker thread.
+
+    The logging thread only puts the record loguru already built on a queue, so
+    the event loop pays for neither JSON encoding nor file I/O. (loguru's own
+    ``enqueue=True`` pickles every message on the caller.) :meth:`stop`, called
+    by ``logger.remove()``, drains the queue.
+    """
+
+    def __init__(self, sink: Any) -> None:
+        self._sink = sink
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        self._queue.put(message.record)
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        owned = isinstance(self._sink, str | Path)
+        stream = open(self._sink, "a", encoding="utf-8") if owned else self._sink  # noqa: SIM115
+        try:
+            while (record := self._queue.get()) is not None:
+                # Write once the logging thread goes quiet (or after _LOG_MAX_DELAY),
+                # so a burst is not slowed by this thread competing for the GIL.
+                deadline = time.monotonic() + _LOG_MAX_DELAY
+                pending = -1
+                while pending != (pending := self._queue.qsize()) and time.monotonic() < deadline:
+                    time.sleep(_LOG_WRITE_INTERVAL)
+                batch = [record]
+                while not self._queue.empty() and (record := self._queue.get()) is not None:
+                    batch.append(record)
+                try:
+                    stream.write("".join(map(_serialize_log_record, batch)))
+                    stream.flush()
+                except Exception as exc:
+                    print(f"log writer failed: {exc!r}", file=sys.__stderr__)
+                if record is None:
+                    break
+        finally:
+            if owned:
+                stream.close()
+
+
+def _add_log_sink(sink: Any, level: str, profile: str) -> int:
+    """Add a loguru sink configured for profile. Returns the handler id."""
+    if profile == "production":
+        # The message is a JSON field, so braces/angles need no escaping; the
+        # writer thread serializes and writes it off the event loop thread.
+        return logger.add(
+            _JSONLineWriter(sink),
+            level=level,
+            format="{message}",
+            colorize=False,
+            filter=_CallSiteSampler(_log_sample_rate()),
+        )
+    return logger.add(
+        sink,
+        level=level,
+        format=("<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {extra[prefix]} | {message}"),
+        filter=_safe_message_filter,
+    )
+
+
+def setup_logging(verbose: bool = False, profile: str | None = None) -> None:
     """Configure loguru. Replace default logging.
     Level: verbose=True or LOG_LEVEL=DEBUG enables DEBUG; otherwise INFO.
+    Profile: profile arg or LOG_PROFILE env ("dev" default, "production" for JSON
+    lines from a writer thread and per-call-site sampling of INFO lines; see LOG_SAMPLE_RATE).
     Intercepts pydle logs and routes them through loguru for protocol debugging.
     Adds component prefix ([IRC], [XMPP], [Discord], etc.) for grep-friendly filtering."""
     level = "INFO"
@@ -139,16 +396,12 @@ def setup_logging(verbose: bool = False) -> None:
         env_level = (os.environ.get("LOG_LEVEL") or "").upper()
         if env_level in ("DEBUG", "INFO", "WARNING", "ERROR"):
             level = env_level
+    profile = _resolve_log_profile(profile)
 
     logger.remove()
     logger.configure(patcher=_patcher_add_prefix)
-    logger.add(
-        sys.stderr,
-        level=level,
-        format=("<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {extra[prefix]} | {message}"),
-        filter=_safe_message_filter,
-    )
-    _intercept_logging(level)
+    _add_log_sink(sys.stderr, level, profile)
+    _intercept_logging(level, profile)
 
 
 def reload_config(config_path: Path) -> Config:
@@ -174,61 +427,128 @@ def main() -> None:
         action="store_true",
         help="Enable debug logging",
     )
+    parser.add_argument(
+        "--log-profile",
+        choices=LOG_PROFILES,
+        default=None,
+        help="Logging profile: dev (colored text) or production (JSON from a writer thread, sampled). Default: LOG_PROFILE or dev",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log import, config load and adapter start times, and the time to the first relayed message",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Run each adapter in its own process, connected to the relay in this one over a Unix socket",
+    )
+    # Internal: how a --processes parent starts each adapter process
+    parser.add_argument("--adapter", choices=[name for name, *_ in _ADAPTERS], help=argparse.SUPPRESS)
+    parser.add_argument("--bus-socket", help=argparse.SUPPRESS)
     parser.add_argument(
         "--version",
         action="version",
         version=f"%(prog)s {__version__}",
     )
     args = parser.parse_args()
+    profile = _StartupProfile() if args.profile_startup else None
+    if profile is not None:
+        profile.record("imports", time.perf_counter() - IMPORT_STARTED)
 
-    setup_logging(args.verbose)
+    setup_logging(args.verbose, args.log_profile)
 
     if not args.config.exists():
         logger.error("Config file not found: {}", args.config)
         sys.exit(1)
 
     # Load config
-    config = reload_config(args.config)
+    with profile.phase("config load") if profile else contextlib.nullcontext():
+        config = reload_config(args.config)
     logger.info("Config loaded from {}", args.config)
 
+    if args.adapter:
+        # Adapter process of a --processes bridge: one adapter, bus connected to the parent
+        router = ChannelRouter()
+        router.load_from_config(config.raw)
+        portal_client, identity_resolver = _identity_from_env(config)
+        _run_event_loop(
+            _run_adapter_process(
+                args.adapter,
+                args.bus_socket,
+                router,
+                identity_resolver,
+                portal_client,
+                config_path=args.config,
+                profile=profile,
+            )
+        )
+        return
+
     # Create gateway components (before SIGHUP handler so it can use bus.publish)
-    bus = Bus()
+    bus = BusHub() if args.processes else Bus()
     router = ChannelRouter()
     router.load_from_config(config.raw)
 
     # Relay: MessageIn -> MessageOut for other protocols
     relay = Relay(bus, router)
     bus.register(relay)
+    if profile is not None:
+        bus.register(profile)
 
-    # Portal client + identity resolver (when Portal URL available)
-    portal_url = _get_portal_url()
-    portal_client: PortalClient | None = None
-    identity_resolver: IdentityResolver | None = None
-    if portal_url:
-        portal_client = PortalClient(portal_url, token=_get_portal_token())
-        identity_resolver = PortalIdentityResolver(
-            portal_client,
-            ttl=config.identity_cache_ttl_seconds,
+    if args.processes:
+        logger.info("Bridge ready — {} mappings; adapters run in separate processes", len(router.all_mappings()))
+        _run_event_loop(
+            _run_processes(bus, router, args.config, _adapter_process_args(args), profile=profile, relay=relay)
         )
-        logger.info("Portal identity client configured: {}", portal_url)
-    elif _dev_irc_puppets_enabled():
-        identity_resolver = DevIdentityResolver()
-        logger.info("Dev IRC puppets enabled (no Portal); nicks from BRIDGE_DEV_IRC_NICK_MAP or atl_dev_*")
-    else:
-        logger.warning("BRIDGE_PORTAL_BASE_URL not set; identity resolution disabled")
+        return
+
+    portal_client, identity_resolver = _identity_from_env(config)
 
     logger.info(
         "Bridge ready — {} mappings",
         len(router.all_mappings()),
     )
 
-    # Run async main (uvloop if available for better I/O throughput)
+    _run_event_loop(_run(bus, router, identity_resolver, portal_client, args.config, profile=profile, relay=relay))
+
+
+def _run_event_loop(main: Coroutine[Any, Any, None]) -> None:
+    """Run *main* to completion (uvloop if available for better I/O throughput)."""
     try:
         import uvloop
-
-        uvloop.run(_run(bus, router, identity_resolver, portal_client, args.config))
     except ImportError:
-        asyncio.run(_run(bus, router, identity_resolver, portal_client, args.config))
+        uvloop = None
+    if uvloop is None:
+        asyncio.run(main)
+    else:
+        uvloop.run(main)
+
+
+def _identity_from_env(config: Config) -> tuple[PortalClient | None, IdentityResolver | None]:
+    """Portal client + identity resolver (when Portal URL available), else dev or no resolver."""
+    portal_url = _get_portal_url()
+    if portal_url:
+        portal_client = PortalClient(portal_url, token=_get_portal_token())
+        logger.info("Portal identity client configured: {}", portal_url)
+        return portal_client, PortalIdentityResolver(portal_client, ttl=config.identity_cache_ttl_seconds)
+    if _dev_irc_puppets_enabled():
+        logger.info("Dev IRC puppets enabled (no Portal); nicks from BRIDGE_DEV_IRC_NICK_MAP or atl_dev_*")
+        return None, DevIdentityResolver()
+    logger.warning("BRIDGE_PORTAL_BASE_URL not set; identity resolution disabled")
+    return None, None
+
+
+def _adapter_process_args(args: argparse.Namespace) -> list[str]:
+    """Command line for an adapter process, less ``--adapter``/``--bus-socket``."""
+    argv = [sys.executable, "-m", "bridge", "--config", str(args.config)]
+    if args.verbose:
+        argv.append("--verbose")
+    if args.log_profile:
+        argv += ["--log-profile", args.log_profile]
+    if args.profile_startup:
+        argv.append("--profile-startup")
+    return argv
 
 
 def _get_portal_url() -> str | None:
@@ -246,14 +566,64 @@ def _get_portal_token() -> str | None:
     return os.environ.get("BRIDGE_PORTAL_TOKEN")
 
 
+def _discord_configured(router: ChannelRouter) -> bool:
+    return bool(os.environ.get("BRIDGE_DISCORD_TOKEN")) and bool(router.all_mappings())
+
+
+def _irc_configured(router: ChannelRouter) -> bool:
+    return any(m.irc for m in router.all_mappings())
+
+
+def _xmpp_configured(router: ChannelRouter) -> bool:
+    env = os.environ
+    credentials = all(
+        env.get(key)
+        for key in ("BRIDGE_XMPP_COMPONENT_JID", "BRIDGE_XMPP_COMPONENT_SECRET", "BRIDGE_XMPP_COMPONENT_SERVER")
+    )
+    return credentials and any(m.xmpp for m in router.all_mappings())
+
+
+# (name, module, class, configured check), in start order
+_ADAPTERS: tuple[tuple[str, str, str, Callable[[ChannelRouter], bool]], ...] = (
+    ("discord", "bridge.adapters.discord", "DiscordAdapter", _discord_configured),
+    ("irc", "bridge.adapters.irc", "IRCAdapter", _irc_configured),
+    ("xmpp", "bridge.adapters.xmpp", "XMPPAdapter", _xmpp_configured),
+)
+
+
+def _configured_adapters(router: ChannelRouter) -> list[tuple[str, str, str]]:
+    """(name, module, class) of each adapter whose protocol has config; the others are never imported."""
+    configured = []
+    for name, module, class_name, is_configured in _ADAPTERS:
+        if is_configured(router):
+            configured.append((name, module, class_name))
+        else:
+            logger.info("{} not configured; adapter not loaded", name)
+    return configured
+
+
+def _load_adapter_class(module: str, class_name: str) -> Any:
+    return getattr(importlib.import_module(module), class_name)
+
+
 async def _run(
     bus: Bus,
     router: ChannelRouter,
     identity_resolver: IdentityResolver | None,
     portal_client: PortalClient | None = None,
     config_path: Path = Path("config.yaml"),
+    *,
+    profile: _StartupProfile | None = None,
+    only: str | None = None,
+    msgid_resolver: MessageIDResolver | None = None,
+    until: asyncio.Event | None = None,
+    relay: Relay | None = None,
 ) -> None:
-    """Async run loop. Start adapters and wait."""
+    """Async run loop. Start adapters and wait (until cancelled, or *until* is set).
+
+    *only* restricts the run to one adapter (an adapter process of ``--processes``).
+    *relay* has its held edits and reactions delivered before the adapters stop.
+    """
     # Register SIGHUP handler inside the running event loop so the callback
     # executes cooperatively (not from a signal interrupt context), eliminating
     # the data race with concurrently-running coroutines.
@@ -262,47 +632,207 @@ async def _run(
 
         def _do_reload() -> None:
             config = reload_config(config_path)
-            router.load_from_config(config.raw)
+            mappings = router.load_from_config(config.raw)
             rebuild_content_filters()
-            _, evt = config_reload()
+            _, evt = config_reload(mappings)
             bus.publish("main", evt)
             logger.info("Config reloaded (SIGHUP)")
 
         loop.add_signal_handler(signal.SIGHUP, _do_reload)
+        watcher = asyncio.create_task(_watch_shard_members(_do_reload))
 
     # Open shared HTTP connection pool before any identity lookups
     if portal_client is not None:
         await portal_client.aopen()
         logger.info("Portal HTTP connection pool opened")
 
-    msgid_resolver = DefaultMessageIDResolver()
-    adapters: list[Adapter] = []
-    discord_adapter = DiscordAdapter(bus, router, identity_resolver, msgid_resolver)
-    irc_adapter = IRCAdapter(bus, router, identity_resolver, msgid_resolver)
-    xmpp_adapter = XMPPAdapter(bus, router, identity_resolver, msgid_resolver)
-    adapters.extend([discord_adapter, irc_adapter, xmpp_adapter])
+    if msgid_resolver is None:
+        msgid_resolver = DefaultMessageIDResolver()
+    adapters: list[tuple[str, Adapter]] = []
+    for name, module, class_name in _configured_adapters(router):
+        if only is not None and name != only:
+            continue
+        with profile.phase(f"{name} import") if profile else contextlib.nullcontext():
+            adapter_cls = _load_adapter_class(module, class_name)
+        adapters.append((name, adapter_cls(bus, router, identity_resolver, msgid_resolver)))
 
     logger.info("Starting adapters")
-    await discord_adapter.start()
-    await irc_adapter.start()
-    await xmpp_adapter.start()
+    for name, adapter in adapters:
+        with profile.phase(f"{name} start") if profile else contextlib.nullcontext():
+            await adapter.start()
+    if profile is not None:
+        profile.report()
+
+    with contextlib.suppress(asyncio.CancelledError):
+        await (until or asyncio.Event()).wait()
+    logger.info("Bridge shutting down")
+    if sys.platform != "win32":
+        watcher.cancel()
+    if relay is not None:
+        relay.flush()
+    for name, adapter in adapters:
+        logger.info("Stopping {} adapter", name)
+        try:
+            await asyncio.wait_for(adapter.stop(), timeout=10.0)
+        except TimeoutError:
+            logger.warning("{} adapter did not stop cleanly within 10s", name)
+    # Close shared HTTP connection pool
+    if portal_client is not None:
+        await portal_client.aclose()
+        logger.info("Portal HTTP connection pool closed")
 
-    try:
-        while True:
-            await asyncio.sleep(60)
-    except asyncio.CancelledError:
-        logger.info("Bridge shutting down")
-        for adapter in adapters:
-            name = getattr(adapter, "name", adapter.__class__.__name__)
-            logger.info("Stopping {} adapter", name)
+
+_SHARD_MEMBERS_POLL_S = 10.0
+
+
+async def _watch_shard_members(on_change: Callable[[], None], interval: float = _SHARD_MEMBERS_POLL_S) -> None:
+    """Reload when the ``shard_members_file`` changes, so instances rebalance without a SIGHUP.
+
+    Appearing, disappearing and being replaced (new inode) all count as changes.
+    """
+    first = True
+    last: tuple[str, int, float] | None = None
+    while True:
+        path = cfg.get("shard_members_file")
+        try:
+            st = os.stat(path) if path else None
+            stamp = (str(path), st.st_ino, st.st_mtime) if st is not None else None
+        except OSError:
+            stamp = None
+        if not first and stamp != last:
+            logger.info("Shard members file {} changed; reloading", path)
             try:
-                await asyncio.wait_for(adapter.stop(), timeout=10.0)
-            except TimeoutError:
-                logger.warning("{} adapter did not stop cleanly within 10s", name)
-        # Close shared HTTP connection pool
-        if portal_client is not None:
-            await portal_client.aclose()
-            logger.info("Portal HTTP connection pool closed")
+                on_change()
+            except Exception as exc:
+                logger.error("Reload after shard members change failed: {}", exc)
+        first = False
+        last = stamp
+        await asyncio.sleep(interval)
+
+
+async def _run_adapter_process(
+    name: str,
+    socket_path: str,
+    router: ChannelRouter,
+    identity_resolver: IdentityResolver | None,
+    portal_client: PortalClient | None,
+    *,
+    config_path: Path,
+    profile: _StartupProfile | None = None,
+) -> None:
+    """Adapter process of ``--processes``: run adapter *name* on an :class:`IPCBus` until the parent goes away."""
+    bus = IPCBus(name)
+    await bus.connect(socket_path)
+    if profile is not None:
+        bus.register(profile)
+    if sys.platform != "win32":
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, bus.close)
+    await _run(
+        bus,
+        router,
+        identity_resolver,
+        portal_client,
+        config_path,
+        profile=profile,
+        only=name,
+        msgid_resolver=RemoteMessageIDResolver(bus),
+        until=bus.closed,
+    )
+
+
+_RESTART_DELAY_S = 5.0
+
+
+class _AdapterProcess:
+    """One adapter's child process under ``--processes``; restarted when it exits."""
+
+    def __init__(self, name: str, argv: list[str], *, restart_delay: float = _RESTART_DELAY_S) -> None:
+        self.name = name
+        self.argv = argv
+        self.proc: asyncio.subprocess.Process | None = None
+        self._restart_delay = restart_delay
+        self._stopping = False
+
+    async def run(self) -> None:
+        while not self._stopping:
+            self.proc = await asyncio.create_subprocess_exec(*self.argv)
+            logger.info("{} adapter process started (pid {})", self.name, self.proc.pid)
+            code = await self.proc.wait()
+            if self._stopping:
+                break
+            logger.warning(
+                "{} adapter process exited with {}; restarting in {:.0f}s", self.name, code, self._restart_delay
+            )
+            await asyncio.sleep(self._restart_delay)
+
+    def send_signal(self, sig: int) -> None:
+        if self.proc is not None and self.proc.returncode is None:
+            self.proc.send_signal(sig)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        self._stopping = True
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        self.proc.terminate()
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout)
+        except TimeoutError:
+            logger.warning("{} adapter process did not stop within {:.0f}s; killing it", self.name, timeout)
+            self.proc.kill()
+            await self.proc.wait()
+
+
+async def _run_processes(
+    hub: BusHub,
+    router: ChannelRouter,
+    config_path: Path,
+    argv: list[str],
+    *,
+    profile: _StartupProfile | None = None,
+    relay: Relay | None = None,
+) -> None:
+    """``--processes``: relay in this process, each configured adapter in a child connected through *hub*."""
+    socket_dir = tempfile.mkdtemp(prefix="atl-bridge-")
+    socket_path = os.path.join(socket_dir, "bus.sock")
+    await hub.start(socket_path)
+    children = [
+        _AdapterProcess(name, [*argv, "--adapter", name, "--bus-socket", socket_path])
+        for name, _, _ in _configured_adapters(router)
+    ]
+
+    if sys.platform != "win32":
+
+        def _do_reload(*, forward: bool = True) -> None:
+            # Adapter processes reload their own config and raise their own ConfigReload
+            config = reload_config(config_path)
+            router.load_from_config(config.raw)
+            rebuild_content_filters()
+            if forward:
+                for child in children:
+                    child.send_signal(signal.SIGHUP)
+            logger.info("Config reloaded (SIGHUP)")
+
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _do_reload)
+        # Adapter processes watch the shard members file themselves
+        tasks = [asyncio.create_task(_watch_shard_members(functools.partial(_do_reload, forward=False)))]
+    else:
+        tasks = []
+
+    tasks += [asyncio.create_task(child.run()) for child in children]
+    if profile is not None:
+        profile.report()
+    with contextlib.suppress(asyncio.CancelledError):
+        await asyncio.Event().wait()
+    logger.info("Bridge shutting down")
+    if relay is not None:
+        relay.flush()
+    for child in children:
+        logger.info("Stopping {} adapter process", child.name)
+    await asyncio.gather(*(child.stop() for child in children))
+    for task in tasks:
+        task.cancel()
+    await hub.close()
+    shutil.rmtree(socket_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
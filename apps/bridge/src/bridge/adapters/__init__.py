@@ -1,9 +1,33 @@
-"""Protocol adapters. Each implements BridgeAdapter (EventTarget + name, start, stop)."""
+"""Protocol adapters. Each implements BridgeAdapter (EventTarget + name, start, stop).
+
+Adapter classes are imported on first attribute access, so importing one
+adapter package (or this one) doesn't pull in the other protocols' libraries.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 from bridge.adapters.base import AdapterBase
-from bridge.adapters.discord import DiscordAdapter
-from bridge.adapters.irc import IRCAdapter
-from bridge.adapters.xmpp import XMPPAdapter
 from bridge.core.events import BridgeAdapter
 
+if TYPE_CHECKING:
+    from bridge.adapters.discord import DiscordAdapter
+    from bridge.adapters.irc import IRCAdapter
+    from bridge.adapters.xmpp import XMPPAdapter
+
 __all__ = ["AdapterBase", "BridgeAdapter", "DiscordAdapter", "IRCAdapter", "XMPPAdapter"]
+
+_LAZY = {
+    "DiscordAdapter": "bridge.adapters.discord",
+    "IRCAdapter": "bridge.adapters.irc",
+    "XMPPAdapter": "bridge.adapters.xmpp",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
@@ -21,7 +21,9 @@ from bridge.adapters.discord import media as discord_media
 from bridge.adapters.discord import outbound as discord_outbound
 from bridge.adapters.discord import reply_emoji as discord_reply_emoji
 from bridge.adapters.discord import webhook as discord_webhook
+from bridge.config import cfg
 from bridge.events import (
+    ConfigReload,
     MessageDeleteOut,
     MessageOut,
     ReactionOut,
@@ -29,8 +31,11 @@ from bridge.events import (
 )
 from bridge.formatting.mention_resolution import resolve_mentions
 from bridge.gateway import Bus, ChannelRouter
+from bridge.gateway.sharding import shard_instance
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from bridge.gateway.msgid_resolver import MessageIDResolver
     from bridge.identity import IdentityResolver
 
@@ -87,6 +92,8 @@ class DiscordAdapter(AdapterBase):
             return True
         if isinstance(evt, MessageDeleteOut) and evt.target_origin == "discord":
             return True
+        if isinstance(evt, ConfigReload):
+            return bool(evt.mappings and evt.mappings.removed)
         return (isinstance(evt, ReactionOut) and evt.target_origin == "discord") or (
             isinstance(evt, TypingOut) and evt.target_origin == "discord"
         )
@@ -102,6 +109,9 @@ class DiscordAdapter(AdapterBase):
         if isinstance(evt, TypingOut) and evt.target_origin == "discord":
             self._track_task(asyncio.create_task(self._handle_typing_out(evt)))
             return
+        if isinstance(evt, ConfigReload) and evt.mappings:
+            self._forget_channels(m.discord_channel_id for m in evt.mappings.removed)
+            return
         if isinstance(evt, MessageOut):
             self._queue.put_nowait(evt)
 
@@ -186,7 +196,7 @@ class DiscordAdapter(AdapterBase):
     async def _resolve_avatar_for_send(self, evt: MessageOut) -> str | None:
         """Resolve avatar URL: prefer Portal, then evt.avatar_url, then XMPP fallback."""
         if self._identity and evt.author_id:
-            origin = (evt.raw or {}).get("origin", "")
+            origin = evt.origin
             try:
                 if origin == "discord":
                     url = await self._identity.avatar_for_discord(evt.author_id)
@@ -207,11 +217,27 @@ class DiscordAdapter(AdapterBase):
     # Webhook delegation
     # ------------------------------------------------------------------
 
+    def _forget_channels(self, channel_ids: Iterable[str]) -> None:
+        """Drop cached webhooks and per-channel state for Discord channels no longer mapped."""
+        for channel_id in channel_ids:
+            if self._router.get_mapping_for_discord(channel_id) is not None:
+                continue
+            self._webhook_cache.pop(channel_id, None)
+            self._webhook_create_locks.pop(channel_id, None)
+            self._channel_locks.pop(channel_id, None)
+            self._typing_throttle.pop(channel_id, None)
+            self._typing_publish_throttle.pop(channel_id, None)
+            logger.info("mapping removed; dropped webhook cache for channel {}", channel_id)
+
     async def _get_or_create_webhook(self, channel_id: str) -> Webhook | None:
         if not self._bot:
             return None
         return await discord_webhook.get_or_create_webhook(
-            self._bot, channel_id, self._webhook_cache, self._webhook_create_locks
+            self._bot,
+            channel_id,
+            self._webhook_cache,
+            self._webhook_create_locks,
+            name=discord_webhook.webhook_name(shard_instance(cfg.raw)),
         )
 
     async def _webhook_send(
@@ -299,9 +325,9 @@ class DiscordAdapter(AdapterBase):
                     evt.author_display,
                 )
 
-                is_edit = evt.raw.get("is_edit", False)
+                is_edit = evt.is_edit
                 replace_id = evt.raw.get("replace_id")
-                origin = evt.raw.get("origin", "")
+                origin = evt.origin
 
                 discord_msg_id: int | None = None
                 if is_edit and replace_id and self._bot:
@@ -390,7 +416,6 @@ class DiscordAdapter(AdapterBase):
                 # will be silently lost. Eliminating this race would require pre-registering a
                 # placeholder before the send and updating it with the real discord_msg_id in the
                 # webhook echo, which is not currently implemented.
-                origin = (evt.raw or {}).get("origin")
                 if discord_msg_id and origin == "xmpp" and self._msgid_resolver:
                     mapping = self._router.get_mapping_for_discord(evt.channel_id)
                     if mapping and mapping.xmpp:
@@ -399,7 +424,7 @@ class DiscordAdapter(AdapterBase):
                             str(discord_msg_id),
                             mapping.xmpp.muc_jid,
                         )
-                        for alias in (evt.raw or {}).get("xmpp_id_aliases", []):
+                        for alias in evt.meta.xmpp_id_aliases:
                             if alias and alias != evt.message_id:
                                 self._msgid_resolver.add_xmpp_alias(alias, evt.message_id)
                         logger.debug(
@@ -415,7 +440,7 @@ class DiscordAdapter(AdapterBase):
                             evt.message_id,
                         )
                 # Store IRC->Discord mapping for REDACT routing
-                if discord_msg_id and evt.raw.get("origin") == "irc" and self._msgid_resolver:
+                if discord_msg_id and origin == "irc" and self._msgid_resolver:
                     self._msgid_resolver.store_irc(evt.message_id, str(discord_msg_id))
                     irc_msgid = evt.message_id
                     if self._msgid_resolver.resolve_irc_xmpp_pending(irc_msgid, str(discord_msg_id)):
@@ -16,8 +16,7 @@ async def resolve_xmpp_avatar_fallback(evt: MessageOut, router: ChannelRouter) -
     PEP/vCard avatar endpoints. Only applies when the channel mapping has
     an XMPP target so we can derive the domain.
     """
-    origin = (evt.raw or {}).get("origin", "")
-    if origin != "irc":
+    if evt.origin != "irc":
         return None
     mapping = router.get_mapping_for_discord(evt.channel_id)
     if not mapping or not mapping.xmpp:
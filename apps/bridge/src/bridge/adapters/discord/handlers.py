@@ -10,7 +10,8 @@ from discord import Message, MessageType, RawBulkMessageDeleteEvent, RawMessageD
 from discord.enums import ReactionType
 from loguru import logger
 
-from bridge.events import message_delete, message_in
+from bridge.events import NO_META, MessageMeta, message_bulk_delete, message_delete, message_in
+from bridge.gateway.enrichment import enricher_for
 
 if TYPE_CHECKING:
     from bridge.adapters.discord.adapter import DiscordAdapter
@@ -96,6 +97,18 @@ def _is_voice_message(message: Message) -> bool:
     return bool(getattr(flags, "value", 0) & (1 << 13))
 
 
+async def _canonical_discord_username(adapter: DiscordAdapter, discord_id: str) -> str | None:
+    """Portal username for *discord_id*, bounded by the enrichment deadline (None on miss/error)."""
+    identity = adapter._identity
+    if not identity:
+        return None
+    with contextlib.suppress(Exception):
+        return await enricher_for(identity).resolve(
+            ("discord", discord_id), lambda: identity.username_for_discord(discord_id)
+        )
+    return None
+
+
 async def on_message(adapter: DiscordAdapter, message: Message) -> None:
     """Handle incoming Discord message; emit MessageIn to bus."""
     if is_bridge_echo(message):
@@ -109,10 +122,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
     if not adapter._is_bridged_channel(channel_id):
         return
 
-    canonical_username: str | None = None
-    if adapter._identity:
-        with contextlib.suppress(Exception):
-            canonical_username = await adapter._identity.username_for_discord(str(message.author.id))
+    canonical_username = await _canonical_discord_username(adapter, str(message.author.id))
     author_display = relay_author_display(canonical_username, message.author)
 
     # Voice messages: relay the audio attachment URL or a placeholder.
@@ -145,7 +155,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
     # Handle attachments: emit each attachment's CDN URL as a message.
     if message.attachments:
         for attachment in message.attachments:
-            att_raw: dict[str, object] = {}
+            att_meta = NO_META
             # Pass image/video dimensions for XEP-0446 file metadata.
             # Guard against zero or negative values that could confuse downstream handlers.
             if (
@@ -154,8 +164,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
                 and attachment.width > 0
                 and attachment.height > 0
             ):
-                att_raw["media_width"] = attachment.width
-                att_raw["media_height"] = attachment.height
+                att_meta = MessageMeta(media_width=attachment.width, media_height=attachment.height)
             _, att_evt = message_in(
                 origin="discord",
                 channel_id=channel_id,
@@ -165,7 +174,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
                 message_id=f"{message.id}_attachment_{attachment.id}",
                 is_action=False,
                 avatar_url=avatar_url,
-                raw=att_raw,
+                meta=att_meta,
             )
             logger.info(
                 "attachment bridged: channel={} author={} file={}",
@@ -181,7 +190,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
         return
 
     # For replies: include referenced message content + author so relay can add quote for IRC
-    raw: dict[str, object] = {}
+    meta = NO_META
     if message.reference:
         ref_content: str | None = None
         ref_author: str | None = None
@@ -196,10 +205,8 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
                 ref_author = relay_author_display(None, ref_msg.author)
             except Exception:
                 pass
-        if ref_content:
-            raw["reply_quoted_content"] = ref_content
-        if ref_author:
-            raw["reply_quoted_author"] = ref_author
+        if ref_content or ref_author:
+            meta = MessageMeta(reply_quoted_content=ref_content or None, reply_quoted_author=ref_author or None)
 
     # Detect Discord /me action: message starting with "/me "
     is_action = False
@@ -218,7 +225,7 @@ async def on_message(adapter: DiscordAdapter, message: Message) -> None:
         is_edit=False,
         is_action=is_action,
         avatar_url=avatar_url,
-        raw=raw,
+        meta=meta,
     )
     logger.info("message bridged: channel={} author={}", channel_id, author_display)
     adapter._bus.publish("discord", evt)
@@ -267,10 +274,7 @@ async def on_raw_message_edit(adapter: DiscordAdapter, payload) -> None:
     if not content.strip():
         return
 
-    canonical_username: str | None = None
-    if adapter._identity:
-        with contextlib.suppress(Exception):
-            canonical_username = await adapter._identity.username_for_discord(str(message.author.id))
+    canonical_username = await _canonical_discord_username(adapter, str(message.author.id))
     author_display = relay_author_display(canonical_username, message.author)
 
     avatar_url = str(message.author.display_avatar.url) if message.author.display_avatar else None
@@ -315,10 +319,7 @@ async def on_reaction_add(adapter: DiscordAdapter, payload) -> None:
     user = payload.member
     if not user and adapter._bot:
         user = await fetch_user(adapter, payload.user_id)
-    canonical_username: str | None = None
-    if adapter._identity and user:
-        with contextlib.suppress(Exception):
-            canonical_username = await adapter._identity.username_for_discord(str(payload.user_id))
+    canonical_username = await _canonical_discord_username(adapter, str(payload.user_id)) if user else None
     author_display = relay_author_display(canonical_username, user) if user else str(payload.user_id)
 
     from bridge.events import reaction_in
@@ -363,10 +364,7 @@ async def on_reaction_remove(adapter: DiscordAdapter, payload) -> None:
         return
 
     user = await fetch_user(adapter, payload.user_id)
-    canonical_username = None
-    if adapter._identity and user:
-        with contextlib.suppress(Exception):
-            canonical_username = await adapter._identity.username_for_discord(str(payload.user_id))
+    canonical_username = await _canonical_discord_username(adapter, str(payload.user_id)) if user else None
     author_display = relay_author_display(canonical_username, user) if user else str(payload.user_id)
 
     from bridge.events import reaction_in
@@ -451,7 +449,8 @@ async def on_raw_bulk_message_delete(adapter: DiscordAdapter, payload: RawBulkMe
 
     cached = {m.id: m for m in payload.cached_messages}
     logger.info("bulk delete bridged: channel={} count={}", channel_id, len(payload.message_ids))
-    for message_id in payload.message_ids:
+    messages = []
+    for message_id in sorted(payload.message_ids):
         # Skip when we initiated the delete (relaying from XMPP/IRC) — avoids duplicate retraction
         key = f"{channel_id}:{message_id}"
         if key in adapter._recently_deleted_by_us:
@@ -464,11 +463,9 @@ async def on_raw_bulk_message_delete(adapter: DiscordAdapter, payload: RawBulkMe
             a = cached[message_id].author
             author_id = str(a.id)
             author_display = relay_author_display(None, a)
-        _, evt = message_delete(
-            origin="discord",
-            channel_id=channel_id,
-            message_id=str(message_id),
-            author_id=author_id,
-            author_display=author_display,
-        )
-        adapter._bus.publish("discord", evt)
+        messages.append((str(message_id), author_id, author_display))
+    if not messages:
+        return
+    # One event for the whole purge: adapters run it as a single rate-budgeted batch
+    _, evt = message_bulk_delete(origin="discord", channel_id=channel_id, messages=tuple(messages))
+    adapter._bus.publish("discord", evt)
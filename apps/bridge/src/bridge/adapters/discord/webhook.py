@@ -16,6 +16,7 @@ from bridge.adapters.discord.reply_emoji import get_reply_prefix
 MIN_USERNAME_LEN = 2
 MAX_USERNAME_LEN = 32
 WEBHOOK_NAME = "ATL Bridge"
+MAX_WEBHOOK_NAME_LEN = 80
 DISCORD_WEBHOOKS_PER_CHANNEL = 10
 REPLY_CONTENT_MAX = 50
 _ALLOWED_MENTIONS = AllowedMentions(everyone=False, roles=False)
@@ -39,6 +40,13 @@ def _avatar_url_ok_for_discord(url: str | None) -> bool:
     return not any(h in url.lower() for h in _AVATAR_INTERNAL_HOSTS)
 
 
+def webhook_name(shard_instance: str | None = None) -> str:
+    """Name of the bridge's webhooks; sharded instances each use their own (``ATL Bridge (a)``)."""
+    if not shard_instance:
+        return WEBHOOK_NAME
+    return f"{WEBHOOK_NAME} ({shard_instance})"[:MAX_WEBHOOK_NAME_LEN]
+
+
 def _build_reply_line(
     reply_to_id: str,
     channel_id: str,
@@ -81,14 +89,16 @@ async def get_or_create_webhook(
     channel_id: str,
     webhook_cache: dict,
     webhook_create_locks: dict[str, asyncio.Lock] | None = None,
+    *,
+    name: str = WEBHOOK_NAME,
 ) -> Webhook | None:
     """Get or create one webhook per channel (matterbridge pattern).
 
     Webhooks allow the bridge to send messages that appear to come from
     different users (with custom username and avatar), rather than all
     messages appearing from the bot account. We reuse a single webhook
-    per channel (named "ATL Bridge") to stay within Discord's 10-webhook
-    limit per channel.
+    per channel (named *name*, "ATL Bridge" unless sharded) to stay within
+    Discord's 10-webhook limit per channel.
 
     A per-channel lock (webhook_create_locks) serializes the cache-check +
     webhook-create operation so that two concurrent callers cannot both see
@@ -123,12 +133,10 @@ async def get_or_create_webhook(
                 webhooks = await channel.webhooks()
                 app_id = str(getattr(bot, "application_id", None) or "")
                 for wh in webhooks:
-                    if wh.name == WEBHOOK_NAME:
-                        # NOTE: Multiple bridge instances will find and share the same
-                        # webhook (same WEBHOOK_NAME). This is safe for read/send but
-                        # means webhook edits/deletes from one instance affect others.
-                        # Single-instance deployments are assumed; multi-instance use
-                        # would require per-instance webhook names.
+                    if wh.name == name:
+                        # Sharded instances name their webhooks after themselves, so an
+                        # instance taking over a channel never edits or deletes through
+                        # the previous owner's webhook.
                         webhook = wh
                         logger.debug("Reusing webhook '{}' for channel {}", wh.name, channel_id)
                         break
@@ -139,7 +147,7 @@ async def get_or_create_webhook(
                             logger.info("Reusing app-owned webhook for channel {} (limit reached)", channel_id)
                             break
                 if not webhook and len(webhooks) < DISCORD_WEBHOOKS_PER_CHANNEL:
-                    webhook = await channel.create_webhook(name=WEBHOOK_NAME, reason="ATL Bridge relay")
+                    webhook = await channel.create_webhook(name=name, reason="ATL Bridge relay")
                 if webhook:
                     webhook_cache[channel_id] = webhook
             except Exception as exc:
@@ -1,6 +1,7 @@
 """IRC adapter package (AUDIT §2.B)."""
 
 from bridge.adapters.irc.adapter import IRCAdapter
+from bridge.adapters.irc.budget import payload_budget
 from bridge.adapters.irc.client import _MAX_ATTEMPTS, IRCClient, _connect_with_backoff
 from bridge.adapters.irc.handlers import (
     decode_irc_bytes,
@@ -32,5 +33,6 @@ __all__ = [
     "is_own_echo",
     "is_puppet_echo",
     "is_relaymsg_echo",
+    "payload_budget",
     "set_puppet_away",
 ]
@@ -6,6 +6,7 @@ import asyncio
 import contextlib
 import os
 import time
+from collections import deque
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -14,9 +15,10 @@ from bridge.adapters.base import AdapterBase
 from bridge.adapters.irc.client import IRCClient, _connect_with_backoff
 from bridge.adapters.irc.msgid import MessageIDTracker, ReactionTracker
 from bridge.adapters.irc.puppet import IRCPuppetManager
+from bridge.adapters.irc.throttle import take_tokens
 from bridge.config import cfg
-from bridge.events import MessageDeleteOut, MessageOut, ReactionOut, TypingOut
-from bridge.gateway import Bus, ChannelRouter
+from bridge.events import ConfigReload, MessageBulkDeleteOut, MessageDeleteOut, MessageOut, ReactionOut, TypingOut
+from bridge.gateway import Bus, ChannelRouter, MappingDiff
 
 if TYPE_CHECKING:
     from bridge.gateway.msgid_resolver import MessageIDResolver
@@ -40,6 +42,8 @@ class IRCAdapter(AdapterBase):
         self._task: asyncio.Task | None = None
         self._puppet_manager: IRCPuppetManager | None = None
         self._puppet_tasks: set[asyncio.Task] = set()
+        # Per-author ordered puppet sends: one drain task per non-empty queue (none when idle)
+        self._puppet_queues: dict[str, deque[MessageOut]] = {}
         self._background_tasks: set[asyncio.Task] = set()
         self._msgid_tracker = MessageIDTracker(ttl_seconds=3600)
         self._reaction_tracker = ReactionTracker(ttl_seconds=3600)
@@ -62,17 +66,19 @@ class IRCAdapter(AdapterBase):
         return "irc"
 
     def accept_event(self, source: str, evt: object) -> bool:
-        """Accept MessageOut, MessageDeleteOut, ReactionOut, or TypingOut targeting IRC."""
+        """Accept MessageOut, MessageDeleteOut, MessageBulkDeleteOut, ReactionOut, or TypingOut targeting IRC."""
         if isinstance(evt, MessageOut) and evt.target_origin == "irc":
             return True
-        if isinstance(evt, MessageDeleteOut) and evt.target_origin == "irc":
+        if isinstance(evt, (MessageDeleteOut, MessageBulkDeleteOut)) and evt.target_origin == "irc":
             return True
         if isinstance(evt, ReactionOut) and evt.target_origin == "irc":
             return True
+        if isinstance(evt, ConfigReload):
+            return bool(evt.mappings)
         return isinstance(evt, TypingOut) and evt.target_origin == "irc"
 
     def push_event(self, source: str, evt: object) -> None:
-        """Queue MessageOut, MessageDeleteOut, or ReactionOut for IRC send."""
+        """Queue MessageOut, MessageDeleteOut, MessageBulkDeleteOut, or ReactionOut for IRC send."""
         if isinstance(evt, MessageDeleteOut) and evt.target_origin == "irc":
             if self._client:
                 logger.debug(
@@ -82,10 +88,17 @@ class IRCAdapter(AdapterBase):
                 )
                 self._track_task(asyncio.create_task(self._send_redact(evt)))
             return
+        if isinstance(evt, MessageBulkDeleteOut) and evt.target_origin == "irc":
+            if self._client:
+                self._track_task(asyncio.create_task(self._send_redact_batch(evt)))
+            return
         if isinstance(evt, ReactionOut) and evt.target_origin == "irc":
             if self._client:
                 self._track_task(asyncio.create_task(self._send_reaction(evt)))
             return
+        if isinstance(evt, ConfigReload) and evt.mappings:
+            self._track_task(asyncio.create_task(self._apply_mapping_diff(evt.mappings)))
+            return
         if isinstance(evt, TypingOut) and evt.target_origin == "irc":
             if self._client:
                 self._track_task(asyncio.create_task(self._send_typing(evt)))
@@ -93,9 +106,7 @@ class IRCAdapter(AdapterBase):
         if isinstance(evt, MessageOut):
             # Use puppet if identity available, otherwise main connection
             if self._identity and self._puppet_manager:
-                task = asyncio.create_task(self._send_via_puppet(evt))
-                self._puppet_tasks.add(task)
-                task.add_done_callback(self._puppet_tasks.discard)
+                self._enqueue_puppet_send(evt)
             elif self._client:
                 self._client.queue_message(evt)
             else:
@@ -210,6 +221,14 @@ class IRCAdapter(AdapterBase):
                 evt.message_id,
             )
             return
+        if len(shared := self._msgid_tracker.discord_ids_on_line(irc_msgid)) > 1:
+            logger.info(
+                "skipping REDACT for Discord message {} (IRC line {} also carries {} other messages)",
+                evt.message_id,
+                irc_msgid,
+                len(shared) - 1,
+            )
+            return
         mapping = self._router.get_mapping_for_discord(evt.channel_id)
         if not mapping or not mapping.irc:
             return
@@ -221,6 +240,93 @@ class IRCAdapter(AdapterBase):
         except Exception as exc:
             logger.exception("REDACT failed: {}", exc)
 
+    async def _send_redact_batch(self, evt: MessageBulkDeleteOut) -> None:
+        """REDACT every message of a bulk delete, pipelined under the main connection's flood budget.
+
+        Lines are written back to back as tokens allow (no waiting for replies), so a
+        purge drains at ``irc_throttle_limit`` lines per second and shares the budget
+        with relayed messages instead of flooding the server.
+        """
+        if not self._client:
+            return
+        if not cfg.irc_redact_enabled:
+            logger.debug("skipping bulk REDACT of {} messages (irc_redact_enabled=false)", len(evt.messages))
+            return
+        caps = getattr(self._client, "_capabilities", {})
+        if not caps.get("draft/message-redaction"):
+            logger.info(
+                "skipping bulk REDACT of {} messages (draft/message-redaction not negotiated)", len(evt.messages)
+            )
+            return
+        mapping = self._router.get_mapping_for_discord(evt.channel_id)
+        if not mapping or not mapping.irc:
+            return
+        target = mapping.irc.channel
+        deleted = {message_id for message_id, _, _ in evt.messages}
+        # One REDACT per IRC line; a coalesced line goes only if every message on it is deleted
+        msgids: dict[str, None] = {}
+        unknown = kept = 0
+        for message_id, _, _ in evt.messages:
+            irc_msgid = self._msgid_tracker.get_irc_msgid(message_id)
+            if not irc_msgid:
+                unknown += 1
+                continue
+            if irc_msgid in msgids:
+                continue
+            if self._msgid_tracker.discord_ids_on_line(irc_msgid) <= deleted:
+                msgids[irc_msgid] = None
+            else:
+                kept += 1
+        start = time.monotonic()
+        sent = 0
+        for irc_msgid in msgids:
+            await take_tokens(self._client._throttle)
+            try:
+                await self._client.rawmsg("REDACT", target, irc_msgid)
+                sent += 1
+            except Exception as exc:
+                logger.warning("REDACT {} failed: {}", irc_msgid, exc)
+        logger.info(
+            "bulk REDACT to {}: {} lines for {} messages ({} without IRC msgid, {} shared lines kept) in {:.2f}s",
+            target,
+            sent,
+            len(evt.messages),
+            unknown,
+            kept,
+            time.monotonic() - start,
+        )
+
+    def _enqueue_puppet_send(self, evt: MessageOut) -> None:
+        """Queue *evt* behind earlier sends from the same author; start a drain task if none runs."""
+        queue = self._puppet_queues.get(evt.author_id)
+        if queue is not None:
+            queue.append(evt)
+            return
+        self._puppet_queues[evt.author_id] = deque([evt])
+        task = asyncio.create_task(self._drain_puppet_queue(evt.author_id))
+        self._puppet_tasks.add(task)
+        task.add_done_callback(self._puppet_tasks.discard)
+
+    async def _drain_puppet_queue(self, author_id: str) -> None:
+        """Send *author_id*'s queued messages one at a time, in order; exit once the queue is empty.
+
+        Lookup, join, METADATA and send for one message finish before the next
+        starts, so a user's messages cannot overtake each other. Flood control is
+        applied per line by IRCPuppetManager.
+        """
+        queue = self._puppet_queues.get(author_id)
+        try:
+            while queue:
+                evt = queue[0]
+                try:
+                    await self._send_via_puppet(evt)
+                except Exception as exc:
+                    logger.exception("puppet send failed for {}: {}", author_id, exc)
+                queue.popleft()
+        finally:
+            if self._puppet_queues.get(author_id) is queue:
+                del self._puppet_queues[author_id]
+
     async def _send_via_puppet(self, evt: MessageOut):
         """Send message via puppet connection."""
         if not self._puppet_manager or not self._identity:
@@ -230,7 +336,7 @@ class IRCAdapter(AdapterBase):
         if not mapping or not mapping.irc:
             return
 
-        origin = (evt.raw or {}).get("origin", "")
+        origin = evt.origin
         # Puppets are keyed by Discord ID; only Discord-origin messages have author_id = Discord snowflake.
         # XMPP/IRC origin: author_id is MUC nick or IRC nick, not Discord ID — use main connection.
         if origin in ("xmpp", "irc"):
@@ -247,11 +353,25 @@ class IRCAdapter(AdapterBase):
                 self._client.queue_message(evt)
             return
 
+        if has_irc and self._client and not self._puppet_manager.has_puppet(evt.author_id):
+            # Puppet not connected yet (e.g. everyone reconnecting after a restart): deliver
+            # now through the main connection (RELAYMSG) and bring the puppet up in the
+            # background under the manager's connect admission; later messages use it.
+            self._puppet_manager.start_puppet(evt.author_id)
+            self._client.queue_message(evt)
+            return
+
+        if has_irc and self._client and self._client.pending_sends(evt.author_id):
+            # Earlier messages of this author are still queued on the main connection
+            # (sent there while the puppet connected); stay behind them until they drain.
+            self._client.queue_message(evt)
+            return
+
         if has_irc:
             avatar_url: str | None = None
             if evt.author_id:
                 try:
-                    origin = (evt.raw or {}).get("origin", "")
+                    origin = evt.origin
                     if origin == "discord":
                         avatar_url = await self._identity.avatar_for_discord(evt.author_id)
                     elif origin == "irc":
@@ -308,6 +428,7 @@ class IRCAdapter(AdapterBase):
             throttle_limit=cfg.irc_throttle_limit,
             rejoin_delay=cfg.irc_rejoin_delay,
             auto_rejoin=cfg.irc_auto_rejoin,
+            coalesce_window_ms=cfg.irc_coalesce_window_ms,
             **irc_kwargs,
         )
 
@@ -337,12 +458,17 @@ class IRCAdapter(AdapterBase):
                 idle_timeout_hours=idle_timeout,
                 ping_interval=cfg.irc_puppet_ping_interval,
                 prejoin_commands=cfg.irc_puppet_prejoin_commands,
+                throttle_limit=cfg.irc_puppet_throttle_limit,
+                global_throttle_limit=cfg.irc_puppet_global_throttle_limit,
+                max_puppets=cfg.irc_puppet_max_connections,
+                connect_concurrency=cfg.irc_puppet_connect_concurrency,
+                connect_rate=cfg.irc_puppet_connect_rate,
             )
             pm = self._puppet_manager
             await pm.start()
             logger.info("puppet manager started (idle timeout: {}h)", idle_timeout)
             # Main connection receives puppet PRIVMSGs; skip to prevent Discord echo
-            self._client._puppet_nick_check = lambda n, m=pm: n in m.get_puppet_nicks()
+            self._client._puppet_nick_check = lambda n, m=pm, c=self._client: m.is_puppet_nick(n, c._server_casemapping)
 
         logger.info(
             "connection started: {}:{}, channels {}",
@@ -351,6 +477,34 @@ class IRCAdapter(AdapterBase):
             channels,
         )
 
+    async def _apply_mapping_diff(self, diff: MappingDiff) -> None:
+        """JOIN/PART only the IRC channels whose mappings were added, removed or changed on reload."""
+        client = self._client
+        if client is None:
+            return
+        left, joined = diff.irc_changes()
+        for server, channel in sorted(left):
+            if self._router.get_mapping_for_irc(server, channel) is None and channel in client._channels:
+                client._channels.remove(channel)
+                if client.connected:
+                    try:
+                        await client.part(channel)
+                    except Exception as exc:
+                        logger.warning("failed to part {}: {}", channel, exc)
+                if self._puppet_manager:
+                    await self._puppet_manager.part_channel(channel)
+                logger.info("mapping removed; parted {}", channel)
+        for _server, channel in sorted(joined):
+            if channel in client._channels:
+                continue
+            client._channels.append(channel)
+            if client.connected:
+                try:
+                    await client.join(channel)
+                except Exception as exc:
+                    logger.warning("failed to join {}: {} (will retry on next reconnect)", channel, exc)
+            logger.info("mapping added; joined {}", channel)
+
     async def stop(self) -> None:
         """Stop IRC connection."""
         self._bus.unregister(self)
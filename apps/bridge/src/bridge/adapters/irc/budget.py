@@ -0,0 +1,127 @@
+"""Exact per-target IRC payload budget.
+
+A relayed line must fit the server's line length twice: as we send it
+(``RELAYMSG #chan nick :text``) and as other clients receive it
+(``:nick!user@host PRIVMSG #chan :text``). The budget is derived from ISUPPORT
+(``LINELEN``, else the RFC 512; ``USERLEN``/``HOSTLEN`` when our own hostmask has
+not been observed yet) and the hostmask the server reports for our connection.
+Clients ask for that hostmask with ``USERHOST`` right after registration
+(:func:`request_own_hostmask`) and track ``RPL_HOSTHIDDEN`` changes, so the
+worst-case fallback only covers the moments before the reply arrives.
+LINELEN is capped at pydle's ``MESSAGE_LENGTH_LIMIT``: pydle refuses to construct
+longer lines, so a larger server limit cannot be used from this client.
+
+Chunks planned against this budget are sent with ``rawmsg``; pydle's
+``message()`` would re-split them at its own, more conservative length.
+
+IRCv3 tags have their own budget once ``message-tags`` is negotiated, so tag
+bytes only count against the line when that capability is missing.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from pydle.features.rfc1459.protocol import MESSAGE_LENGTH_LIMIT
+
+DEFAULT_LINELEN = 512  # RFC 1459/2812, including CRLF, excluding tags
+_DEFAULT_USERLEN = 10
+_DEFAULT_HOSTLEN = 63
+_MIN_PAYLOAD = 64  # never plan chunks smaller than this, whatever the overhead
+_CRLF = 2
+
+
+def _isupport_int(client: Any, key: str) -> int | None:
+    isupport = getattr(client, "_isupport", None)
+    if not isinstance(isupport, dict):
+        return None
+    try:
+        value = int(isupport.get(key))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def observed_hostmask(client: Any) -> tuple[str, str] | None:
+    """``(username, hostname)`` the server reports for *client*'s own nick, if seen yet."""
+    users = getattr(client, "users", None)
+    nickname = getattr(client, "nickname", None)
+    if not isinstance(users, Mapping) or not isinstance(nickname, str):
+        return None
+    info = users.get(nickname)
+    if not isinstance(info, Mapping):
+        return None
+    username, hostname = info.get("username"), info.get("hostname")
+    if isinstance(username, str) and isinstance(hostname, str) and username and hostname:
+        return username, hostname
+    return None
+
+
+async def request_own_hostmask(client: Any) -> None:
+    """Ask the server for our ``user@host`` (answered by RPL_USERHOST, see :func:`observe_userhost`)."""
+    await client.rawmsg("USERHOST", client.nickname)
+
+
+async def observe_userhost(client: Any, message: Any) -> None:
+    """RPL_USERHOST (302): record our own ``nick[*]=[+-]user@host`` entry."""
+    for entry in (message.params[-1] if message.params else "").split():
+        nick, sep, mask = entry.partition("=")
+        user, at, host = mask[1:].partition("@")
+        if sep and at and user and host and nick.rstrip("*") == client.nickname:
+            await client._sync_user(client.nickname, {"username": user, "hostname": host})
+
+
+async def observe_displayed_host(client: Any, message: Any) -> None:
+    """RPL_HOSTHIDDEN (396) ``<nick> [user@]host :is now your displayed host``: record the new host."""
+    if len(message.params) < 2:
+        return
+    user, at, host = message.params[1].rpartition("@")
+    if not host:
+        return
+    metadata = {"hostname": host}
+    if at and user:
+        metadata["username"] = user
+    await client._sync_user(client.nickname, metadata)
+
+
+def _tag_bytes(tags: dict[str, str] | None) -> int:
+    if not tags:
+        return 0
+    # "@k=v;k2=v2 " (escaping is rare for our tags; values are ids/labels)
+    return 1 + len(";".join(f"{k}={v}" if v else k for k, v in tags.items()).encode()) + 1
+
+
+def payload_budget(
+    client: Any,
+    target: str,
+    source_nick: str,
+    *,
+    command: str = "PRIVMSG",
+    tags: dict[str, str] | None = None,
+) -> int:
+    """Largest UTF-8 payload (bytes) for one ``command`` line to *target* appearing from *source_nick*.
+
+    ``command`` is ``"RELAYMSG"`` (spoofed *source_nick* is sent as a parameter)
+    or ``"PRIVMSG"``.
+    """
+    linelen = min(_isupport_int(client, "LINELEN") or DEFAULT_LINELEN, MESSAGE_LENGTH_LIMIT)
+    hostmask = observed_hostmask(client)
+    if hostmask is not None:
+        user_len, host_len = len(hostmask[0].encode()), len(hostmask[1].encode())
+    else:
+        user_len = (_isupport_int(client, "USERLEN") or _DEFAULT_USERLEN) + 1  # "~" ident prefix
+        host_len = _isupport_int(client, "HOSTLEN") or _DEFAULT_HOSTLEN
+
+    nick_len = len(source_nick.encode())
+    target_len = len(target.encode())
+    # ":nick!user@host PRIVMSG #chan :" + CRLF, as delivered to other members
+    relayed = 1 + nick_len + 1 + user_len + 1 + host_len + len(" PRIVMSG ") + target_len + len(" :") + _CRLF
+    # "RELAYMSG #chan nick :" / "PRIVMSG #chan :" + CRLF, as we send it
+    sent = len(command) + 1 + target_len + len(" :") + _CRLF
+    if command == "RELAYMSG":
+        sent += nick_len + 1
+    caps = getattr(client, "_capabilities", None)
+    if not (isinstance(caps, dict) and caps.get("message-tags")):
+        sent += _tag_bytes(tags)
+    return max(_MIN_PAYLOAD, linelen - max(relayed, sent))
@@ -14,11 +14,14 @@ import pydle
 from cachetools import TTLCache
 from loguru import logger
 
+from bridge.adapters.irc.budget import observe_displayed_host, observe_userhost, request_own_hostmask
+from bridge.adapters.irc.gapfill import GapFiller
 from bridge.adapters.irc.msgid import MessageIDTracker, ReactionTracker
 from bridge.adapters.irc.throttle import TokenBucket
 from bridge.config import cfg
 from bridge.events import MessageOut
 from bridge.gateway import Bus, ChannelRouter
+from bridge.tracking.echo import EchoCorrelator
 
 if TYPE_CHECKING:
     from bridge.identity import IdentityResolver
@@ -122,6 +125,8 @@ class IRCClient(pydle.Client):
         throttle_limit: int = 10,
         rejoin_delay: float = 5,
         auto_rejoin: bool = True,
+        *,
+        coalesce_window_ms: int = 0,
         **kwargs,
     ):
         super().__init__(nick, **kwargs)
@@ -138,18 +143,27 @@ class IRCClient(pydle.Client):
         self._throttle = TokenBucket(limit=throttle_limit, refill_rate=float(throttle_limit))
         self._rejoin_delay = rejoin_delay
         self._auto_rejoin = auto_rejoin
+        # Burst coalescing (outbound.coalesce_burst): latency bound in seconds (0 = off) and the
+        # (channel, author) keys dequeued within the last window, i.e. currently bursting.
+        self._coalesce_window = max(0, coalesce_window_ms) / 1000
+        self._coalesce_recent: TTLCache[tuple[str, str], None] = TTLCache(
+            maxsize=1024, ttl=self._coalesce_window or 1.0
+        )
+        # First discord_id of a merged send -> the ids merged into it, aliased to the
+        # echo's msgid when it is correlated (handlers._correlate_own_echo).
+        self._coalesced_ids: TTLCache[str, tuple[str, ...]] = TTLCache(maxsize=1024, ttl=120)
+        # author_id -> messages queued but not yet sent, so the adapter can keep an author on
+        # this queue until it drains instead of letting a new puppet overtake (pending_sends).
+        self._unsent: dict[str, int] = {}
         self._ready = False
-        self._pending_sends: asyncio.Queue[str] = asyncio.Queue()  # discord_id for echo correlation
         self._message_tags: dict[str, str | bool | None] = {}  # set in on_raw_privmsg from message.tags
         self._puppet_nick_check: Callable[[str], bool] | None = None  # set by adapter for echo detection
-        # Fallback echo detection when relaymsg tag missing (e.g. via irc-services)
-        self._recent_relaymsg_sends: TTLCache[tuple[str, str, str], None] = TTLCache(maxsize=100, ttl=5)
-        # labeled-response: label counter and pending label→discord_id mapping for echo correlation.
-        # When we send a RELAYMSG/PRIVMSG with a label tag, the server echoes it back with the
-        # same label. We match the echo's label to the discord_id we stored, enabling reliable
-        # msgid→discord_id correlation even when multiple messages are in flight.
+        # Echo correlation for our sends: each send is keyed by its labeled-response label
+        # or by target + nick + content digest, so the echo's msgid maps to the right
+        # discord_id even when echoes arrive out of order or are lost. Also holds the short
+        # RELAYMSG markers used when the relaymsg tag is missing (e.g. via irc-services).
         self._label_counter: int = 0
-        self._pending_labels: TTLCache[str, str] = TTLCache(maxsize=200, ttl=120)  # label -> discord_id
+        self._echoes = EchoCorrelator(ttl=120, name="IRC echo")
         # ISUPPORT values (Requirement 11.7, 11.8)
         self._server_nicklen: int = 23  # effective limit: min(server_nicklen, 23)
         self._server_casemapping: str = "rfc1459"  # default per IRC spec
@@ -161,6 +175,10 @@ class IRCClient(pydle.Client):
         self._last_message_times: dict[str, str] = {}
         # Active chathistory batch references — messages in these batches bypass history replay suppression
         self._chathistory_batches: set[str] = set()
+        # Reconnect gap-fill (paged CHATHISTORY, dedup, paced replay) and the msgids we
+        # published recently, so replayed history already relayed is not relayed twice.
+        self._gapfill = GapFiller(self)
+        self._relayed_msgids: TTLCache[str, None] = TTLCache(maxsize=5000, ttl=3600)
         # Track fire-and-forget background tasks to prevent GC and log exceptions
         self._background_tasks: set[asyncio.Task[Any]] = set()
 
@@ -186,6 +204,7 @@ class IRCClient(pydle.Client):
         await super().on_connect()
         self._ready = False
         logger.info("connected to {}", self._server)
+        await request_own_hostmask(self)  # exact line budget before the first JOIN echo
         for channel in self._channels:
             try:
                 await self.join(channel)
@@ -250,8 +269,12 @@ class IRCClient(pydle.Client):
     # ------------------------------------------------------------------
 
     async def on_raw_396(self, message: object) -> None:
-        """RPL_HOSTHIDDEN: host change notice (InspIRCd/UnrealIRCd). No-op to avoid Unknown command."""
-        pass
+        """RPL_HOSTHIDDEN: our displayed host changed (InspIRCd/UnrealIRCd); it bounds the line budget."""
+        await observe_displayed_host(self, message)
+
+    async def on_raw_302(self, message: object) -> None:
+        """RPL_USERHOST: our own hostmask, requested on connect for the line budget."""
+        await observe_userhost(self, message)
 
     async def on_raw_379(self, message: object) -> None:
         """RPL_WHOISHOST: mode info in WHOIS. No-op to avoid Unknown command."""
@@ -332,6 +355,8 @@ class IRCClient(pydle.Client):
         """Handle disconnect; rejoin channels on reconnect."""
         await super().on_disconnect(expected)
         self._ready = False
+        self._gapfill.reset()
+        self._chathistory_batches.clear()
 
     async def disconnect(self, expected=True):
         """Disconnect and cleanup."""
@@ -432,6 +457,18 @@ class IRCClient(pydle.Client):
         caps = getattr(self, "_capabilities", {})
         return bool(caps.get("draft/multiline"))
 
+    def _multiline_limits(self) -> tuple[int | None, int | None]:
+        """``(max_bytes, max_lines)`` advertised with draft/multiline; None when not given."""
+        caps = getattr(self, "_capabilities", {})
+        value = caps.get("draft/multiline")
+        limits: dict[str, int] = {}
+        if isinstance(value, str):
+            for item in value.split(","):
+                key, _, raw = item.partition("=")
+                if raw.isdigit() and int(raw) > 0:
+                    limits[key.strip()] = int(raw)
+        return limits.get("max-bytes"), limits.get("max-lines")
+
     def _next_batch_ref(self) -> str:
         """Generate the next unique batch reference tag for BATCH commands."""
         self._batch_counter += 1
@@ -453,9 +490,10 @@ class IRCClient(pydle.Client):
     async def _fetch_chathistory(self) -> None:
         """Fetch missed messages via CHATHISTORY AFTER on reconnect.
 
-        Waits for the client to be ready, then issues CHATHISTORY AFTER for
-        each channel that has a stored last-message timestamp. Messages arrive
-        in a chathistory batch and bypass history replay suppression.
+        Waits for the client to be ready, then hands every channel that has a
+        stored last-message timestamp to the gap-filler, which requests them
+        concurrently and pages through long gaps. Messages arrive in a
+        chathistory batch and bypass history replay suppression.
         """
         if not cfg.irc_chathistory_on_reconnect:
             return
@@ -467,16 +505,16 @@ class IRCClient(pydle.Client):
         if not self._has_chathistory():
             logger.debug("draft/chathistory not negotiated; skipping reconnect history fetch")
             return
-        limit = str(cfg.irc_chathistory_limit)
-        for channel in self._channels:
-            last = self._last_message_times.get(channel)
-            if not last:
-                continue
-            try:
-                await self.rawmsg("CHATHISTORY", "AFTER", channel, f"timestamp={last}", limit)
-                logger.info("requested CHATHISTORY AFTER {} since {}", channel, last)
-            except Exception as exc:
-                logger.warning("CHATHISTORY request failed for {}: {}", channel, exc)
+        since = {ch: last for ch in self._channels if (last := self._last_message_times.get(ch))}
+        if not since:
+            return
+        logger.info("requesting CHATHISTORY for {} channel(s)", len(since))
+        await self._gapfill.fill(
+            since,
+            limit=cfg.irc_chathistory_limit,
+            max_pages=cfg.irc_chathistory_max_pages,
+            replay_rate=cfg.irc_chathistory_replay_rate,
+        )
 
     # ------------------------------------------------------------------
     # BATCH handler (chathistory batch tracking)
@@ -494,12 +532,15 @@ class IRCClient(pydle.Client):
             batch_type = params[1] if len(params) > 1 else ""
             if batch_type == "chathistory":
                 self._chathistory_batches.add(ref)
+                if len(params) > 2:
+                    self._gapfill.batch_started(ref, str(params[2]))
                 logger.debug("chathistory batch started ref={}", ref)
         elif ref_tag.startswith("-"):
             # Batch end: -ref
             ref = ref_tag[1:]
             if ref in self._chathistory_batches:
                 self._chathistory_batches.discard(ref)
+                self._gapfill.batch_ended(ref)
                 logger.debug("chathistory batch ended ref={}", ref)
 
     async def on_capability_draft_relaymsg_available(self, value):
@@ -541,8 +582,20 @@ class IRCClient(pydle.Client):
     def queue_message(self, evt: MessageOut):
         """Queue outbound message."""
         logger.info("queued message for channel={}", evt.channel_id)
+        self._unsent[evt.author_id] = self._unsent.get(evt.author_id, 0) + 1
         self._outbound.put_nowait(evt)
 
+    def pending_sends(self, author_id: str) -> int:
+        """Messages from *author_id* queued on this connection and not yet sent."""
+        return self._unsent.get(author_id, 0)
+
+    def _mark_sent(self, author_id: str, count: int = 1) -> None:
+        left = self._unsent.get(author_id, 0) - count
+        if left > 0:
+            self._unsent[author_id] = left
+        else:
+            self._unsent.pop(author_id, None)
+
     # ------------------------------------------------------------------
     # Thin delegation stubs — inbound handlers (→ handlers.py)
     # ------------------------------------------------------------------
@@ -0,0 +1,231 @@
+"""Reconnect gap-fill: replay missed channel history via IRCv3 CHATHISTORY.
+
+On reconnect the client sends ``CHATHISTORY AFTER`` for every channel at once
+and pages through gaps larger than one request: the page size is
+``irc_chathistory_limit`` (capped by the server's ``CHATHISTORY`` ISUPPORT
+token). A full page means there may be more, so the next request starts from
+the last message seen, up to ``irc_chathistory_max_pages`` pages per channel.
+Replies arrive in ``chathistory`` batches, which are matched to their channel
+by the batch's target parameter.
+
+Replayed messages that were already relayed (msgid known to the message-ID
+tracker, or published this session) are dropped. The rest are queued and
+published to the bus at ``irc_chathistory_replay_rate`` messages per second, so
+a large backlog cannot flood the Discord/XMPP queues ahead of live traffic,
+which keeps publishing directly. Each channel's gap size, duplicate count and
+fill time are logged when its replay completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from bridge.adapters.irc.throttle import TokenBucket, take_tokens
+
+if TYPE_CHECKING:
+    from bridge.adapters.irc.client import IRCClient
+
+PAGE_TIMEOUT_S = 30.0  # give up on a channel when its batch doesn't arrive
+
+
+@dataclass
+class GapReport:
+    """Outcome of one channel's gap-fill."""
+
+    channel: str
+    pages: int = 0
+    received: int = 0  # history lines the server returned
+    duplicates: int = 0  # dropped: already relayed
+    replayed: int = 0  # published to the bus
+    seconds: float = 0.0  # from first request to last replay published
+    complete: bool = True  # False when a page timed out, failed, or max_pages cut the gap short
+
+
+class _ChannelFill:
+    __slots__ = ("cursor", "drained", "page_count", "page_done", "pending", "report", "started")
+
+    def __init__(self, channel: str, started: float) -> None:
+        self.report = GapReport(channel)
+        self.started = started
+        self.page_count = 0
+        self.cursor: str | None = None
+        self.page_done = asyncio.Event()
+        self.pending = 0
+        self.drained = asyncio.Event()
+        self.drained.set()
+
+
+class GapFiller:
+    """CHATHISTORY requests, batch routing, dedup and paced replay for one :class:`IRCClient`."""
+
+    def __init__(
+        self,
+        client: IRCClient,
+        *,
+        page_timeout: float = PAGE_TIMEOUT_S,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._page_timeout = page_timeout
+        self._timer = timer
+        self._fills: dict[str, _ChannelFill] = {}  # casefolded channel -> in-progress fill
+        self._batches: dict[str, _ChannelFill] = {}  # chathistory batch ref -> fill
+        self._queue: asyncio.Queue[tuple[_ChannelFill, str, Any, str | None, str | None]] = asyncio.Queue()
+        self._bucket = TokenBucket(limit=1, refill_rate=1.0)
+        self._pacer: asyncio.Task[None] | None = None
+        self.reports: dict[str, GapReport] = {}  # latest report per channel
+
+    # -- requests -------------------------------------------------------------
+
+    async def fill(self, since: dict[str, str], *, limit: int, max_pages: int, replay_rate: float) -> list[GapReport]:
+        """Fetch and replay history after each channel's timestamp in *since*, all channels concurrently."""
+        server_max = _isupport_chathistory(self._client)
+        if server_max:
+            limit = min(limit, server_max)
+        limit = max(1, limit)
+        rate = max(0.1, replay_rate)
+        self._bucket = TokenBucket(limit=max(1, int(rate)), refill_rate=rate)
+        if self._pacer is None or self._pacer.done():
+            self._pacer = asyncio.create_task(self._pace())
+        return list(
+            await asyncio.gather(*(self._fill_channel(ch, ts, limit, max(1, max_pages)) for ch, ts in since.items()))
+        )
+
+    async def _fill_channel(self, channel: str, since: str, limit: int, max_pages: int) -> GapReport:
+        fill = _ChannelFill(channel, self._timer())
+        report = fill.report
+        self._fills[channel.casefold()] = fill
+        cursor = f"timestamp={since}"
+        try:
+            while True:
+                fill.page_count = 0
+                fill.page_done.clear()
+                await self._client.rawmsg("CHATHISTORY", "AFTER", channel, cursor, str(limit))
+                report.pages += 1
+                try:
+                    await asyncio.wait_for(fill.page_done.wait(), self._page_timeout)
+                except TimeoutError:
+                    logger.warning("CHATHISTORY {}: no reply within {:.0f}s", channel, self._page_timeout)
+                    report.complete = False
+                    break
+                if fill.page_count < limit or fill.cursor in (None, cursor):
+                    break
+                if report.pages >= max_pages:
+                    logger.warning(
+                        "CHATHISTORY {}: gap exceeds {} page(s) of {}; rest skipped", channel, max_pages, limit
+                    )
+                    report.complete = False
+                    break
+                cursor = fill.cursor
+        except Exception as exc:
+            logger.warning("CHATHISTORY request failed for {}: {}", channel, exc)
+            report.complete = False
+        finally:
+            if self._fills.get(channel.casefold()) is fill:
+                del self._fills[channel.casefold()]
+        await fill.drained.wait()
+        report.seconds = self._timer() - fill.started
+        self.reports[channel] = report
+        logger.info(
+            "CHATHISTORY gap-fill {}: {} message(s), {} replayed, {} duplicate(s), {} page(s), {:.1f}s{}",
+            channel,
+            report.received,
+            report.replayed,
+            report.duplicates,
+            report.pages,
+            report.seconds,
+            "" if report.complete else " (incomplete)",
+        )
+        return report
+
+    # -- batch routing (called from the BATCH / PRIVMSG handlers) ---------------
+
+    def batch_started(self, ref: str, target: str) -> None:
+        fill = self._fills.get(target.casefold())
+        if fill is not None:
+            self._batches[ref] = fill
+
+    def batch_ended(self, ref: str) -> None:
+        fill = self._batches.pop(ref, None)
+        if fill is not None:
+            fill.page_done.set()
+
+    def admit(self, ref: str, msgid: str | None, time_str: str | None) -> bool:
+        """Count a history line in batch *ref*; False when it was already relayed and must be dropped."""
+        fill = self._batches.get(ref)
+        if fill is not None:
+            fill.page_count += 1
+            fill.report.received += 1
+            if msgid:
+                fill.cursor = f"msgid={msgid}"
+            elif time_str:
+                fill.cursor = f"timestamp={time_str}"
+        if msgid and (msgid in self._client._relayed_msgids or self._client._msgid_tracker.get_discord_id(msgid)):
+            if fill is not None:
+                fill.report.duplicates += 1
+            return False
+        return True
+
+    def submit(self, ref: str, target: str, evt: Any, *, msgid: str | None, time_str: str | None) -> None:
+        """Publish a replayed message: paced when it belongs to a gap-fill, else immediately."""
+        fill = self._batches.get(ref)
+        if fill is None:
+            self._publish(target, evt, msgid, time_str)
+            return
+        fill.pending += 1
+        fill.drained.clear()
+        self._queue.put_nowait((fill, target, evt, msgid, time_str))
+
+    def reset(self) -> None:
+        """Abandon in-progress fills (connection lost); queued replays are dropped."""
+        if self._pacer is not None:
+            self._pacer.cancel()
+            self._pacer = None
+        while not self._queue.empty():
+            fill, *_ = self._queue.get_nowait()
+            fill.report.complete = False
+            fill.pending = 0
+            fill.drained.set()
+        for fill in (*self._fills.values(), *self._batches.values()):
+            fill.report.complete = False
+            fill.page_done.set()
+        self._fills.clear()
+        self._batches.clear()
+
+    # -- replay -----------------------------------------------------------------
+
+    async def _pace(self) -> None:
+        while True:
+            fill, target, evt, msgid, time_str = await self._queue.get()
+            await take_tokens(self._bucket)
+            self._publish(target, evt, msgid, time_str)
+            fill.report.replayed += 1
+            fill.pending -= 1
+            if fill.pending <= 0:
+                fill.drained.set()
+
+    def _publish(self, target: str, evt: Any, msgid: str | None, time_str: str | None) -> None:
+        client = self._client
+        client._bus.publish("irc", evt)
+        if msgid:
+            client._relayed_msgids[msgid] = None
+        if time_str and time_str > client._last_message_times.get(target, ""):
+            client._last_message_times[target] = time_str
+
+
+def _isupport_chathistory(client: Any) -> int | None:
+    """Server's max messages per CHATHISTORY request (ISUPPORT ``CHATHISTORY``), if advertised."""
+    isupport = getattr(client, "_isupport", None)
+    if not isinstance(isupport, dict):
+        return None
+    try:
+        value = int(isupport.get("CHATHISTORY"))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
@@ -17,11 +17,27 @@ from loguru import logger
 
 from bridge.config import cfg
 from bridge.events import message_in
+from bridge.formatting.primitives import irc_casefold
+from bridge.gateway.enrichment import enricher_for
+from bridge.tracking.echo import content_digest
 
 if TYPE_CHECKING:
     from bridge.adapters.irc.client import IRCClient
 
 
+async def _canonical_irc_username(client: IRCClient, nick: str) -> str | None:
+    """Portal username for *nick*, bounded by the enrichment deadline (None on miss/error)."""
+    identity = getattr(client, "_identity", None)
+    if not identity:
+        return None
+    server = client._server
+    with contextlib.suppress(Exception):
+        return await enricher_for(identity).resolve(
+            ("irc", nick, server), lambda: identity.username_for_irc(nick, server)
+        )
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Echo suppression utilities (Requirement 17.1)
 # ---------------------------------------------------------------------------
@@ -55,13 +71,50 @@ def is_puppet_echo(client: IRCClient, source: str) -> bool:
     return False
 
 
+RELAYMSG_MARKER_TTL = 5.0
+
+
+def relaymsg_marker_key(server: str, target: str, nick: str) -> tuple[str, str, str, str]:
+    """Echo-correlator marker key for "we recently sent RELAYMSG as *nick* in *target*"."""
+    return ("relaymsg", server, target, nick)
+
+
+def echo_keys(client: IRCClient, target: str, nick: str, text: str) -> tuple[tuple, tuple[str, str]]:
+    """Echo-correlator key (target, nick, content digest) and its (target, nick) group.
+
+    Target and nick are casefolded with the server's CASEMAPPING so the echo
+    matches what we sent regardless of how the server cases them.
+    """
+    mapping = client._server_casemapping
+    group = (irc_casefold(target, mapping), irc_casefold(nick, mapping))
+    return (*group, content_digest(text)), group
+
+
+def expect_echo(
+    client: IRCClient, target: str, nick: str, text: str, discord_id: str, *, label: str | None = None
+) -> None:
+    """Record a send so its echo (by label, else by target/nick/content) maps back to *discord_id*."""
+    key, group = echo_keys(client, target, nick, text)
+    client._echoes.expect(("label", label) if label else key, discord_id, group=group)
+
+
+def claim_echo(client: IRCClient, target: str, source: str, text: str, label: str | None) -> str | None:
+    """Pop the discord_id of the send this echo belongs to (None if nothing matches)."""
+    if label:
+        discord_id = client._echoes.claim(("label", label))
+        if discord_id is not None:
+            return discord_id
+    key, group = echo_keys(client, target, source, text)
+    return client._echoes.claim(key, group=group)
+
+
 def is_relaymsg_echo(client: IRCClient, server: str, target: str, source: str, tags: dict) -> bool:
-    """Return True if the message matches a recent RELAYMSG send (TTLCache fallback).
+    """Return True if the message matches a recent RELAYMSG send (correlator marker fallback).
 
     When the relaymsg tag is missing (e.g. via irc-services or UnrealIRCd
-    quirks), we fall back to checking the recent-sends cache.
+    quirks), we fall back to the short-lived RELAYMSG markers.
     """
-    return (server, target, source) in client._recent_relaymsg_sends
+    return client._echoes.seen(relaymsg_marker_key(server, target, source))
 
 
 # ---------------------------------------------------------------------------
@@ -113,6 +166,34 @@ def is_history_replay(tags: dict) -> bool:
         return False
 
 
+def _correlate_own_echo(client: IRCClient, target: str, source: str, text: str, tags: dict) -> None:
+    """Claim the pending send an echo of ours belongs to and map its msgid for REDACT/edits."""
+    # Correlate by labeled-response label (Req 11.5), else by target + nick + content
+    msgid = tags.get("msgid")
+    label = tags.get("label")
+    discord_id = claim_echo(client, target, source, text, label if isinstance(label, str) else None)
+    if discord_id is not None:
+        if msgid:
+            client._msgid_tracker.store(msgid, discord_id)  # irc_msgid, discord_id
+            if merged := client._coalesced_ids.pop(discord_id, None):
+                client._msgid_tracker.store_aliases(msgid, merged)  # coalesced burst: one line, many ids
+            logger.debug("echo label={} correlated msgid {} -> {} for REDACT/edit", label, msgid, discord_id)
+        else:
+            logger.debug("echo for {} matched (label={}) but no msgid tag on echo", discord_id, label)
+    elif msgid:
+        logger.debug("echo had msgid {} but no pending send matches; cannot correlate", msgid)
+    elif is_relaymsg_echo(client, client._server, target, source, tags) or _is_relayed_by_us(client, tags):
+        logger.info(
+            "RELAYMSG echo received for {} in {} but no msgid tag (UnrealIRCd message-ids may not add msgid to relaymsg)",
+            source,
+            target,
+        )
+        logger.debug(
+            "RELAYMSG echo tags={} (empty => server may not send tags or message-tags cap not negotiated)",
+            tags,
+        )
+
+
 async def handle_message(client: IRCClient, target: str, source: str, message: str) -> None:
     """Handle channel message; emit MessageIn to bus."""
     if not client._ready:
@@ -140,10 +221,15 @@ async def handle_message(client: IRCClient, target: str, source: str, message: s
     # server-time timestamps significantly in the past (>30s).
     # Exception: messages in a chathistory batch are intentionally replayed
     # and should NOT be suppressed.
-    in_chathistory = tags.get("batch") in client._chathistory_batches if tags.get("batch") else False
+    batch = tags.get("batch")
+    in_chathistory = batch in client._chathistory_batches if batch else False
     if not in_chathistory and is_history_replay(tags):
         logger.debug("discarding history replay message from {} in {}", source, target)
         return
+    # Reconnect gap-fill: count the line for paging and drop history we already relayed.
+    if in_chathistory and not client._gapfill.admit(batch, msgid, tags.get("time")):
+        logger.debug("skipping already-relayed history message {} in {}", msgid, target)
+        return
 
     message_id = msgid or f"irc-{int(time.time_ns())}-{uuid.uuid4().hex[:8]}"
 
@@ -157,52 +243,20 @@ async def handle_message(client: IRCClient, target: str, source: str, message: s
     # 1. is_own_echo: source matches our nick OR draft/relaymsg tag matches us
     # 2. is_puppet_echo: source is one of our puppet connections
     # 3. is_relaymsg_echo: TTLCache fallback when relaymsg tag is missing
-    if (
-        is_own_echo(client, source, tags)
-        or is_puppet_echo(client, source)
-        or is_relaymsg_echo(client, client._server, target, source, tags)
-    ):
-        # labeled-response correlation (Req 11.5): use label tag for reliable echo matching
-        label = tags.get("label")
-        discord_id = client._pending_labels.pop(label, None) if label else None
-        if discord_id is not None:
-            if msgid:
-                client._msgid_tracker.store(msgid, discord_id)
-                logger.debug("label={} correlated msgid {} -> {} for REDACT/edit", label, msgid, discord_id)
-            else:
-                logger.debug("label={} matched but no msgid tag on echo", label)
-        elif msgid:
-            try:
-                discord_id = client._pending_sends.get_nowait()
-                client._msgid_tracker.store(msgid, discord_id)  # irc_msgid, discord_id
-                logger.debug("stored msgid {} -> {} for REDACT/edit correlation", msgid, discord_id)
-            except asyncio.QueueEmpty:
-                logger.debug(
-                    "RELAYMSG echo had msgid {} but no pending_send (queue empty); cannot correlate",
-                    msgid,
-                )
-        elif is_relaymsg_echo(client, client._server, target, source, tags) or _is_relayed_by_us(client, tags):
-            logger.info(
-                "RELAYMSG echo received for {} in {} but no msgid tag (UnrealIRCd message-ids may not add msgid to relaymsg)",
-                source,
-                target,
-            )
-            logger.debug(
-                "RELAYMSG echo tags={} (empty => server may not send tags or message-tags cap not negotiated)",
-                tags,
-            )
+    own_echo = is_own_echo(client, source, tags) or is_relaymsg_echo(client, client._server, target, source, tags)
+    if own_echo or is_puppet_echo(client, source):
+        if not own_echo:
+            return  # puppet sends are not tracked by the echo correlator
+        _correlate_own_echo(client, target, source, message, tags)
         return  # Skip publishing our own echoed messages to prevent doubling
 
     if msgid:
         logger.debug("external message with msgid={} from {}", msgid, source)
 
     author_display = source
-    identity = getattr(client, "_identity", None)
-    if identity:
-        with contextlib.suppress(Exception):
-            canonical = await identity.username_for_irc(source, client._server)
-            if canonical:
-                author_display = canonical
+    canonical = await _canonical_irc_username(client, source)
+    if canonical:
+        author_display = canonical
 
     _, evt = message_in(
         origin="irc",
@@ -216,10 +270,16 @@ async def handle_message(client: IRCClient, target: str, source: str, message: s
         raw={"tags": tags, "irc_msgid": msgid, "irc_reply_to": reply_to},
     )
     logger.info("message bridged: channel={} author={}", target, source)
+    time_str = tags.get("time")
+    if in_chathistory:
+        # Replays are paced by the gap-filler so a long backlog cannot crowd out live traffic.
+        client._gapfill.submit(batch, target, evt, msgid=msgid, time_str=time_str)
+        return
     client._bus.publish("irc", evt)
+    if msgid and (relayed := getattr(client, "_relayed_msgids", None)) is not None:
+        relayed[msgid] = None
 
     # Track last message timestamp for CHATHISTORY AFTER on reconnect
-    time_str = tags.get("time")
     if time_str:
         client._last_message_times[target] = time_str
 
@@ -237,21 +297,18 @@ async def handle_ctcp_action(client: IRCClient, by: str, target: str, message: s
 
     # Echo suppression: skip our own, puppet, and relaymsg echoes (same as handle_message)
     tags = getattr(client, "_message_tags", {}) or {}
-    if (
-        is_own_echo(client, by, tags)
-        or is_puppet_echo(client, by)
-        or is_relaymsg_echo(client, client._server, target, by, tags)
-    ):
+    own_echo = is_own_echo(client, by, tags) or is_relaymsg_echo(client, client._server, target, by, tags)
+    if own_echo or is_puppet_echo(client, by):
+        if own_echo:
+            # Rebuild the exact line outbound.send_message sent (prefix inside the CTCP wrapper)
+            _correlate_own_echo(client, target, by, f"\x01ACTION {message}\x01", tags)
         return
 
     content = f"* {by} {message}"
     author_display = by
-    identity = getattr(client, "_identity", None)
-    if identity:
-        with contextlib.suppress(Exception):
-            canonical = await identity.username_for_irc(by, client._server)
-            if canonical:
-                author_display = canonical
+    canonical = await _canonical_irc_username(client, by)
+    if canonical:
+        author_display = canonical
     _, evt = message_in(
         origin="irc",
         channel_id=mapping.discord_channel_id,
@@ -322,12 +379,9 @@ async def handle_tagmsg(client: IRCClient, message: object) -> None:
                 author_id=nick,
                 author_display=nick,
             )
-            identity = getattr(client, "_identity", None)
-            if identity:
-                with contextlib.suppress(Exception):
-                    canonical = await identity.username_for_irc(nick, client._server)
-                    if canonical:
-                        evt.author_display = canonical
+            canonical = await _canonical_irc_username(client, nick)
+            if canonical:
+                evt.author_display = canonical
             logger.info("reaction bridged: channel={} author={} emoji={}", target, nick, react)
             client._bus.publish("irc", evt)
     elif unreact and reply_to:
@@ -352,12 +406,9 @@ async def handle_tagmsg(client: IRCClient, message: object) -> None:
                 author_display=nick,
                 raw={"is_remove": True},
             )
-            identity = getattr(client, "_identity", None)
-            if identity:
-                with contextlib.suppress(Exception):
-                    canonical = await identity.username_for_irc(nick, client._server)
-                    if canonical:
-                        evt.author_display = canonical
+            canonical = await _canonical_irc_username(client, nick)
+            if canonical:
+                evt.author_display = canonical
             logger.info("reaction removal bridged: channel={} author={} emoji={}", target, nick, unreact)
             client._bus.publish("irc", evt)
     elif typing_val in ("active", "done"):
@@ -436,12 +487,9 @@ async def handle_redact(client: IRCClient, message: object) -> None:
         author_display=nick,
         raw=raw,
     )
-    identity = getattr(client, "_identity", None)
-    if identity:
-        with contextlib.suppress(Exception):
-            canonical = await identity.username_for_irc(nick, client._server)
-            if canonical:
-                evt.author_display = canonical
+    canonical = await _canonical_irc_username(client, nick)
+    if canonical:
+        evt.author_display = canonical
     logger.info("REDACT (message) bridged: channel={} msgid={}", target, irc_msgid)
     client._bus.publish("irc", evt)
 
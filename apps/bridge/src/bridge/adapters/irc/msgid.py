@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Iterable
 from typing import NamedTuple
 
 
@@ -31,6 +32,7 @@ class MessageIDTracker:
         self._irc_to_discord: dict[str, MessageMapping] = {}
         self._discord_to_irc: dict[str, MessageMapping] = {}
         self._irc_msgid_origin: dict[str, str] = {}  # "irc" | "xmpp" for REDACT skip logic
+        self._shared_lines: dict[str, frozenset[str]] = {}  # irc_msgid -> every Discord ID on that line
         self._last_cleanup: float = 0.0
         self._cleanup_interval: float = 60.0  # cleanup at most once per minute
 
@@ -46,6 +48,31 @@ class MessageIDTracker:
         # XMPP-origin messages store xmpp_id (ULID); Discord/IRC-origin store numeric snowflake
         self._irc_msgid_origin[irc_msgid] = "irc" if _is_discord_snowflake(discord_id) else "xmpp"
 
+    def store_aliases(self, irc_msgid: str, discord_ids: Iterable[str]) -> None:
+        """Map more Discord IDs to *irc_msgid* (one IRC line carrying several Discord messages).
+
+        ``get_discord_id(irc_msgid)`` keeps returning the ID given to :meth:`store`;
+        :meth:`discord_ids_on_line` returns them all, so a delete of one of them
+        does not REDACT the others.
+        """
+        mapping = self._irc_to_discord.get(irc_msgid)
+        if mapping is None:
+            return
+        ids = {mapping.discord_id}
+        for discord_id in discord_ids:
+            self._discord_to_irc[discord_id] = mapping
+            ids.add(discord_id)
+        if len(ids) > 1:
+            self._shared_lines[irc_msgid] = frozenset(ids)
+
+    def discord_ids_on_line(self, irc_msgid: str) -> frozenset[str]:
+        """Discord IDs carried by the IRC line *irc_msgid* (more than one for a coalesced burst)."""
+        self._cleanup()
+        if (ids := self._shared_lines.get(irc_msgid)) is not None:
+            return ids
+        mapping = self._irc_to_discord.get(irc_msgid)
+        return frozenset((mapping.discord_id,)) if mapping else frozenset()
+
     def get_discord_id(self, irc_msgid: str) -> str | None:
         """Get Discord message ID from IRC msgid."""
         self._cleanup()
@@ -103,6 +130,7 @@ class MessageIDTracker:
         for msgid in expired_irc:
             del self._irc_to_discord[msgid]
             self._irc_msgid_origin.pop(msgid, None)
+            self._shared_lines.pop(msgid, None)
 
         # Clean Discord -> IRC
         expired_discord = [
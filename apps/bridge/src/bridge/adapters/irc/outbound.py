@@ -7,19 +7,31 @@ following the same pattern as the Discord and XMPP adapter outbound modules.
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from bridge.adapters.irc.budget import payload_budget
 from bridge.adapters.irc.client import _nick_color
+from bridge.adapters.irc.handlers import RELAYMSG_MARKER_TTL, expect_echo, relaymsg_marker_key
 from bridge.config import cfg
 from bridge.events import MessageOut
-from bridge.formatting.splitter import extract_code_blocks, split_irc_lines
+from bridge.formatting.splitter import extract_code_blocks, split_irc_line_groups
 
 if TYPE_CHECKING:
     from bridge.adapters.irc.client import IRCClient
 
 
+_ACTION_WRAP = "\x01ACTION \x01"
+
+# Burst coalescing: at most this many messages per merged send; separator for the joined-line
+# fallback (no draft/multiline); batch size assumed when the cap advertises no max-bytes.
+_COALESCE_MAX_MESSAGES = 10
+_COALESCE_JOIN = " | "
+_MULTILINE_DEFAULT_MAX_BYTES = 4096
+
+
 def format_remote_nick(nick: str, protocol: str = "discord") -> str:
     """Format a remote nick using the configured remote_nick_format template.
 
@@ -37,23 +49,114 @@ def format_remote_nick(nick: str, protocol: str = "discord") -> str:
 
 async def consume_outbound(client: IRCClient) -> None:
     """Consume outbound message queue with token bucket throttling."""
+    held: MessageOut | None = None
     while True:
         try:
-            evt = await client._outbound.get()
+            evt = held if held is not None else await client._outbound.get()
+            held = None
             logger.debug("dequeued message discord_id={} channel={}", evt.message_id, evt.channel_id)
-            # Wait for token before sending (flood control)
-            wait = client._throttle.acquire()
-            if wait > 0:
-                logger.debug("throttle wait {:.2f}s for channel={}", wait, evt.channel_id)
-                await asyncio.sleep(wait)
-            client._throttle.use_token()  # Consume (guaranteed after acquire wait)
-            await send_message(client, evt)
+            evt, held = await coalesce_burst(client, evt)
+            merged = 1 + len(client._coalesced_ids.get(evt.message_id, ()))
+            try:
+                # Wait for token before sending (flood control)
+                wait = client._throttle.acquire()
+                if wait > 0:
+                    logger.debug("throttle wait {:.2f}s for channel={}", wait, evt.channel_id)
+                    await asyncio.sleep(wait)
+                client._throttle.use_token()  # Consume (guaranteed after acquire wait)
+                await send_message(client, evt)
+            finally:
+                client._mark_sent(evt.author_id, merged)
         except asyncio.CancelledError:
             break
         except Exception as exc:
             logger.exception("send failed: {}", exc)
 
 
+def _coalesce_key(evt: MessageOut) -> tuple[str, str] | None:
+    """``(channel, author)`` if *evt* may be merged with its neighbours, else None.
+
+    Actions, replies, edits, multi-line messages and code blocks keep their own send.
+    """
+    content = evt.content or ""
+    if evt.is_action or evt.reply_to_id or evt.is_edit or "\n" in content or "```" in content:
+        return None
+    return evt.channel_id, evt.author_id
+
+
+def _coalesce_limits(client: IRCClient, evt: MessageOut) -> tuple[int, int]:
+    """``(max_bytes, max_messages)`` for a merged send starting with *evt*.
+
+    With draft/multiline the batch limits apply; otherwise the messages are
+    joined on one line, which must fit that line's payload budget.
+    """
+    if client._has_multiline():
+        max_bytes, max_lines = client._multiline_limits()
+        max_messages = min(_COALESCE_MAX_MESSAGES, max_lines or _COALESCE_MAX_MESSAGES)
+        return max_bytes or _MULTILINE_DEFAULT_MAX_BYTES, max_messages
+    mapping = client._router.get_mapping_for_discord(evt.channel_id)
+    if not mapping or not mapping.irc:
+        return 0, 1
+    target = mapping.irc.channel
+    display = str(evt.author_display or evt.author_id or "user").strip()
+    if client._has_relaymsg():
+        nick = client._sanitize_relaymsg_nick(display)
+        return payload_budget(client, target, nick, command="RELAYMSG"), _COALESCE_MAX_MESSAGES
+    prefix = len(f"{_nick_color(display)} ".encode())
+    return payload_budget(client, target, client.nickname) - prefix, _COALESCE_MAX_MESSAGES
+
+
+async def coalesce_burst(client: IRCClient, evt: MessageOut) -> tuple[MessageOut, MessageOut | None]:
+    """Merge consecutive short messages from one author in one channel into a single send.
+
+    Returns the (possibly merged) event and a dequeued event that could not be
+    merged, which the caller sends next. Adaptive: a message from an author who
+    is not bursting only absorbs what is already queued, so it is never delayed;
+    once the same (channel, author) is seen again within ``_coalesce_window``,
+    the consumer waits up to that window for more. Merged messages become lines
+    of one draft/multiline batch, or one `` | ``-joined line without the cap.
+    The merged send keeps the first message's id for echo correlation; the other
+    ids are aliased to the same IRC msgid once the echo arrives.
+    """
+    window = client._coalesce_window
+    key = _coalesce_key(evt) if window > 0 else None
+    if key is None:
+        return evt, None
+    bursting = key in client._coalesce_recent
+    client._coalesce_recent[key] = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + window if bursting else 0.0
+    max_bytes, max_messages = _coalesce_limits(client, evt)
+    multiline = client._has_multiline()
+    sep = "\n" if multiline else _COALESCE_JOIN
+    merged = [evt]
+    size = len(evt.content.encode())
+    held: MessageOut | None = None
+    while len(merged) < max_messages:
+        if not client._outbound.empty():
+            nxt = client._outbound.get_nowait()
+        else:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                nxt = await asyncio.wait_for(client._outbound.get(), timeout)
+            except TimeoutError:
+                break
+        added = len(sep.encode()) + len(nxt.content.encode())
+        if _coalesce_key(nxt) != key or size + added > max_bytes:
+            held = nxt
+            break
+        merged.append(nxt)
+        size += added
+        client._coalesce_recent[key] = None
+    if len(merged) == 1:
+        return evt, held
+    logger.debug("coalesced {} messages from {} in {} (multiline={})", len(merged), key[1], key[0], multiline)
+    client._coalesced_ids[evt.message_id] = tuple(m.message_id for m in merged[1:])
+    return dataclasses.replace(evt, content=sep.join(m.content for m in merged)), held
+
+
 async def send_message(client: IRCClient, evt: MessageOut) -> None:
     """Send message to IRC. Uses RELAYMSG when available (stateless bridging)."""
     mapping = client._router.get_mapping_for_discord(evt.channel_id)
@@ -107,9 +210,6 @@ async def send_message(client: IRCClient, evt: MessageOut) -> None:
     # IRC forbids \r, \0 in message payload; newlines are split into separate messages
     content = content.replace("\r", "").replace("\x00", "")
 
-    chunks = split_irc_lines(content, max_bytes=450)
-    logger.debug("split into {} chunk(s) for {}", len(chunks), target)
-
     # Spoofed nick for RELAYMSG: display/discord (Valware requires '/' in nick).
     # When RELAYMSG is available, messages appear to come from the spoofed nick
     # directly, without needing a puppet connection per user.
@@ -120,9 +220,28 @@ async def send_message(client: IRCClient, evt: MessageOut) -> None:
     is_action = getattr(evt, "is_action", False)
     logger.debug("use_relaymsg={} spoofed_nick={} is_action={}", use_relaymsg, spoofed_nick, is_action)
 
+    # Exact payload budget for this target (ISUPPORT LINELEN, our hostmask, source nick).
+    # PRIVMSG/ACTION lines carry a colored nick prefix on the first chunk; actions also
+    # wrap every chunk in \x01ACTION ...\x01.
+    if use_relaymsg and not is_action:
+        budget = payload_budget(client, target, spoofed_nick, command="RELAYMSG", tags=reply_tags)
+        first_budget = budget
+    else:
+        budget = payload_budget(client, target, client.nickname, tags=reply_tags)
+        if is_action:
+            budget -= len(_ACTION_WRAP)
+        first_budget = budget - len(f"{_nick_color(display)} ".encode())
+    # Keep chunks grouped per source line: in a multiline batch only the continuation
+    # chunks of one line are concatenated, each further line starts a new one.
+    groups = split_irc_line_groups(content, max_bytes=budget, first_max_bytes=first_budget) or [[""]]
+    chunks = [chunk for group in groups for chunk in group]
+    concat = [j > 0 for group in groups for j in range(len(group))]
+    logger.debug("split into {} chunk(s) for {} (budget={} bytes)", len(chunks), target, budget)
+
     # --- Multiline batch: wrap multiple chunks in a BATCH when draft/multiline is available ---
     use_multiline = len(chunks) > 1 and not is_action and client._has_multiline()
     batch_ref: str | None = None
+    echo_label: str | None = None
     if use_multiline:
         batch_ref = client._next_batch_ref()
         await client.rawmsg("BATCH", f"+{batch_ref}", "draft/multiline", target)
@@ -135,10 +254,9 @@ async def send_message(client: IRCClient, evt: MessageOut) -> None:
             # Generate labeled-response tag for first chunk (echo correlation, Req 11.5)
             label_tag: dict[str, str] | None = None
             if i == 0 and client._has_labeled_response():
-                label = client._next_label()
-                label_tag = {"label": label}
-                client._pending_labels[label] = evt.message_id
-                logger.debug("attached label={} for echo correlation (discord_id={})", label, evt.message_id)
+                echo_label = client._next_label()
+                label_tag = {"label": echo_label}
+                logger.debug("attached label={} for echo correlation (discord_id={})", echo_label, evt.message_id)
 
             # Merge reply tags, label tag, and batch tag for first chunk
             first_chunk_tags: dict[str, str] | None = None
@@ -153,7 +271,7 @@ async def send_message(client: IRCClient, evt: MessageOut) -> None:
             # Multiline batch tags: all chunks get batch=ref, continuation chunks get concat
             if use_multiline and batch_ref:
                 ml_tags: dict[str, str] = {"batch": batch_ref}
-                if i > 0:
+                if concat[i]:
                     ml_tags["draft/multiline-concat"] = ""
                 if first_chunk_tags and i == 0:
                     ml_tags.update(first_chunk_tags)
@@ -164,45 +282,46 @@ async def send_message(client: IRCClient, evt: MessageOut) -> None:
                     first_chunk_tags = ml_tags
 
             if is_action:
-                # CTCP ACTION (/me): wrap in \x01ACTION ...\x01
-                # RELAYMSG doesn't support CTCP, fall back to PRIVMSG with colored prefix
-                action_text = f"\x01ACTION {chunk}\x01"
-                colored_prefix = f"{_nick_color(display)} "
-                prefixed = colored_prefix + action_text if i == 0 else action_text
+                # CTCP ACTION (/me): wrap in \x01ACTION ...\x01, colored nick prefix inside
+                # the wrapper so the line stays a CTCP (and its echo reaches handle_ctcp_action).
+                # RELAYMSG doesn't support CTCP, so actions go out as PRIVMSG.
+                colored_prefix = f"{_nick_color(display)} " if i == 0 else ""
+                prefixed = f"\x01ACTION {colored_prefix}{chunk}\x01"
+                if i == 0:
+                    expect_echo(client, target, client.nickname, prefixed, evt.message_id, label=echo_label)
                 if first_chunk_tags:
                     await client.rawmsg("PRIVMSG", target, prefixed, tags=first_chunk_tags)
                 else:
-                    await client.message(target, prefixed)
+                    await client.rawmsg("PRIVMSG", target, prefixed)
                 if i == 0:
                     logger.info("sent CTCP ACTION to {} as {}", target, spoofed_nick)
             elif use_relaymsg:
                 # RELAYMSG #channel spoofed_nick :message
                 tags_to_send = first_chunk_tags if first_chunk_tags else None
+                if i == 0:
+                    client._echoes.mark(
+                        relaymsg_marker_key(client._server, target, spoofed_nick), ttl=RELAYMSG_MARKER_TTL
+                    )
+                    expect_echo(client, target, spoofed_nick, chunk, evt.message_id, label=echo_label)
                 if tags_to_send:
                     await client.rawmsg("RELAYMSG", target, spoofed_nick, chunk, tags=tags_to_send)
                 else:
                     await client.rawmsg("RELAYMSG", target, spoofed_nick, chunk)
                 if i == 0:
                     logger.info("sent RELAYMSG to {} as {}", target, spoofed_nick)
-                    client._recent_relaymsg_sends[(client._server, target, spoofed_nick)] = None
             else:
                 # PRIVMSG fallback: prefix message with configurable remote nick format
                 colored_prefix = f"{_nick_color(display)} "
                 prefixed = colored_prefix + chunk if i == 0 else chunk
                 tags_to_send = first_chunk_tags if first_chunk_tags else None
+                if i == 0:
+                    expect_echo(client, target, client.nickname, prefixed, evt.message_id, label=echo_label)
                 if tags_to_send:
                     await client.rawmsg("PRIVMSG", target, prefixed, tags=tags_to_send)
                 else:
-                    await client.message(target, prefixed)
+                    await client.rawmsg("PRIVMSG", target, prefixed)
                 if i == 0:
                     logger.info("sent PRIVMSG to {} as {}", target, spoofed_nick)
-            # Only store mapping for first chunk (echo will have msgid)
-            if i == 0:
-                client._pending_sends.put_nowait(evt.message_id)
-                logger.debug(
-                    "IRC: queued pending_send discord_id={} for echo correlation",
-                    evt.message_id,
-                )
     finally:
         # Always close multiline batch if we opened one (even on error)
         if use_multiline and batch_ref:
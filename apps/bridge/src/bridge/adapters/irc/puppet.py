@@ -5,14 +5,25 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import hashlib
+import math
 import random
 import time
+from collections.abc import Callable, Hashable
 from typing import TYPE_CHECKING
 
 import pydle
 from cachetools import TTLCache
 from loguru import logger
 
+from bridge.adapters.irc.budget import (
+    observe_displayed_host,
+    observe_userhost,
+    payload_budget,
+    request_own_hostmask,
+)
+from bridge.adapters.irc.scheduler import DeadlineScheduler
+from bridge.adapters.irc.throttle import TokenBucket, take_tokens
+from bridge.formatting.primitives import irc_casefold
 from bridge.formatting.splitter import split_irc_message
 
 if TYPE_CHECKING:
@@ -29,6 +40,7 @@ class IRCPuppet(pydle.Client):
         discord_id: str,
         ping_interval: int = 120,
         prejoin_commands: list[str] | None = None,
+        throttle_limit: int = 3,
         **kwargs,
     ):
         super().__init__(nick, **kwargs)
@@ -36,9 +48,12 @@ class IRCPuppet(pydle.Client):
         self.last_activity = time.time()
         self._ping_interval = ping_interval
         self._prejoin_commands: list[str] = prejoin_commands or []
-        self._pinger_task: asyncio.Task | None = None
         self._initial_nick = nick
         self._last_avatar_hash: str | None = None
+        # Per-connection flood control for lines sent by IRCPuppetManager
+        self._throttle = TokenBucket(limit=throttle_limit, refill_rate=float(throttle_limit))
+        # Set by IRCPuppetManager so its nick index follows server-side renames
+        self._nick_listener: Callable[[IRCPuppet], None] | None = None
 
     async def on_capability_draft_metadata_available(self, value):
         """Request draft/metadata (METADATA command)."""
@@ -52,13 +67,15 @@ class IRCPuppet(pydle.Client):
         """Update last activity timestamp."""
         self.last_activity = time.time()
 
-    async def on_nick(self, old: str, new: str) -> None:
+    async def on_nick_change(self, old: str, new: str) -> None:
         """Revert any nick change forced onto this puppet (e.g. NickServ enforcement).
 
         On revert failure, logs an error. The manager evicts the puppet so the
         next message recreates it fresh rather than leaving it with a wrong nick.
         """
-        await super().on_nick(old, new)
+        await super().on_nick_change(old, new)
+        if self._nick_listener is not None:
+            self._nick_listener(self)
         if old.lower() == self._initial_nick.lower():
             logger.warning("puppet nick changed {} -> {}; reverting", old, new)
             try:
@@ -75,26 +92,22 @@ class IRCPuppet(pydle.Client):
                 self._evict_on_next_use = True
 
     async def on_connect(self):
-        """Handle connection: send pre-join commands and start pinger."""
+        """Handle connection: send pre-join commands. Keepalives are scheduled by IRCPuppetManager."""
         await super().on_connect()
         logger.debug("puppet {} connected", self.nickname)
+        await request_own_hostmask(self)  # exact line budget before the first JOIN echo
 
         for cmd in self._prejoin_commands:
             raw = cmd.replace("{nick}", self._initial_nick)
             await self.rawmsg(*raw.split(" ", 1) if " " in raw else [raw])
 
-        if self._pinger_task:
-            self._pinger_task.cancel()
-        self._pinger_task = asyncio.create_task(self._pinger())
+    async def on_raw_302(self, message) -> None:
+        """RPL_USERHOST: our own hostmask, requested on connect for the line budget."""
+        await observe_userhost(self, message)
 
-    async def _pinger(self) -> None:
-        """Send PING every ping_interval seconds to keep connection alive."""
-        while True:
-            await asyncio.sleep(self._ping_interval)
-            try:
-                await self.rawmsg("PING", "keep-alive")
-            except Exception:
-                break
+    async def on_raw_396(self, message) -> None:
+        """RPL_HOSTHIDDEN: our displayed host changed; it bounds the line budget."""
+        await observe_displayed_host(self, message)
 
 
 class IRCPuppetManager:
@@ -112,6 +125,12 @@ class IRCPuppetManager:
         idle_timeout_hours: int = 24,
         ping_interval: int = 120,
         prejoin_commands: list[str] | None = None,
+        *,
+        throttle_limit: int = 3,
+        global_throttle_limit: int = 10,
+        max_puppets: int = 0,
+        connect_concurrency: int = 4,
+        connect_rate: float = 2.0,
     ):
         self._bus = bus
         self._router = router
@@ -123,11 +142,54 @@ class IRCPuppetManager:
         self._idle_timeout = idle_timeout_hours * 3600
         self._ping_interval = ping_interval
         self._prejoin_commands: list[str] = prejoin_commands or []
+        # Each puppet has its own bucket (lines/sec, see IRCPuppet); all puppets share one
+        # host, so their lines also draw from a global bucket sized for the server's per-IP limits.
+        self._throttle_limit = throttle_limit
+        self._global_throttle = TokenBucket(limit=global_throttle_limit, refill_rate=float(global_throttle_limit))
+        # Insertion order doubles as recency (get_or_create_puppet moves hits to the end),
+        # so the least recently used puppet is evicted first when max_puppets is reached.
         self._puppets: dict[str, IRCPuppet] = {}
+        self._max_puppets = max_puppets  # 0 = unlimited
+        # Keepalive PINGs and idle eviction for all puppets run from one heap-based task:
+        # keys are ("ping" | "idle", discord_id), re-armed from last_activity when they fire.
+        self._scheduler = DeadlineScheduler(self._on_deadline)
+        # Casefolded nick -> discord_id, maintained on connect/rename/eviction so
+        # echo checks on the main connection are O(1) (see is_puppet_nick).
+        self._casemapping = "rfc1459"
+        self._nick_index: dict[str, str] = {}
+        self._indexed_nicks: dict[str, str] = {}  # discord_id -> casefolded nick
         # TTLCache prevents unbounded growth; TTL matches puppet idle timeout so locks
         # for long-absent users are automatically evicted.
         self._puppet_locks: TTLCache[str, asyncio.Lock] = TTLCache(maxsize=1024, ttl=self._idle_timeout)
-        self._cleanup_task: asyncio.Task | None = None
+        self._scheduler_task: asyncio.Task | None = None
+        # Connect admission: at most connect_concurrency TLS handshakes in flight and
+        # connect_rate new connections per second, so restarts don't trip the ircd's
+        # connection throttle. Background connects started by start_puppet, by discord_id.
+        self._connect_slots = asyncio.Semaphore(max(1, connect_concurrency))
+        # connect_rate <= 0: no rate limit (a zero-rate bucket would never refill).
+        self._connect_rate = (
+            TokenBucket(limit=max(1, math.ceil(connect_rate)), refill_rate=connect_rate) if connect_rate > 0 else None
+        )
+        self._connecting: dict[str, asyncio.Task] = {}
+
+    def has_puppet(self, discord_id: str) -> bool:
+        """True if *discord_id* has a connected puppet that can send right now."""
+        puppet = self._puppets.get(discord_id)
+        return puppet is not None and not getattr(puppet, "_evict_on_next_use", False)
+
+    def start_puppet(self, discord_id: str) -> None:
+        """Bring up *discord_id*'s puppet in the background; no-op if connected or already pending."""
+        if discord_id in self._connecting or self.has_puppet(discord_id):
+            return
+        task = asyncio.create_task(self.get_or_create_puppet(discord_id))
+        self._connecting[discord_id] = task
+        task.add_done_callback(lambda t, d=discord_id: self._on_connect_done(d, t))
+
+    def _on_connect_done(self, discord_id: str, task: asyncio.Task) -> None:
+        if self._connecting.get(discord_id) is task:
+            del self._connecting[discord_id]
+        if not task.cancelled() and (exc := task.exception()):
+            logger.error("background puppet connect for {} failed: {}", discord_id, exc)
 
     async def get_or_create_puppet(self, discord_id: str) -> IRCPuppet | None:
         """Get existing puppet or create new one for Discord user.
@@ -144,9 +206,9 @@ class IRCPuppetManager:
                     puppet.nickname,
                     discord_id,
                 )
-                self._puppets.pop(discord_id, None)
-                self._puppet_locks.pop(discord_id, None)
+                self._evict(discord_id)
             else:
+                self._puppets[discord_id] = self._puppets.pop(discord_id)  # most recently used
                 puppet.touch()
                 return puppet
 
@@ -172,11 +234,22 @@ class IRCPuppetManager:
                 discord_id,
                 ping_interval=self._ping_interval,
                 prejoin_commands=self._prejoin_commands,
+                throttle_limit=self._throttle_limit,
             )
 
-            if await self._connect_puppet_with_backoff(puppet):
+            async with self._connect_slots:
+                waited = await take_tokens(self._connect_rate) if self._connect_rate else 0.0
+                if waited > 0:
+                    logger.debug("puppet connect for {} admitted after {:.2f}s", discord_id, waited)
+                connected = await self._connect_puppet_with_backoff(puppet)
+
+            if connected:
+                await self._enforce_max_puppets()
                 self._puppets[discord_id] = puppet
+                puppet._nick_listener = self._index_puppet
+                self._index_puppet(puppet)
                 puppet.touch()
+                self._arm_timers(discord_id)
                 logger.info("created puppet {} for Discord user {}", nick, discord_id)
                 return puppet
 
@@ -223,9 +296,111 @@ class IRCPuppetManager:
         return False
 
     def get_puppet_nicks(self) -> set[str]:
-        """Return set of current puppet nicks (for echo detection on main connection)."""
+        """Return set of current puppet nicks. Echo checks should use is_puppet_nick."""
         return {p.nickname for p in self._puppets.values()}
 
+    def is_puppet_nick(self, nick: str, casemapping: str | None = None) -> bool:
+        """Return True if *nick* belongs to one of our puppets (casefold-aware, O(1)).
+
+        *casemapping* is the server's ISUPPORT CASEMAPPING; when it differs from
+        the one the index was built with, the index is rebuilt once.
+        """
+        if casemapping is not None and casemapping != self._casemapping:
+            self.set_casemapping(casemapping)
+        return irc_casefold(nick, self._casemapping) in self._nick_index
+
+    def set_casemapping(self, mapping: str) -> None:
+        """Rebuild the nick index under *mapping* (ascii, rfc1459, rfc1459-strict)."""
+        if mapping == self._casemapping:
+            return
+        self._casemapping = mapping
+        self._nick_index.clear()
+        self._indexed_nicks.clear()
+        for puppet in self._puppets.values():
+            self._index_puppet(puppet)
+
+    def _index_puppet(self, puppet: IRCPuppet) -> None:
+        """(Re)index *puppet* under its current nickname; no-op when unchanged."""
+        folded = irc_casefold(puppet.nickname, self._casemapping)
+        previous = self._indexed_nicks.get(puppet.discord_id)
+        if previous == folded:
+            return
+        if previous is not None and self._nick_index.get(previous) == puppet.discord_id:
+            del self._nick_index[previous]
+        self._nick_index[folded] = puppet.discord_id
+        self._indexed_nicks[puppet.discord_id] = folded
+
+    def _evict(self, discord_id: str) -> IRCPuppet | None:
+        """Drop *discord_id*'s puppet, lock and nick index entry. Returns the puppet, if any."""
+        puppet = self._puppets.pop(discord_id, None)
+        self._puppet_locks.pop(discord_id, None)
+        self._scheduler.cancel(("ping", discord_id))
+        self._scheduler.cancel(("idle", discord_id))
+        folded = self._indexed_nicks.pop(discord_id, None)
+        if folded is not None and self._nick_index.get(folded) == discord_id:
+            del self._nick_index[folded]
+        if puppet is not None:
+            puppet._nick_listener = None
+        return puppet
+
+    async def _throttle_line(self, puppet: IRCPuppet) -> None:
+        """Wait for a token from *puppet*'s bucket and the global puppet bucket."""
+        buckets = [self._global_throttle]
+        own = getattr(puppet, "_throttle", None)
+        if own is not None:
+            buckets.append(own)
+        waited = await take_tokens(*buckets)
+        if waited > 0:
+            logger.debug("puppet {} throttled {:.2f}s", puppet.nickname, waited)
+
+    def _arm_timers(self, discord_id: str) -> None:
+        """Schedule the first keepalive and idle check for a newly created puppet."""
+        now = time.time()
+        puppet = self._puppets[discord_id]
+        self._scheduler.schedule(("ping", discord_id), now + getattr(puppet, "_ping_interval", self._ping_interval))
+        self._scheduler.schedule(("idle", discord_id), now + self._idle_timeout)
+
+    async def _enforce_max_puppets(self) -> None:
+        """Disconnect least recently used puppets until there is room for one more."""
+        while self._max_puppets and len(self._puppets) >= self._max_puppets:
+            discord_id = next(iter(self._puppets))
+            puppet = self._evict(discord_id)
+            logger.info("puppet limit {} reached; disconnecting least recently used {}", self._max_puppets, discord_id)
+            if puppet is not None:
+                with contextlib.suppress(Exception):
+                    await puppet.disconnect()
+
+    async def _on_deadline(self, key: Hashable, now: float) -> None:
+        """Scheduler callback: send a keepalive PING or evict an idle puppet.
+
+        Both timers are re-armed relative to ``last_activity`` instead of being
+        rescheduled on every send, so activity costs no heap operations.
+        """
+        kind, discord_id = key  # type: ignore[misc]
+        puppet = self._puppets.get(discord_id)
+        if puppet is None:
+            return
+        if kind == "idle":
+            due = puppet.last_activity + self._idle_timeout
+            if due > now:
+                self._scheduler.schedule(key, due)
+                return
+            self._evict(discord_id)
+            logger.info("disconnecting idle puppet for {}", discord_id)
+            await puppet.disconnect()
+            return
+        interval = getattr(puppet, "_ping_interval", self._ping_interval)
+        due = puppet.last_activity + interval
+        if due > now:
+            # The puppet sent something recently; that kept the connection alive.
+            self._scheduler.schedule(key, due)
+            return
+        self._scheduler.schedule(key, now + interval)
+        try:
+            await puppet.rawmsg("PING", "keep-alive")
+        except Exception as exc:
+            logger.debug("keepalive PING failed for puppet {}: {}", puppet.nickname, exc)
+
     async def send_message(
         self,
         discord_id: str,
@@ -242,6 +417,7 @@ class IRCPuppetManager:
         # Ensure puppet has joined the target channel before sending
         if channel not in puppet.channels:
             try:
+                await self._throttle_line(puppet)
                 await puppet.join(channel)
                 logger.debug("puppet {} joined {}", puppet.nickname, channel)
             except Exception as exc:
@@ -253,8 +429,11 @@ class IRCPuppetManager:
             await self._set_puppet_avatar(puppet, discord_id, avatar_url)
 
         try:
-            for chunk in split_irc_message(content, max_bytes=450):
-                await puppet.message(channel, chunk)
+            budget = payload_budget(puppet, channel, puppet.nickname)
+            for chunk in split_irc_message(content, max_bytes=budget):
+                await self._throttle_line(puppet)
+                # rawmsg, not message(): pydle re-chunks message() at its own, smaller length
+                await puppet.rawmsg("PRIVMSG", channel, chunk or " ")
             puppet.touch()
             logger.info("puppet sent to {} as {}", channel, puppet.nickname)
         except (OSError, ConnectionError) as exc:
@@ -263,8 +442,7 @@ class IRCPuppetManager:
                 discord_id,
                 exc,
             )
-            self._puppets.pop(discord_id, None)
-            self._puppet_locks.pop(discord_id, None)
+            self._evict(discord_id)
         except Exception as exc:
             logger.exception("Puppet send failed for {}: {}", discord_id, exc)
 
@@ -283,6 +461,7 @@ class IRCPuppetManager:
             return
 
         try:
+            await self._throttle_line(puppet)
             await puppet.set_metadata("*", "avatar", avatar_url)
             puppet._last_avatar_hash = avatar_hash
             logger.debug("Set METADATA avatar for puppet {} ({})", puppet.nickname, discord_id)
@@ -296,40 +475,35 @@ class IRCPuppetManager:
             await puppet.join(channel)
             puppet.touch()
 
-    async def _cleanup_idle_puppets(self):
-        """Periodically disconnect idle puppets."""
-        while True:
+    async def part_channel(self, channel: str) -> None:
+        """PART *channel* with every puppet in it (its mapping was removed on reload)."""
+        for puppet in list(self._puppets.values()):
+            if channel not in puppet.channels:
+                continue
             try:
-                await asyncio.sleep(3600)  # Check every hour
-                now = time.time()
-                to_remove = []
-
-                for discord_id, puppet in self._puppets.items():
-                    if now - puppet.last_activity > self._idle_timeout:
-                        to_remove.append(discord_id)
-
-                for discord_id in to_remove:
-                    puppet = self._puppets.pop(discord_id)
-                    self._puppet_locks.pop(discord_id, None)
-                    await puppet.disconnect()
-                    logger.info("disconnected idle puppet for {}", discord_id)
-
-            except asyncio.CancelledError:
-                break
+                await self._throttle_line(puppet)
+                await puppet.part(channel)
             except Exception as exc:
-                logger.exception("Puppet cleanup error: {}", exc)
+                logger.warning("puppet {} failed to part {}: {}", puppet.nickname, channel, exc)
 
     async def start(self):
-        """Start cleanup task."""
-        self._cleanup_task = asyncio.create_task(self._cleanup_idle_puppets())
+        """Start the keepalive/idle-eviction scheduler."""
+        self._scheduler_task = asyncio.create_task(self._scheduler.run())
 
     async def stop(self):
         """Stop all puppets."""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
-                await self._cleanup_task
+                await self._scheduler_task
+        self._scheduler.clear()
+
+        for task in list(self._connecting.values()):
+            task.cancel()
+        self._connecting.clear()
 
         for puppet in list(self._puppets.values()):
             await puppet.disconnect()
         self._puppets.clear()
+        self._nick_index.clear()
+        self._indexed_nicks.clear()
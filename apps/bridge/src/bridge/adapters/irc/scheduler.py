@@ -0,0 +1,125 @@
+"""Deadline scheduler: one task firing per-key deadlines from a min-heap.
+
+Used by IRCPuppetManager for puppet keepalives and idle eviction, so the
+number of sleeping tasks does not grow with the number of puppets. Each key
+has at most one live deadline; rescheduling or cancelling leaves the old heap
+entry behind, and it is skipped when popped (lazy invalidation). The heap is
+compacted when stale entries outnumber live ones. Each due callback runs as
+its own task, so a slow one (a disconnect waiting on its socket) does not
+delay the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+from loguru import logger
+
+_COMPACT_MIN = 64  # don't bother compacting tiny heaps
+
+
+class DeadlineScheduler:
+    """Call ``callback(key, now)`` once each key's deadline passes."""
+
+    def __init__(
+        self,
+        callback: Callable[[Hashable, float], Awaitable[None]],
+        *,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self._callback = callback
+        self._timer = timer
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._due: dict[Hashable, float] = {}
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._running: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._due
+
+    def due(self, key: Hashable) -> float | None:
+        """Deadline currently set for *key*, if any."""
+        return self._due.get(key)
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        """Set (or move) *key*'s deadline to *when*."""
+        earliest = self._heap[0][0] if self._heap else None
+        self._due[key] = when
+        heapq.heappush(self._heap, (when, next(self._seq), key))
+        if earliest is None or when < earliest:
+            self._wake.set()
+        self._maybe_compact()
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop *key*'s deadline; no-op when none is set."""
+        if self._due.pop(key, None) is not None:
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due.clear()
+
+    def pop_due(self, now: float | None = None) -> list[Hashable]:
+        """Remove and return the keys whose deadline is at or before *now*, earliest first."""
+        now = self._timer() if now is None else now
+        fired: list[Hashable] = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) == when:
+                del self._due[key]
+                fired.append(key)
+        return fired
+
+    async def run(self) -> None:
+        """Sleep until the earliest deadline (or an earlier one is scheduled) and fire due keys.
+
+        Callbacks still running when this is cancelled are cancelled too.
+        """
+        try:
+            await self._run()
+        finally:
+            for task in list(self._running):
+                task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            self._drop_stale_head()
+            if self._heap:
+                timeout = self._heap[0][0] - self._timer()
+                if timeout > 0:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._wake.wait(), timeout)
+                    continue
+            else:
+                await self._wake.wait()
+                continue
+            now = self._timer()
+            for key in self.pop_due(now):
+                task = asyncio.create_task(self._callback(key, now))
+                self._running.add(task)
+                task.add_done_callback(functools.partial(self._finished, key))
+
+    def _finished(self, key: Hashable, task: asyncio.Task[None]) -> None:
+        self._running.discard(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.opt(exception=exc).error("scheduled callback failed for {}: {}", key, exc)
+
+    def _drop_stale_head(self) -> None:
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > _COMPACT_MIN and len(self._heap) > 2 * len(self._due):
+            self._heap = [entry for entry in self._heap if self._due.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
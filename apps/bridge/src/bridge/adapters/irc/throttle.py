@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 
 
@@ -35,3 +36,18 @@ class TokenBucket:
         elapsed = now - self._last_refill
         self._tokens = min(self._limit, self._tokens + elapsed * self._refill_rate)
         self._last_refill = now
+
+
+async def take_tokens(*buckets: TokenBucket) -> float:
+    """Wait until every bucket has a token, then consume one from each.
+
+    Used where one line counts against several limits (a puppet's own bucket
+    and the bucket shared by all puppets). Returns the total seconds waited.
+    """
+    waited = 0.0
+    while (wait := max(bucket.acquire() for bucket in buckets)) > 0:
+        await asyncio.sleep(wait)
+        waited += wait
+    for bucket in buckets:
+        bucket.use_token()
+    return waited
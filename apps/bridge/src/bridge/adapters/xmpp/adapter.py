@@ -14,11 +14,22 @@ from loguru import logger
 
 from bridge.adapters.base import AdapterBase
 from bridge.adapters.xmpp.component import XMPPComponent, _escape_jid_node
-from bridge.events import MessageDeleteOut, MessageOut, ReactionOut, TypingOut
-from bridge.gateway import Bus, ChannelRouter
+from bridge.config import cfg
+from bridge.events import (
+    ConfigReload,
+    MessageBulkDeleteOut,
+    MessageDeleteOut,
+    MessageOut,
+    ReactionOut,
+    TypingOut,
+    message_delete_out,
+)
+from bridge.gateway import Bus, ChannelRouter, MappingDiff
 from bridge.identity.sanitize import puppet_muc_nick_from_base, xmpp_jid_or_plain_to_muc_nick
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from bridge.gateway.msgid_resolver import MessageIDResolver
     from bridge.identity import IdentityResolver
 
@@ -82,47 +93,101 @@ class XMPPAdapter(AdapterBase):
         self._router = router
         self._identity = identity_resolver
         self._msgid_resolver = msgid_resolver
-        self._outbound: asyncio.Queue[MessageOut | MessageDeleteOut | ReactionOut] = asyncio.Queue(maxsize=500)
+        self._outbound: asyncio.Queue[MessageOut | MessageDeleteOut | MessageBulkDeleteOut | ReactionOut] = (
+            asyncio.Queue(maxsize=500)
+        )
         self._send_lock = asyncio.Lock()
         self._component: XMPPComponent | None = None
         self._consumer_task: asyncio.Task[None] | None = None
         self._component_task: asyncio.Future[None] | None = None
         self._xmpp_typing_throttle: dict[str, float] = {}  # muc_jid -> last_sent
         self._xmpp_paused_tasks: dict[str, asyncio.Task] = {}  # muc_jid -> auto-paused task
+        self._reload_tasks: set[asyncio.Task] = set()  # MUC joins/leaves after a mapping reload
+        # (channel, message, author) -> reactions folded into the ReactionOut already queued for it
+        self._queued_reactions: dict[tuple[str, str, str], list[ReactionOut]] = {}
+        # Reaction batches whose queued ReactionOut was evicted by a full queue; sent once the queue drains
+        self._deferred_reactions: dict[tuple[str, str, str], list[ReactionOut]] = {}
+        self.reactions_deferred = 0
 
     @property
     def name(self) -> str:
         return "xmpp"
 
     def accept_event(self, source: str, evt: object) -> bool:
-        """Accept MessageOut, MessageDeleteOut, ReactionOut, or TypingOut targeting XMPP."""
+        """Accept MessageOut, MessageDeleteOut, MessageBulkDeleteOut, ReactionOut, or TypingOut targeting XMPP."""
         if isinstance(evt, MessageOut) and evt.target_origin == "xmpp":
             return True
-        if isinstance(evt, MessageDeleteOut) and evt.target_origin == "xmpp":
+        if isinstance(evt, (MessageDeleteOut, MessageBulkDeleteOut)) and evt.target_origin == "xmpp":
             return True
         if isinstance(evt, ReactionOut) and evt.target_origin == "xmpp":
             return True
+        if isinstance(evt, ConfigReload):
+            return bool(evt.mappings)
         return isinstance(evt, TypingOut) and evt.target_origin == "xmpp"
 
     def push_event(self, source: str, evt: object) -> None:
-        """Queue MessageOut, MessageDeleteOut, or ReactionOut for XMPP send; fire-and-forget TypingOut."""
+        """Queue MessageOut, (bulk) deletes, or ReactionOut for XMPP send; fire-and-forget TypingOut."""
         if isinstance(evt, TypingOut) and evt.target_origin == "xmpp":
             asyncio.create_task(self._handle_typing_out(evt))  # noqa: RUF006
             return
-        if isinstance(evt, (MessageOut, MessageDeleteOut, ReactionOut)):
+        if isinstance(evt, ConfigReload) and evt.mappings:
+            task = asyncio.create_task(self._apply_mapping_diff(evt.mappings))
+            self._reload_tasks.add(task)
+            task.add_done_callback(self._reload_tasks.discard)
+            return
+        if isinstance(evt, (MessageOut, MessageDeleteOut, MessageBulkDeleteOut, ReactionOut)):
             if isinstance(evt, MessageOut):
                 logger.info("queued message for channel={}", evt.channel_id)
+            if isinstance(evt, ReactionOut):
+                # XEP-0444 sends the user's full set: later reactions ride along in one stanza
+                key = (evt.channel_id, evt.message_id, evt.author_id)
+                if key in self._deferred_reactions:
+                    self._deferred_reactions[key].append(evt)
+                    return
+                if key in self._queued_reactions:
+                    self._queued_reactions[key].append(evt)
+                    return
+                self._queued_reactions[key] = []
             try:
                 self._outbound.put_nowait(evt)
             except asyncio.QueueFull:
                 dropped = self._outbound.get_nowait()
-                logger.warning(
-                    "outbound queue full (maxsize={}); dropped oldest item to make room (dropped type={})",
-                    self._outbound.maxsize,
-                    type(dropped).__name__,
-                )
+                if isinstance(dropped, ReactionOut):
+                    self._defer_reactions(dropped)
+                else:
+                    logger.warning(
+                        "outbound queue full (maxsize={}); dropped oldest item to make room (dropped type={})",
+                        self._outbound.maxsize,
+                        type(dropped).__name__,
+                    )
                 self._outbound.put_nowait(evt)
 
+    def _defer_reactions(self, evt: ReactionOut) -> None:
+        """Hold *evt* and its folded reactions until the queue drains instead of dropping them."""
+        key = (evt.channel_id, evt.message_id, evt.author_id)
+        batch = [evt, *self._queued_reactions.pop(key, [])]
+        self._deferred_reactions[key] = batch
+        self.reactions_deferred += len(batch)
+        logger.warning(
+            "outbound queue full (maxsize={}); deferred {} reaction(s) on {} until it drains (total deferred={})",
+            self._outbound.maxsize,
+            len(batch),
+            evt.message_id,
+            self.reactions_deferred,
+        )
+
+    async def _apply_mapping_diff(self, diff: MappingDiff) -> None:
+        """Join or leave only the MUCs whose mappings were added, removed or changed on reload."""
+        comp = self._component
+        if comp is None or not comp.is_connected():
+            return  # session start joins every mapped MUC
+        left, joined = diff.xmpp_changes()
+        for muc_jid in sorted(left):
+            if self._router.get_mapping_for_xmpp(muc_jid) is None:
+                comp.leave_muc(muc_jid)
+        for muc_jid in sorted(joined):
+            await comp.join_muc_as_listener(muc_jid)
+
     def _resolve_nick(self, evt: MessageOut | MessageDeleteOut | ReactionOut) -> str:
         """Fallback nick when identity resolver unavailable (dev without Portal)."""
         author = getattr(evt, "author_id", None) or ""
@@ -150,15 +215,25 @@ class XMPPAdapter(AdapterBase):
         """Drain outbound queue and send to MUC via component."""
         while True:
             try:
+                if self._deferred_reactions and self._outbound.empty():
+                    key = next(iter(self._deferred_reactions))
+                    first, *folded = self._deferred_reactions.pop(key)
+                    await self._handle_reaction_out(first, folded=folded)
+                    await asyncio.sleep(0.25)
+                    continue
                 evt = await self._outbound.get()
                 if isinstance(evt, MessageDeleteOut):
                     logger.debug("dequeued MessageDeleteOut discord_id={}", evt.message_id)
                     await self._handle_delete_out(evt)
                     await asyncio.sleep(0.25)
                     continue
+                if isinstance(evt, MessageBulkDeleteOut):
+                    await self._handle_bulk_delete_out(evt)
+                    continue
                 if isinstance(evt, ReactionOut):
                     logger.debug("dequeued ReactionOut discord_id={} emoji={}", evt.message_id, evt.emoji)
-                    await self._handle_reaction_out(evt)
+                    folded = self._queued_reactions.pop((evt.channel_id, evt.message_id, evt.author_id), [])
+                    await self._handle_reaction_out(evt, folded=folded)
                     await asyncio.sleep(0.25)
                     continue
                 mapping = self._router.get_mapping_for_discord(evt.channel_id)
@@ -176,7 +251,7 @@ class XMPPAdapter(AdapterBase):
 
                         # Resolve avatar: prefer Portal, then evt.avatar_url
                         avatar_url: str | None = None
-                        origin = (evt.raw or {}).get("origin", "")
+                        origin = evt.origin
                         if self._identity and evt.author_id:
                             try:
                                 if origin == "discord":
@@ -204,7 +279,7 @@ class XMPPAdapter(AdapterBase):
                             )
 
                         # Check if this is an edit
-                        is_edit = evt.raw.get("is_edit", False)
+                        is_edit = evt.is_edit
                         if is_edit:
                             # Look up original XMPP message ID (stored when we sent Discord→XMPP)
                             lookup_id = evt.message_id or evt.raw.get("replace_id")
@@ -241,8 +316,8 @@ class XMPPAdapter(AdapterBase):
                                 reply_to_xmpp_id = self._component._msgid_tracker.get_xmpp_id_for_reaction(
                                     evt.reply_to_id
                                 )
-                            reply_to_author_nick: str | None = evt.raw.get("reply_quoted_author")
-                            reply_to_body: str | None = evt.raw.get("reply_quoted_content")
+                            reply_to_author_nick = evt.meta.reply_quoted_author
+                            reply_to_body = evt.meta.reply_quoted_content
 
                             # Send new message; store mapping before send so stanza-id from
                             # MUC echo can update it (required for Discord→XMPP edits)
@@ -279,7 +354,6 @@ class XMPPAdapter(AdapterBase):
                             # *bold*/_italic_/etc., and XMPP content is native XEP-0393).
                             # Running discord_to_xmpp on XEP-0393 text would double-process
                             # it (e.g. *bold* → _bold_ because Discord *text* = italic).
-                            origin = evt.raw.get("origin", "")
                             if origin == "discord":
                                 xmpp_markup = discord_to_xmpp(content)
                                 if xmpp_markup.styled_body is not None:
@@ -307,7 +381,8 @@ class XMPPAdapter(AdapterBase):
 
                             # XEP-0393 uses single ~ for strikethrough; Fluux and some clients
                             # don't render ~~ (Discord-style). Normalize any ~~ that slipped through.
-                            content = re.sub(r"~~([^~]+)~~", r"~\1~", content)
+                            if "~~" in content:
+                                content = re.sub(r"~~([^~]+)~~", r"~\1~", content)
 
                             # For IRC-origin, evt.message_id is an IRC msgid.
                             # The temporary (xmpp_id, irc_msgid) mapping is created
@@ -324,10 +399,10 @@ class XMPPAdapter(AdapterBase):
                                 discord_message_id=evt.message_id if is_discord_origin else None,
                                 is_media=is_media,
                                 markup_spans=markup_spans,
-                                media_width=evt.raw.get("media_width"),
-                                media_height=evt.raw.get("media_height"),
-                                spoiler=evt.raw.get("spoiler", False),
-                                spoiler_reason=evt.raw.get("spoiler_reason"),
+                                media_width=evt.meta.media_width,
+                                media_height=evt.meta.media_height,
+                                spoiler=evt.meta.spoiler,
+                                spoiler_reason=evt.meta.spoiler_reason,
                                 reply_to_author_nick=reply_to_author_nick,
                                 reply_to_body=reply_to_body,
                             )
@@ -402,8 +477,40 @@ class XMPPAdapter(AdapterBase):
         else:
             await self._component.send_retraction_as_bridge(muc_jid, target_xmpp_id)
 
-    async def _handle_reaction_out(self, evt: ReactionOut) -> None:
-        """Send XMPP reaction for ReactionOut."""
+    async def _handle_bulk_delete_out(self, evt: MessageBulkDeleteOut) -> None:
+        """Send the retractions of a bulk delete back to back (no per-message pause)."""
+        if not self._component:
+            return
+        mapping = self._router.get_mapping_for_discord(evt.channel_id)
+        if not mapping or not mapping.xmpp:
+            return
+        tracker = self._component._msgid_tracker
+        muc_jid = mapping.xmpp.muc_jid
+        start = time.monotonic()
+        sent = 0
+        for message_id, author_id, author_display in evt.messages:
+            target_xmpp_id = tracker.get_xmpp_id_for_reaction(message_id) or tracker.get_xmpp_id(message_id)
+            if not target_xmpp_id:
+                continue
+            if author_id or author_display:
+                _, one = message_delete_out(
+                    "xmpp", evt.channel_id, message_id, author_id=author_id, author_display=author_display
+                )
+                nick = await self._resolve_nick_async(one)
+                await self._component.send_retraction_as_user(author_id or "unknown", muc_jid, target_xmpp_id, nick)
+            else:
+                await self._component.send_retraction_as_bridge(muc_jid, target_xmpp_id)
+            sent += 1
+        logger.info(
+            "bulk retraction to {}: {} of {} messages in {:.2f}s",
+            muc_jid,
+            sent,
+            len(evt.messages),
+            time.monotonic() - start,
+        )
+
+    async def _handle_reaction_out(self, evt: ReactionOut, *, folded: Sequence[ReactionOut] = ()) -> None:
+        """Send XMPP reaction for ReactionOut, with *folded* (same user and message) in the same stanza."""
         if not self._component:
             return
         mapping = self._router.get_mapping_for_discord(evt.channel_id)
@@ -424,6 +531,15 @@ class XMPPAdapter(AdapterBase):
             evt.message_id,
         )
         nick = await self._resolve_nick_async(evt)
+        if folded:
+            await self._component.send_reactions_as_user(
+                evt.author_id or "unknown",
+                mapping.xmpp.muc_jid,
+                target_xmpp_id,
+                [(r.emoji, bool(r.raw.get("is_remove", False))) for r in (evt, *folded)],
+                nick=nick,
+            )
+            return
         await self._component.send_reaction_as_user(
             evt.author_id or "unknown",
             mapping.xmpp.muc_jid,
@@ -497,6 +613,8 @@ class XMPPAdapter(AdapterBase):
             self._bus,
             self._router,
             self._identity,
+            prewarm_concurrency=cfg.xmpp_prewarm_concurrency,
+            occupancy_file=cfg.xmpp_puppet_occupancy_file or None,
         )
         if self._msgid_resolver:
             self._msgid_resolver.register_xmpp(self._component)
@@ -126,9 +126,7 @@ async def set_avatar_for_user(
         if origin:
             comp._puppet_origins[user_jid] = origin
         # Avatar changed — clear broadcast tracker so all MUCs get the new hash
-        stale = [k for k in comp._avatar_broadcast_done if k[1] == user_jid]
-        for k in stale:
-            comp._avatar_broadcast_done.pop(k, None)
+        comp._avatar_broadcast_done.discard_second(user_jid)
         logger.info("Set vCard avatar for {} (hash: {})", user_jid, avatar_hash[:8])
         return avatar_hash
     except Exception as exc:
@@ -142,11 +140,8 @@ async def broadcast_avatar_presence(
     avatar_hash: str,
 ) -> None:
     """Send updated presence with XEP-0153 vCard avatar hash to all MUCs the puppet is in."""
-    matched = False
-    for muc_jid, joined_jid in list(comp._puppets_joined):
-        if joined_jid != user_jid:
-            continue
-        matched = True
+    joined = comp._puppets_joined.keys_with_second(user_jid)
+    for muc_jid, _ in joined:
         try:
             # Build nick from user_jid localpart (the escaped nick)
             nick_str = user_jid.split("@", maxsplit=1)[0]
@@ -163,7 +158,7 @@ async def broadcast_avatar_presence(
             logger.info("Broadcast avatar hash {} to {} for {}", avatar_hash[:8], muc_jid, user_jid)
         except Exception as exc:
             logger.warning("Failed to broadcast avatar presence to {}: {}", muc_jid, exc)
-    if not matched:
+    if not joined:
         logger.warning(
             "No MUC entries in _puppets_joined for {} (total entries: {})",
             user_jid,
@@ -16,6 +16,7 @@ Avatar management → avatar.py
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import re
 from typing import TYPE_CHECKING, Any
 from xml.etree import ElementTree as ET
@@ -27,9 +28,13 @@ from slixmpp import JID
 from slixmpp.componentxmpp import ComponentXMPP
 from slixmpp.exceptions import XMPPError
 
+from bridge.adapters.xmpp.dedupe import MUCDeliveryDeduper
 from bridge.adapters.xmpp.msgid import XMPPMessageIDTracker
+from bridge.adapters.xmpp.prewarm import OccupancyRecord, prewarm_puppets
 from bridge.gateway import Bus, ChannelRouter
 from bridge.identity.sanitize import puppet_muc_xep0172_display_nick
+from bridge.tracking.echo import EchoCorrelator
+from bridge.tracking.pair_index import PairIndexedTTLCache
 
 # ---------------------------------------------------------------------------
 # XEP-0106 JID escape map: chars disallowed by nodeprep -> escape sequence.
@@ -105,6 +110,14 @@ def _muc_nick_to_bare_jid(nick: str, room_jid: str) -> str | None:
         return None
 
 
+def _puppet_presence_options(user_jid: str, nick: str) -> dict[str, Any]:
+    """Join presence options for a puppet: sent from *user_jid*, with its XEP-0172 display nick."""
+    options: dict[str, Any] = {"pfrom": JID(user_jid)}
+    if display_nick := puppet_muc_xep0172_display_nick(nick):
+        options["pnick"] = display_nick
+    return options
+
+
 # ---------------------------------------------------------------------------
 # Shared constants used by submodules
 # ---------------------------------------------------------------------------
@@ -114,6 +127,9 @@ SID_NS = "urn:xmpp:sid:0"
 # Puppet MUC join: join_muc_wait blocks the XMPP outbound queue until it returns.
 MUC_JOIN_WAIT_S = 25
 
+# Occupant nick of the bridge's own listener in every mapped MUC.
+_LISTENER_NICK = "bridge"
+
 # Bare URL pattern: body is *only* a URL (no other text)
 _BARE_URL_RE = re.compile(r"^https?://\S+$", re.IGNORECASE)
 
@@ -211,6 +227,8 @@ def _capture_stanza_id_from_echo(tracker: XMPPMessageIDTracker, msg: Any, room_j
 
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from bridge.identity import IdentityResolver
 
 
@@ -231,6 +249,9 @@ class XMPPComponent(ComponentXMPP):
         bus: Bus,
         router: ChannelRouter,
         identity: IdentityResolver | None,
+        *,
+        prewarm_concurrency: int = 8,
+        occupancy_file: str | None = None,
     ):
         ComponentXMPP.__init__(self, jid, secret, server, port)
         self._bus = bus
@@ -245,17 +266,26 @@ class XMPPComponent(ComponentXMPP):
         self._session: aiohttp.ClientSession | None = None
         self._ibb_streams: dict[str, asyncio.Task] = {}  # sid -> handler task
         self._msgid_tracker = XMPPMessageIDTracker()  # Track message IDs for edits
-        self._puppets_joined: TTLCache[tuple[str, str], None] = TTLCache(
-            maxsize=10000, ttl=86400
-        )  # (muc_jid, user_jid) — avoid re-join
+        # (muc_jid, user_jid) -> occupant nick — avoid re-join. Indexed by room and by puppet JID.
+        self._puppets_joined: PairIndexedTTLCache[str, str] = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+        # In-flight puppet joins, shared by lazy sends and the session-start pre-warm: tasks
+        # awaiting join_muc_wait, or pre-warm futures resolved by the self-presence (status 110).
+        self._pending_joins: dict[tuple[str, str], asyncio.Future[bool]] = {}
+        # Recently active (muc_jid, nick) pairs, rejoined in parallel on session start.
+        self._occupancy = OccupancyRecord(occupancy_file)
+        self._occupancy.load()
+        self._prewarm_concurrency = prewarm_concurrency
+        self._prewarm_task: asyncio.Task[int] | None = None
         # Track which (muc_jid, user_jid) pairs have had their avatar hash broadcast
         # so we don't re-broadcast on every message.  Cleared when avatar changes.
-        self._avatar_broadcast_done: TTLCache[tuple[str, str], None] = TTLCache(maxsize=10000, ttl=86400)
-        # Dedupe: MUC delivers same message to each occupant (listener + puppets) — process once
+        self._avatar_broadcast_done: PairIndexedTTLCache[str, str] = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+        # Dedupe: MUC delivers same message to each occupant (listener + puppets) — process once.
+        # Most copies are already dropped by the MUCDeliveryDeduper stanza filter; this is the backstop.
         self._seen_msg_ids: TTLCache[tuple[str, str], None] = TTLCache(maxsize=500, ttl=60)
-        # Fallback echo detection when get_jid_property returns None (MUC may not expose real JID)
-        # Must cover MUC_JOIN_WAIT_S + queue delay so echo suppression never expires mid-send.
-        self._recent_sent_nicks: TTLCache[tuple[str, str], None] = TTLCache(maxsize=200, ttl=90)
+        # Fallback echo detection when get_jid_property returns None (MUC may not expose real JID):
+        # (muc_jid, nick) markers. Must cover MUC_JOIN_WAIT_S + queue delay so echo suppression
+        # never expires mid-send; capacity follows the send rate so bursts don't evict live markers.
+        self._echoes = EchoCorrelator(ttl=90, name="XMPP echo")
         # XEP-0444: track per-user reaction sets to detect removals (full set sent each update)
         self._reactions_by_user: TTLCache[tuple[str, str], frozenset[str]] = TTLCache(maxsize=2000, ttl=3600)
         # Dedupe moderation: MUC delivers to each occupant + multiple handlers fire per stanza
@@ -384,6 +414,12 @@ class XMPPComponent(ComponentXMPP):
             self.default_ns,
         )
 
+        # Collapse the N+1 MUC copies of each groupchat message before handler matching.
+        # Appended after plugin registration so plugin 'in' filters (e.g. XEP-0198 ack
+        # counting, when stream management is active) still see every stanza.
+        self._muc_dedupe = MUCDeliveryDeduper(lambda: len(self._puppets_joined) + len(self._confirmed_mucs))
+        self.add_filter("in", self._muc_dedupe)
+
     # ===================================================================
     # Debug: log all incoming IQs
     # ===================================================================
@@ -462,31 +498,79 @@ class XMPPComponent(ComponentXMPP):
             self._session = aiohttp.ClientSession()
 
         # Join all mapped MUCs so we receive groupchat_message events (XMPP → Discord/IRC)
-        muc_plugin = self.plugin.get("xep_0045", None)
-        if muc_plugin:
-            bridge_nick = "bridge"
-            bridge_jid = f"bridge@{self._component_jid}"
+        if self.plugin.get("xep_0045", None):
             for mapping in self._router.all_mappings():
                 if mapping.xmpp:
-                    try:
-                        await muc_plugin.join_muc_wait(  # type: ignore[misc,call-arg]
-                            JID(mapping.xmpp.muc_jid),
-                            bridge_nick,
-                            presence_options={"pfrom": JID(bridge_jid)},
-                            timeout=30,
-                            maxchars=0,  # Requirement 10.11 / 18.1: suppress MUC history replay
-                        )
-                        logger.info("Joined MUC {} as listener ({})", mapping.xmpp.muc_jid, bridge_nick)
-                    except XMPPError as exc:
-                        logger.warning("Failed to join MUC {}: {}", mapping.xmpp.muc_jid, exc)
+                    await self.join_muc_as_listener(mapping.xmpp.muc_jid)
+            self._start_prewarm()
+
+    async def join_muc_as_listener(self, muc_jid: str) -> bool:
+        """Join *muc_jid* as the bridge listener (receives the room's messages). Returns True on success."""
+        muc_plugin = self.plugin.get("xep_0045", None)
+        if not muc_plugin:
+            return False
+        try:
+            await muc_plugin.join_muc_wait(  # type: ignore[misc,call-arg]
+                JID(muc_jid),
+                _LISTENER_NICK,
+                presence_options={"pfrom": JID(f"bridge@{self._component_jid}")},
+                timeout=30,
+                maxchars=0,  # Requirement 10.11 / 18.1: suppress MUC history replay
+            )
+        except XMPPError as exc:
+            logger.warning("Failed to join MUC {}: {}", muc_jid, exc)
+            return False
+        logger.info("Joined MUC {} as listener ({})", muc_jid, _LISTENER_NICK)
+        return True
+
+    def leave_muc(self, muc_jid: str) -> None:
+        """Leave *muc_jid* with the listener and every joined puppet (its mapping was removed)."""
+        muc_plugin = self.plugin.get("xep_0045", None)
+        if muc_plugin:
+            occupants = [(f"bridge@{self._component_jid}", _LISTENER_NICK)]
+            occupants += [
+                (key[1], self._puppets_joined.get(key)) for key in self._puppets_joined.keys_with_first(muc_jid)
+            ]
+            for user_jid, nick in occupants:
+                if nick:
+                    with contextlib.suppress(KeyError):  # not in slixmpp's room list
+                        muc_plugin.leave_muc(JID(muc_jid), nick, pfrom=JID(user_jid))
+        self._puppets_joined.discard_first(muc_jid)
+        self._avatar_broadcast_done.discard_first(muc_jid)
+        self._confirmed_mucs.discard(muc_jid)
+        logger.info("Left MUC {}", muc_jid)
+
+    def _start_prewarm(self) -> None:
+        """Rejoin recently active puppets in the background so their next send doesn't wait on a join."""
+        record = getattr(self, "_occupancy", None)
+        concurrency = getattr(self, "_prewarm_concurrency", 0)
+        if record is None or concurrency <= 0:
+            return
+        mapped = {m.xmpp.muc_jid for m in self._router.all_mappings() if m.xmpp}
+        pairs = [(muc, nick) for muc, nick in record.recent() if muc in mapped and muc not in self._banned_rooms]
+        if not pairs:
+            return
+        task = asyncio.create_task(prewarm_puppets(self, pairs, concurrency=concurrency))
+        self._prewarm_task = task
+        self._background_tasks.add(task)  # type: ignore[arg-type]
+        task.add_done_callback(self._background_tasks.discard)  # type: ignore[arg-type]
 
     async def _on_disconnected(self, event: Any) -> None:
         """Clean up state on XMPP disconnect so reconnect starts fresh."""
         # Clear puppet join tracking — MUC evicts all occupants on disconnect,
         # so _ensure_puppet_joined must re-join them after reconnect.
         self._puppets_joined.clear()
+        if (prewarm := getattr(self, "_prewarm_task", None)) is not None:
+            prewarm.cancel()
+            self._prewarm_task = None
+        for pending in list(getattr(self, "_pending_joins", {}).values()):
+            pending.cancel()
+        if (record := getattr(self, "_occupancy", None)) is not None:
+            await record.save_async()
         self._avatar_broadcast_done.clear()
         self._confirmed_mucs.clear()
+        if (dedupe := getattr(self, "_muc_dedupe", None)) is not None:
+            dedupe.clear()
         if self._session:
             await self._session.close()
             self._session = None
@@ -503,11 +587,107 @@ class XMPPComponent(ComponentXMPP):
         """
         key = (muc_jid, user_jid)
         if key in self._puppets_joined:
-            return True
-        if await self.join_muc_as_user(muc_jid, nick):
-            self._puppets_joined[key] = None
-            return True
-        return False
+            # Refresh the TTL so an active puppet never lapses into a blocking rejoin.
+            self._puppets_joined[key] = nick
+            joined = True
+        else:
+            task = self._join_puppet(muc_jid, user_jid, nick)
+            try:
+                joined = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                joined = False  # join abandoned on disconnect
+        if joined and (record := getattr(self, "_occupancy", None)) is not None:
+            record.touch(muc_jid, nick)
+            await record.maybe_save()
+        return joined
+
+    def _join_puppet(self, muc_jid: str, user_jid: str, nick: str) -> asyncio.Future[bool]:
+        """Start joining *muc_jid* as *user_jid*, or return the join already in flight."""
+        key = (muc_jid, user_jid)
+        pending_joins = getattr(self, "_pending_joins", None)
+        if pending_joins is None:
+            pending_joins = self._pending_joins = {}
+        task = pending_joins.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_puppet_join(muc_jid, user_jid, nick))
+            pending_joins[key] = task
+
+            def _done(t: asyncio.Task[bool]) -> None:
+                if pending_joins.get(key) is t:
+                    del pending_joins[key]
+
+            task.add_done_callback(_done)
+        return task
+
+    def _prewarm_join(self, muc_jid: str, user_jid: str, nick: str) -> asyncio.Future[bool]:
+        """Send the join presence for *user_jid* without waiting for the room.
+
+        The future resolves True on the puppet's self-presence (status 110, see
+        :meth:`_confirm_puppet_join`) and False after ``MUC_JOIN_WAIT_S``. A join
+        already in flight is returned instead; lazy sends await this one as well.
+        """
+        key = (muc_jid, user_jid)
+        pending_joins = getattr(self, "_pending_joins", None)
+        if pending_joins is None:
+            pending_joins = self._pending_joins = {}
+        if (pending := pending_joins.get(key)) is not None:
+            return pending
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+        if not self._send_join_presence(muc_jid, user_jid, nick):
+            future.set_result(False)
+            return future
+        pending_joins[key] = future
+
+        def _expire() -> None:
+            if not future.done():
+                logger.warning("pre-warm join of {} as {} got no self-presence", muc_jid, user_jid)
+                future.set_result(False)
+
+        expiry = loop.call_later(MUC_JOIN_WAIT_S, _expire)
+
+        def _done(f: asyncio.Future[bool]) -> None:
+            expiry.cancel()
+            if pending_joins.get(key) is f:
+                del pending_joins[key]
+
+        future.add_done_callback(_done)
+        return future
+
+    def _confirm_puppet_join(self, muc_jid: str, user_jid: str, nick: str) -> None:
+        """Self-presence of *user_jid* in *muc_jid*: complete its pre-warm join, if one is pending."""
+        pending = getattr(self, "_pending_joins", {}).get((muc_jid, user_jid))
+        # Tasks are lazy joins; join_muc_wait confirms those itself.
+        if pending is None or pending.done() or isinstance(pending, asyncio.Task):
+            return
+        self._puppets_joined[(muc_jid, user_jid)] = nick
+        self._echoes.mark((muc_jid, nick))
+        logger.info("Joined MUC {} as {} (pre-warm)", muc_jid, user_jid)
+        pending.set_result(True)
+
+    def _send_join_presence(self, muc_jid: str, user_jid: str, nick: str) -> bool:
+        """Send *user_jid*'s MUC join presence (no history) and register the room with slixmpp."""
+        muc_plugin = self.plugin.get("xep_0045", None)
+        if not muc_plugin:
+            logger.error("XEP-0045 plugin not available")
+            return False
+        room, pfrom = JID(muc_jid), JID(user_jid)
+        stanza = muc_plugin.make_join_stanza(
+            room, nick, presence_options=_puppet_presence_options(user_jid, nick), maxchars=0
+        )
+        # What join_muc_wait records before sending, so slixmpp tracks this occupant.
+        muc_plugin.rooms[pfrom][room] = {}
+        muc_plugin.our_nicks[pfrom][room] = nick
+        stanza.send()
+        return True
+
+    async def _run_puppet_join(self, muc_jid: str, user_jid: str, nick: str) -> bool:
+        if not await self.join_muc_as_user(muc_jid, nick):
+            return False
+        self._puppets_joined[(muc_jid, user_jid)] = nick
+        return True
 
     async def join_muc_as_user(self, muc_jid: str, nick: str) -> bool:
         """Join MUC as a specific user JID (puppet presence). Returns True on success."""
@@ -520,10 +700,8 @@ class XMPPComponent(ComponentXMPP):
             return False
 
         try:
-            presence_options: dict[str, Any] = {"pfrom": JID(user_jid)}
-            display_nick = puppet_muc_xep0172_display_nick(nick)
-            if display_nick:
-                presence_options["pnick"] = display_nick
+            presence_options = _puppet_presence_options(user_jid, nick)
+            display_nick = presence_options.get("pnick")
 
             await muc_plugin.join_muc_wait(  # type: ignore[misc,call-arg]
                 JID(muc_jid),
@@ -533,7 +711,7 @@ class XMPPComponent(ComponentXMPP):
                 maxchars=0,  # Requirement 10.11 / 18.1: suppress MUC history replay
             )
             # Echo suppression: inbound groupchat uses this occupant nick for is_recent_echo.
-            self._recent_sent_nicks[(muc_jid, nick)] = None
+            self._echoes.mark((muc_jid, nick))
             if display_nick:
                 logger.info(
                     "Joined MUC {} as {} (XEP-0172 display nick: {})",
@@ -681,6 +859,19 @@ class XMPPComponent(ComponentXMPP):
 
         await send_reaction_as_user(self, discord_id, muc_jid, target_msg_id, emoji, nick, is_remove=is_remove)
 
+    async def send_reactions_as_user(
+        self,
+        discord_id: str,
+        muc_jid: str,
+        target_msg_id: str,
+        changes: Sequence[tuple[str, bool]],
+        *,
+        nick: str,
+    ) -> None:
+        from bridge.adapters.xmpp.outbound import send_reactions_as_user
+
+        await send_reactions_as_user(self, discord_id, muc_jid, target_msg_id, changes, nick=nick)
+
     async def send_retraction_as_user(self, discord_id: str, muc_jid: str, target_msg_id: str, nick: str) -> None:
         from bridge.adapters.xmpp.outbound import send_retraction_as_user
 
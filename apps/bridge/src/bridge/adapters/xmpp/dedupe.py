@@ -0,0 +1,135 @@
+"""Early collapse of duplicate MUC deliveries (one copy per hosted occupant).
+
+Prosody reflects every groupchat message to each occupant the component hosts:
+the listener plus every joined puppet. Without this filter each of the N+1
+copies runs through slixmpp handler matching, the MUC plugin,
+``on_raw_groupchat`` and ``on_groupchat_message`` before the handler-level
+``_seen_msg_ids`` check drops it.
+
+:class:`MUCDeliveryDeduper` is installed as the last slixmpp ``'in'`` stanza
+filter (plugin filters such as XEP-0198 ack counting still see every stanza)
+and therefore runs before any handler. It keys on the room-assigned stanza-id (XEP-0359), then
+origin-id, then the message id, and drops copies it has already seen.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import TTLCache
+from loguru import logger
+
+_SID_NS = "urn:xmpp:sid:0"
+_STANZA_ID_TAG = f"{{{_SID_NS}}}stanza-id"
+_ORIGIN_ID_TAG = f"{{{_SID_NS}}}origin-id"
+
+# Seen-key capacity: base size plus headroom per hosted occupant. Every occupant gets a
+# copy of every message, so copies of consecutive messages interleave more as rooms
+# fill up; keys must survive until the last copy of their message has arrived.
+_BASE_CAPACITY = 500
+_PER_OCCUPANT_CAPACITY = 4
+_MAX_CAPACITY = 100_000
+_TTL_SECONDS = 60.0
+_REPORT_INTERVAL_S = 60.0
+
+
+def delivery_key(xml: Any) -> tuple[str, str, str] | None:
+    """Dedupe key for a groupchat ``<message>`` element, or None when it carries no id.
+
+    Only direct children are inspected (stanza-id / origin-id are top-level
+    per XEP-0359), so the cost is independent of payload size.
+    """
+    sender = xml.get("from") or ""
+    room = sender.split("/", 1)[0]
+    origin_id = None
+    for child in xml:
+        tag = child.tag
+        if tag == _STANZA_ID_TAG:
+            sid = child.get("id")
+            if sid and child.get("by") == room:
+                return (room, "sid", sid)
+        elif tag == _ORIGIN_ID_TAG:
+            origin_id = child.get("id") or origin_id
+    if origin_id:
+        return (sender, "oid", origin_id)
+    msg_id = xml.get("id")
+    if msg_id:
+        return (sender, "id", msg_id)
+    return None
+
+
+class MUCDeliveryDeduper:
+    """slixmpp ``'in'`` filter that drops repeated MUC deliveries of the same message.
+
+    Capacity follows ``occupants()`` (hosted MUC occupants: listener + puppets) and is
+    re-sized with hysteresis. ``collapsed`` counts dropped copies; a summary is logged
+    at most once per minute while duplicates are being collapsed.
+    """
+
+    def __init__(self, occupants: Callable[[], int], *, ttl: float = _TTL_SECONDS) -> None:
+        self._occupants = occupants
+        self._ttl = ttl
+        self._seen: TTLCache[tuple[str, str, str], None] = TTLCache(maxsize=_BASE_CAPACITY, ttl=ttl)
+        self.collapsed = 0
+        self.unique = 0
+        self._reported_collapsed = 0
+        self._last_report = time.monotonic()
+
+    @property
+    def capacity(self) -> int:
+        return int(self._seen.maxsize)
+
+    def _target_capacity(self) -> int:
+        return min(_MAX_CAPACITY, max(_BASE_CAPACITY, self._occupants() * _PER_OCCUPANT_CAPACITY))
+
+    def _adapt(self) -> None:
+        """Grow as soon as occupants need it; shrink only when 4x oversized."""
+        target = self._target_capacity()
+        current = self._seen.maxsize
+        if target > current or target * 4 <= current:
+            resized: TTLCache[tuple[str, str, str], None] = TTLCache(maxsize=target, ttl=self._ttl)
+            for key in list(self._seen.keys())[-target:]:
+                resized[key] = None
+            self._seen = resized
+
+    def clear(self) -> None:
+        """Forget seen keys (e.g. on disconnect: the MUC evicts all hosted occupants)."""
+        self._seen.clear()
+
+    def __call__(self, stanza: Any) -> Any:
+        if getattr(stanza, "name", None) != "message":
+            return stanza
+        xml = stanza.xml
+        if xml.get("type") != "groupchat":
+            return stanza
+        key = delivery_key(xml)
+        if key is None:
+            return stanza
+        if key in self._seen:
+            self.collapsed += 1
+            self._maybe_report()
+            return None
+        self._adapt()
+        self._seen[key] = None
+        self.unique += 1
+        return stanza
+
+    def _maybe_report(self) -> None:
+        now = time.monotonic()
+        if now - self._last_report < _REPORT_INTERVAL_S:
+            return
+        logger.info(
+            "MUC dedupe: collapsed {} duplicate deliveries in last {:.0f}s ({} total, {} unique, capacity {})",
+            self.collapsed - self._reported_collapsed,
+            now - self._last_report,
+            self.collapsed,
+            self.unique,
+            self.capacity,
+        )
+        self._reported_collapsed = self.collapsed
+        self._last_report = now
+
+    def stats(self) -> dict[str, int]:
+        return {"collapsed": self.collapsed, "unique": self.unique, "capacity": self.capacity}
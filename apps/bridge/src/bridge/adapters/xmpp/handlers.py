@@ -18,7 +18,8 @@ from bridge.adapters.xmpp.component import (
     _capture_stanza_id_from_echo,
     _muc_nick_to_bare_jid,
 )
-from bridge.events import message_in
+from bridge.events import NO_META, MessageMeta, message_in
+from bridge.gateway.enrichment import enricher_for
 
 if TYPE_CHECKING:
     from bridge.adapters.xmpp.component import XMPPComponent
@@ -65,7 +66,7 @@ def is_recent_echo(comp: XMPPComponent, room_jid: str, nick: str) -> bool:
     ``get_jid_property`` returns ``None`` (the MUC does not expose real JIDs
     to all occupants).
     """
-    return (room_jid, nick) in comp._recent_sent_nicks
+    return comp._echoes.seen((room_jid, nick))
 
 
 def is_listener_nick(nick: str) -> bool:
@@ -110,8 +111,8 @@ async def on_groupchat_message(comp: XMPPComponent, msg: Any) -> None:
     nick = msg["mucnick"] if msg["mucnick"] else ""
     from_jid = str(msg["from"]) if msg["from"] else ""
 
-    # Detect XEP-0382 spoiler element and record in raw_data for the pipeline.
-    # The pipeline's unwrap_spoiler (XMPP branch) checks raw["spoiler"] to set
+    # Detect XEP-0382 spoiler element and record it in the event meta for the pipeline.
+    # The pipeline's unwrap_spoiler (XMPP branch) checks meta.spoiler to set
     # ctx.spoiler, then wrap_spoiler re-applies the correct target syntax
     # (||…|| for Discord, fg==bg color for IRC, XEP-0382 element for XMPP).
     is_spoiler = False
@@ -265,18 +266,13 @@ async def on_groupchat_message(comp: XMPPComponent, msg: Any) -> None:
             origin_id_val = origin_id_elem.get("id")
 
     raw_data: dict[str, Any] = {}
+    reply_quoted_content: str | None = None
     if unstyled:
         raw_data["unstyled"] = True
-    if is_spoiler:
-        raw_data["spoiler"] = True
-        if spoiler_reason:
-            raw_data["spoiler_reason"] = spoiler_reason
     if replace_id:
         raw_data["replace_id"] = replace_id
     if reply_to_xmpp_id:
         raw_data["reply_to_id"] = reply_to_xmpp_id  # Original XMPP stanza-id (for tests/debug)
-        if reply_quoted_author:
-            raw_data["reply_quoted_author"] = reply_quoted_author
         # Extract quoted content from XEP-0428 fallback so relay can add > quote for IRC
         if xml is not None:
             fb = xml.find(".//{urn:xmpp:fallback:0}fallback[@for='urn:xmpp:reply:0']")
@@ -289,15 +285,22 @@ async def on_groupchat_message(comp: XMPPComponent, msg: Any) -> None:
                         try:
                             s, e = int(start), int(end)
                             if 0 <= s < e <= len(body):
-                                raw_data["reply_quoted_content"] = body[s:e]
+                                reply_quoted_content = body[s:e]
                         except (ValueError, TypeError):
                             pass
     aliases = []
     for aid in (origin_id_val, top_level_id):
         if aid and aid != xmpp_msg_id and aid not in aliases:
             aliases.append(aid)
-    if aliases:
-        raw_data["xmpp_id_aliases"] = aliases
+    meta = NO_META
+    if is_spoiler or aliases or reply_quoted_author or reply_quoted_content:
+        meta = MessageMeta(
+            reply_quoted_content=reply_quoted_content,
+            reply_quoted_author=reply_quoted_author,
+            spoiler=is_spoiler,
+            spoiler_reason=spoiler_reason if is_spoiler else None,
+            xmpp_id_aliases=tuple(aliases),
+        )
 
     # Build avatar URL: try PEP first, then vCard as fallback. Base from room domain (muc.atl.chat → atl.chat);
     # path from real JID localpart (alice@atl.chat → /pep_avatar/alice). User domain irrelevant.
@@ -312,7 +315,10 @@ async def on_groupchat_message(comp: XMPPComponent, msg: Any) -> None:
             room_domain = JID(room_jid).domain
             base_domain = room_domain[4:] if room_domain.startswith("muc.") else room_domain
             node = JID(real_jid).local
-            avatar_url = await comp._resolve_avatar_url(base_domain, node)
+            with contextlib.suppress(Exception):
+                avatar_url = await enricher_for(comp).resolve(
+                    ("avatar", base_domain, node), lambda: comp._resolve_avatar_url(base_domain, node)
+                )
 
     # Use localpart as author_display when nick is escaped JID (kaizen\40xmpp.localhost -> kaizen)
     author_display = nick.split("\\40")[0] if "\\40" in nick else nick
@@ -328,7 +334,8 @@ async def on_groupchat_message(comp: XMPPComponent, msg: Any) -> None:
         is_edit=is_edit,
         is_action=False,
         avatar_url=avatar_url,
-        raw=raw_data if raw_data else {},
+        meta=meta,
+        raw=raw_data,
     )
     logger.info("message bridged: room={} author={}", room_jid, nick)
     comp._bus.publish("xmpp", evt)
@@ -841,6 +848,8 @@ def on_muc_presence(comp: XMPPComponent, presence: Any) -> None:
     if 110 in codes:
         comp._confirmed_mucs.add(room_jid)
         logger.info("MUC join confirmed (status 110) for {} in {}", nick, room_jid)
+        if user_jid := str(presence.get("to", "")).split("/", maxsplit=1)[0]:
+            comp._confirm_puppet_join(room_jid, user_jid, nick)
 
         # Status 210 often accompanies 110 when the server modified the nick
         if 210 in codes:
@@ -897,10 +906,11 @@ def _handle_nick_modified(comp: XMPPComponent, room_jid: str, new_nick: str) ->
 
 
 def _remove_puppet_entries(comp: XMPPComponent, room_jid: str) -> None:
-    """Remove all puppet join entries for a given MUC room."""
-    to_remove = [key for key in comp._puppets_joined if key[0] == room_jid]
-    for key in to_remove:
-        comp._puppets_joined.pop(key, None)
+    """Remove all puppet join entries (and their avatar broadcast state) for a given MUC room."""
+    comp._puppets_joined.discard_first(room_jid)
+    broadcast_done = getattr(comp, "_avatar_broadcast_done", None)
+    if broadcast_done is not None:
+        broadcast_done.discard_first(room_jid)
 
 
 def _schedule_rejoin(comp: XMPPComponent, room_jid: str) -> None:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from collections import deque
 from typing import NamedTuple
 
 
@@ -15,15 +16,48 @@ class XMPPMessageMapping(NamedTuple):
     timestamp: float
 
 
+class _AliasGroup:
+    """Every key (XMPP origin-id/stanza-id, Discord/IRC ids) that refers to one stored message."""
+
+    __slots__ = ("discord_ids", "timestamp", "xmpp_ids")
+
+    def __init__(self, timestamp: float) -> None:
+        self.timestamp = timestamp
+        self.xmpp_ids: set[str] = set()
+        self.discord_ids: set[str] = set()
+
+
 class XMPPMessageIDTracker:
-    """Track XMPP message ID <-> Discord message ID mappings with TTL."""
+    """Track XMPP message ID <-> Discord message ID mappings with TTL.
+
+    Each stored message owns an alias group listing all of its keys, so
+    updating, re-keying or expiring a message touches only its own aliases
+    rather than scanning every tracked ID.
+    """
 
     def __init__(self, ttl_seconds: int = 3600):
         self._ttl = ttl_seconds
         self._xmpp_to_discord: dict[str, XMPPMessageMapping] = {}
         self._discord_to_xmpp: dict[str, XMPPMessageMapping] = {}
         self._discord_to_stanza_id: dict[str, str] = {}  # discord_id -> stanza_id (for reactions)
-        self._last_cleanup: float = 0.0  # monotonic timestamp of last full cleanup scan
+        self._xmpp_groups: dict[str, _AliasGroup] = {}
+        self._discord_groups: dict[str, _AliasGroup] = {}
+        self._expiry: deque[_AliasGroup] = deque()  # groups in store order (oldest first)
+        self._last_cleanup: float = 0.0  # monotonic timestamp of last cleanup pass
+
+    def _link_xmpp(self, key: str, group: _AliasGroup) -> None:
+        previous = self._xmpp_groups.get(key)
+        if previous is not None and previous is not group:
+            previous.xmpp_ids.discard(key)
+        group.xmpp_ids.add(key)
+        self._xmpp_groups[key] = group
+
+    def _link_discord(self, key: str, group: _AliasGroup) -> None:
+        previous = self._discord_groups.get(key)
+        if previous is not None and previous is not group:
+            previous.discord_ids.discard(key)
+        group.discord_ids.add(key)
+        self._discord_groups[key] = group
 
     def store(self, xmpp_id: str, discord_id: str, room_jid: str):
         """Store bidirectional mapping."""
@@ -35,6 +69,10 @@ class XMPPMessageIDTracker:
         )
         self._xmpp_to_discord[xmpp_id] = mapping
         self._discord_to_xmpp[discord_id] = mapping
+        group = _AliasGroup(mapping.timestamp)
+        self._link_xmpp(xmpp_id, group)
+        self._link_discord(discord_id, group)
+        self._expiry.append(group)
 
     def add_stanza_id_alias(self, our_id: str, stanza_id: str) -> bool:
         """Add stanza-id as alias for lookups.
@@ -50,6 +88,9 @@ class XMPPMessageIDTracker:
             return False
         self._xmpp_to_discord[stanza_id] = mapping
         self._discord_to_stanza_id[mapping.discord_id] = stanza_id
+        group = self._xmpp_groups.get(our_id)
+        if group is not None:
+            self._link_xmpp(stanza_id, group)
         return True
 
     def add_alias(self, alias_id: str, primary_xmpp_id: str) -> bool:
@@ -59,6 +100,9 @@ class XMPPMessageIDTracker:
         if not mapping:
             return False
         self._xmpp_to_discord[alias_id] = mapping
+        group = self._xmpp_groups.get(primary_xmpp_id)
+        if group is not None:
+            self._link_xmpp(alias_id, group)
         return True
 
     def add_discord_id_alias(self, new_discord_id: str, existing_key: str) -> bool:
@@ -78,6 +122,9 @@ class XMPPMessageIDTracker:
         stanza_id = self._discord_to_stanza_id.get(existing_key)
         if stanza_id:
             self._discord_to_stanza_id[new_discord_id] = stanza_id
+        group = self._discord_groups.get(existing_key)
+        if group is not None:
+            self._link_discord(new_discord_id, group)
         return True
 
     def get_discord_id(self, xmpp_id: str) -> str | None:
@@ -126,6 +173,10 @@ class XMPPMessageIDTracker:
         )
         self._xmpp_to_discord[new_xmpp_id] = new_mapping
         self._discord_to_xmpp[mapping.discord_id] = new_mapping
+        group = self._xmpp_groups.pop(old_xmpp_id, None)
+        if group is not None:
+            group.xmpp_ids.discard(old_xmpp_id)
+            self._link_xmpp(new_xmpp_id, group)
         return True
 
     def update_discord_id(self, xmpp_id: str, new_discord_id: str) -> bool:
@@ -147,23 +198,30 @@ class XMPPMessageIDTracker:
             room_jid=mapping.room_jid,
             timestamp=mapping.timestamp,
         )
-        # Update all keys pointing to the old mapping (xmpp_id + aliases like stanza_id).
-        # Identity check (`is`) is intentional: multiple keys (origin-id, stanza-id) may map
-        # to the *same* XMPPMessageMapping object (set by add_stanza_id_alias / add_alias).
-        # Using `is` instead of `==` ensures we update every aliased key in one pass without
-        # having to maintain a separate reverse-alias index.
-        for key in list(self._xmpp_to_discord.keys()):
-            if self._xmpp_to_discord[key] is mapping:
+        # Update the keys in this message's alias group (xmpp_id + aliases like stanza_id)
+        # that still share the old mapping object (set by add_stanza_id_alias / add_alias).
+        group = self._xmpp_groups.get(xmpp_id)
+        for key in group.xmpp_ids if group is not None else (xmpp_id,):
+            if self._xmpp_to_discord.get(key) is mapping:
                 self._xmpp_to_discord[key] = new_mapping
         self._discord_to_xmpp.pop(old_discord_id, None)
         self._discord_to_xmpp[new_discord_id] = new_mapping
         stanza_id = self._discord_to_stanza_id.pop(old_discord_id, None)
         if stanza_id:
             self._discord_to_stanza_id[new_discord_id] = stanza_id
+        if group is not None:
+            if self._discord_groups.get(old_discord_id) is group:
+                del self._discord_groups[old_discord_id]
+                group.discord_ids.discard(old_discord_id)
+            self._link_discord(new_discord_id, group)
         return True
 
     def _cleanup(self):
-        """Remove expired entries (throttled: runs at most once per second)."""
+        """Remove expired entries (throttled: runs at most once per second).
+
+        Walks alias groups oldest-first and stops at the first live one, so the
+        cost is proportional to what expired, not to the number of tracked IDs.
+        """
         now = time.monotonic()
         if now - self._last_cleanup < 1.0:
             return
@@ -171,15 +229,12 @@ class XMPPMessageIDTracker:
         now_wall = time.time()
         cutoff = now_wall - self._ttl
 
-        # Clean XMPP -> Discord
-        expired_xmpp = [xmpp_id for xmpp_id, mapping in self._xmpp_to_discord.items() if mapping.timestamp < cutoff]
-        for xmpp_id in expired_xmpp:
-            del self._xmpp_to_discord[xmpp_id]
-
-        # Clean Discord -> XMPP
-        expired_discord = [
-            discord_id for discord_id, mapping in self._discord_to_xmpp.items() if mapping.timestamp < cutoff
-        ]
-        for discord_id in expired_discord:
-            del self._discord_to_xmpp[discord_id]
-            self._discord_to_stanza_id.pop(discord_id, None)
+        while self._expiry and self._expiry[0].timestamp < cutoff:
+            group = self._expiry.popleft()
+            for xmpp_id in group.xmpp_ids:
+                self._xmpp_to_discord.pop(xmpp_id, None)
+                self._xmpp_groups.pop(xmpp_id, None)
+            for discord_id in group.discord_ids:
+                self._discord_to_xmpp.pop(discord_id, None)
+                self._discord_to_stanza_id.pop(discord_id, None)
+                self._discord_groups.pop(discord_id, None)
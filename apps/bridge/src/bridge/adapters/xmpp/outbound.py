@@ -8,6 +8,7 @@ from __future__ import annotations
 import re as _re
 import time
 import uuid
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 from xml.etree import ElementTree as ET
 from xml.sax.saxutils import escape as _xml_escape
@@ -52,7 +53,7 @@ async def send_message_as_user(
     escaped_nick = _escape_jid_node(nick)
     user_jid = f"{escaped_nick}@{comp._component_jid}"
     # Record before send for echo detection fallback (when get_jid_property returns None)
-    comp._recent_sent_nicks[(muc_jid, nick)] = None
+    comp._echoes.mark((muc_jid, nick))
     if not await comp._ensure_puppet_joined(muc_jid, user_jid, nick):
         logger.warning(
             "skip groupchat message: puppet not in MUC {} as {} (nick {!r})",
@@ -191,7 +192,7 @@ async def send_message_as_user(
                 logger.debug("XEP-0394 markup attach failed: {}", exc)
 
         # Refresh TTL after join (join may exceed the original pre-seed window).
-        comp._recent_sent_nicks[(muc_jid, nick)] = None
+        comp._echoes.mark((muc_jid, nick))
         msg.send()
 
         logger.debug("sent message {} from {} to {}", msg_id, user_jid, muc_jid)
@@ -211,15 +212,29 @@ async def send_reaction_as_user(
     *,
     is_remove: bool = False,
 ) -> None:
-    """Send reaction (add or remove) to a message from a specific Discord user's JID.
+    """Send reaction (add or remove) to a message from a specific Discord user's JID."""
+    await send_reactions_as_user(comp, discord_id, muc_jid, target_msg_id, [(emoji, is_remove)], nick=nick)
+
+
+async def send_reactions_as_user(
+    comp: XMPPComponent,
+    discord_id: str,
+    muc_jid: str,
+    target_msg_id: str,
+    changes: Sequence[tuple[str, bool]],
+    *,
+    nick: str,
+) -> None:
+    """Apply reaction *changes* (``(emoji, is_remove)`` in order) and send one stanza from the user's JID.
 
     XEP-0444 requires sending the full reaction set per-user per-message.
     We accumulate state in ``comp._reactions_by_user`` (keyed by
-    ``(target_msg_id, nick)``) and always send the complete set.
+    ``(target_msg_id, nick)``) and always send the complete set, so any
+    number of changes to the same message costs one stanza.
     """
     escaped_nick = _escape_jid_node(nick)
     user_jid = f"{escaped_nick}@{comp._component_jid}"
-    comp._recent_sent_nicks[(muc_jid, nick)] = None
+    comp._echoes.mark((muc_jid, nick))
     if not await comp._ensure_puppet_joined(muc_jid, user_jid, nick):
         logger.warning(
             "skip reaction: puppet not in MUC {} as {} (nick {!r})",
@@ -238,10 +253,11 @@ async def send_reaction_as_user(
         # Accumulate full reaction state per (message, user)
         cache_key = (target_msg_id, nick)
         prev_set = set(comp._reactions_by_user.get(cache_key, frozenset()))
-        if is_remove:
-            prev_set.discard(emoji)
-        else:
-            prev_set.add(emoji)
+        for emoji, is_remove in changes:
+            if is_remove:
+                prev_set.discard(emoji)
+            else:
+                prev_set.add(emoji)
         # Update cache with new full set
         comp._reactions_by_user[cache_key] = frozenset(prev_set)
 
@@ -252,11 +268,11 @@ async def send_reaction_as_user(
         )
         reactions_plugin.set_reactions(msg, target_msg_id, prev_set)
         msg.enable("no-store")
-        comp._recent_sent_nicks[(muc_jid, nick)] = None
+        comp._echoes.mark((muc_jid, nick))
         msg.send()
         logger.info(
             "sent reaction {} (full set: {}) to message {} in room {} (from IRC/Discord)",
-            "removal" if is_remove else emoji,
+            ", ".join(f"-{emoji}" if is_remove else emoji for emoji, is_remove in changes),
             prev_set or "empty",
             target_msg_id,
             muc_jid,
@@ -283,7 +299,7 @@ async def send_retraction_as_user(
     """
     escaped_nick = _escape_jid_node(nick)
     user_jid = f"{escaped_nick}@{comp._component_jid}"
-    comp._recent_sent_nicks[(muc_jid, nick)] = None
+    comp._echoes.mark((muc_jid, nick))
     if not await comp._ensure_puppet_joined(muc_jid, user_jid, nick):
         logger.warning(
             "skip retraction: puppet not in MUC {} as {} (nick {!r})",
@@ -305,7 +321,7 @@ async def send_retraction_as_user(
         fb = msg.enable("fallback")
         fb["for"] = "urn:xmpp:message-retract:1"
         msg.enable("store")
-        comp._recent_sent_nicks[(muc_jid, nick)] = None
+        comp._echoes.mark((muc_jid, nick))
         msg.send()
         logger.info("sent retraction for message {} to room {} (from IRC/Discord)", target_msg_id, muc_jid)
     except Exception as exc:
@@ -357,7 +373,7 @@ async def send_correction_as_user(
     """Send message correction (XEP-0308) to MUC via slixmpp's build_correction."""
     escaped_nick = _escape_jid_node(nick)
     user_jid = f"{escaped_nick}@{comp._component_jid}"
-    comp._recent_sent_nicks[(muc_jid, nick)] = None
+    comp._echoes.mark((muc_jid, nick))
     if not await comp._ensure_puppet_joined(muc_jid, user_jid, nick):
         logger.warning(
             "skip correction: puppet not in MUC {} as {} (nick {!r})",
@@ -387,7 +403,7 @@ async def send_correction_as_user(
             msg["id"] = f"bridge-correct-{uuid.uuid4().hex}"
             msg.enable("replace")
             msg["replace"]["id"] = original_xmpp_id
-        comp._recent_sent_nicks[(muc_jid, nick)] = None
+        comp._echoes.mark((muc_jid, nick))
         msg.send()
         logger.debug(
             "sent correction: replace_id={} from={} to={} body_len={}",
@@ -0,0 +1,171 @@
+"""Puppet MUC pre-warm: rejoin recently active puppets when the session starts.
+
+Puppets join a MUC lazily, on their first send, and a join waits for the room
+to reflect our self-presence (up to ``MUC_JOIN_WAIT_S``). After a reconnect or
+restart that wait lands on the first message of every active user.
+
+:class:`OccupancyRecord` remembers which ``(muc_jid, nick)`` pairs sent
+recently (optionally persisted to a JSON file so it survives restarts; the
+file is written off the event loop). :func:`prewarm_puppets` sends their join
+presences on session start with at most ``xmpp_prewarm_concurrency`` joins in
+flight; each join is confirmed by the puppet's self-presence (status 110), and
+a send that arrives mid-join awaits that join instead of issuing another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from bridge.adapters.xmpp.component import XMPPComponent
+
+_DEFAULT_MAX_ENTRIES = 2000
+_DEFAULT_MAX_AGE = 7 * 86400  # don't resurrect puppets idle for over a week
+_SAVE_INTERVAL = 60.0  # seconds between writes of the occupancy file
+
+
+class OccupancyRecord:
+    """Recently active ``(muc_jid, nick)`` pairs, most recent last, bounded by count and age."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        max_age: float = _DEFAULT_MAX_AGE,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._timer = timer
+        self._entries: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._dirty = False
+        self._last_save = timer()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def touch(self, muc_jid: str, nick: str) -> None:
+        """Record that *nick* was active in *muc_jid* now."""
+        key = (muc_jid, nick)
+        self._entries[key] = self._timer()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def discard(self, muc_jid: str, nick: str) -> None:
+        if self._entries.pop((muc_jid, nick), None) is not None:
+            self._dirty = True
+
+    def recent(self) -> list[tuple[str, str]]:
+        """Pairs active within ``max_age``, most recent first."""
+        cutoff = self._timer() - self._max_age
+        return [key for key, seen in reversed(self._entries.items()) if seen >= cutoff]
+
+    def load(self) -> None:
+        """Merge entries from the occupancy file; a missing or unreadable file is ignored."""
+        if self._path is None:
+            return
+        try:
+            rows = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("ignoring unreadable puppet occupancy file {}: {}", self._path, exc)
+            return
+        loaded: list[tuple[float, str, str]] = []
+        for row in rows if isinstance(rows, list) else ():
+            if isinstance(row, list) and len(row) == 3:
+                muc_jid, nick, seen = row
+                if isinstance(muc_jid, str) and isinstance(nick, str) and isinstance(seen, int | float):
+                    loaded.append((float(seen), muc_jid, nick))
+        for seen, muc_jid, nick in sorted(loaded):
+            key = (muc_jid, nick)
+            if self._entries.get(key, 0.0) < seen:
+                self._entries[key] = seen
+                self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        logger.debug("loaded {} puppet occupancy entries from {}", len(loaded), self._path)
+
+    def save(self) -> None:
+        """Write the record to the occupancy file (atomic replace) if it changed. Blocks on file I/O."""
+        if (rows := self._take_rows()) is not None:
+            self._write(rows)
+
+    async def save_async(self) -> None:
+        """:meth:`save`, with the file write in a worker thread so the event loop keeps running."""
+        if (rows := self._take_rows()) is not None:
+            await asyncio.to_thread(self._write, rows)
+
+    async def maybe_save(self) -> None:
+        """:meth:`save_async`, at most once per ``_SAVE_INTERVAL``."""
+        if self._dirty and self._timer() - self._last_save >= _SAVE_INTERVAL:
+            await self.save_async()
+
+    def _take_rows(self) -> list[list[object]] | None:
+        # Snapshot on the loop; the write may then run in a thread while entries change.
+        self._last_save = self._timer()
+        if self._path is None or not self._dirty:
+            return None
+        self._dirty = False
+        return [[muc_jid, nick, seen] for (muc_jid, nick), seen in self._entries.items()]
+
+    def _write(self, rows: list[list[object]]) -> None:
+        if self._path is None:
+            return
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(rows), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            logger.warning("could not write puppet occupancy file {}: {}", self._path, exc)
+            self._dirty = True
+
+
+async def prewarm_puppets(comp: XMPPComponent, pairs: Iterable[tuple[str, str]], *, concurrency: int) -> int:
+    """Send join presences for each ``(muc_jid, nick)`` as its puppet, at most *concurrency* in flight.
+
+    Presences go out without awaiting each room: a puppet counts as joined when
+    its self-presence arrives (see :meth:`XMPPComponent._prewarm_join`), and its
+    slot is freed then or when the join times out. Pending joins are shared with
+    lazy sends, so a send racing the pre-warm awaits the same join rather than
+    issuing a second one. Returns the number of puppets confirmed in their rooms.
+    """
+    from bridge.adapters.xmpp.component import _escape_jid_node
+
+    pairs = list(pairs)
+    if not pairs:
+        return 0
+    started = time.monotonic()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    joins: list[asyncio.Future[bool]] = []
+    already = 0
+    for muc_jid, nick in pairs:
+        user_jid = f"{_escape_jid_node(nick)}@{comp._component_jid}"
+        if (muc_jid, user_jid) in comp._puppets_joined:
+            already += 1
+            continue
+        await slots.acquire()
+        join = comp._prewarm_join(muc_jid, user_jid, nick)
+        join.add_done_callback(lambda _: slots.release())
+        joins.append(asyncio.shield(join))
+    logger.debug("sent {} puppet join presences in {:.3f}s", len(joins), time.monotonic() - started)
+    results = await asyncio.gather(*joins, return_exceptions=True)
+    joined = already + sum(1 for r in results if r is True)
+    logger.info("pre-warmed {}/{} puppet MUC presences in {:.1f}s", joined, len(pairs), time.monotonic() - started)
+    return joined
@@ -26,15 +26,22 @@ _FIELD_SCHEMA: dict[str, tuple[tuple[type, ...], Any]] = {
     "announce_extras": ((bool,), False),
     "identity_cache_ttl_seconds": ((int,), 3600),
     "avatar_cache_ttl_seconds": ((int,), 86400),
+    "enrichment_deadline_ms": ((int,), 200),
     "content_filter_regex": ((list,), []),
     "paste_service_url": ((str,), None),
     "remote_nick_format": ((str,), "<{nick}> "),
     "edit_suffix": ((str,), " (edited)"),
+    "edit_coalesce_window_ms": ((int,), 0),
+    "reaction_aggregate_window_ms": ((int,), 0),
+    "shard_instance": ((str,), None),
+    "shard_members": ((list,), []),
+    "shard_members_file": ((str,), None),
     # IRC
     "irc_puppet_idle_timeout_hours": ((int,), 24),
     "irc_puppet_postfix": ((str,), ""),
     "irc_throttle_limit": ((int,), 10),
     "irc_message_queue": ((int,), 30),
+    "irc_coalesce_window_ms": ((int,), 0),
     "irc_rejoin_delay": ((int, float), 5),
     "irc_auto_rejoin": ((bool,), True),
     "irc_use_sasl": ((bool,), False),
@@ -44,7 +51,14 @@ _FIELD_SCHEMA: dict[str, tuple[tuple[type, ...], Any]] = {
     "irc_relaymsg_clean_nicks": ((bool,), False),
     "irc_tls_verify": ((bool,), True),
     "irc_puppet_ping_interval": ((int,), 120),
+    "irc_puppet_throttle_limit": ((int,), 3),
+    "irc_puppet_global_throttle_limit": ((int,), 10),
+    "irc_puppet_max_connections": ((int,), 0),
+    "irc_puppet_connect_concurrency": ((int,), 4),
+    "irc_puppet_connect_rate": ((int, float), 2.0),
     "irc_puppet_prejoin_commands": ((list,), []),
+    "irc_chathistory_max_pages": ((int,), 10),
+    "irc_chathistory_replay_rate": ((int, float), 5.0),
     # Discord
     "discord_webhook_cache_ttl": ((int,), 86400),
     "discord_max_webhooks_per_channel": ((int,), 15),
@@ -54,6 +68,8 @@ _FIELD_SCHEMA: dict[str, tuple[tuple[type, ...], Any]] = {
     "xmpp_avatar_base_url": ((str,), None),
     "xmpp_avatar_public_url": ((str,), None),
     "xmpp_auto_rejoin": ((bool,), True),
+    "xmpp_prewarm_concurrency": ((int,), 8),
+    "xmpp_puppet_occupancy_file": ((str,), ""),
 }
 
 
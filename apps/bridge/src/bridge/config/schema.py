@@ -82,6 +82,7 @@ class IRCConfig:
     puppet_postfix: str = ""
     throttle_limit: int = 10
     message_queue: int = 30
+    coalesce_window_ms: int = 0
     rejoin_delay: float = 5
     auto_rejoin: bool = True
     use_sasl: bool = False
@@ -91,9 +92,16 @@ class IRCConfig:
     relaymsg_clean_nicks: bool = False
     tls_verify: bool = True
     puppet_ping_interval: int = 120
+    puppet_throttle_limit: int = 3
+    puppet_global_throttle_limit: int = 10
+    puppet_max_connections: int = 0
+    puppet_connect_concurrency: int = 4
+    puppet_connect_rate: float = 2.0
     puppet_prejoin_commands: list[str] = field(default_factory=list)
     chathistory_on_reconnect: bool = True
     chathistory_limit: int = 50
+    chathistory_max_pages: int = 10
+    chathistory_replay_rate: float = 5.0
     history_replay_threshold_seconds: int = 30
 
 
@@ -108,6 +116,10 @@ class XMPPConfig:
     # This makes Dino (and other clients that only accept moderation in MUC) delete locally.
     # Requires bridge component JID to be a MUC moderator.
     promote_retraction_to_moderation: bool = True
+    # Puppet joins in flight when rejoining recently active puppets on session start (0 = off).
+    prewarm_concurrency: int = 8
+    # JSON file recording recently active puppets so pre-warm also covers restarts ("" = memory only).
+    puppet_occupancy_file: str = ""
 
 
 @dataclass
@@ -133,18 +145,26 @@ def _build_irc_config(data: dict[str, Any], env: dict[str, str]) -> IRCConfig:
     kw["puppet_postfix"] = str(data.get("irc_puppet_postfix", ""))
     kw["throttle_limit"] = int(data.get("irc_throttle_limit", 10))
     kw["message_queue"] = int(data.get("irc_message_queue", 30))
+    kw["coalesce_window_ms"] = int(data.get("irc_coalesce_window_ms", 0))
     kw["rejoin_delay"] = float(data.get("irc_rejoin_delay", 5))
     kw["auto_rejoin"] = _coerce_bool(data.get("irc_auto_rejoin"), True)
     kw["use_sasl"] = _coerce_bool(data.get("irc_use_sasl"), False)
     kw["sasl_user"] = str(data.get("irc_sasl_user", ""))
     kw["sasl_password"] = str(data.get("irc_sasl_password", ""))
     kw["puppet_ping_interval"] = int(data.get("irc_puppet_ping_interval", 120))
+    kw["puppet_throttle_limit"] = int(data.get("irc_puppet_throttle_limit", 3))
+    kw["puppet_global_throttle_limit"] = int(data.get("irc_puppet_global_throttle_limit", 10))
+    kw["puppet_max_connections"] = int(data.get("irc_puppet_max_connections", 0))
+    kw["puppet_connect_concurrency"] = int(data.get("irc_puppet_connect_concurrency", 4))
+    kw["puppet_connect_rate"] = float(data.get("irc_puppet_connect_rate", 2.0))
 
     val = data.get("irc_puppet_prejoin_commands")
     kw["puppet_prejoin_commands"] = [str(c) for c in val] if isinstance(val, list) else []
 
     kw["chathistory_on_reconnect"] = _coerce_bool(data.get("irc_chathistory_on_reconnect"), True)
     kw["chathistory_limit"] = int(data.get("irc_chathistory_limit", 50))
+    kw["chathistory_max_pages"] = int(data.get("irc_chathistory_max_pages", 10))
+    kw["chathistory_replay_rate"] = float(data.get("irc_chathistory_replay_rate", 5.0))
     kw["history_replay_threshold_seconds"] = int(data.get("irc_history_replay_threshold_seconds", 30))
 
     # --- env overrides for redact_enabled ---
@@ -182,6 +202,8 @@ def _build_xmpp_config(data: dict[str, Any]) -> XMPPConfig:
         avatar_public_url=public.strip() if isinstance(public, str) and public and public.strip() else None,
         auto_rejoin=_coerce_bool(data.get("xmpp_auto_rejoin"), True),
         promote_retraction_to_moderation=_coerce_bool(data.get("xmpp_promote_retraction_to_moderation"), True),
+        prewarm_concurrency=int(data.get("xmpp_prewarm_concurrency", 8)),
+        puppet_occupancy_file=str(data.get("xmpp_puppet_occupancy_file") or ""),
     )
 
 
@@ -299,6 +321,11 @@ class Config:
     def avatar_cache_ttl_seconds(self) -> int:
         return int(self._data.get("avatar_cache_ttl_seconds", 86400))
 
+    @property
+    def enrichment_deadline_ms(self) -> int:
+        """Max time an inbound event waits for identity/avatar lookups before publishing (0 = cache only)."""
+        return max(0, int(self._data.get("enrichment_deadline_ms", 200)))
+
     @property
     def content_filter_regex(self) -> list[str]:
         val = self._data.get("content_filter_regex")
@@ -330,6 +357,16 @@ class Config:
             return val
         return " (edited)"
 
+    @property
+    def edit_coalesce_window_ms(self) -> int:
+        """Quiet period an edit is held for so a burst of edits relays only the last one (0 = off)."""
+        return max(0, int(self._data.get("edit_coalesce_window_ms", 0)))
+
+    @property
+    def reaction_aggregate_window_ms(self) -> int:
+        """Time a user's reactions on a message are collected before the net change is relayed (0 = off)."""
+        return max(0, int(self._data.get("reaction_aggregate_window_ms", 0)))
+
     # ------------------------------------------------------------------
     # Backward-compatible flat IRC properties (delegate to self.irc)
     # ------------------------------------------------------------------
@@ -350,6 +387,10 @@ class Config:
     def irc_message_queue(self) -> int:
         return self.irc.message_queue
 
+    @property
+    def irc_coalesce_window_ms(self) -> int:
+        return self.irc.coalesce_window_ms
+
     @property
     def irc_rejoin_delay(self) -> float:
         return self.irc.rejoin_delay
@@ -386,6 +427,26 @@ class Config:
     def irc_puppet_ping_interval(self) -> int:
         return self.irc.puppet_ping_interval
 
+    @property
+    def irc_puppet_throttle_limit(self) -> int:
+        return self.irc.puppet_throttle_limit
+
+    @property
+    def irc_puppet_global_throttle_limit(self) -> int:
+        return self.irc.puppet_global_throttle_limit
+
+    @property
+    def irc_puppet_max_connections(self) -> int:
+        return self.irc.puppet_max_connections
+
+    @property
+    def irc_puppet_connect_concurrency(self) -> int:
+        return self.irc.puppet_connect_concurrency
+
+    @property
+    def irc_puppet_connect_rate(self) -> float:
+        return self.irc.puppet_connect_rate
+
     @property
     def irc_puppet_prejoin_commands(self) -> list[str]:
         return self.irc.puppet_prejoin_commands
@@ -398,6 +459,14 @@ class Config:
     def irc_chathistory_limit(self) -> int:
         return self.irc.chathistory_limit
 
+    @property
+    def irc_chathistory_max_pages(self) -> int:
+        return self.irc.chathistory_max_pages
+
+    @property
+    def irc_chathistory_replay_rate(self) -> float:
+        return self.irc.chathistory_replay_rate
+
     @property
     def irc_history_replay_threshold_seconds(self) -> int:
         return self.irc.history_replay_threshold_seconds
@@ -422,5 +491,13 @@ class Config:
     def xmpp_promote_retraction_to_moderation(self) -> bool:
         return self.xmpp.promote_retraction_to_moderation
 
+    @property
+    def xmpp_prewarm_concurrency(self) -> int:
+        return self.xmpp.prewarm_concurrency
+
+    @property
+    def xmpp_puppet_occupancy_file(self) -> str:
+        return self.xmpp.puppet_occupancy_file
+
 
 cfg: Config = Config({})
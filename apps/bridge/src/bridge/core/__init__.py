@@ -11,6 +11,7 @@ from bridge.core.events import (
     MessageDelete,
     MessageDeleteOut,
     MessageIn,
+    MessageMeta,
     MessageOut,
     Part,
     Quit,
@@ -45,6 +46,7 @@ __all__ = [
     "MessageDelete",
     "MessageDeleteOut",
     "MessageIn",
+    "MessageMeta",
     "MessageOut",
     "Part",
     "ProtocolOrigin",
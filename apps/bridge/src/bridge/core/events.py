@@ -3,13 +3,43 @@
 from __future__ import annotations
 
 import functools
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
+if TYPE_CHECKING:
+    from bridge.gateway.router import MappingDiff
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
+class MessageMeta:
+    """Optional message metadata with a known shape (reply quote, spoiler, media, aliases).
+
+    A ``MessageIn`` and the ``MessageOut`` events relayed from it share one
+    instance; the relay copies it (``dataclasses.replace``) only for a target
+    whose values differ, e.g. when the pipeline unwrapped a Discord spoiler.
+    """
+
+    reply_quoted_content: str | None = None  # XEP-0461 / Discord reply quote
+    reply_quoted_author: str | None = None
+    reply_fallback_added: bool = False  # pipeline prepended an IRC reply fallback
+    spoiler: bool = False  # XEP-0382 spoiler (content markers already stripped)
+    spoiler_reason: str | None = None
+    media_width: int | None = None  # XEP-0446 file metadata for attachments
+    media_height: int | None = None
+    xmpp_id_aliases: tuple[str, ...] = ()  # origin-id / stanza-id of an XMPP message
+
+
+NO_META = MessageMeta()  # shared default for events without metadata
+
+
+@dataclass(frozen=True, slots=True)
 class MessageIn:
-    """Inbound message event — protocol-agnostic."""
+    """Inbound message event — protocol-agnostic.
+
+    Immutable; ``raw`` holds protocol-specific extras only and is shared, not
+    copied, with the ``MessageOut`` events relayed from this message.
+    """
 
     origin: str  # "discord" | "irc" | "xmpp"
     channel_id: str
@@ -21,10 +51,11 @@ class MessageIn:
     is_edit: bool = False
     is_action: bool = False
     avatar_url: str | None = None  # For avatar sync
-    raw: dict[str, Any] = field(default_factory=dict)
+    meta: MessageMeta = NO_META
+    raw: Mapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageOut:
     """Outbound message event — to be sent to target protocol(s)."""
 
@@ -37,7 +68,10 @@ class MessageOut:
     reply_to_id: str | None = None
     is_action: bool = False  # True for CTCP ACTION (/me) messages
     avatar_url: str | None = None  # For avatar sync
-    raw: dict[str, Any] = field(default_factory=dict)
+    origin: str = ""  # Protocol the message was relayed from
+    is_edit: bool = False
+    meta: MessageMeta = NO_META
+    raw: Mapping[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -76,9 +110,9 @@ class Quit:
 
 @dataclass
 class ConfigReload:
-    """Config was reloaded (e.g. SIGHUP)."""
+    """Config was reloaded (e.g. SIGHUP). ``mappings`` lists the channel mappings that changed."""
 
-    pass
+    mappings: MappingDiff | None = None
 
 
 @dataclass
@@ -105,6 +139,26 @@ class MessageDeleteOut:
     raw: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class MessageBulkDelete:
+    """Several messages deleted at once (e.g. a Discord purge) — relayed as one batch."""
+
+    origin: str
+    channel_id: str
+    messages: tuple[tuple[str, str, str], ...]  # (message_id, author_id, author_display)
+    raw: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class MessageBulkDeleteOut:
+    """Outbound bulk delete — sent by the target adapter as one rate-budgeted batch."""
+
+    target_origin: str
+    channel_id: str
+    messages: tuple[tuple[str, str, str], ...]  # (message_id, author_id, author_display)
+    raw: dict[str, Any] = field(default_factory=dict)
+
+
 class EventTarget(Protocol):
     """Minimal interface for bus dispatch: accept_event + push_event (AUDIT §1)."""
 
@@ -170,7 +224,8 @@ def message_in(
     is_edit: bool = False,
     is_action: bool = False,
     avatar_url: str | None = None,
-    raw: dict[str, Any] | None = None,
+    meta: MessageMeta = NO_META,
+    raw: Mapping[str, Any] | None = None,
 ) -> MessageIn:
     return MessageIn(
         origin=origin,
@@ -183,6 +238,7 @@ def message_in(
         is_edit=is_edit,
         is_action=is_action,
         avatar_url=avatar_url,
+        meta=meta,
         raw=raw or {},
     )
 
@@ -199,7 +255,10 @@ def message_out(
     reply_to_id: str | None = None,
     is_action: bool = False,
     avatar_url: str | None = None,
-    raw: dict[str, Any] | None = None,
+    origin: str = "",
+    is_edit: bool = False,
+    meta: MessageMeta = NO_META,
+    raw: Mapping[str, Any] | None = None,
 ) -> MessageOut:
     return MessageOut(
         target_origin=target_origin,
@@ -211,6 +270,9 @@ def message_out(
         reply_to_id=reply_to_id,
         is_action=is_action,
         avatar_url=avatar_url,
+        origin=origin,
+        is_edit=is_edit,
+        meta=meta,
         raw=raw or {},
     )
 
@@ -244,8 +306,8 @@ def quit(origin: str, user_id: str, display: str, *, reason: str | None = None)
 
 
 @event("config_reload")
-def config_reload() -> ConfigReload:
-    return ConfigReload()
+def config_reload(mappings: MappingDiff | None = None) -> ConfigReload:
+    return ConfigReload(mappings)
 
 
 @event("message_delete")
@@ -268,6 +330,17 @@ def message_delete(
     )
 
 
+@event("message_bulk_delete")
+def message_bulk_delete(
+    origin: str,
+    channel_id: str,
+    messages: tuple[tuple[str, str, str], ...],
+    *,
+    raw: dict[str, Any] | None = None,
+) -> MessageBulkDelete:
+    return MessageBulkDelete(origin=origin, channel_id=channel_id, messages=messages, raw=raw or {})
+
+
 @dataclass
 class ReactionIn:
     """Reaction was added — relay to other protocols."""
@@ -333,6 +406,15 @@ def message_delete_out(
     )
 
 
+@event("message_bulk_delete_out")
+def message_bulk_delete_out(
+    target_origin: str,
+    channel_id: str,
+    messages: tuple[tuple[str, str, str], ...],
+) -> MessageBulkDeleteOut:
+    return MessageBulkDeleteOut(target_origin=target_origin, channel_id=channel_id, messages=messages)
+
+
 @event("reaction_in")
 def reaction_in(
     origin: str,
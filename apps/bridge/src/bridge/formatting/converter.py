@@ -2,14 +2,31 @@
 
 convert            — convert content from origin protocol format to target format
 strip_formatting   — parse content and return plain text (no formatting markers)
+has_markup         — cheap check whether content could contain any formatting
+
+Most chat lines contain no formatting at all. Such content parses to bare plain
+text, which every emitter returns unchanged, so both conversions short-circuit
+to the input after a single character-class scan instead of an IR round-trip.
 """
 
 from __future__ import annotations
 
+import re
 from collections.abc import Callable
 from typing import Literal
 
-from bridge.formatting.irc_codes import emit_irc_codes, parse_irc_codes
+from bridge.formatting.irc_codes import (
+    BOLD,
+    COLOR,
+    ITALIC,
+    MONOSPACE,
+    RESET,
+    REVERSE,
+    STRIKETHROUGH,
+    UNDERLINE,
+    emit_irc_codes,
+    parse_irc_codes,
+)
 from bridge.formatting.markdown import emit_discord_markdown, parse_discord_markdown
 from bridge.formatting.primitives import FormattedText
 from bridge.formatting.xmpp_styling import emit_xep0393, parse_xep0393
@@ -34,17 +51,35 @@ _EMITTERS: dict[ProtocolName, Callable[[FormattedText], str]] = {
     "xmpp": emit_xep0393,
 }
 
+# Every character that can make an origin's parser produce spans, code blocks, or
+# plain text that differs from its input. Content without any of them converts to itself.
+# Discord: markdown markers, backslash escapes and the parser's escape sentinels
+# (U+E001-U+E006), plus ``|``/``>`` for spoilers and quotes. IRC: control codes.
+# XMPP: XEP-0393 directives (quotes are kept verbatim by the parser).
+_MARKUP_RE: dict[ProtocolName, re.Pattern[str]] = {
+    "discord": re.compile(r"[*_~`|>\\\ue001-\ue006]"),
+    "irc": re.compile(
+        f"[{re.escape(BOLD + COLOR + RESET + MONOSPACE + REVERSE + ITALIC + STRIKETHROUGH + UNDERLINE)}]"
+    ),
+    "xmpp": re.compile(r"[*_~`]"),
+}
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
+def has_markup(content: str, protocol: ProtocolName) -> bool:
+    """Return False when *content* cannot contain any *protocol* formatting (fast path)."""
+    return _MARKUP_RE[protocol].search(content) is not None
+
+
 def convert(content: str, origin: ProtocolName, target: ProtocolName) -> str:
     """Convert *content* from *origin* protocol format to *target* format via IR.
 
     Returns *content* unchanged when *origin* equals *target*.
     """
-    if origin == target:
+    if origin == target or not has_markup(content, origin):
         return content
     parser = _PARSERS[origin]
     emitter = _EMITTERS[target]
@@ -58,6 +93,8 @@ def strip_formatting(content: str, protocol: ProtocolName) -> str:
     Useful for property tests that need to compare semantic content
     independent of formatting markers.
     """
+    if not has_markup(content, protocol):
+        return content
     parser = _PARSERS[protocol]
     ir = parser(content)
     return ir.plain
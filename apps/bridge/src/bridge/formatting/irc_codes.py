@@ -62,6 +62,10 @@ _STYLE_ORDER: list[Style] = [
 # ---------------------------------------------------------------------------
 
 
+# ASCII only: str.isdigit() also accepts e.g. "²", which int() rejects.
+_DIGITS = frozenset("0123456789")
+
+
 def _parse_color_params(content: str, pos: int) -> tuple[int, int | None, int | None]:
     """Parse optional fg[,bg] digits after a \\x03 color code.
 
@@ -72,9 +76,9 @@ def _parse_color_params(content: str, pos: int) -> tuple[int, int | None, int |
     bg: int | None = None
 
     # fg: 1-2 digits
-    if pos < len(content) and content[pos].isdigit():
+    if pos < len(content) and content[pos] in _DIGITS:
         end = pos + 1
-        if end < len(content) and content[end].isdigit():
+        if end < len(content) and content[end] in _DIGITS:
             end += 1
         fg = int(content[pos:end])
         pos = end
@@ -82,9 +86,9 @@ def _parse_color_params(content: str, pos: int) -> tuple[int, int | None, int |
         # bg: comma + 1-2 digits
         if pos < len(content) and content[pos] == ",":
             next_pos = pos + 1
-            if next_pos < len(content) and content[next_pos].isdigit():
+            if next_pos < len(content) and content[next_pos] in _DIGITS:
                 end = next_pos + 1
-                if end < len(content) and content[end].isdigit():
+                if end < len(content) and content[end] in _DIGITS:
                     end += 1
                 bg = int(content[next_pos:end])
                 pos = end
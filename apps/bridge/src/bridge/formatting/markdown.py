@@ -1,16 +1,20 @@
 """Discord markdown parser and emitter using the formatting IR.
 
-parse_discord_markdown  — Discord markdown → FormattedText IR
-emit_discord_markdown   — FormattedText IR → Discord markdown
+parse_discord_markdown    — Discord markdown → FormattedText IR
+emit_discord_markdown     — FormattedText IR → Discord markdown
+resolve_discord_entities  — Discord-only syntax (mentions, emoji, links) → readable text
 """
 
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 
 from bridge.formatting.primitives import (
+    DISCORD_ENTITY_HINT_RE,
     FENCE_RE,
     URL_RE,
+    ZWS_RE,
     CodeBlock,
     FormattedText,
     Span,
@@ -24,6 +28,11 @@ from bridge.formatting.primitives import (
 # ---------------------------------------------------------------------------
 
 _INLINE_PATTERNS: list[tuple[re.Pattern[str], Style]] = [
+    # Underline wrapping bold / italic  __***text***__, __**text**__, __*text*__
+    # (before plain __text__, which would otherwise keep the inner markers)
+    (re.compile(r"__\*\*\*(.+?)\*\*\*__", re.DOTALL), Style.UNDERLINE | Style.BOLD | Style.ITALIC),
+    (re.compile(r"__\*\*(.+?)\*\*__", re.DOTALL), Style.UNDERLINE | Style.BOLD),
+    (re.compile(r"__\*([^*\n]+)\*__"), Style.UNDERLINE | Style.ITALIC),
     # Bold + italic  ***text***
     (re.compile(r"\*\*\*(.+?)\*\*\*", re.DOTALL), Style.BOLD | Style.ITALIC),
     # Bold  **text**
@@ -57,6 +66,25 @@ _ESC_SENTINELS: dict[str, str] = {
 _ESC_RESTORE: dict[str, str] = {v: k[1:] for k, v in _ESC_SENTINELS.items()}
 
 
+# ---------------------------------------------------------------------------
+# Discord entities — syntax other protocols can't render, resolved to text
+# (target-agnostic, so applied by callers rather than by the parser itself)
+# ---------------------------------------------------------------------------
+
+_ENTITY_RULES: list[tuple[re.Pattern[str], str | Callable[[re.Match[str]], str]]] = [
+    (ZWS_RE, ""),  # zero-width spaces from anti-ping logic in other bridges
+    (re.compile(r"^#{1,3} ", re.MULTILINE), ""),  # headers
+    (re.compile(r"^-# ", re.MULTILINE), ""),  # subtext
+    (re.compile(r"<(https?://[^>]+)>"), r"\1"),  # no-embed URL
+    (re.compile(r"\[([^\]]+)\]\((https?://[^\)]+)\)"), lambda m: f"{m.group(1)} ({m.group(2)})"),  # masked link
+    (re.compile(r"<a?:(\w+):\d+>"), r":\1:"),  # custom / animated emoji
+    (re.compile(r"<@!?(\d+)>"), r"@\1"),  # user mention
+    (re.compile(r"<#(\d+)>"), r"#\1"),  # channel mention
+    (re.compile(r"<@&(\d+)>"), r"@\1"),  # role mention
+    (re.compile(r"<t:(\d+)(?::[tTdDfFR])?>"), ""),  # timestamp
+]
+
+
 # ---------------------------------------------------------------------------
 # Fenced code block helpers
 # ---------------------------------------------------------------------------
@@ -123,6 +151,32 @@ def parse_discord_markdown(content: str) -> FormattedText:
     return FormattedText(plain="".join(plain_parts), spans=spans, code_blocks=code_blocks)
 
 
+def resolve_discord_entities(text: str) -> str:
+    """Resolve Discord-only syntax to readable text; fenced code blocks are left alone.
+
+    Mentions become ``@id`` / ``#id``, custom emoji ``:name:``, masked links
+    ``text (url)``; header/subtext prefixes, no-embed brackets, timestamps and
+    zero-width spaces are dropped. Markdown styling is untouched, so the result
+    still goes through :func:`parse_discord_markdown`.
+    """
+    if not DISCORD_ENTITY_HINT_RE.search(text):
+        return text
+    parts: list[str] = []
+    last_end = 0
+    for m in FENCE_RE.finditer(text):
+        parts.append(_resolve_entities(text[last_end : m.start()]))
+        parts.append(m.group(0))
+        last_end = m.end()
+    parts.append(_resolve_entities(text[last_end:]))
+    return "".join(parts)
+
+
+def _resolve_entities(text: str) -> str:
+    for pattern, repl in _ENTITY_RULES:
+        text = pattern.sub(repl, text)
+    return text
+
+
 def _parse_inline(text: str, base_offset: int) -> tuple[str, list[Span]]:
     """Strip inline Discord markdown, returning (plain_text, spans).
 
@@ -2,7 +2,7 @@
 
 This module is the single source of truth for:
 - Style Flag enum and IR dataclasses (Span, CodeBlock, FormattedText)
-- Shared regex patterns (URL_RE, FENCE_RE, ZWS_RE)
+- Shared regex patterns (URL_RE, FENCE_RE, ZWS_RE, DISCORD_ENTITY_HINT_RE)
 - IRC casefold utility for correct nick/channel comparison
 """
 
@@ -76,6 +76,10 @@ FENCE_RE = re.compile(r"```[\s\S]*?```", re.MULTILINE)
 
 ZWS_RE = re.compile(r"\u200B")
 
+# Cheap pre-check for Discord-only entities (mentions, custom emoji, masked links,
+# timestamps, header/subtext, zero-width spaces): each one needs one of these characters.
+DISCORD_ENTITY_HINT_RE = re.compile(r"[<\[#\u200b]")
+
 
 # ---------------------------------------------------------------------------
 # IRC casefold
@@ -2,6 +2,8 @@
 
 Each chunk encodes to at most *max_bytes* bytes in UTF-8, and the
 concatenation of all chunks equals the original text (no content loss).
+Splits prefer the last space in the budget (kept at the end of the chunk)
+so words are not cut, as long as that still fills at least half the budget.
 
 Also provides code-block extraction for paste-service upload.
 """
@@ -53,31 +55,43 @@ def extract_code_blocks(content: str) -> ProcessedContent:
     return ProcessedContent(text=text, blocks=blocks)
 
 
-def split_irc_lines(content: str, max_bytes: int = 450) -> list[str]:
+def split_irc_lines(content: str, max_bytes: int = 450, *, first_max_bytes: int | None = None) -> list[str]:
     """Split on newlines first, then byte-split each line.
 
-    Empty lines are skipped.
+    Empty lines are skipped. *first_max_bytes* (default *max_bytes*) bounds
+    the very first chunk, e.g. when a nick prefix is prepended to it.
     """
-    lines = content.split("\n") or [""]
-    result: list[str] = []
-    for line in lines:
+    groups = split_irc_line_groups(content, max_bytes, first_max_bytes=first_max_bytes)
+    return [chunk for group in groups for chunk in group] or [""]
+
+
+def split_irc_line_groups(content: str, max_bytes: int = 450, *, first_max_bytes: int | None = None) -> list[list[str]]:
+    """Like :func:`split_irc_lines`, but keep the chunks of each source line together.
+
+    Needed for ``draft/multiline`` batches, where only the continuation chunks
+    of one line carry ``draft/multiline-concat``. Returns ``[]`` when every line is blank.
+    """
+    groups: list[list[str]] = []
+    for line in content.split("\n"):
         if not line.strip():
             continue
-        result.extend(split_irc_message(line, max_bytes=max_bytes))
-    return result or [""]
+        first = first_max_bytes if not groups else None
+        groups.append(split_irc_message(line, max_bytes=max_bytes, first_max_bytes=first))
+    return groups
 
 
-def split_irc_message(text: str, max_bytes: int = 450) -> list[str]:
+def split_irc_message(text: str, max_bytes: int = 450, *, first_max_bytes: int | None = None) -> list[str]:
     """Split *text* into chunks where each chunk ≤ *max_bytes* in UTF-8.
 
     The default of 450 leaves room for the IRC protocol overhead:
     ``:nick!user@host PRIVMSG #channel :`` prefix (~80 bytes), IRCv3 tags
     (variable), and the trailing CRLF (2 bytes).  512 is the hard IRC line
     limit, but with tags the effective limit can be higher — 450 is a safe
-    conservative default that works with all servers.
+    conservative default that works with all servers. The IRC adapter passes
+    the exact per-target budget (see ``bridge.adapters.irc.budget``).
 
     Guarantees:
-    - No chunk exceeds *max_bytes* when encoded as UTF-8.
+    - No chunk exceeds *max_bytes* (the first: *first_max_bytes*) when encoded as UTF-8.
     - Multi-byte characters are never split across chunks.
     - ``"".join(split_irc_message(t, n)) == t`` for all inputs.
     """
@@ -85,7 +99,8 @@ def split_irc_message(text: str, max_bytes: int = 450) -> list[str]:
         return []
 
     encoded = text.encode("utf-8")
-    if len(encoded) <= max_bytes:
+    limit = max_bytes if first_max_bytes is None else max(1, first_max_bytes)
+    if len(encoded) <= limit:
         return [text]
 
     chunks: list[str] = []
@@ -93,9 +108,13 @@ def split_irc_message(text: str, max_bytes: int = 450) -> list[str]:
     total = len(encoded)
 
     while pos < total:
-        end = min(pos + max_bytes, total)
+        end = min(pos + limit, total)
 
         if end < total:
+            # Prefer breaking after the last space, unless that wastes over half the budget.
+            space = encoded.rfind(b" ", pos, end)
+            if space >= pos + limit // 2:
+                end = space + 1
             # We might be in the middle of a multi-byte character.
             # UTF-8 continuation bytes have the form 0b10xxxxxx.
             # Back up until we're at a character start boundary.
@@ -126,5 +145,6 @@ def split_irc_message(text: str, max_bytes: int = 450) -> list[str]:
             )
             chunks.append(encoded[pos:end].decode("utf-8", errors="ignore"))
         pos = end
+        limit = max_bytes
 
     return chunks
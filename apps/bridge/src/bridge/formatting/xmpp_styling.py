@@ -3,6 +3,7 @@
 parse_xep0393   — XEP-0393 styled text → FormattedText IR
 emit_xep0393    — FormattedText IR → XEP-0393 styled text
 emit_xep0394    — FormattedText IR → slixmpp Markup stanza
+xep0394_types   — Style flags → XEP-0394 span type names
 
 XEP-0393 is implemented from scratch (slixmpp has no built-in plugin).
 XEP-0394 uses slixmpp's stanza classes, extended with a custom StrongType
@@ -11,18 +12,10 @@ for bold (not present in slixmpp's bundled v0.2 stanzas).
 
 from __future__ import annotations
 
+import functools
 import re
-
-from slixmpp.plugins.xep_0394.stanza import (
-    BlockCode,
-    Markup,
-    _SpanType,
-)
-from slixmpp.plugins.xep_0394.stanza import (
-    Span as XEP0394Span,
-)
-from slixmpp.xmlstream import ET
-from slixmpp.xmlstream.stanzabase import register_stanza_plugin
+from typing import TYPE_CHECKING, Any
+from xml.etree import ElementTree as ET
 
 from bridge.formatting.primitives import (
     URL_RE,
@@ -32,21 +25,36 @@ from bridge.formatting.primitives import (
     Style,
 )
 
+if TYPE_CHECKING:
+    from slixmpp.plugins.xep_0394.stanza import Markup
+
 # ---------------------------------------------------------------------------
 # Custom StrongType for XEP-0394 v0.3.0+ bold support
 # slixmpp's bundled stanzas only have emphasis, code, deleted.
 # ---------------------------------------------------------------------------
 
 
-class StrongType(_SpanType):
-    """XEP-0394 v0.3.0+ ``<strong/>`` element for bold text."""
+@functools.cache
+def _xep0394_stanzas() -> tuple[Any, Any, Any]:
+    """slixmpp's (Markup, Span, BlockCode) stanzas, imported on first use.
+
+    Deferred so the gateway (which only needs XEP-0393) doesn't import slixmpp
+    when the XMPP adapter is not configured.
+    """
+    from slixmpp.plugins.xep_0394.stanza import BlockCode, Markup, _SpanType
+    from slixmpp.plugins.xep_0394.stanza import Span as XEP0394Span
+    from slixmpp.xmlstream.stanzabase import register_stanza_plugin
+
+    class StrongType(_SpanType):
+        """XEP-0394 v0.3.0+ ``<strong/>`` element for bold text."""
 
-    name = "strong"
-    plugin_attrib = "strong"
+        name = "strong"
+        plugin_attrib = "strong"
 
+    # Register so Span.append(StrongType()) works correctly.
+    register_stanza_plugin(XEP0394Span, StrongType)
+    return Markup, XEP0394Span, BlockCode
 
-# Register so Span.append(StrongType()) works correctly.
-register_stanza_plugin(XEP0394Span, StrongType)
 
 # ---------------------------------------------------------------------------
 # XEP-0393 constants and patterns
@@ -286,6 +294,11 @@ _STYLE_TO_XEP0394: dict[Style, str] = {
 }
 
 
+def xep0394_types(style: Style) -> list[str]:
+    """Decompose combined Style flags into XEP-0394 span type names (empty for UNDERLINE only)."""
+    return [type_name for flag, type_name in _STYLE_TO_XEP0394.items() if flag in style]
+
+
 def emit_xep0394(ft: FormattedText) -> Markup:
     """Emit XEP-0394 Message Markup from a *FormattedText* IR.
 
@@ -297,20 +310,16 @@ def emit_xep0394(ft: FormattedText) -> Markup:
         MONOSPACE → ``<code/>``, STRIKETHROUGH → ``<deleted/>``.
         UNDERLINE is dropped (no XEP-0394 equivalent).
     """
-    markup = Markup()
+    markup_cls, span_cls, block_code_cls = _xep0394_stanzas()
+    markup = markup_cls()
 
     for span in ft.spans:
-        # Decompose combined flags into individual XEP-0394 types.
-        types: list[str] = []
-        for flag, type_name in _STYLE_TO_XEP0394.items():
-            if flag in span.style:
-                types.append(type_name)
-
+        types = xep0394_types(span.style)
         if not types:
             # Only UNDERLINE (or empty) — skip.
             continue
 
-        xep_span = XEP0394Span()
+        xep_span = span_cls()
         xep_span["start"] = span.start
         xep_span["end"] = span.end
 
@@ -320,7 +329,7 @@ def emit_xep0394(ft: FormattedText) -> Markup:
         markup.append(xep_span)
 
     for cb in ft.code_blocks:
-        bcode = BlockCode()
+        bcode = block_code_cls()
         bcode["start"] = cb.start
         bcode["end"] = cb.start + len(cb.content) if cb.content else cb.start
         markup.append(bcode)
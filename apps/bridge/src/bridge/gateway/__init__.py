@@ -1,7 +1,8 @@
-"""Gateway: event bus, channel router, relay (AUDIT §1)."""
+"""Gateway: event bus (in-process or across adapter processes), channel router, relay (AUDIT §1)."""
 
 from bridge.gateway.bus import Bus
+from bridge.gateway.ipc import BusHub, IPCBus
 from bridge.gateway.relay import Relay
-from bridge.gateway.router import ChannelRouter
+from bridge.gateway.router import ChannelRouter, MappingDiff
 
-__all__ = ["Bus", "ChannelRouter", "Relay"]
+__all__ = ["Bus", "BusHub", "ChannelRouter", "IPCBus", "MappingDiff", "Relay"]
@@ -0,0 +1,99 @@
+"""Edit coalescing: relay only the final content of a burst of edits.
+
+Fixing a typo three times in ten seconds makes three ``MessageIn(is_edit=True)``.
+Relayed one by one, IRC gets three new lines (each with ``edit_suffix``, each
+spending throttle tokens), XMPP three corrections and Discord three webhook
+edits. :class:`EditCoalescer` holds edits per message until none has arrived for
+``cfg.edit_coalesce_window_ms`` and then delivers only the latest, so every
+target gets a single send. A delete of a message with a held edit drops the edit;
+only the delete goes out. A message edited without pause is still flushed after
+``_MAX_HOLD_WINDOWS`` windows.
+
+``edit_coalesce_window_ms: 0`` (the default) relays every edit as it arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from loguru import logger
+
+from bridge.events import MessageBulkDelete, MessageDelete, MessageIn
+from bridge.gateway.holding import TimedHold
+
+# Upper bound on how long an edit is held, in quiescence windows.
+_MAX_HOLD_WINDOWS = 4
+
+EditKey = tuple[str, str, str]  # (origin, channel_id, id of the edited message)
+
+
+def edit_key(evt: MessageIn | MessageDelete) -> EditKey:
+    """Key of the message an edit or delete refers to (XMPP corrections carry it as ``replace_id``)."""
+    return (evt.origin, evt.channel_id, str(evt.raw.get("replace_id") or evt.message_id))
+
+
+@dataclass(slots=True)
+class _Held:
+    evt: MessageIn
+    targets: int
+    deadline: float
+    timer: asyncio.TimerHandle
+
+
+class EditCoalescer(TimedHold[EditKey, MessageIn, _Held]):
+    """Per-message holding area for edits; *deliver* receives the latest edit once edits go quiet."""
+
+    window_setting = "edit_coalesce_window_ms"
+    label = "edit coalescing"
+
+    def __init__(self, deliver: Callable[[MessageIn], None], *, window: float | None = None) -> None:
+        super().__init__(deliver, window=window)
+        self.superseded = 0
+        self.dropped_by_delete = 0
+
+    def offer(self, evt: MessageIn, *, targets: int) -> bool:
+        loop = self._loop()
+        if loop is None:
+            return False
+        window = self.window
+        key = edit_key(evt)
+        now = loop.time()
+        held = self._held.get(key)
+        if held is None:
+            deadline = now + window * _MAX_HOLD_WINDOWS
+        else:
+            held.timer.cancel()
+            deadline = held.deadline
+            self.superseded += 1
+            self.sends_saved += held.targets
+            logger.debug("edit {} superseded by a newer edit; {} sends saved", key[2], held.targets)
+        timer = loop.call_at(min(now + window, deadline), self._flush, key)
+        self._held[key] = _Held(evt, targets, deadline, timer)
+        return True
+
+    def discard(self, evt: MessageDelete | MessageBulkDelete) -> int:
+        """Drop held edits of the messages *evt* deletes. Returns how many were held."""
+        if isinstance(evt, MessageBulkDelete):
+            keys = [(evt.origin, evt.channel_id, message_id) for message_id, _, _ in evt.messages]
+        else:
+            keys = [edit_key(evt)]
+        dropped = 0
+        for key in keys:
+            held = self._held.pop(key, None)
+            if held is None:
+                continue
+            held.timer.cancel()
+            dropped += 1
+            self.dropped_by_delete += 1
+            self.sends_saved += held.targets
+            logger.debug("held edit {} dropped: message deleted; {} sends saved", key[2], held.targets)
+        return dropped
+
+    def _release(self, key: EditKey, held: _Held) -> None:
+        self.delivered += 1
+        self._deliver(held.evt)
+
+    def counters(self) -> dict[str, int]:
+        return {"superseded": self.superseded, "dropped_by_delete": self.dropped_by_delete}
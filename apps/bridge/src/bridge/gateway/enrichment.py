@@ -0,0 +1,106 @@
+"""Deadline-bounded enrichment for inbound events (identity, avatar).
+
+Inbound handlers used to await Portal / Prosody lookups before publishing, so a
+slow external service delayed every message. :class:`Enricher` bounds that wait:
+
+- one lookup per key is started (or joined) and awaited for at most
+  ``cfg.enrichment_deadline_ms``;
+- a lookup that misses the deadline keeps running, so the resolver's own cache is
+  warm for the next message from the same user.
+
+Caching and expiry stay with the resolvers (``PortalIdentityResolver``,
+``bridge.avatar``); the enricher holds no values, so an invalidation or a newly
+linked account there is seen on the next event. Enrichers are per owner via
+:func:`enricher_for`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from bridge.config import cfg
+
+T = TypeVar("T")
+
+
+class Enricher:
+    """Lookups bounded by a per-event deadline; late ones finish in the background."""
+
+    def __init__(self, *, deadline: float | None = None) -> None:
+        # None → read from cfg on each call so SIGHUP reloads apply.
+        self._deadline = deadline
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.lookups = 0
+        self.deadline_misses = 0
+        self.background_fills = 0
+
+    @property
+    def deadline(self) -> float:
+        """Deadline in seconds for one lookup."""
+        if self._deadline is not None:
+            return self._deadline
+        return cfg.enrichment_deadline_ms / 1000
+
+    def _on_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.debug("enrichment lookup failed for {}: {}", key, exc)
+
+    def _count_background_fill(self, task: asyncio.Task[Any]) -> None:
+        if not task.cancelled() and task.exception() is None:
+            self.background_fills += 1
+
+    async def resolve(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T | None:
+        """Return the value for *key* if *fetch* finishes within the deadline, else None.
+
+        With a zero deadline the lookup gets one pass of the event loop, which is
+        enough for a resolver cache hit but never waits on the network. Lookup
+        errors are logged at DEBUG and yield None (callers fall back to
+        protocol-native display names / no avatar, as before).
+        """
+        self.lookups += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        deadline = self.deadline
+        try:
+            if deadline <= 0:
+                await asyncio.sleep(0)
+                if not task.done():
+                    raise TimeoutError
+                return task.result()
+            return await asyncio.wait_for(asyncio.shield(task), timeout=deadline)
+        except TimeoutError:
+            self.deadline_misses += 1
+            task.add_done_callback(self._count_background_fill)
+            logger.debug("enrichment deadline ({:.0f}ms) missed for {}; finishing in background", deadline * 1000, key)
+            return None
+        except Exception:
+            return None
+
+    def stats(self) -> dict[str, int]:
+        """Counters for logs / debugging."""
+        return {
+            "lookups": self.lookups,
+            "deadline_misses": self.deadline_misses,
+            "background_fills": self.background_fills,
+            "inflight": len(self._inflight),
+        }
+
+
+_enrichers: weakref.WeakKeyDictionary[Any, Enricher] = weakref.WeakKeyDictionary()
+
+
+def enricher_for(owner: object) -> Enricher:
+    """Return the :class:`Enricher` bound to *owner* (created on first use)."""
+    enricher = _enrichers.get(owner)
+    if enricher is None:
+        enricher = _enrichers[owner] = Enricher()
+    return enricher
@@ -0,0 +1,98 @@
+"""Keyed holding area shared by the relay's edit coalescer and reaction aggregator.
+
+Both hold events under a key for a window read from config, deliver what is
+left when a loop timer fires, flush everything on shutdown and count the sends
+they saved. :class:`TimedHold` owns that bookkeeping; subclasses decide what an
+entry holds (:meth:`offer`) and what is delivered when it expires (:meth:`_release`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
+from typing import ClassVar, Generic, Protocol, TypeVar
+
+from loguru import logger
+
+from bridge.config import cfg
+
+
+class _Timed(Protocol):
+    timer: asyncio.TimerHandle
+
+
+K = TypeVar("K", bound=Hashable)
+E = TypeVar("E")
+H = TypeVar("H", bound=_Timed)
+
+
+class TimedHold(ABC, Generic[K, E, H]):
+    """Per-key entries (*H*, each with a loop timer) that deliver events of type *E* to *deliver* on expiry."""
+
+    # Config key of the window in milliseconds, and the name used in logs.
+    window_setting: ClassVar[str]
+    label: ClassVar[str]
+
+    def __init__(self, deliver: Callable[[E], None], *, window: float | None = None) -> None:
+        # None → read from cfg on each offer so SIGHUP reloads apply.
+        self._deliver = deliver
+        self._window = window
+        self._held: dict[K, H] = {}
+        self.delivered = 0
+        self.sends_saved = 0
+
+    @property
+    def window(self) -> float:
+        """Holding window in seconds (0 = off)."""
+        if self._window is not None:
+            return self._window
+        return getattr(cfg, self.window_setting) / 1000
+
+    def _loop(self) -> asyncio.AbstractEventLoop | None:
+        """Running loop to schedule expiry on, or None when the caller should relay now.
+
+        That is when holding is off or there is no running event loop to flush later.
+        """
+        if self.window <= 0:
+            return None
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    @abstractmethod
+    def offer(self, evt: E, *, targets: int) -> bool:
+        """Hold *evt*, which fans out to *targets* protocols; False means relay it now."""
+
+    @abstractmethod
+    def _release(self, key: K, held: H) -> None:
+        """Deliver what *held* still carries; it has already left the holding area."""
+
+    def flush(self) -> None:
+        """Deliver every held entry now (shutdown, tests) and log the counters."""
+        for key in list(self._held):
+            self._flush(key)
+        if self.delivered or self.sends_saved:
+            logger.info("{}: {}", self.label, self.stats())
+
+    def _flush(self, key: K) -> None:
+        held = self._held.pop(key, None)
+        if held is None:
+            return
+        held.timer.cancel()
+        self._release(key, held)
+        logger.debug("{}: {} delivered; {}", self.label, key, self.stats())
+
+    def counters(self) -> dict[str, int]:
+        """Subclass-specific counters, merged into :meth:`stats`."""
+        return {}
+
+    def stats(self) -> dict[str, int]:
+        """Counters for logs / debugging."""
+        return {
+            "delivered": self.delivered,
+            **self.counters(),
+            "sends_saved": self.sends_saved,
+            "held": len(self._held),
+        }
@@ -0,0 +1,432 @@
+"""Multi-process event bus (``--processes``): adapters in child processes, relay in the parent.
+
+The parent runs a :class:`BusHub` and each adapter process an :class:`IPCBus`,
+connected over a Unix socket. Both are :class:`Bus` subclasses, so adapters and
+the relay register and publish exactly as they do in one process: an event is
+dispatched to the local targets and sent to the processes that consume it,
+where it is dispatched to theirs. Events with a ``target_origin`` (relay output)
+go only to that protocol's process; inbound events stay with the hub's relay;
+:class:`ResolverCall` replays are forwarded from one adapter process to all the
+others as received (no re-encoding).
+
+Wire format: 4-byte big-endian length, then one event: a type tag, the source,
+and the dataclass fields in declaration order, each a one-byte value tag plus
+a varint length or fixed-width number. Only the types in ``_EVENT_TYPES`` cross
+processes; others (``ConfigReload``, which each process raises on its own
+SIGHUP) stay local.
+
+Writes never wait for the reader: a process that stops reading only grows its
+own socket buffer, and above ``MAX_PENDING_BYTES`` events for it are dropped
+(logged) instead of stalling the sender.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import struct
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from bridge.core.events import (
+    NO_META,
+    Join,
+    MessageBulkDelete,
+    MessageBulkDeleteOut,
+    MessageDelete,
+    MessageDeleteOut,
+    MessageIn,
+    MessageMeta,
+    MessageOut,
+    Part,
+    Quit,
+    ReactionIn,
+    ReactionOut,
+    TypingIn,
+    TypingOut,
+)
+from bridge.gateway.bus import Bus
+
+__all__ = ["MAX_PENDING_BYTES", "BusHub", "IPCBus", "ResolverCall", "decode_event", "encode_event"]
+
+MAX_PENDING_BYTES = 16 * 1024 * 1024  # per peer; beyond this its events are dropped
+
+_LENGTH = struct.Struct(">I")
+_I64 = struct.Struct(">q")
+_F64 = struct.Struct(">d")
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _LIST, _TUPLE, _DICT, _META, _NO_META = range(12)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolverCall:
+    """A message-ID resolver write made in another process, to be applied to this process's trackers."""
+
+    method: str
+    args: tuple[Any, ...]
+
+
+_EVENT_TYPES: tuple[type, ...] = (
+    MessageIn,
+    MessageOut,
+    MessageDelete,
+    MessageDeleteOut,
+    ReactionIn,
+    ReactionOut,
+    TypingIn,
+    TypingOut,
+    Join,
+    Part,
+    Quit,
+    ResolverCall,
+    MessageBulkDelete,
+    MessageBulkDeleteOut,
+)
+_TYPE_TAGS = {cls: tag for tag, cls in enumerate(_EVENT_TYPES)}
+_FIELDS = {cls: tuple(f.name for f in dataclasses.fields(cls)) for cls in (*_EVENT_TYPES, MessageMeta)}
+
+
+# -- encoding -------------------------------------------------------------------
+
+
+def _write_uvarint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif type(value) is str:
+        data = value.encode()
+        out.append(_STR)
+        _write_uvarint(out, len(data))
+        out += data
+    elif type(value) is int:
+        out.append(_INT)
+        try:
+            out += _I64.pack(value)
+        except struct.error:
+            raise TypeError(f"int out of range: {value}") from None
+    elif type(value) is float:
+        out.append(_FLOAT)
+        out += _F64.pack(value)
+    elif value is NO_META:
+        out.append(_NO_META)
+    elif isinstance(value, MessageMeta):
+        out.append(_META)
+        for name in _FIELDS[MessageMeta]:
+            _write(out, getattr(value, name))
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST if isinstance(value, list) else _TUPLE)
+        _write_uvarint(out, len(value))
+        for item in value:
+            _write(out, item)
+    elif isinstance(value, Mapping):
+        out.append(_DICT)
+        _write_uvarint(out, len(value))
+        for key, item in value.items():
+            _write(out, key)
+            _write(out, item)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_BYTES)
+        _write_uvarint(out, len(value))
+        out += value
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def encode_event(source: str, evt: object) -> bytes | None:
+    """Binary encoding of *evt* published by *source*; None for types that stay in-process.
+
+    Raises TypeError when a field (typically ``raw``) holds a value with no encoding.
+    """
+    tag = _TYPE_TAGS.get(type(evt))
+    if tag is None:
+        return None
+    out = bytearray((tag,))
+    _write(out, source)
+    for name in _FIELDS[type(evt)]:
+        value = getattr(evt, name)
+        if type(value) is str and len(value) < 0x80 and value.isascii():  # most fields: short ids and names
+            out.append(_STR)
+            out.append(len(value))
+            out += value.encode()
+        else:
+            _write(out, value)
+    return bytes(out)
+
+
+# -- decoding -------------------------------------------------------------------
+
+
+def _read_uvarint(data: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _read(data: bytes, pos: int) -> tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == _STR:
+        size, pos = _read_uvarint(data, pos)
+        return data[pos : pos + size].decode(), pos + size
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _NO_META:
+        return NO_META, pos
+    if tag == _INT:
+        return _I64.unpack_from(data, pos)[0], pos + 8
+    if tag == _FLOAT:
+        return _F64.unpack_from(data, pos)[0], pos + 8
+    if tag == _META:
+        values = []
+        for _ in _FIELDS[MessageMeta]:
+            value, pos = _read(data, pos)
+            values.append(value)
+        return MessageMeta(*values), pos
+    if tag in (_LIST, _TUPLE):
+        size, pos = _read_uvarint(data, pos)
+        items = []
+        for _ in range(size):
+            item, pos = _read(data, pos)
+            items.append(item)
+        return (items if tag == _LIST else tuple(items)), pos
+    if tag == _DICT:
+        size, pos = _read_uvarint(data, pos)
+        result = {}
+        for _ in range(size):
+            key, pos = _read(data, pos)
+            result[key], pos = _read(data, pos)
+        return result, pos
+    if tag == _BYTES:
+        size, pos = _read_uvarint(data, pos)
+        return data[pos : pos + size], pos + size
+    raise ValueError(f"unknown value tag {tag}")
+
+
+def decode_event(data: bytes) -> tuple[str, object]:
+    """Inverse of :func:`encode_event`: ``(source, event)``. Raises ValueError on malformed input."""
+    try:
+        cls = _EVENT_TYPES[data[0]]
+        source, pos = _read(data, 1)
+        values = []
+        for _ in _FIELDS[cls]:
+            if data[pos] == _STR and data[pos + 1] < 0x80:  # short string, one-byte length
+                end = pos + 2 + data[pos + 1]
+                values.append(data[pos + 2 : end].decode())
+                pos = end
+            else:
+                value, pos = _read(data, pos)
+                values.append(value)
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise ValueError(f"malformed event frame: {exc}") from exc
+    return source, cls(*values)
+
+
+# -- framing ----------------------------------------------------------------------
+
+
+def _frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(_LENGTH.size)
+    return await reader.readexactly(_LENGTH.unpack(header)[0])
+
+
+class _Peer:
+    """Write side of one connection; drops frames while the reader is too far behind."""
+
+    __slots__ = ("congested", "name", "writer")
+
+    def __init__(self, name: str, writer: asyncio.StreamWriter) -> None:
+        self.name = name
+        self.writer = writer
+        self.congested = False
+
+    def send(self, frame: bytes) -> None:
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            if not self.congested:
+                logger.warning("IPC: {} is not reading; dropping events until it catches up", self.name)
+                self.congested = True
+            return
+        if self.congested:
+            logger.info("IPC: {} caught up", self.name)
+            self.congested = False
+        self.writer.write(frame)
+
+
+def _encode_frame(source: str, evt: object) -> bytes | None:
+    try:
+        payload = encode_event(source, evt)
+    except TypeError as exc:
+        logger.warning("IPC: {} from {} not sent to other processes: {}", type(evt).__name__, source, exc)
+        return None
+    return None if payload is None else _frame(payload)
+
+
+# -- buses ------------------------------------------------------------------------
+
+
+class IPCBus(Bus):
+    """Bus for an adapter process: local targets plus the connection to the parent's :class:`BusHub`."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+        self.closed = asyncio.Event()  # set when the hub connection ends
+        self._peer: _Peer | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+
+    async def connect(self, path: str) -> None:
+        """Connect to the hub at *path* and start receiving events."""
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(_frame(self.name.encode()))
+        self._peer = _Peer("hub", writer)
+        self._reader_task = asyncio.create_task(self._receive(reader))
+
+    def publish(self, source: str, evt: object) -> None:
+        """Dispatch to local targets, then send to the other processes (unless it targets this one)."""
+        super().publish(source, evt)
+        if getattr(evt, "target_origin", None) != self.name:
+            self.send(source, evt)
+
+    def send(self, source: str, evt: object) -> None:
+        """Send *evt* to the other processes only."""
+        if self._peer is None:
+            return
+        frame = _encode_frame(source, evt)
+        if frame is not None:
+            self._peer.send(frame)
+
+    def close(self) -> None:
+        """Close the hub connection; ``closed`` is set once it is down."""
+        if self._peer is not None:
+            self._peer.writer.close()
+        if self._reader_task is None:
+            self.closed.set()
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                try:
+                    source, evt = decode_event(payload)
+                except ValueError as exc:
+                    logger.warning("IPC: dropped event from hub: {}", exc)
+                    continue
+                super().publish(source, evt)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            logger.info("IPC: {} disconnected from hub", self.name)
+            self.closed.set()
+
+
+class BusHub(Bus):
+    """Bus for the parent process: local targets (the relay) plus one connection per adapter process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._peers: dict[str, _Peer] = {}
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task[Any]] = set()
+
+    @property
+    def peers(self) -> list[str]:
+        """Names of the connected adapter processes."""
+        return list(self._peers)
+
+    async def start(self, path: str) -> None:
+        """Listen for adapter processes on the Unix socket *path*."""
+        self._server = await asyncio.start_unix_server(self._serve, path)
+
+    async def close(self) -> None:
+        """Stop listening and close every adapter connection."""
+        if self._server is not None:
+            self._server.close()
+        for peer in list(self._peers.values()):
+            peer.writer.close()
+        self._peers.clear()
+        if self._connections:
+            await asyncio.wait(self._connections, timeout=5.0)
+
+    def publish(self, source: str, evt: object) -> None:
+        """Dispatch to local targets, then send to the adapter processes that may want *evt*."""
+        super().publish(source, evt)
+        peers = self._recipients(None, evt)
+        if peers:
+            frame = _encode_frame(source, evt)
+            if frame is not None:
+                for peer in peers:
+                    peer.send(frame)
+
+    def _recipients(self, sender: str | None, evt: object) -> list[_Peer]:
+        target = getattr(evt, "target_origin", None)
+        if target is not None:
+            peer = self._peers.get(target)
+            return [peer] if peer is not None and target != sender else []
+        if isinstance(evt, ResolverCall):  # tracker writes are replayed in every process
+            return [peer for name, peer in self._peers.items() if name != sender]
+        return []  # inbound events are consumed by the relay, which runs in this process
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+            task.add_done_callback(self._connections.discard)
+        try:
+            name = (await _read_frame(reader)).decode()
+        except (asyncio.IncompleteReadError, ConnectionError, UnicodeDecodeError):
+            writer.close()
+            return
+        previous = self._peers.get(name)
+        if previous is not None:  # restarted process reconnecting before the old socket closed
+            previous.writer.close()
+        peer = self._peers[name] = _Peer(name, writer)
+        logger.info("IPC: {} adapter process connected", name)
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                try:
+                    source, evt = decode_event(payload)
+                except ValueError as exc:
+                    logger.warning("IPC: dropped event from {}: {}", name, exc)
+                    continue
+                recipients = self._recipients(name, evt)
+                if recipients:
+                    frame = _frame(payload)
+                    for other in recipients:
+                        other.send(frame)
+                super().publish(source, evt)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._peers.get(name) is peer:
+                del self._peers[name]
+            writer.close()
+            logger.warning("IPC: {} adapter process disconnected", name)
@@ -8,9 +8,11 @@ from cachetools import TTLCache
 from loguru import logger
 
 from bridge.adapters.irc.msgid import MessageIDTracker
+from bridge.gateway.ipc import ResolverCall
 
 if TYPE_CHECKING:
     from bridge.adapters.xmpp.component import XMPPComponent
+    from bridge.gateway.ipc import IPCBus
 
 
 class MessageIDResolver(Protocol):
@@ -165,3 +167,83 @@ class DefaultMessageIDResolver:
         if self._xmpp_component:
             return self._xmpp_component._msgid_tracker.update_discord_id(xmpp_id, discord_id)
         return False
+
+
+# Resolver writes replayed in the other adapter processes (``--processes``)
+_REPLAYED: frozenset[str] = frozenset(
+    {
+        "store_irc",
+        "store_xmpp",
+        "add_xmpp_alias",
+        "add_discord_id_alias",
+        "add_irc_discord_id_alias",
+        "resolve_irc_xmpp_pending",
+    }
+)
+
+
+class RemoteMessageIDResolver(DefaultMessageIDResolver):
+    """Resolver for one adapter process when each adapter runs in its own process.
+
+    The trackers live with their adapters, in different processes. Every write
+    is applied to this process's trackers and sent over the bus as a
+    :class:`ResolverCall`, which the other processes apply to theirs. Lookups
+    this process can't answer from its own tracker fall back to the Discord IDs
+    stored from here (what the Discord adapter needs to resolve edits). There
+    is no XMPP component outside the XMPP process, so ``get_xmpp_component`` is
+    None elsewhere.
+    """
+
+    def __init__(self, bus: IPCBus) -> None:
+        super().__init__()
+        self._bus = bus
+        # (protocol, source id) -> Discord ID, for ids whose tracker is in another process
+        self._stored: TTLCache[tuple[str, str], str] = TTLCache(maxsize=_IRC_XMPP_PENDING_MAXSIZE, ttl=3600)
+        bus.register(self)
+
+    def accept_event(self, source: str, evt: object) -> bool:
+        return isinstance(evt, ResolverCall) and evt.method in _REPLAYED
+
+    def push_event(self, source: str, evt: object) -> None:
+        if isinstance(evt, ResolverCall):
+            getattr(DefaultMessageIDResolver, evt.method)(self, *evt.args)
+
+    def _replay(self, method: str, *args: str) -> None:
+        self._bus.send("resolver", ResolverCall(method, args))
+
+    def get_discord_id(self, source: str, source_id: str) -> str | None:
+        found = super().get_discord_id(source, source_id)
+        return found if found is not None else self._stored.get((source, source_id))
+
+    def store_irc(self, irc_msgid: str, discord_id: str) -> None:
+        super().store_irc(irc_msgid, discord_id)
+        self._stored["irc", irc_msgid] = discord_id
+        self._replay("store_irc", irc_msgid, discord_id)
+
+    def store_xmpp(self, xmpp_id: str, discord_id: str, muc_jid: str) -> None:
+        super().store_xmpp(xmpp_id, discord_id, muc_jid)
+        self._stored["xmpp", xmpp_id] = discord_id
+        self._replay("store_xmpp", xmpp_id, discord_id, muc_jid)
+
+    def add_xmpp_alias(self, alias: str, xmpp_id: str) -> bool:
+        added = super().add_xmpp_alias(alias, xmpp_id)
+        discord_id = self._stored.get(("xmpp", xmpp_id))
+        if discord_id is not None:
+            self._stored["xmpp", alias] = discord_id
+        self._replay("add_xmpp_alias", alias, xmpp_id)
+        return added
+
+    def add_discord_id_alias(self, discord_id: str, irc_msgid: str) -> bool:
+        added = super().add_discord_id_alias(discord_id, irc_msgid)
+        self._replay("add_discord_id_alias", discord_id, irc_msgid)
+        return added
+
+    def add_irc_discord_id_alias(self, new_discord_id: str, existing_value: str) -> bool:
+        added = super().add_irc_discord_id_alias(new_discord_id, existing_value)
+        self._replay("add_irc_discord_id_alias", new_discord_id, existing_value)
+        return added
+
+    def resolve_irc_xmpp_pending(self, irc_msgid: str, discord_id: str) -> bool:
+        resolved = super().resolve_irc_xmpp_pending(irc_msgid, discord_id)
+        self._replay("resolve_irc_xmpp_pending", irc_msgid, discord_id)
+        return resolved
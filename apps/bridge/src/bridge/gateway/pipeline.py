@@ -7,10 +7,12 @@ message content during relay.  The pipeline short-circuits on ``None``
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any, Protocol
 
 from bridge.core.constants import ProtocolOrigin
+from bridge.core.events import NO_META, MessageMeta
 
 # Re-export under the design-document name for convenience.
 ProtocolName = ProtocolOrigin
@@ -22,9 +24,13 @@ class TransformStep(Protocol):
     def __call__(self, content: str, ctx: TransformContext) -> str | None: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class TransformContext:
-    """Carries metadata through the pipeline for each message relay."""
+    """Carries metadata through the pipeline for each message relay.
+
+    ``meta`` and ``raw`` are the inbound event's own (shared, read-only);
+    steps record per-target results in the context's own fields.
+    """
 
     origin: ProtocolName
     target: ProtocolName
@@ -32,7 +38,9 @@ class TransformContext:
     reply_to_id: str | None = None
     spoiler: bool = False
     spoiler_reason: str | None = None
-    raw: dict[str, Any] = field(default_factory=dict)
+    reply_fallback_added: bool = False
+    meta: MessageMeta = NO_META
+    raw: Mapping[str, Any] = field(default_factory=dict)
 
 
 class Pipeline:
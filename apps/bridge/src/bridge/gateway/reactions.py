@@ -0,0 +1,82 @@
+"""Reaction aggregation: relay a burst of reactions as its net change.
+
+Reactions are relayed one at a time: each becomes a ``ReactionOut`` per target,
+an XEP-0444 stanza (carrying the user's full reaction set anyway) on XMPP and a
+TAGMSG on IRC. :class:`ReactionAggregator` collects the reactions of one user on
+one message for ``cfg.reaction_aggregate_window_ms`` after the first, then
+delivers the net change: an add and a remove of the same emoji cancel out, and a
+repeated add or remove is sent once. What remains goes out back to back, so the
+XMPP adapter folds it into a single stanza (see ``XMPPAdapter.push_event``).
+
+``reaction_aggregate_window_ms: 0`` (the default) relays every reaction as it arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from bridge.events import ReactionIn
+from bridge.gateway.holding import TimedHold
+
+ReactionKey = tuple[str, str, str, str]  # (origin, channel_id, message_id, author_id)
+
+
+def reaction_key(evt: ReactionIn) -> ReactionKey:
+    return (evt.origin, evt.channel_id, evt.message_id, evt.author_id)
+
+
+def _is_remove(evt: ReactionIn) -> bool:
+    return bool(evt.raw.get("is_remove", False))
+
+
+@dataclass(slots=True)
+class _Pending:
+    targets: int
+    timer: asyncio.TimerHandle
+    # emoji -> reaction to deliver; dicts keep first-seen order
+    changes: dict[str, ReactionIn] = field(default_factory=dict)
+
+
+class ReactionAggregator(TimedHold[ReactionKey, ReactionIn, _Pending]):
+    """Per (message, user) holding area for reactions; *deliver* receives the net change after the window."""
+
+    window_setting = "reaction_aggregate_window_ms"
+    label = "reaction aggregation"
+
+    def __init__(self, deliver: Callable[[ReactionIn], None], *, window: float | None = None) -> None:
+        super().__init__(deliver, window=window)
+        self.cancelled = 0
+        self.repeated = 0
+
+    def offer(self, evt: ReactionIn, *, targets: int) -> bool:
+        loop = self._loop()
+        if loop is None:
+            return False
+        key = reaction_key(evt)
+        pending = self._held.get(key)
+        if pending is None:
+            pending = self._held[key] = _Pending(targets, loop.call_later(self.window, self._flush, key))
+        held = pending.changes.get(evt.emoji)
+        if held is None:
+            pending.changes[evt.emoji] = evt
+        elif _is_remove(held) != _is_remove(evt):
+            del pending.changes[evt.emoji]
+            self.cancelled += 2
+            self.sends_saved += 2 * pending.targets
+            logger.debug("reaction {} on {} added and removed within the window; not relayed", evt.emoji, key[2])
+        else:
+            self.repeated += 1
+            self.sends_saved += pending.targets
+        return True
+
+    def _release(self, key: ReactionKey, held: _Pending) -> None:
+        for evt in held.changes.values():
+            self.delivered += 1
+            self._deliver(evt)
+
+    def counters(self) -> dict[str, int]:
+        return {"cancelled": self.cancelled, "repeated": self.repeated}
@@ -2,25 +2,32 @@
 
 from __future__ import annotations
 
+import dataclasses
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 
 from loguru import logger
 
 from bridge.config import cfg
+from bridge.core.constants import ORIGINS
 from bridge.events import (
+    MessageBulkDelete,
     MessageDelete,
     MessageIn,
+    MessageMeta,
+    MessageOut,
     ReactionIn,
     TypingIn,
+    message_bulk_delete_out,
     message_delete_out,
-    message_out,
     reaction_out,
     typing_out,
 )
-from bridge.formatting.converter import convert
+from bridge.formatting.converter import convert, strip_formatting
 from bridge.gateway.bus import Bus
+from bridge.gateway.edits import EditCoalescer
 from bridge.gateway.pipeline import Pipeline, TransformContext
+from bridge.gateway.reactions import ReactionAggregator
 from bridge.gateway.router import ChannelMapping, ChannelRouter
 from bridge.gateway.steps import (
     add_reply_fallback,
@@ -47,6 +54,13 @@ def _transform_content(content: str, origin: str, target: str) -> str:
 
 _compiled_filters: list[re.Pattern[str]] = []
 
+# Regex metacharacters: a pattern containing none of these is a plain literal.
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+# Backreferences / conditionals depend on group numbering and cannot be merged.
+_GROUP_DEPENDENT_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# Leading global inline flags, e.g. "(?i)spam"; rewritten to a scoped group when merged.
+_GLOBAL_FLAGS_RE = re.compile(r"\(\?([aiLmsux]+)\)")
+
 
 def _build_content_filters(patterns: list[str]) -> list[re.Pattern[str]]:
     """Pre-compile regex patterns. Invalid patterns are logged and skipped."""
@@ -59,37 +73,146 @@ def _build_content_filters(patterns: list[str]) -> list[re.Pattern[str]]:
     return compiled
 
 
+def _literal_trie_regex(literals: list[str]) -> str:
+    """Build a regex from a character trie of *literals* (shared prefixes matched once)."""
+    trie: dict[str, dict] = {}
+    for word in literals:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            return (body if len(alts) > 1 else "(?:" + body + ")") + "?"
+        return body
+
+    return emit(trie)
+
+
+def _mergeable_source(pat: re.Pattern[str]) -> str | None:
+    """Return *pat* as a self-contained alternation branch, or None if it must run alone."""
+    source = pat.pattern
+    if _GROUP_DEPENDENT_RE.search(source):
+        return None
+    m = _GLOBAL_FLAGS_RE.match(source)
+    if m:
+        if not set(m.group(1)) <= set("ims"):
+            return None
+        return f"(?{m.group(1)}:{source[m.end() :]})"
+    if pat.flags != re.UNICODE:
+        return None
+    return f"(?:{source})"
+
+
+class ContentFilterMatcher:
+    """Single-pass matcher equivalent to ``any(p.search(text) for p in patterns)``.
+
+    Literal patterns are folded into one trie regex; other patterns become
+    branches of a single alternation. Patterns whose meaning depends on group
+    numbering (backreferences) or on global flags that cannot be scoped are
+    kept aside and searched individually. If the merged regex fails to compile
+    (e.g. duplicate named groups) every pattern falls back to individual search.
+    """
+
+    __slots__ = ("_combined", "_fallback", "source")
+
+    def __init__(self, patterns: list[re.Pattern[str]]) -> None:
+        self.source = patterns
+        literals: list[str] = []
+        branches: list[str] = []
+        fallback: list[re.Pattern[str]] = []
+        for pat in patterns:
+            if pat.flags == re.UNICODE and not _REGEX_META.intersection(pat.pattern):
+                literals.append(pat.pattern)
+                continue
+            branch = _mergeable_source(pat)
+            if branch is None:
+                fallback.append(pat)
+            else:
+                branches.append(branch)
+        if literals:
+            branches.insert(0, _literal_trie_regex(literals))
+        self._combined: re.Pattern[str] | None = None
+        if branches:
+            try:
+                self._combined = re.compile("|".join(branches))
+            except re.error:
+                fallback = list(patterns)
+        self._fallback = fallback
+
+    def __bool__(self) -> bool:
+        return bool(self.source)
+
+    def search(self, text: str) -> bool:
+        """Return True if any pattern matches anywhere in *text*."""
+        if self._combined is not None and self._combined.search(text):
+            return True
+        return any(pat.search(text) for pat in self._fallback)
+
+
+_matcher = ContentFilterMatcher([])
+
+
+def _content_matcher() -> ContentFilterMatcher:
+    """Matcher for the current ``_compiled_filters``; rebuilt when the list is replaced."""
+    global _matcher  # noqa: PLW0603
+    matcher = _matcher
+    if matcher.source is not _compiled_filters:
+        matcher = _matcher = ContentFilterMatcher(_compiled_filters)
+    return matcher
+
+
 def rebuild_content_filters() -> None:
     """Rebuild compiled content filters from config. Called on config load/reload."""
     global _compiled_filters  # noqa: PLW0603
     # Atomic under CPython GIL; safe for concurrent reads.
     _compiled_filters = _build_content_filters(cfg.content_filter_regex)
+    _content_matcher()
 
 
 def _content_matches_filter(content: str) -> bool:
     """Return True if content matches any pre-compiled content_filter_regex pattern."""
-    return any(pat.search(content) for pat in _compiled_filters)
+    return _content_matcher().search(content)
 
 
-def _lazy_content_filter(content: str, ctx: TransformContext) -> str | None:
-    """Content filter step that reads from the module-level ``_compiled_filters``.
+def _message_matches_filter(evt: MessageIn) -> bool:
+    """Content-filter verdict for *evt*; the relay asks once per message, before fan-out.
 
-    Uses module-level state instead of closure-captured patterns so that
-    filters can be rebuilt (e.g. on config reload or in tests) without
-    reconstructing the entire pipeline object.
+    Checks the origin content and its formatting-stripped plain text, so markup
+    (``**sp**am``, IRC color codes) cannot dodge a pattern. Empty content is
+    never filtered (Requirement 4.8).
     """
-    if not content:
-        return content  # empty → pass through unchanged
-    for pat in _compiled_filters:
-        if pat.search(content):
-            logger.debug(
-                "content filter dropped message: {} -> {} (matched {!r})",
-                ctx.origin,
-                ctx.target,
-                pat.pattern[:60] + "..." if len(pat.pattern) > 60 else pat.pattern,
-            )
-            return None  # drop
-    return content
+    matcher = _content_matcher()
+    content = evt.content
+    if not matcher or not content:
+        return False
+    if matcher.search(content):
+        return True
+    plain = strip_formatting(content, evt.origin) if evt.origin in ORIGINS else content
+    return plain != content and matcher.search(plain)
+
+
+def _out_meta(meta: MessageMeta, ctx: TransformContext) -> MessageMeta:
+    """The inbound *meta*, copied only when the pipeline changed a field for this target."""
+    # Propagate the spoiler flag so the XMPP adapter can emit XEP-0382 (pipeline strips || before relay),
+    # and reply_fallback_added so adapters know the quote is already in the body.
+    if (ctx.spoiler, ctx.spoiler_reason, ctx.reply_fallback_added) == (
+        meta.spoiler,
+        meta.spoiler_reason,
+        meta.reply_fallback_added,
+    ):
+        return meta
+    return dataclasses.replace(
+        meta,
+        spoiler=ctx.spoiler,
+        spoiler_reason=ctx.spoiler_reason if ctx.spoiler else None,
+        reply_fallback_added=ctx.reply_fallback_added,
+    )
 
 
 def _build_default_pipeline() -> Pipeline:
@@ -102,7 +225,9 @@ def _build_default_pipeline() -> Pipeline:
     4. wrap_spoiler          — re-apply spoiler in target-protocol syntax
     5. strip_invalid_xml     — remove chars illegal in XML 1.0 (XMPP targets only)
     6. add_reply_fallback    — prepend "> quote | reply" for IRC targets
-    7. content_filter        — drop messages matching configured regex patterns
+
+    Content filtering is not a pipeline step: :func:`_message_matches_filter`
+    runs once per ``MessageIn`` before fan-out.
 
     Order matters: spoiler must be unwrapped before format conversion so the
     converter sees clean text, and re-wrapped after so the target gets the
@@ -117,7 +242,6 @@ def _build_default_pipeline() -> Pipeline:
             wrap_spoiler,
             strip_invalid_xml,
             add_reply_fallback,
-            _lazy_content_filter,
         ]
     )
 
@@ -132,6 +256,13 @@ class Relay:
         self._router = router
         rebuild_content_filters()
         self._pipeline = _build_default_pipeline()
+        self.edits = EditCoalescer(self._push_message)
+        self.reactions = ReactionAggregator(self._emit_reaction)
+
+    def flush(self) -> None:
+        """Deliver the edits and reactions still held (shutdown)."""
+        self.edits.flush()
+        self.reactions.flush()
 
     def _get_mapping_for_origin(
         self, origin: str, channel_id: str, *, fallback_discord: bool = False
@@ -155,13 +286,8 @@ class Relay:
             return self._router.get_mapping_for_xmpp(channel_id)
         return None
 
-    def _emit_targets(
-        self,
-        mapping: ChannelMapping,
-        origin: str,
-        emit_fn: Callable[[str], object],
-    ) -> None:
-        """Call emit_fn(target) for each target protocol that should receive the event."""
+    def _targets(self, mapping: ChannelMapping, origin: str) -> Iterator[str]:
+        """Target protocols of *mapping* that should receive an event from *origin*."""
         for target in self.TARGETS:
             if target == origin:
                 continue
@@ -171,17 +297,30 @@ class Relay:
                 continue
             if target == "discord" and not mapping.discord_channel_id:
                 continue
+            yield target
+
+    def _emit_targets(
+        self,
+        mapping: ChannelMapping,
+        origin: str,
+        emit_fn: Callable[[str], object],
+    ) -> None:
+        """Call emit_fn(target) for each target protocol that should receive the event."""
+        for target in self._targets(mapping, origin):
             evt = emit_fn(target)
             if evt is not None:
                 self._bus.publish("relay", evt)
 
     def accept_event(self, source: str, evt: object) -> bool:
-        return isinstance(evt, (MessageIn, MessageDelete, ReactionIn, TypingIn))
+        return isinstance(evt, (MessageIn, MessageDelete, MessageBulkDelete, ReactionIn, TypingIn))
 
     def push_event(self, source: str, evt: object) -> None:
         if isinstance(evt, MessageDelete):
             self._push_message_delete(evt)
             return
+        if isinstance(evt, MessageBulkDelete):
+            self._push_bulk_delete(evt)
+            return
         if isinstance(evt, ReactionIn):
             self._push_reaction(evt)
             return
@@ -190,7 +329,20 @@ class Relay:
             return
         if not isinstance(evt, MessageIn):
             return
+        if evt.is_edit:
+            self._push_edit(evt)
+            return
+        self._push_message(evt)
+
+    def _push_edit(self, evt: MessageIn) -> None:
+        """Hand an edit to the coalescer; relayed now when coalescing is off."""
+        mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id, fallback_discord=True)
+        targets = sum(1 for _ in self._targets(mapping, evt.origin)) if mapping else 0
+        if not (targets and self.edits.offer(evt, targets=targets)):
+            self._push_message(evt)
 
+    def _push_message(self, evt: MessageIn) -> None:
+        """Run *evt* through the content filter and pipeline and emit a MessageOut per target."""
         mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id, fallback_discord=True)
         if not mapping:
             logger.warning("no mapping for {} channel {}", evt.origin, evt.channel_id)
@@ -198,33 +350,32 @@ class Relay:
 
         channel_id = mapping.discord_channel_id
 
+        if _message_matches_filter(evt):
+            logger.info(
+                "message dropped by content filter: origin={} author={} channel={}",
+                evt.origin,
+                evt.author_id,
+                channel_id,
+            )
+            return
+
         def emit_message(target: str) -> object:
             logger.info("{} -> {} channel={}", evt.origin, target, channel_id)
 
-            # Build TransformContext from event fields
+            # The context and the MessageOut share the event's meta and raw
+            # instead of copying them key by key for every target.
             ctx = TransformContext(
                 origin=evt.origin,
                 target=target,
                 is_edit=evt.is_edit,
                 reply_to_id=evt.reply_to_id,
-                raw={
-                    "reply_quoted_content": evt.raw.get("reply_quoted_content"),
-                    "reply_quoted_author": evt.raw.get("reply_quoted_author"),
-                    "unstyled": evt.raw.get("unstyled"),
-                    "spoiler": evt.raw.get("spoiler"),
-                    "spoiler_reason": evt.raw.get("spoiler_reason"),
-                },
+                meta=evt.meta,
+                raw=evt.raw,
             )
 
             # Run the pipeline
             content = self._pipeline.transform(evt.content, ctx)
             if content is None:
-                logger.info(
-                    "message dropped by content filter: origin={} author={} channel={}",
-                    evt.origin,
-                    evt.author_id,
-                    channel_id,
-                )
                 return None
 
             # Edit suffix: append when target doesn't support native edits
@@ -233,32 +384,7 @@ class Relay:
                 if suffix:
                     content += suffix
 
-            out_raw = {
-                "is_edit": evt.is_edit,
-                "replace_id": evt.raw.get("replace_id"),
-                "origin": evt.origin,
-                "xmpp_id_aliases": evt.raw.get("xmpp_id_aliases", []),
-            }
-            if evt.origin == "xmpp" and evt.raw.get("real_jid"):
-                out_raw["real_jid"] = evt.raw["real_jid"]
-            # Pass through media dimensions for XEP-0446 file metadata
-            if evt.raw.get("media_width"):
-                out_raw["media_width"] = evt.raw["media_width"]
-                out_raw["media_height"] = evt.raw["media_height"]
-            # Propagate reply quoted metadata so XMPP adapter can build XEP-0461 fallback
-            if evt.raw.get("reply_quoted_author"):
-                out_raw["reply_quoted_author"] = evt.raw["reply_quoted_author"]
-            if evt.raw.get("reply_quoted_content"):
-                out_raw["reply_quoted_content"] = evt.raw["reply_quoted_content"]
-            # Propagate reply_fallback_added from pipeline context
-            if ctx.raw.get("reply_fallback_added"):
-                out_raw["reply_fallback_added"] = True
-            # Propagate spoiler flag so XMPP adapter can emit XEP-0382 (pipeline strips || before relay)
-            if ctx.raw.get("spoiler"):
-                out_raw["spoiler"] = True
-                if ctx.raw.get("spoiler_reason"):
-                    out_raw["spoiler_reason"] = ctx.raw["spoiler_reason"]
-            _, out_evt = message_out(
+            out_evt = MessageOut(
                 target_origin=target,
                 channel_id=channel_id,
                 author_id=evt.author_id,
@@ -268,7 +394,10 @@ class Relay:
                 reply_to_id=evt.reply_to_id,
                 is_action=evt.is_action,
                 avatar_url=evt.avatar_url,
-                raw=out_raw,
+                origin=evt.origin,
+                is_edit=evt.is_edit,
+                meta=_out_meta(evt.meta, ctx),
+                raw=evt.raw,
             )
             logger.debug(
                 "emitting MessageOut target={} author={} content={!r}",
@@ -281,6 +410,13 @@ class Relay:
         self._emit_targets(mapping, evt.origin, emit_message)
 
     def _push_reaction(self, evt: ReactionIn) -> None:
+        """Hand a reaction to the aggregator; relayed now when aggregation is off."""
+        mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id)
+        targets = sum(1 for _ in self._targets(mapping, evt.origin)) if mapping else 0
+        if not (targets and self.reactions.offer(evt, targets=targets)):
+            self._emit_reaction(evt)
+
+    def _emit_reaction(self, evt: ReactionIn) -> None:
         """Route ReactionIn to IRC and XMPP."""
         mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id)
         if not mapping:
@@ -316,6 +452,7 @@ class Relay:
 
     def _push_message_delete(self, evt: MessageDelete) -> None:
         """Route MessageDelete to IRC and XMPP for REDACT/retraction."""
+        self.edits.discard(evt)  # an edit still held for this message is moot
         mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id)
         if not mapping:
             logger.debug("no mapping for delete from {} channel {}", evt.origin, evt.channel_id)
@@ -337,3 +474,23 @@ class Relay:
             return out_evt
 
         self._emit_targets(mapping, evt.origin, emit)
+
+    def _push_bulk_delete(self, evt: MessageBulkDelete) -> None:
+        """Route MessageBulkDelete to IRC and XMPP as one batch per target."""
+        self.edits.discard(evt)
+        mapping = self._get_mapping_for_origin(evt.origin, evt.channel_id)
+        if not mapping:
+            logger.debug("no mapping for bulk delete from {} channel {}", evt.origin, evt.channel_id)
+            return
+
+        logger.info("bulk delete {} -> all targets count={}", evt.origin, len(evt.messages))
+
+        def emit(target: str) -> object:
+            _, out_evt = message_bulk_delete_out(
+                target_origin=target,
+                channel_id=mapping.discord_channel_id,
+                messages=evt.messages,
+            )
+            return out_evt
+
+        self._emit_targets(mapping, evt.origin, emit)
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
 from loguru import logger
 
+from bridge.gateway.sharding import shard_from_config
+
 
 @dataclass
 class IrcTarget:
@@ -34,25 +38,65 @@ class ChannelMapping:
     xmpp: XmppTarget | None
 
 
+@dataclass(frozen=True)
+class MappingDiff:
+    """What a mapping reload changed, keyed by Discord channel ID."""
+
+    added: tuple[ChannelMapping, ...] = ()
+    removed: tuple[ChannelMapping, ...] = ()
+    changed: tuple[tuple[ChannelMapping, ChannelMapping], ...] = ()  # (old, new)
+    seconds: float = 0.0  # parse, diff and index swap
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def irc_changes(self) -> tuple[set[tuple[str, str]], set[tuple[str, str]]]:
+        """(server, channel) pairs the affected mappings stopped and started targeting."""
+        return self._endpoint_changes(lambda m: (m.irc.server, m.irc.channel) if m.irc and m.irc.channel else None)
+
+    def xmpp_changes(self) -> tuple[set[str], set[str]]:
+        """MUC JIDs the affected mappings stopped and started targeting."""
+        return self._endpoint_changes(lambda m: m.xmpp.muc_jid if m.xmpp else None)
+
+    def _endpoint_changes(self, key: Callable[[ChannelMapping], Any]) -> tuple[set[Any], set[Any]]:
+        before = {key(m) for m in (*self.removed, *(old for old, _ in self.changed))}
+        after = {key(m) for m in (*self.added, *(new for _, new in self.changed))}
+        before.discard(None)
+        after.discard(None)
+        return before - after, after - before
+
+
+@dataclass(frozen=True)
+class _RouterIndex:
+    mappings: tuple[ChannelMapping, ...] = ()
+    by_discord: dict[str, ChannelMapping] = field(default_factory=dict)
+    by_irc: dict[tuple[str, str], ChannelMapping] = field(default_factory=dict)
+    by_xmpp: dict[str, ChannelMapping] = field(default_factory=dict)
+    duplicates: bool = False  # some key is claimed by more than one mapping
+
+
 class ChannelRouter:
-    """Routes events by channel mapping. Uses config mappings."""
+    """Routes events by channel mapping. Uses config mappings.
+
+    Lookups read one immutable index snapshot; a reload builds the next
+    snapshot from the previous one, touching only the entries of mappings that
+    were added, removed or changed, and swaps it in with a single assignment.
+    """
 
     def __init__(self) -> None:
-        self._mappings: list[ChannelMapping] = []
-        self._by_discord: dict[str, ChannelMapping] = {}
-        self._by_irc: dict[tuple[str, str], ChannelMapping] = {}
-        self._by_xmpp: dict[str, ChannelMapping] = {}
+        self._index = _RouterIndex()
 
-    def load_from_config(self, config: dict[str, Any]) -> None:
-        """Load mappings from config dict (from config.mappings)."""
+    def load_from_config(self, config: dict[str, Any]) -> MappingDiff:
+        """Load mappings from config dict (from config.mappings). Returns what changed.
+
+        With sharding configured (``shard_instance``), only the mappings this
+        instance owns are loaded; see :mod:`bridge.gateway.sharding`.
+        """
+        started = time.perf_counter()
         raw = config.get("mappings")
         if not isinstance(raw, list):
             logger.warning("no mappings list in config; using empty mappings")
-            self._mappings = []
-            self._by_discord = {}
-            self._by_irc = {}
-            self._by_xmpp = {}
-            return
+            raw = []
 
         mappings: list[ChannelMapping] = []
         skipped = 0
@@ -89,58 +133,140 @@ class ChannelRouter:
                     xmpp=xmpp_target,
                 )
             )
-        self._mappings = mappings
-
-        # Build O(1) lookup indexes.
-        # Three separate dicts allow constant-time routing from any protocol's
-        # channel identifier to the shared ChannelMapping, avoiding linear scans
-        # on every message relay.
-        by_discord: dict[str, ChannelMapping] = {}
-        by_irc: dict[tuple[str, str], ChannelMapping] = {}
-        by_xmpp: dict[str, ChannelMapping] = {}
-
-        for m in mappings:
-            if m.discord_channel_id in by_discord:
-                logger.error("Duplicate discord_channel_id: {}", m.discord_channel_id)
-            by_discord[m.discord_channel_id] = m
-
-            if m.irc:
-                key = (m.irc.server, m.irc.channel)
-                if key in by_irc:
-                    logger.warning("Duplicate IRC key: {}", key)
-                by_irc[key] = m
-
-            if m.xmpp:
-                if m.xmpp.muc_jid in by_xmpp:
-                    logger.warning("Duplicate XMPP MUC JID: {}", m.xmpp.muc_jid)
-                by_xmpp[m.xmpp.muc_jid] = m
-
-        self._by_discord = by_discord
-        self._by_irc = by_irc
-        self._by_xmpp = by_xmpp
 
+        shard = shard_from_config(config)
+        if shard is not None:
+            total = len(mappings)
+            mappings = [m for m in mappings if shard.owns(m.discord_channel_id)]
+            logger.info(
+                "shard {}: owns {} of {} mappings ({} instances)",
+                shard.instance,
+                len(mappings),
+                total,
+                len(shard.ring.members),
+            )
+
+        # Diff by Discord channel ID (the last of duplicate IDs wins, as in the index).
+        current = self._index
+        new_by_id = {m.discord_channel_id: m for m in mappings}
+        added: list[ChannelMapping] = []
+        changed: list[tuple[ChannelMapping, ChannelMapping]] = []
+        for dc_id, m in new_by_id.items():
+            old = current.by_discord.get(dc_id)
+            if old is None:
+                added.append(m)
+            elif old != m:
+                changed.append((old, m))
+        removed = [old for dc_id, old in current.by_discord.items() if dc_id not in new_by_id]
+
+        if current.duplicates or len(new_by_id) < len(mappings):
+            self._index = _full_index(mappings)  # duplicates resolve by config order
+        elif added or removed or changed:
+            self._index = _patched_index(current, mappings, removed, changed, added) or _full_index(mappings)
+        elif tuple(mappings) != current.mappings:
+            # Same mappings in another order; the lookup dicts stay valid.
+            self._index = _RouterIndex(tuple(mappings), current.by_discord, current.by_irc, current.by_xmpp)
+
+        diff = MappingDiff(tuple(added), tuple(removed), tuple(changed), time.perf_counter() - started)
         irc_count = sum(1 for m in mappings if m.irc)
         xmpp_count = sum(1 for m in mappings if m.xmpp)
         logger.info(
-            "loaded {} mappings ({} IRC, {} XMPP){}",
+            "loaded {} mappings ({} IRC, {} XMPP){}; {} added, {} removed, {} changed in {:.1f}ms",
             len(mappings),
             irc_count,
             xmpp_count,
             f", skipped {skipped}" if skipped else "",
+            len(added),
+            len(removed),
+            len(changed),
+            diff.seconds * 1000,
         )
+        return diff
 
     def get_mapping_for_discord(self, discord_channel_id: str) -> ChannelMapping | None:
         """Get mapping for a Discord channel ID."""
-        return self._by_discord.get(discord_channel_id)
+        return self._index.by_discord.get(discord_channel_id)
 
     def get_mapping_for_irc(self, server: str, channel: str) -> ChannelMapping | None:
         """Get mapping for an IRC server/channel."""
-        return self._by_irc.get((server, channel))
+        return self._index.by_irc.get((server, channel))
 
     def get_mapping_for_xmpp(self, muc_jid: str) -> ChannelMapping | None:
         """Get mapping for an XMPP MUC JID."""
-        return self._by_xmpp.get(muc_jid)
+        return self._index.by_xmpp.get(muc_jid)
 
     def all_mappings(self) -> list[ChannelMapping]:
         """Return all channel mappings."""
-        return list(self._mappings)
+        return list(self._index.mappings)
+
+
+def _patched_index(
+    current: _RouterIndex,
+    mappings: list[ChannelMapping],
+    removed: list[ChannelMapping],
+    changed: list[tuple[ChannelMapping, ChannelMapping]],
+    added: list[ChannelMapping],
+) -> _RouterIndex | None:
+    """Next index: copies of *current*'s lookup dicts with only the affected entries replaced.
+
+    *current* must have no duplicate keys. Returns None when a new entry collides
+    with an existing key: duplicates are resolved by config order, which only a
+    full rebuild (:func:`_full_index`) sees.
+    """
+    by_discord = dict(current.by_discord)
+    by_irc = dict(current.by_irc)
+    by_xmpp = dict(current.by_xmpp)
+
+    for old in (*removed, *(old for old, _ in changed)):
+        del by_discord[old.discord_channel_id]
+        if old.irc:
+            del by_irc[(old.irc.server, old.irc.channel)]
+        if old.xmpp:
+            del by_xmpp[old.xmpp.muc_jid]
+
+    for m in (*added, *(new for _, new in changed)):
+        by_discord[m.discord_channel_id] = m
+        if m.irc:
+            key = (m.irc.server, m.irc.channel)
+            if key in by_irc:
+                return None
+            by_irc[key] = m
+        if m.xmpp:
+            if m.xmpp.muc_jid in by_xmpp:
+                return None
+            by_xmpp[m.xmpp.muc_jid] = m
+
+    return _RouterIndex(tuple(mappings), by_discord, by_irc, by_xmpp)
+
+
+def _full_index(mappings: list[ChannelMapping]) -> _RouterIndex:
+    """Index built from scratch; with duplicate keys the last mapping in config order wins."""
+    # Build O(1) lookup indexes.
+    # Three separate dicts allow constant-time routing from any protocol's
+    # channel identifier to the shared ChannelMapping, avoiding linear scans
+    # on every message relay.
+    by_discord: dict[str, ChannelMapping] = {}
+    by_irc: dict[tuple[str, str], ChannelMapping] = {}
+    by_xmpp: dict[str, ChannelMapping] = {}
+    duplicates = False
+
+    for m in mappings:
+        if m.discord_channel_id in by_discord:
+            logger.error("Duplicate discord_channel_id: {}", m.discord_channel_id)
+            duplicates = True
+        by_discord[m.discord_channel_id] = m
+
+        if m.irc:
+            key = (m.irc.server, m.irc.channel)
+            if key in by_irc:
+                logger.warning("Duplicate IRC key: {}", key)
+                duplicates = True
+            by_irc[key] = m
+
+        if m.xmpp:
+            if m.xmpp.muc_jid in by_xmpp:
+                logger.warning("Duplicate XMPP MUC JID: {}", m.xmpp.muc_jid)
+                duplicates = True
+            by_xmpp[m.xmpp.muc_jid] = m
+
+    return _RouterIndex(tuple(mappings), by_discord, by_irc, by_xmpp, duplicates)
@@ -0,0 +1,115 @@
+"""Mapping sharding: spread ``mappings`` over several bridge instances (consistent hashing).
+
+Each instance loads the same config and keeps only the mappings it owns: those
+whose ``discord_channel_id`` lands on it in a hash ring of the member instances.
+Every instance computes the same ring, so no coordination is needed beyond
+agreeing on the member list. Adding or removing an instance moves only the
+mappings that hash to it (about 1/N), and a reload (SIGHUP, or a change to the
+members file) applies the move through the router's incremental diff: the
+instance that gains a mapping joins its channels, the one that loses it parts.
+
+Config (flat keys, like the rest of config.yaml):
+
+``shard_instance``
+    This instance's id; ``BRIDGE_SHARD_INSTANCE`` overrides it so several
+    instances can share one config file. Unset: no sharding, all mappings.
+``shard_members``
+    List of instance ids.
+``shard_members_file``
+    Path to a file of instance ids, one per line (``#`` comments); read on
+    every reload and takes precedence over ``shard_members``.
+
+A mapping (Discord channel, IRC channel, MUC) is the unit of ownership, so all
+traffic for a channel goes through one instance and its process-local message-ID
+trackers stay complete.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from bridge.core.errors import BridgeConfigurationError
+
+VNODES = 64  # ring points per instance; more evens out the share per instance
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring: each key belongs to the first instance point at or after its hash."""
+
+    def __init__(self, members: Iterable[str], *, vnodes: int = VNODES) -> None:
+        self.members = tuple(sorted(set(members)))
+        if not self.members:
+            raise ValueError("hash ring needs at least one member")
+        points = sorted((_hash(f"{member}#{i}"), member) for member in self.members for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner(self, key: str) -> str:
+        """Instance that owns *key*."""
+        i = bisect.bisect_left(self._hashes, _hash(key))
+        return self._owners[i % len(self._owners)]
+
+
+@dataclass(frozen=True)
+class Shard:
+    """This instance's share of the mappings."""
+
+    instance: str
+    ring: HashRing
+
+    def owns(self, discord_channel_id: str) -> bool:
+        return self.ring.owner(discord_channel_id) == self.instance
+
+
+def shard_instance(config: Mapping[str, Any]) -> str | None:
+    """This instance's shard id (``BRIDGE_SHARD_INSTANCE``, else ``shard_instance``), or None."""
+    instance = str(os.environ.get("BRIDGE_SHARD_INSTANCE") or config.get("shard_instance") or "").strip()
+    return instance or None
+
+
+def _read_members_file(path: str) -> list[str]:
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except OSError as exc:
+        raise BridgeConfigurationError(
+            f"cannot read shard members file {path}: {exc}",
+            code="shard_members_file",
+            details={"path": path},
+        ) from exc
+    members = []
+    for line in text.splitlines():
+        member = line.split("#", 1)[0].strip()
+        if member:
+            members.append(member)
+    return members
+
+
+def shard_from_config(config: Mapping[str, Any]) -> Shard | None:
+    """The :class:`Shard` described by *config*, or None when sharding is off."""
+    instance = shard_instance(config)
+    if instance is None:
+        return None
+    members_file = config.get("shard_members_file")
+    if members_file:
+        members = _read_members_file(str(members_file))
+    else:
+        raw = config.get("shard_members")
+        members = [str(m) for m in raw] if isinstance(raw, list) else []
+    if not members:
+        logger.warning("shard {}: no shard members configured; owning all mappings", instance)
+        members = [instance]
+    elif instance not in members:
+        logger.warning("shard {}: not in shard members {}; owning no mappings", instance, members)
+    return Shard(instance, HashRing(members))
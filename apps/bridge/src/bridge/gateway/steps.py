@@ -75,7 +75,7 @@ def unwrap_spoiler(content: str, ctx: TransformContext) -> str:
 
     * **Discord** – strips ``||…||`` markers, sets flag.
     * **IRC** – detects fg==bg color regions via :func:`detect_irc_spoilers`.
-    * **XMPP** – checks ``ctx.raw`` for XEP-0382 spoiler element.
+    * **XMPP** – checks ``ctx.meta`` for the XEP-0382 spoiler element.
     """
     if ctx.origin == "discord":
         if _DISCORD_SPOILER_RE.search(content):
@@ -90,11 +90,10 @@ def unwrap_spoiler(content: str, ctx: TransformContext) -> str:
 
     if ctx.origin == "xmpp":
         # XEP-0382: spoiler info lives in the stanza, not inline text.
-        if ctx.raw.get("spoiler") or ctx.raw.get("xep_0382"):
+        if ctx.meta.spoiler or ctx.raw.get("xep_0382"):
             ctx.spoiler = True
-            reason = ctx.raw.get("spoiler_reason")
-            if reason:
-                ctx.spoiler_reason = reason
+            if ctx.meta.spoiler_reason:
+                ctx.spoiler_reason = ctx.meta.spoiler_reason
         return content
 
     return content
@@ -114,8 +113,8 @@ def format_convert(content: str, ctx: TransformContext) -> str:
     as plain text, respecting the sender's intent.
 
     When origin is Discord and target is XMPP, we pass through raw content.
-    The XMPP adapter runs discord_to_xmpp to produce XEP-0393 styled body
-    and XEP-0394 spans (the IR converter only emits XEP-0393 text, not spans).
+    The XMPP adapter runs discord_to_xmpp after its paste upload, which parses
+    once into the IR and emits both the XEP-0393 styled body and XEP-0394 spans.
     """
     if ctx.raw.get("unstyled"):
         return content
@@ -134,7 +133,8 @@ def wrap_spoiler(content: str, ctx: TransformContext) -> str:
 
     * **Discord** – wraps with ``||content||``.
     * **IRC** – wraps with fg==bg color codes (``\\x0301,01content\\x03``).
-    * **XMPP** – sets ``ctx.raw["spoiler"]`` for the adapter to emit XEP-0382.
+    * **XMPP** – content unchanged; the relay carries ``ctx.spoiler`` on the
+      ``MessageOut`` for the adapter to emit XEP-0382.
     """
     if not ctx.spoiler:
         return content
@@ -150,13 +150,7 @@ def wrap_spoiler(content: str, ctx: TransformContext) -> str:
         # to reveal, mimicking Discord's ||spoiler|| behavior.
         return f"{COLOR}01,01{content}{RESET}"
 
-    if ctx.target == "xmpp":
-        # XEP-0382 is a stanza-level element; signal the adapter via ctx.raw.
-        ctx.raw["spoiler"] = True
-        if ctx.spoiler_reason:
-            ctx.raw["spoiler_reason"] = ctx.spoiler_reason
-        return content
-
+    # XMPP: XEP-0382 is a stanza-level element, emitted by the adapter.
     return content
 
 
@@ -169,7 +163,7 @@ def add_reply_fallback(content: str, ctx: TransformContext) -> str:
     """Prepend a reply indicator for IRC targets when reply context exists.
 
     When ``reply_quoted_content`` and optionally ``reply_quoted_author`` are
-    available in ``ctx.raw``, format as ``author: > quoted | reply`` (the
+    available in ``ctx.meta``, format as ``author: > quoted | reply`` (the
     traditional IRC reply style).  Without quoted content, the message is
     returned unchanged (the reply reference is handled by the IRC adapter
     via ``+draft/reply`` tags when available).
@@ -177,7 +171,7 @@ def add_reply_fallback(content: str, ctx: TransformContext) -> str:
     if ctx.target != "irc" or not ctx.reply_to_id:
         return content
 
-    quoted = ctx.raw.get("reply_quoted_content")
+    quoted = ctx.meta.reply_quoted_content
     if not quoted:
         return content
 
@@ -196,8 +190,9 @@ def add_reply_fallback(content: str, ctx: TransformContext) -> str:
         quoted_clean = "> " + quoted_clean
     quoted_line = " ".join(quoted_clean.splitlines())
     reply_part = f"{quoted_line} | {content}"
-    content = f"{ctx.raw['reply_quoted_author']}: {reply_part}" if ctx.raw.get("reply_quoted_author") else reply_part
-    ctx.raw["reply_fallback_added"] = True
+    author = ctx.meta.reply_quoted_author
+    content = f"{author}: {reply_part}" if author else reply_part
+    ctx.reply_fallback_added = True
     return content
 
 
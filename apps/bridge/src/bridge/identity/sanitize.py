@@ -85,7 +85,7 @@ def xmpp_jid_or_plain_to_muc_nick(value: str, *, max_len: int = 23) -> str:
     ``discord_to_xmpp`` returns a bare JID (e.g. ``alice@chat.example``). Using that
     full string as the MUC nick breaks join and echo matching: the server applies
     its own escaping for the resource, so ``mucnick`` may not match what we store
-    in ``_recent_sent_nicks``. We always use the JID's local part, then
+    as an echo marker (``comp._echoes``). We always use the JID's local part, then
     :func:`sanitize_nick`.
     """
     value = str(value).strip()
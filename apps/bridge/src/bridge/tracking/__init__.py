@@ -1,6 +1,8 @@
 """Unified message ID tracking with TTL-based expiry."""
 
 from bridge.tracking.base import BidirectionalTTLMap, TTLEntry
+from bridge.tracking.echo import EchoCorrelator
 from bridge.tracking.message_ids import MessageIDResolver
+from bridge.tracking.pair_index import PairIndexedTTLCache
 
-__all__ = ["BidirectionalTTLMap", "MessageIDResolver", "TTLEntry"]
+__all__ = ["BidirectionalTTLMap", "EchoCorrelator", "MessageIDResolver", "PairIndexedTTLCache", "TTLEntry"]
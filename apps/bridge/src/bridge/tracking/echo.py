@@ -0,0 +1,216 @@
+"""Echo correlation: match the copies the server echoes back to the sends that caused them.
+
+IRC servers echo our PRIVMSG/RELAYMSG (echo-message, labeled-response) and MUCs
+reflect our groupchat messages. :class:`EchoCorrelator` keeps every pending send
+keyed by what identifies its echo — a labeled-response label, or
+target + nick + content digest — so echoes are paired by identity rather than by
+arrival order, and out-of-order or lost echoes cannot shift later pairings.
+
+Non-consumable *markers* (``mark``/``seen``) cover fallbacks that only need to
+know "we sent as this nick here recently" (RELAYMSG without tags, MUCs that hide
+real JIDs).
+
+Capacity follows the observed send rate (``rate * ttl * headroom``, clamped), so
+bursts do not evict live entries the way fixed-size caches did. Evicting a live
+entry counts as an overflow; a claim with nothing pending counts as a mismatch.
+The counters are logged every ``_STATS_LOG_INTERVAL`` seconds while echoes flow.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from loguru import logger
+
+_RATE_WINDOW = 5.0  # seconds per send-rate sample
+_HEADROOM = 2.0
+_OVERFLOW_LOG_INTERVAL = 60.0
+_STATS_LOG_INTERVAL = 300.0
+
+
+def content_digest(text: str) -> bytes:
+    """Short stable digest of a message body for echo keys."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+
+
+class _Pending:
+    __slots__ = ("deadline", "group", "key", "value")
+
+    def __init__(self, key: Hashable, value: Any, group: Hashable | None, deadline: float) -> None:
+        self.key = key
+        self.value = value
+        self.group = group
+        self.deadline = deadline
+
+
+class EchoCorrelator:
+    """Pending sends keyed by echo identity, with send-rate-sized capacity and counters."""
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        name: str = "echo",
+        min_capacity: int = 200,
+        max_capacity: int = 50_000,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._name = name
+        self._min_capacity = min_capacity
+        self._max_capacity = max_capacity
+        self._timer = timer
+        self._seq = itertools.count()
+        # Insertion order == oldest first. OrderedDict so peeking the head after
+        # popping from the front stays O(1) (a plain dict scans the deleted prefix).
+        self._entries: OrderedDict[int, _Pending] = OrderedDict()
+        self._by_key: dict[Hashable, deque[int]] = {}
+        self._by_group: dict[Hashable, deque[int]] = {}
+        self._rate = 0.0  # sends/second
+        self._window_start = timer()
+        self._window_sends = 0
+        self._last_overflow_log = -_OVERFLOW_LOG_INTERVAL
+        self._last_stats_log = self._window_start
+        self.matched = 0
+        self.mismatched = 0
+        self.overflowed = 0
+        self.expired = 0
+
+    @property
+    def capacity(self) -> int:
+        """Current bound on tracked entries, derived from the observed send rate."""
+        wanted = math.ceil(self._rate * self._ttl * _HEADROOM)
+        return max(self._min_capacity, min(self._max_capacity, wanted))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- recording ----------------------------------------------------------
+
+    def expect(self, key: Hashable, value: Any, *, group: Hashable | None = None, ttl: float | None = None) -> None:
+        """Record a send whose echo will be claimed by *key* (or, failing that, *group*)."""
+        now = self._timer()
+        self._observe_send(now)
+        self._add(key, value, group, now + (self._ttl if ttl is None else ttl))
+        self._trim(now)
+
+    def mark(self, key: Hashable, *, ttl: float | None = None) -> None:
+        """Set or refresh a non-consumable marker checked with :meth:`seen`."""
+        now = self._timer()
+        self._observe_send(now)
+        for eid in self._by_key.pop(key, ()):
+            self._entries.pop(eid, None)
+        self._add(key, None, None, now + (self._ttl if ttl is None else ttl))
+        self._trim(now)
+
+    # -- matching -----------------------------------------------------------
+
+    def claim(self, key: Hashable, *, group: Hashable | None = None) -> Any:
+        """Pop the oldest pending value for *key*, else for *group*; None when nothing matches."""
+        now = self._timer()
+        eid = self._live_head(self._by_key, key, now)
+        if eid is None and group is not None:
+            eid = self._live_head(self._by_group, group, now)
+        self._maybe_log_stats(now)
+        if eid is None:
+            self.mismatched += 1
+            return None
+        entry = self._entries[eid]
+        self._remove(eid, entry)
+        self.matched += 1
+        return entry.value
+
+    def seen(self, key: Hashable) -> bool:
+        """True if *key* has a live entry (marker or pending send); does not consume it."""
+        return self._live_head(self._by_key, key, self._timer()) is not None
+
+    def clear(self) -> None:
+        """Drop all pending entries (counters are kept)."""
+        self._entries.clear()
+        self._by_key.clear()
+        self._by_group.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Counters and sizing for logs/diagnostics."""
+        return {
+            "pending": len(self._entries),
+            "capacity": self.capacity,
+            "send_rate": round(self._rate, 2),
+            "matched": self.matched,
+            "mismatched": self.mismatched,
+            "overflowed": self.overflowed,
+            "expired": self.expired,
+        }
+
+    # -- internals ----------------------------------------------------------
+
+    def _maybe_log_stats(self, now: float) -> None:
+        if now - self._last_stats_log >= _STATS_LOG_INTERVAL:
+            self._last_stats_log = now
+            logger.info("{} correlation: {}", self._name, self.stats())
+
+    def _observe_send(self, now: float) -> None:
+        self._window_sends += 1
+        elapsed = now - self._window_start
+        # Bursts raise the estimate immediately; a quiet window halves it.
+        self._rate = max(self._rate, self._window_sends / max(elapsed, 1.0))
+        if elapsed >= _RATE_WINDOW:
+            self._rate = max(self._window_sends / elapsed, self._rate / 2)
+            self._window_start = now
+            self._window_sends = 0
+
+    def _add(self, key: Hashable, value: Any, group: Hashable | None, deadline: float) -> None:
+        eid = next(self._seq)
+        self._entries[eid] = _Pending(key, value, group, deadline)
+        self._by_key.setdefault(key, deque()).append(eid)
+        if group is not None:
+            self._by_group.setdefault(group, deque()).append(eid)
+
+    def _remove(self, eid: int, entry: _Pending) -> None:
+        del self._entries[eid]
+        for index, name in ((self._by_key, entry.key), (self._by_group, entry.group)):
+            ids = index.get(name)
+            if ids is None:
+                continue
+            while ids and ids[0] not in self._entries:
+                ids.popleft()
+            if not ids:
+                del index[name]
+
+    def _live_head(self, index: dict[Hashable, deque[int]], name: Hashable, now: float) -> int | None:
+        while (ids := index.get(name)) is not None:
+            eid = ids[0]
+            entry = self._entries.get(eid)
+            if entry is None:
+                ids.popleft()
+                if not ids:
+                    del index[name]
+                continue
+            if entry.deadline <= now:
+                self.expired += 1
+                self._remove(eid, entry)
+                continue
+            return eid
+        return None
+
+    def _trim(self, now: float) -> None:
+        capacity = self.capacity
+        while self._entries:
+            eid = next(iter(self._entries))
+            entry = self._entries[eid]
+            if entry.deadline <= now:
+                self.expired += 1
+            elif len(self._entries) > capacity:
+                self.overflowed += 1
+                if now - self._last_overflow_log >= _OVERFLOW_LOG_INTERVAL:
+                    self._last_overflow_log = now
+                    logger.warning("{} correlation overflow: evicting live entries ({})", self._name, self.stats())
+            else:
+                break
+            self._remove(eid, entry)
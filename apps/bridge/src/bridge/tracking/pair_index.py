@@ -0,0 +1,99 @@
+"""TTLCache of ``(first, second)`` pairs with per-component secondary indexes.
+
+Used for XMPP puppet presence (``(muc_jid, user_jid)``) and avatar broadcast
+state: "all rooms for this puppet" and "all puppets in this room" become
+O(matches) instead of a scan over every tracked pair.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+from cachetools import TTLCache
+
+A = TypeVar("A", bound=Hashable)
+B = TypeVar("B", bound=Hashable)
+
+
+class PairIndexedTTLCache(TTLCache, Generic[A, B]):
+    """Drop-in ``TTLCache[tuple[A, B], V]`` that also indexes keys by each component.
+
+    The indexes follow every removal path of the underlying cache (``del``,
+    ``pop``, TTL expiry, LRU eviction, ``clear``). An index may briefly reference
+    a pair that has expired but not yet been purged, so lookups re-check
+    membership: TTL semantics are those of :class:`cachetools.TTLCache`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self._by_first: dict[A, set[B]] = {}
+        self._by_second: dict[B, set[A]] = {}
+        super().__init__(maxsize, ttl, timer)
+
+    # -- index maintenance --------------------------------------------------
+
+    def _index_add(self, key: tuple[A, B]) -> None:
+        first, second = key
+        self._by_first.setdefault(first, set()).add(second)
+        self._by_second.setdefault(second, set()).add(first)
+
+    def _index_discard(self, key: tuple[A, B]) -> None:
+        first, second = key
+        seconds = self._by_first.get(first)
+        if seconds is not None:
+            seconds.discard(second)
+            if not seconds:
+                del self._by_first[first]
+        firsts = self._by_second.get(second)
+        if firsts is not None:
+            firsts.discard(first)
+            if not firsts:
+                del self._by_second[second]
+
+    def __setitem__(self, key: tuple[A, B], value: Any) -> None:
+        super().__setitem__(key, value)
+        self._index_add(key)
+
+    def __delitem__(self, key: tuple[A, B]) -> None:
+        try:
+            super().__delitem__(key)
+        finally:
+            self._index_discard(key)
+
+    def expire(self, time: float | None = None) -> list[tuple[tuple[A, B], Any]]:
+        expired = super().expire(time)
+        for key, _value in expired:
+            self._index_discard(key)
+        return expired
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_first.clear()
+        self._by_second.clear()
+
+    # -- indexed queries ----------------------------------------------------
+
+    def keys_with_first(self, first: A) -> list[tuple[A, B]]:
+        """Live keys whose first component is *first* (e.g. puppets in a room)."""
+        return [(first, s) for s in tuple(self._by_first.get(first, ())) if (first, s) in self]
+
+    def keys_with_second(self, second: B) -> list[tuple[A, B]]:
+        """Live keys whose second component is *second* (e.g. rooms for a puppet)."""
+        return [(f, second) for f in tuple(self._by_second.get(second, ())) if (f, second) in self]
+
+    def discard_first(self, first: A) -> int:
+        """Remove every pair with first component *first*. Returns the number removed."""
+        keys = [(first, s) for s in tuple(self._by_first.get(first, ()))]
+        for key in keys:
+            self.pop(key, None)
+            self._index_discard(key)  # pop() skips expired-but-unpurged keys
+        return len(keys)
+
+    def discard_second(self, second: B) -> int:
+        """Remove every pair with second component *second*. Returns the number removed."""
+        keys = [(f, second) for f in tuple(self._by_second.get(second, ()))]
+        for key in keys:
+            self.pop(key, None)
+            self._index_discard(key)  # pop() skips expired-but-unpurged keys
+        return len(keys)
@@ -0,0 +1 @@
+"""Micro-benchmarks for hot paths. Quick enough for the default run; numbers are printed with -s."""
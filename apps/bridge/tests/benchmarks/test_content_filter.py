@@ -0,0 +1,73 @@
+"""Benchmark: 500 content_filter_regex patterns, per-target loop vs combined matcher once per message."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+from bridge.events import message_in
+from bridge.gateway.relay import ContentFilterMatcher, _build_content_filters, _message_matches_filter
+
+pytestmark = pytest.mark.benchmark
+
+_TARGETS = 2  # a Discord message fanned out to IRC and XMPP
+_MESSAGES = 300
+
+
+def _patterns() -> list[str]:
+    literals = [f"badword{i:03d}" for i in range(400)]
+    regexes = [rf"\bspam{i:02d}\w*" for i in range(50)] + [rf"^!cmd{i:02d}\b" for i in range(50)]
+    return literals + regexes
+
+
+def _messages() -> list[str]:
+    return [
+        f"hello world, this is ordinary chat line number {i} with a link https://example.com/{i}"
+        for i in range(_MESSAGES)
+    ]
+
+
+def test_combined_matcher_beats_per_target_loop():
+    compiled = _build_content_filters(_patterns())
+    assert len(compiled) == 500
+    messages = _messages()
+
+    start = time.perf_counter()
+    for content in messages:
+        for _ in range(_TARGETS):
+            any(pat.search(content) for pat in compiled)
+    loop_s = time.perf_counter() - start
+
+    matcher = ContentFilterMatcher(compiled)
+    start = time.perf_counter()
+    for content in messages:
+        matcher.search(content)
+    combined_s = time.perf_counter() - start
+
+    print(
+        f"\n500 patterns x {_MESSAGES} msgs: per-target loop {loop_s * 1e6 / _MESSAGES:.1f}us/msg, "
+        f"combined once {combined_s * 1e6 / _MESSAGES:.1f}us/msg ({loop_s / combined_s:.1f}x)"
+    )
+    assert combined_s < loop_s
+
+
+def test_combined_matcher_agrees_with_loop():
+    compiled = _build_content_filters(_patterns())
+    matcher = ContentFilterMatcher(compiled)
+    samples = [*_messages()[:20], "you badword123!", "spam07 here", "!cmd42 go", "!cmd42x no", "spam"]
+    for content in samples:
+        assert matcher.search(content) == any(pat.search(content) for pat in compiled), content
+
+
+def test_message_verdict_end_to_end():
+    """Full per-message path (plain-text normalization included) stays well under a millisecond."""
+    compiled = _build_content_filters(_patterns())
+    with patch("bridge.gateway.relay._compiled_filters", compiled):
+        start = time.perf_counter()
+        for i, content in enumerate(_messages()):
+            _, evt = message_in("discord", "123", "u1", "User", f"**{content}**", f"m{i}")
+            assert _message_matches_filter(evt) is False
+        elapsed = time.perf_counter() - start
+    print(f"\n_message_matches_filter: {elapsed * 1e6 / _MESSAGES:.1f}us/msg")
+    assert elapsed / _MESSAGES < 1e-3
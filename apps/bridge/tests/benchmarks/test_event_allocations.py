@@ -0,0 +1,117 @@
+"""Benchmark: memory and time per relayed message (MessageIn -> Relay -> MessageOut).
+
+Alternates XMPP messages carrying a reply quote, ID aliases and a real JID with
+Discord attachments carrying media dimensions, and relays each to the two other
+protocols. Reports the bytes and allocation blocks still held per message when
+the inbound event and its outbound copies are kept (as the queues and trackers
+do), the transient peak of one relay, and the cost per message.
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+
+import pytest
+from bridge.events import MessageMeta, message_in
+from bridge.gateway.relay import Relay
+from bridge.gateway.router import ChannelRouter
+from loguru import logger
+
+pytestmark = pytest.mark.benchmark
+
+_MESSAGES = 5000
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.events: list[object] = []
+
+    def publish(self, source: str, evt: object) -> None:
+        self.events.append(evt)
+
+
+def _relay() -> tuple[Relay, _Sink]:
+    router = ChannelRouter()
+    router.load_from_config(
+        {
+            "mappings": [
+                {
+                    "discord_channel_id": "123",
+                    "irc": {"server": "irc.example.com", "channel": "#c", "port": 6667, "tls": False},
+                    "xmpp": {"muc_jid": "c@muc.example.com"},
+                }
+            ]
+        }
+    )
+    sink = _Sink()
+    return Relay(sink, router), sink  # type: ignore[arg-type]
+
+
+def _make(i: int):
+    if i % 2:
+        meta = MessageMeta(
+            reply_quoted_content="earlier", reply_quoted_author="bob", xmpp_id_aliases=(f"x{i}", f"s{i}")
+        )
+        _, evt = message_in(
+            "xmpp", "c@muc.example.com", f"u{i}", "alice", f"hello there {i}", f"x{i}",
+            meta=meta, raw={"real_jid": "alice@example.com"},
+        )  # fmt: skip
+        return evt
+    _, evt = message_in(
+        "discord", "123", f"u{i}", "alice", f"hello there {i}", f"d{i}",
+        meta=MessageMeta(media_width=640, media_height=480),
+    )  # fmt: skip
+    return evt
+
+
+def test_relay_allocations_per_message():
+    relay, sink = _relay()
+    logger.disable("bridge")
+    try:
+        for i in range(200):  # warm caches (router lookups, formatting regexes)
+            relay.push_event("x", _make(i))
+        sink.events.clear()
+        gc.collect()
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            held = []
+            for i in range(_MESSAGES):
+                evt = _make(i)
+                relay.push_event("x", evt)
+                held.append(evt)
+            gc.collect()
+            stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+            retained = sum(s.size_diff for s in stats) / _MESSAGES
+            blocks = sum(s.count_diff for s in stats) / _MESSAGES
+
+            held.clear()
+            sink.events.clear()
+            gc.collect()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            evt = _make(1)
+            for _ in range(2000):
+                relay.push_event("x", evt)
+                sink.events.clear()
+            peak = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+
+        start = time.perf_counter()
+        for i in range(_MESSAGES):
+            relay.push_event("x", _make(i))
+            sink.events.clear()
+        per_msg_us = (time.perf_counter() - start) / _MESSAGES * 1e6
+    finally:
+        logger.enable("bridge")
+
+    print(
+        f"\nrelay: {retained:.0f} bytes and {blocks:.1f} blocks retained/msg, "
+        f"transient peak {peak} bytes, {per_msg_us:.1f}us/msg"
+    )
+    assert retained < 4096
+    assert per_msg_us < 1000
@@ -0,0 +1,81 @@
+"""Benchmark: plain-text fast path in formatting.converter vs the full IR round-trip.
+
+The corpus is a synthetic stand-in for bridged channel traffic: short chat
+lines, links, emoji and mentions, with a minority of messages using each
+protocol's formatting. It reports the share of messages that take the fast
+path per origin and the per-message cost of both paths.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+from bridge.formatting.converter import _EMITTERS, _PARSERS, ProtocolName, convert, has_markup
+
+pytestmark = pytest.mark.benchmark
+
+_MESSAGES = 2000
+_TARGETS: dict[ProtocolName, tuple[ProtocolName, ...]] = {
+    "discord": ("irc",),  # Discord → XMPP passes through to discord_to_xmpp
+    "irc": ("discord", "xmpp"),
+    "xmpp": ("discord", "irc"),
+}
+
+_PLAIN = [
+    "hey all",
+    "anyone tried the new kernel yet?",
+    "lol",
+    "yeah that worked, thanks!",
+    "see https://wiki.archlinux.org/title/Systemd-networkd for the config",
+    "brb 10 min",
+    "@alice did you push the fix?",
+    "it's in /etc/ssh/sshd_config I think",
+    "👍",
+    "does anyone know why my wifi drops after suspend",
+    "good morning :)",
+    "nvm, found it",
+]
+_STYLED: dict[ProtocolName, list[str]] = {
+    "discord": ["run `sudo pacman -Syu` first", "**do not** rm -rf /", "> quoted reply\nagreed", "||spoiler||"],
+    "irc": ["\x02important\x02 notice", "\x0304red\x03 text", "\x1ditalic\x1d aside"],
+    "xmpp": ["*really* slow today", "use `journalctl -b`", "_maybe_ tomorrow"],
+}
+_STYLED_SHARE = 0.15
+
+
+def _corpus(origin: ProtocolName) -> list[str]:
+    rng = random.Random(origin)
+    return [
+        rng.choice(_STYLED[origin]) if rng.random() < _STYLED_SHARE else rng.choice(_PLAIN) for _ in range(_MESSAGES)
+    ]
+
+
+def _full(content: str, origin: ProtocolName, target: ProtocolName) -> str:
+    return _EMITTERS[target](_PARSERS[origin](content))
+
+
+@pytest.mark.parametrize("origin", ["discord", "irc", "xmpp"])
+def test_fast_path_share_and_savings(origin: ProtocolName):
+    corpus = _corpus(origin)
+    targets = _TARGETS[origin]
+    hits = sum(not has_markup(c, origin) for c in corpus)
+
+    start = time.perf_counter()
+    full = [_full(c, origin, t) for c in corpus for t in targets]
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [convert(c, origin, t) for c in corpus for t in targets]
+    fast_s = time.perf_counter() - start
+
+    conversions = len(corpus) * len(targets)
+    print(
+        f"\n{origin}: fast path {hits / len(corpus):.0%} of msgs; "
+        f"IR round-trip {full_s * 1e6 / conversions:.2f}us/conv, with fast path {fast_s * 1e6 / conversions:.2f}us/conv "
+        f"({full_s / fast_s:.1f}x)"
+    )
+    assert fast == full
+    assert hits / len(corpus) > 0.7
+    assert fast_s < full_s
@@ -0,0 +1,59 @@
+"""Benchmark: IPC event encoding (``--processes``) — bytes and time per relayed message.
+
+Encodes the relay's output for a Discord message with media metadata and an
+IRC message carrying its tags, and decodes it again, as the hub and an adapter
+process do for every event. Compared with pickle for size and speed.
+"""
+
+from __future__ import annotations
+
+import pickle
+import time
+
+import pytest
+from bridge.events import MessageMeta, message_in, message_out
+from bridge.gateway.ipc import decode_event, encode_event
+
+pytestmark = pytest.mark.benchmark
+
+_ROUNDS = 20000
+
+
+def _events() -> list[object]:
+    _, from_irc = message_in(
+        "irc", "#linux", "alice!a@host", "alice", "anyone tried the new kernel yet?", "msgid-0001",
+        raw={"tags": {"msgid": "msgid-0001", "time": "2026-01-01T00:00:00.000Z"}, "irc_msgid": "msgid-0001"},
+    )  # fmt: skip
+    _, to_xmpp = message_out(
+        "xmpp", "123456789012345678", "987654321098765432", "bob", "see https://wiki.archlinux.org", "1234567890",
+        origin="discord", avatar_url="https://cdn.discordapp.com/avatars/1/a.png",
+        meta=MessageMeta(media_width=640, media_height=480),
+    )  # fmt: skip
+    return [from_irc, to_xmpp]
+
+
+def test_encode_decode_cost():
+    events = _events()
+    for evt in events:
+        assert decode_event(encode_event("x", evt)) == ("x", evt)
+
+    start = time.perf_counter()
+    for _ in range(_ROUNDS):
+        for evt in events:
+            decode_event(encode_event("x", evt))
+    ours_us = (time.perf_counter() - start) / (_ROUNDS * len(events)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(_ROUNDS):
+        for evt in events:
+            pickle.loads(pickle.dumps(("x", evt), protocol=pickle.HIGHEST_PROTOCOL))
+    pickle_us = (time.perf_counter() - start) / (_ROUNDS * len(events)) * 1e6
+
+    ours_bytes = sum(len(encode_event("x", evt)) for evt in events) / len(events)
+    pickle_bytes = sum(len(pickle.dumps(("x", evt), protocol=pickle.HIGHEST_PROTOCOL)) for evt in events) / len(events)
+    print(
+        f"\nipc codec: {ours_bytes:.0f} bytes/event, {ours_us:.1f}us encode+decode; "
+        f"pickle: {pickle_bytes:.0f} bytes/event, {pickle_us:.1f}us"
+    )
+    assert ours_bytes < pickle_bytes
+    assert ours_us < 200
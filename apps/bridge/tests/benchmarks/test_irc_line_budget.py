@@ -0,0 +1,67 @@
+"""Benchmark: IRC lines per long message, legacy 450-byte split vs exact per-target budget.
+
+The exact budget uses the hostmask from the USERHOST reply requested after registration.
+
+Corpus: paragraphs of the bridge README, joined into long chat-style messages.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pydle
+import pytest
+from bridge.adapters.irc import payload_budget
+from bridge.adapters.irc.budget import observe_userhost
+from bridge.formatting.splitter import split_irc_lines
+
+pytestmark = pytest.mark.benchmark
+
+_README = Path(__file__).resolve().parents[2] / "README.md"
+
+
+def _corpus() -> list[str]:
+    paragraphs = [" ".join(p.split()) for p in _README.read_text(encoding="utf-8").split("\n\n")]
+    paragraphs = [p for p in paragraphs if len(p) > 40 and not p.startswith(("|", "```", "#"))]
+    messages, current = [], ""
+    for paragraph in paragraphs:
+        current = f"{current} {paragraph}".strip()
+        if len(current.encode()) >= 500:
+            messages.append(current)
+            current = ""
+    return messages
+
+
+async def _client(**isupport: str) -> pydle.Client:
+    """A registered client whose hostmask came from the USERHOST reply it asks for on connect."""
+    client = pydle.Client("bridge")
+    client.nickname = "bridge"
+    client._isupport.update(isupport)
+    client._capabilities["message-tags"] = True
+    await observe_userhost(client, SimpleNamespace(command="302", params=["bridge", "bridge=+~bridge@irc.atl.chat"]))
+    return client
+
+
+def _lines(message: str, budget: int) -> int:
+    return len(split_irc_lines(message, max_bytes=budget))
+
+
+@pytest.mark.asyncio
+async def test_exact_budget_lines_per_message():
+    messages = _corpus()
+    assert len(messages) >= 5
+    budget_512 = payload_budget(await _client(), "#general", "someuser/d", command="RELAYMSG")
+    budget_1024 = payload_budget(await _client(LINELEN="1024"), "#general", "someuser/d", command="RELAYMSG")
+    legacy = [_lines(m, 450) for m in messages]
+    exact = [_lines(m, budget_512) for m in messages]
+
+    n = len(messages)
+    print(
+        f"\n{n} msgs: legacy {sum(legacy) / n:.2f} lines/msg, exact {sum(exact) / n:.2f} "
+        f"(budget {budget_512} bytes, LINELEN=1024 capped to {budget_1024})"
+    )
+    # With the observed hostmask no message takes more lines than the old fixed 450-byte cut...
+    assert all(e <= old for e, old in zip(exact, legacy, strict=True))
+    # ...and a LINELEN above what pydle can construct does not plan oversized lines.
+    assert budget_1024 == budget_512
@@ -0,0 +1,80 @@
+"""Benchmark: dev vs production logging profile on a per-message INFO line."""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import pytest
+from bridge.__main__ import _add_log_sink, _patcher_add_prefix
+from loguru import logger
+
+pytestmark = pytest.mark.benchmark
+
+_RECORDS = 5000
+
+
+@pytest.fixture
+def isolated_logger():
+    """Remove loguru handlers for the benchmark; restore a default stderr sink afterwards."""
+    logger.remove()
+    logger.configure(patcher=_patcher_add_prefix)
+    yield logger
+    logger.remove()
+    logger.configure(patcher=None)
+    logger.add(sys.stderr)
+
+
+def _emit_per_message_lines(n: int) -> float:
+    """Log n relay-style INFO lines from a single call site; return caller-side seconds."""
+    start = time.perf_counter()
+    for i in range(n):
+        logger.info("{} -> {} channel={} content={{braces}}", "discord", "irc", f"#chan{i % 4}")
+    return time.perf_counter() - start
+
+
+def _run_profile(profile: str, path) -> tuple[float, float, int]:
+    """Caller-side and drained seconds for _RECORDS lines through *profile*'s sink, and lines written."""
+    handler_id = _add_log_sink(str(path), "INFO", profile)
+    start = time.perf_counter()
+    caller_s = _emit_per_message_lines(_RECORDS)
+    logger.remove(handler_id)  # drains the writer thread before we count lines
+    drained_s = time.perf_counter() - start
+    with open(path, encoding="utf-8") as f:
+        written = sum(1 for _ in f)
+    return caller_s, drained_s, written
+
+
+def test_sink_cost_per_call(isolated_logger, tmp_path, monkeypatch):
+    """Cost of the sink alone: sampling off, so both profiles write every line.
+
+    Production must cost the caller less per line than dev: serialization and
+    writes happen on the writer thread. Best of three rounds, to damp noise.
+    """
+    monkeypatch.setenv("LOG_SAMPLE_RATE", "0")
+    dev_runs = [_run_profile("dev", tmp_path / f"dev{i}.log") for i in range(3)]
+    prod_runs = [_run_profile("production", tmp_path / f"prod{i}.jsonl") for i in range(3)]
+    dev_s, dev_total_s, dev_lines = min(dev_runs)
+    prod_s, prod_total_s, prod_lines = min(prod_runs)
+
+    print(
+        f"\nlogging {_RECORDS} INFO lines, no sampling: "
+        f"dev {dev_s * 1e6 / _RECORDS:.1f}us/call ({dev_total_s * 1e3:.0f}ms written), "
+        f"production {prod_s * 1e6 / _RECORDS:.1f}us/call on the caller ({prod_total_s * 1e3:.0f}ms drained)"
+    )
+    assert dev_lines == prod_lines == _RECORDS
+    assert prod_s < dev_s
+
+
+def test_production_output_is_json_with_unescaped_braces(isolated_logger, tmp_path):
+    """Serialized records keep the message verbatim (no {{ }} doubling) and carry the prefix."""
+    import json
+
+    path = tmp_path / "out.jsonl"
+    handler_id = _add_log_sink(str(path), "INFO", "production")
+    logger.info("payload {}", "{not a field}")
+    logger.remove(handler_id)
+
+    record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])["record"]
+    assert record["message"] == "payload {not a field}"
+    assert record["extra"]["prefix"]
@@ -0,0 +1,60 @@
+"""Benchmark: puppet timers on one heap vs one sleeping task per puppet."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+from bridge.adapters.irc.scheduler import DeadlineScheduler
+
+pytestmark = pytest.mark.benchmark
+
+_PUPPETS = 5_000
+
+
+async def _noop(key, now) -> None:
+    return None
+
+
+async def _sleeper(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_heap_timers_cost_less_than_a_task_per_puppet():
+    now = time.time()
+
+    tracemalloc.start()
+    scheduler = DeadlineScheduler(_noop)
+    start = time.perf_counter()
+    for i in range(_PUPPETS):
+        scheduler.schedule(("ping", f"d{i}"), now + 120 + i * 0.001)
+        scheduler.schedule(("idle", f"d{i}"), now + 86400)
+    heap_time = time.perf_counter() - start
+    heap_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(_sleeper(120)) for _ in range(_PUPPETS)]
+    await asyncio.sleep(0)
+    task_time = time.perf_counter() - start
+    task_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    start = time.perf_counter()
+    fired = scheduler.pop_due(now + 125)
+    pop_time = time.perf_counter() - start
+
+    print(
+        f"\n{_PUPPETS} puppets: heap {heap_time * 1e3:.1f}ms/{heap_mem / 1024:.0f}KiB (2 timers each), "
+        f"tasks {task_time * 1e3:.1f}ms/{task_mem / 1024:.0f}KiB; "
+        f"{len(fired)} keepalives due popped in {pop_time * 1e3:.2f}ms"
+    )
+    assert len(fired) == _PUPPETS
+    assert heap_mem < task_mem
@@ -0,0 +1,87 @@
+"""Benchmark: sends for a reaction burst on a popular message, with and without aggregation.
+
+Thirty users react to one Discord message within a second; a third of them
+change their mind (add then remove), some add several emoji. Counts the
+``ReactionOut`` events the relay emits and the XEP-0444 stanzas the XMPP
+adapter's queue folding would send.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bridge.events import ReactionIn, ReactionOut
+from bridge.gateway.bus import Bus
+from bridge.gateway.reactions import ReactionAggregator
+from bridge.gateway.relay import Relay
+from bridge.gateway.router import ChannelRouter
+
+pytestmark = pytest.mark.benchmark
+
+_USERS = 30
+_WINDOW = 0.05
+
+
+def _burst() -> list[ReactionIn]:
+    events = []
+    for u in range(_USERS):
+        author = f"u{u}"
+        events.append(ReactionIn("discord", "123", "m1", "👍", author, author))
+        if u % 3 == 0:
+            events.append(ReactionIn("discord", "123", "m1", "👍", author, author, raw={"is_remove": True}))
+        if u % 4 == 0:
+            events += [ReactionIn("discord", "123", "m1", e, author, author) for e in ("❤️", "🎉")]
+    return events
+
+
+async def _sends(window: float) -> tuple[int, int, int]:
+    bus = Bus()
+    router = ChannelRouter()
+    router.load_from_config(
+        {
+            "mappings": [
+                {
+                    "discord_channel_id": "123",
+                    "irc": {"server": "irc.libera.chat", "channel": "#test"},
+                    "xmpp": {"muc_jid": "room@conf.example.com"},
+                }
+            ]
+        }
+    )
+    relay = Relay(bus, router)
+    relay.reactions = ReactionAggregator(relay._emit_reaction, window=window)
+    bus.register(relay)
+    out: list[ReactionOut] = []
+
+    class _Capture:
+        def accept_event(self, source: str, evt: object) -> bool:
+            return isinstance(evt, ReactionOut)
+
+        def push_event(self, source: str, evt: object) -> None:
+            out.append(evt)
+
+    bus.register(_Capture())
+    for evt in _burst():
+        bus.publish("discord", evt)
+    await asyncio.sleep(window * 2)
+    tagmsgs = sum(1 for e in out if e.target_origin == "irc")
+    xmpp = [(e.message_id, e.author_id) for e in out if e.target_origin == "xmpp"]
+    # XMPPAdapter folds consecutive reactions of one user on one message into one stanza
+    stanzas = sum(1 for i, key in enumerate(xmpp) if i == 0 or xmpp[i - 1] != key)
+    return len(out), tagmsgs, stanzas
+
+
+@pytest.mark.asyncio
+async def test_reaction_burst_sends():
+    events = len(_burst())
+    total_off, tagmsgs_off, _ = await _sends(0)
+    _, tagmsgs_on, stanzas_on = await _sends(_WINDOW)
+    print(
+        f"\nreaction burst ({events} reactions, {_USERS} users): "
+        f"unaggregated {tagmsgs_off} TAGMSGs + {total_off - tagmsgs_off} stanzas; "
+        f"aggregated {tagmsgs_on} TAGMSGs + {stanzas_on} stanzas"
+    )
+    assert tagmsgs_off == events
+    assert tagmsgs_on < tagmsgs_off
+    assert stanzas_on < (total_off - tagmsgs_off) / 2
@@ -0,0 +1,40 @@
+"""Benchmark: XMPPMessageIDTracker.update_discord_id cost at 1k vs 100k tracked messages."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from bridge.adapters.xmpp import XMPPMessageIDTracker
+
+pytestmark = pytest.mark.benchmark
+
+_UPDATES = 2000
+
+
+def _tracker(n: int) -> XMPPMessageIDTracker:
+    tracker = XMPPMessageIDTracker()
+    for i in range(n):
+        tracker.store(f"origin-{i}", f"irc-{i}", "room@muc.example.com")
+        tracker.add_stanza_id_alias(f"origin-{i}", f"stanza-{i}")
+    return tracker
+
+
+def _time_updates(tracker: XMPPMessageIDTracker, n: int) -> float:
+    step = max(1, n // _UPDATES)
+    start = time.perf_counter()
+    for i in range(0, step * _UPDATES, step):
+        tracker.update_discord_id(f"origin-{i % n}", f"discord-{i}")
+    return (time.perf_counter() - start) / _UPDATES
+
+
+def test_update_discord_id_is_independent_of_tracked_count():
+    small = _time_updates(_tracker(1_000), 1_000)
+    large_tracker = _tracker(100_000)
+    large = _time_updates(large_tracker, 100_000)
+
+    print(f"\nupdate_discord_id: 1k tracked {small * 1e6:.2f}us, 100k tracked {large * 1e6:.2f}us")
+    # A full scan of 200k keys costs milliseconds; alias groups keep it in the microseconds.
+    assert large < 100e-6
+    assert large < small * 10
+    assert large_tracker.get_discord_id("stanza-0") == "discord-0"
@@ -11,7 +11,6 @@ event is published to the bus.
 
 from __future__ import annotations
 
-import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -31,6 +30,7 @@ from bridge.adapters.irc.handlers import (
     is_own_echo,
     is_puppet_echo,
     is_relaymsg_echo,
+    relaymsg_marker_key,
 )
 
 # ---------------------------------------------------------------------------
@@ -43,7 +43,7 @@ from bridge.adapters.xmpp.handlers import (
     should_suppress_echo,
 )
 from bridge.gateway import Bus, ChannelRouter
-from cachetools import TTLCache
+from bridge.tracking.echo import EchoCorrelator
 
 # ===================================================================
 # Shared helpers
@@ -196,10 +196,10 @@ class TestIRCEchoSuppressionIntegration:
         client._router = router
         client._bus = bus
         client._puppet_nick_check = lambda n: n in {"alice_d", "bob_d"}
-        client._recent_relaymsg_sends = TTLCache(maxsize=100, ttl=5)
+        client._echoes = EchoCorrelator(ttl=120)
         client._message_tags = {}
         client._msgid_tracker = MagicMock()
-        client._pending_sends = asyncio.Queue()
+        client._server_casemapping = "rfc1459"
         return client
 
     # -- Echo-message (own nick) through handle_message --
@@ -244,21 +244,21 @@ class TestIRCEchoSuppressionIntegration:
         await handle_message(client, "#bridge", "spoofed_nick/d", "relayed content")
         assert published == [], "RELAYMSG tag echo should not relay"
 
-    # -- RELAYMSG echo via TTLCache fallback --
+    # -- RELAYMSG echo via marker fallback --
 
     @pytest.mark.asyncio
     async def test_relaymsg_cache_echo_suppressed_in_handler(self) -> None:
-        """A RELAYMSG echo detected via TTLCache (no tag) must not relay."""
+        """A RELAYMSG echo detected via the recent-send marker (no tag) must not relay."""
         bus, router = _make_bus_and_router()
         client = self._make_irc_client(bus, router)
         client._message_tags = {}
         # Simulate a recent RELAYMSG send
-        client._recent_relaymsg_sends[("irc.example.com", "#bridge", "alice/d")] = None
+        client._echoes.mark(relaymsg_marker_key("irc.example.com", "#bridge", "alice/d"))
         published: list = []
         bus.publish = lambda s, e: published.append((s, e))  # type: ignore[method-assign]
 
         await handle_message(client, "#bridge", "alice/d", "relayed via relaymsg")
-        assert published == [], "RELAYMSG TTLCache echo should not relay"
+        assert published == [], "RELAYMSG marker echo should not relay"
 
     # -- Combined utility checks at integration level --
 
@@ -267,8 +267,8 @@ class TestIRCEchoSuppressionIntegration:
         client = MagicMock()
         client.nickname = "bridge"
         client._puppet_nick_check = lambda n: n == "puppet_d"
-        client._recent_relaymsg_sends = TTLCache(maxsize=100, ttl=5)
-        client._recent_relaymsg_sends[("srv", "#ch", "relay/d")] = None
+        client._echoes = EchoCorrelator(ttl=120)
+        client._echoes.mark(relaymsg_marker_key("srv", "#ch", "relay/d"))
 
         # Own nick
         assert is_own_echo(client, "bridge", {}) is True
@@ -308,7 +308,7 @@ class TestXMPPEchoSuppressionIntegration:
     def _make_xmpp_component(self) -> MagicMock:
         comp = MagicMock()
         comp._component_jid = "bridge.example.com"
-        comp._recent_sent_nicks = {}
+        comp._echoes = EchoCorrelator(ttl=90)
         comp._router = MagicMock()
         comp._msgid_tracker = MagicMock()
         return comp
@@ -357,7 +357,7 @@ class TestXMPPEchoSuppressionIntegration:
                 ("room@muc.example.com", "puppet"): None,  # JID not exposed
             },
         )
-        comp._recent_sent_nicks[("room@muc.example.com", "puppet")] = None
+        comp._echoes.mark(("room@muc.example.com", "puppet"))
         assert should_suppress_echo(comp, "room@muc.example.com", "puppet") is True
 
     def test_no_jid_no_recent_not_suppressed(self) -> None:
@@ -405,7 +405,7 @@ class TestXMPPEchoSuppressionIntegration:
             },
         )
         # Also in recent-sent (both should detect, but JID is primary)
-        comp._recent_sent_nicks[("room@muc.example.com", "puppet")] = None
+        comp._echoes.mark(("room@muc.example.com", "puppet"))
         assert is_xmpp_echo(comp, "room@muc.example.com", "puppet") is True
         assert should_suppress_echo(comp, "room@muc.example.com", "puppet") is True
 
@@ -419,7 +419,7 @@ class TestXMPPEchoSuppressionIntegration:
                 ("room@muc.example.com", "external"): "ext@users.example.com/client",
             },
         )
-        comp._recent_sent_nicks[("room@muc.example.com", "recent_puppet")] = None
+        comp._echoes.mark(("room@muc.example.com", "recent_puppet"))
 
         # JID match → suppressed
         assert should_suppress_echo(comp, "room@muc.example.com", "puppet") is True
@@ -455,8 +455,8 @@ class TestCrossProtocolEchoSuppression:
         client = MagicMock()
         client.nickname = "bridge"
         client._puppet_nick_check = lambda n: n == "puppet_d"
-        client._recent_relaymsg_sends = TTLCache(maxsize=100, ttl=5)
-        client._recent_relaymsg_sends[("srv", "#ch", "relay/d")] = None
+        client._echoes = EchoCorrelator(ttl=120)
+        client._echoes.mark(relaymsg_marker_key("srv", "#ch", "relay/d"))
 
         assert is_own_echo(client, "bridge", {}) is True
         assert is_puppet_echo(client, "puppet_d") is True
@@ -466,7 +466,8 @@ class TestCrossProtocolEchoSuppression:
         """XMPP: puppet JID, recent-sent, and listener nick are all detected."""
         comp = MagicMock()
         comp._component_jid = "bridge.example.com"
-        comp._recent_sent_nicks = {("room@muc.example.com", "puppet"): None}
+        comp._echoes = EchoCorrelator(ttl=90)
+        comp._echoes.mark(("room@muc.example.com", "puppet"))
 
         muc = MagicMock()
         muc.get_jid_property = lambda r, n, p: "puppet@bridge.example.com/res" if n == "jid_puppet" else None
@@ -487,7 +488,7 @@ class TestCrossProtocolEchoSuppression:
         client = MagicMock()
         client.nickname = "bridge"
         client._puppet_nick_check = lambda n: False
-        client._recent_relaymsg_sends = TTLCache(maxsize=100, ttl=5)
+        client._echoes = EchoCorrelator(ttl=120)
         assert is_own_echo(client, "alice", {}) is False
         assert is_puppet_echo(client, "alice") is False
         assert is_relaymsg_echo(client, "srv", "#ch", "alice", {}) is False
@@ -495,7 +496,7 @@ class TestCrossProtocolEchoSuppression:
         # XMPP
         comp = MagicMock()
         comp._component_jid = "bridge.example.com"
-        comp._recent_sent_nicks = {}
+        comp._echoes = EchoCorrelator(ttl=90)
         muc = MagicMock()
         muc.get_jid_property = lambda r, n, p: "alice@users.example.com/client"
         comp.plugin = {"xep_0045": muc}
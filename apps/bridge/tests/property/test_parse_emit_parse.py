@@ -32,8 +32,9 @@ _EMIT_PARSE: dict[str, tuple] = {
 # Styles that each protocol can roundtrip.  The parsers use flat left-to-right
 # scanning, so only styles expressible without nesting survive emit→parse.
 #
-# Discord: single flags + BOLD|ITALIC (***text***).  Nesting __**text**__
-#          is NOT parsed back correctly (parser is non-recursive).
+# Discord: single flags, BOLD|ITALIC (***text***) and underline around bold
+#          or italic (__**text**__, __*text*__, __***text***__).  Other
+#          nesting is NOT parsed back correctly (parser is non-recursive).
 # IRC:     all single flags (toggle-based, no nesting issues).
 # XMPP:    single flags except UNDERLINE (dropped by emitter).
 _ROUNDTRIPPABLE_STYLES: dict[str, list[Style]] = {
@@ -44,6 +45,9 @@ _ROUNDTRIPPABLE_STYLES: dict[str, list[Style]] = {
         Style.STRIKETHROUGH,
         Style.MONOSPACE,
         Style.BOLD | Style.ITALIC,  # *** syntax
+        Style.UNDERLINE | Style.BOLD,  # __** syntax
+        Style.UNDERLINE | Style.ITALIC,  # __* syntax
+        Style.UNDERLINE | Style.BOLD | Style.ITALIC,  # __*** syntax
     ],
     "irc": [
         Style.BOLD,
@@ -0,0 +1,43 @@
+"""Property-based tests for the converter's plain-text fast path.
+
+Property: for any content, origin and target, ``convert`` and
+``strip_formatting`` return exactly what the full IR round-trip returns. When
+``has_markup`` reports no markup for the origin, that result is the content
+itself, so skipping the parser is never observable.
+"""
+
+from __future__ import annotations
+
+from bridge.formatting.converter import _EMITTERS, _PARSERS, ProtocolName, convert, has_markup, strip_formatting
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+_protocols = st.sampled_from(["discord", "irc", "xmpp"])
+
+# Mix markup characters, control codes, URLs and the Discord escape sentinels
+# into ordinary text so both paths are exercised often.
+_char = st.one_of(
+    st.characters(blacklist_categories=("Cs",)),
+    st.sampled_from(list("*_~`|>\\\n \x02\x03\x0f\x11\x16\x1d\x1e\x1f:/.0123\ue001\ue006")),
+)
+_content = st.lists(
+    st.one_of(st.text(alphabet=_char, max_size=20), st.just("https://example.com/a_b*c")),
+    max_size=8,
+).map("".join)
+
+
+class TestPlainFastPath:
+    @given(content=_content, origin=_protocols, target=_protocols)
+    @settings(max_examples=500)
+    def test_convert_matches_ir_round_trip(self, content: str, origin: ProtocolName, target: ProtocolName) -> None:
+        if origin == target:
+            return
+        full = _EMITTERS[target](_PARSERS[origin](content))
+        assert convert(content, origin, target) == full
+        if not has_markup(content, origin):
+            assert full == content
+
+    @given(content=_content, protocol=_protocols)
+    @settings(max_examples=300)
+    def test_strip_formatting_matches_ir(self, content: str, protocol: ProtocolName) -> None:
+        assert strip_formatting(content, protocol) == _PARSERS[protocol](content).plain
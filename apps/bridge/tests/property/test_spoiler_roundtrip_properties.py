@@ -11,11 +11,12 @@ Property CP11: Pipeline Spoiler Round-Trip
 All three protocols support spoilers:
   - Discord: ``||text||``
   - IRC: fg==bg color codes (e.g. ``\\x0301,01text\\x0f``)
-  - XMPP: XEP-0382 via ``ctx.raw``
+  - XMPP: XEP-0382 via ``ctx.meta`` (origin) / ``ctx.spoiler`` (target)
 """
 
 from __future__ import annotations
 
+from bridge.events import NO_META, MessageMeta
 from bridge.formatting.irc_codes import COLOR, RESET
 from bridge.gateway.pipeline import TransformContext
 from bridge.gateway.steps import format_convert, unwrap_spoiler, wrap_spoiler
@@ -42,20 +43,20 @@ _safe_word = st.from_regex(r"[a-zA-Z]{1,10}", fullmatch=True)
 _safe_text = st.lists(_safe_word, min_size=1, max_size=5).map(" ".join)
 
 
-def _wrap_spoiler_for_origin(text: str, origin: str) -> tuple[str, dict]:
+def _wrap_spoiler_for_origin(text: str, origin: str) -> tuple[str, MessageMeta]:
     """Wrap *text* in spoiler markers appropriate for *origin*.
 
-    Returns ``(content, raw_dict)`` where *raw_dict* carries XMPP stanza
-    metadata when the origin is ``"xmpp"``.
+    Returns ``(content, meta)`` where *meta* carries the XMPP stanza's
+    spoiler flag when the origin is ``"xmpp"``.
     """
     if origin == "discord":
-        return f"||{text}||", {}
+        return f"||{text}||", NO_META
     if origin == "irc":
         # fg==bg color 1 (black on black)
-        return f"{COLOR}01,01{text}{RESET}", {}
+        return f"{COLOR}01,01{text}{RESET}", NO_META
     if origin == "xmpp":
         # XEP-0382: spoiler info lives in the stanza, not inline text.
-        return text, {"spoiler": True}
+        return text, MessageMeta(spoiler=True)
     raise ValueError(origin)
 
 
@@ -68,12 +69,12 @@ def _run_spoiler_pipeline(
     content: str,
     origin: str,
     target: str,
-    raw: dict | None = None,
+    meta: MessageMeta = NO_META,
 ) -> tuple[str | None, TransformContext]:
     """Execute the unwrap→format_convert→wrap sub-pipeline and return the
     result together with the final :class:`TransformContext`.
     """
-    ctx = TransformContext(origin=origin, target=target, raw=dict(raw or {}))
+    ctx = TransformContext(origin=origin, target=target, meta=meta)
     result = unwrap_spoiler(content, ctx)
     result = format_convert(result, ctx)
     result = wrap_spoiler(result, ctx)
@@ -100,8 +101,8 @@ class TestSpoilerRoundTrip:
         **Validates: Requirements 4.3, 4.4**
         """
         origin, target = pair
-        content, raw = _wrap_spoiler_for_origin(text, origin)
-        _result, ctx = _run_spoiler_pipeline(content, origin, target, raw)
+        content, meta = _wrap_spoiler_for_origin(text, origin)
+        _result, ctx = _run_spoiler_pipeline(content, origin, target, meta)
         assert ctx.spoiler is True, (
             f"Spoiler flag not set for {origin}→{target}: content={content!r}, result={_result!r}"
         )
@@ -120,8 +121,8 @@ class TestSpoilerRoundTrip:
         origin, target = pair
         if target != "discord":
             return  # only check Discord targets
-        content, raw = _wrap_spoiler_for_origin(text, origin)
-        result, _ctx = _run_spoiler_pipeline(content, origin, target, raw)
+        content, meta = _wrap_spoiler_for_origin(text, origin)
+        result, _ctx = _run_spoiler_pipeline(content, origin, target, meta)
         assert result is not None
         assert result.startswith("||") and result.endswith("||"), (
             f"Discord target missing spoiler markers for {origin}→discord: result={result!r}"
@@ -141,28 +142,26 @@ class TestSpoilerRoundTrip:
         origin, target = pair
         if target != "irc":
             return
-        content, raw = _wrap_spoiler_for_origin(text, origin)
-        result, _ctx = _run_spoiler_pipeline(content, origin, target, raw)
+        content, meta = _wrap_spoiler_for_origin(text, origin)
+        result, _ctx = _run_spoiler_pipeline(content, origin, target, meta)
         assert result is not None
         assert COLOR in result, f"IRC target missing color codes for {origin}→irc: result={result!r}"
         assert result.endswith(RESET), f"IRC target missing RESET for {origin}→irc: result={result!r}"
 
     @given(text=_safe_text, pair=_PROTOCOL_PAIRS)
     @settings(max_examples=200)
-    def test_xmpp_target_sets_raw_spoiler(
+    def test_xmpp_target_keeps_spoiler_flag(
         self,
         text: str,
         pair: tuple[str, str],
     ) -> None:
-        """When the target is XMPP, ``ctx.raw["spoiler"]`` is True.
+        """When the target is XMPP, ``ctx.spoiler`` stays set for the adapter's XEP-0382 element.
 
         **Validates: Requirements 4.3, 4.4**
         """
         origin, target = pair
         if target != "xmpp":
             return
-        content, raw = _wrap_spoiler_for_origin(text, origin)
-        _result, ctx = _run_spoiler_pipeline(content, origin, target, raw)
-        assert ctx.raw.get("spoiler") is True, (
-            f"XMPP target missing raw spoiler flag for {origin}→xmpp: raw={ctx.raw!r}"
-        )
+        content, meta = _wrap_spoiler_for_origin(text, origin)
+        _result, ctx = _run_spoiler_pipeline(content, origin, target, meta)
+        assert ctx.spoiler is True, f"XMPP target missing spoiler flag for {origin}→xmpp"
@@ -260,12 +260,17 @@ class TestConfig:
             ("irc_puppet_postfix", ""),
             ("irc_throttle_limit", 10),
             ("irc_message_queue", 30),
+            ("irc_coalesce_window_ms", 0),
+            ("irc_chathistory_max_pages", 10),
+            ("irc_chathistory_replay_rate", 5.0),
             ("irc_rejoin_delay", 5.0),
             ("irc_auto_rejoin", True),
             ("irc_use_sasl", False),
             ("irc_sasl_user", ""),
             ("irc_sasl_password", ""),
             ("content_filter_regex", []),
+            ("xmpp_prewarm_concurrency", 8),
+            ("xmpp_puppet_occupancy_file", ""),
         ],
     )
     def test_config_property_defaults(self, prop, expected):
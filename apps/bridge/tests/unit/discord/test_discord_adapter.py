@@ -12,6 +12,7 @@ import discord
 import pytest
 from bridge.adapters.discord.handlers import relay_author_display
 from bridge.events import (
+    ConfigReload,
     MessageDeleteOut,
     MessageIn,
     MessageOut,
@@ -334,6 +335,33 @@ async def test_on_message_delete_skips_when_we_initiated_delete(bus: Bus, router
     assert len(published) == 0
 
 
+@pytest.mark.asyncio
+async def test_on_bulk_delete_publishes_one_event(bus: Bus, router: ChannelRouter) -> None:
+    """A purge becomes one MessageBulkDelete, oldest first, without messages we deleted ourselves."""
+    from bridge.adapters.discord import DiscordAdapter
+    from bridge.events import MessageBulkDelete
+
+    adapter = DiscordAdapter(bus, router, identity_resolver=None)
+    published = []
+    bus.publish = lambda s, e: published.append((s, e))  # type: ignore[method-assign]
+    adapter._recently_deleted_by_us["123:997"] = None
+    cached = MagicMock()
+    cached.id = 999
+    cached.author.id = 111
+
+    payload = MagicMock()
+    payload.channel_id = 123
+    payload.message_ids = {999, 997, 998}
+    payload.cached_messages = [cached]
+
+    await adapter._on_raw_bulk_message_delete(payload)
+
+    assert len(published) == 1
+    evt = published[0][1]
+    assert isinstance(evt, MessageBulkDelete)
+    assert [(mid, author) for mid, author, _ in evt.messages] == [("998", ""), ("999", "111")]
+
+
 @pytest.mark.asyncio
 async def test_queue_consumer_edits_when_resolve_succeeds(bus: Bus, router: ChannelRouter) -> None:
     """When replace_id resolves, queue consumer calls _webhook_edit instead of send."""
@@ -361,7 +389,9 @@ async def test_queue_consumer_edits_when_resolve_succeeds(bus: Bus, router: Chan
         "Alice",
         "edited content",
         "new-msg-id",
-        raw={"is_edit": True, "replace_id": "orig-123", "origin": "irc"},
+        origin="irc",
+        is_edit=True,
+        raw={"replace_id": "orig-123"},
     )
     adapter._queue.put_nowait(evt)
     consumer = asyncio.create_task(adapter._queue_consumer(delay=0.01))
@@ -513,7 +543,9 @@ async def test_edit_fallback_to_send_when_resolve_fails(bus: Bus, router: Channe
         "Alice",
         "corrected",
         "corr-2",
-        raw={"is_edit": True, "replace_id": "unknown", "origin": "xmpp"},
+        origin="xmpp",
+        is_edit=True,
+        raw={"replace_id": "unknown"},
     )
     adapter._queue.put_nowait(evt)
     consumer = asyncio.create_task(adapter._queue_consumer(delay=0.01))
@@ -969,6 +1001,35 @@ async def test_prepare_media_fallback_on_fetch_failure(bus: Bus, router: Channel
 # ---------------------------------------------------------------------------
 
 
+class TestMappingReload:
+    def test_removed_channel_drops_webhook_and_channel_state(self):
+        from bridge.adapters.discord import DiscordAdapter
+
+        router = ChannelRouter()
+        router.load_from_config({"mappings": [{"discord_channel_id": "1"}, {"discord_channel_id": "2"}]})
+        adapter = DiscordAdapter(Bus(), router, identity_resolver=None)
+        for channel_id in ("1", "2"):
+            adapter._webhook_cache[channel_id] = MagicMock()
+            adapter._get_channel_lock(channel_id)
+        diff = router.load_from_config({"mappings": [{"discord_channel_id": "1"}]})
+
+        assert adapter.accept_event("main", ConfigReload(diff))
+        adapter.push_event("main", ConfigReload(diff))
+
+        assert "1" in adapter._webhook_cache
+        assert "1" in adapter._channel_locks
+        assert "2" not in adapter._webhook_cache
+        assert "2" not in adapter._channel_locks
+
+    def test_reload_without_removals_is_ignored(self):
+        from bridge.adapters.discord import DiscordAdapter
+
+        router = ChannelRouter()
+        adapter = DiscordAdapter(Bus(), router, identity_resolver=None)
+        diff = router.load_from_config({"mappings": [{"discord_channel_id": "1"}]})
+        assert not adapter.accept_event("main", ConfigReload(diff))
+
+
 class TestChannelLockIsolationProperty:
     """Property 4: Per-channel lock isolation.
 
@@ -1012,3 +1073,45 @@ class TestChannelLockIsolationProperty:
         first = adapter._get_channel_lock(channel_id)
         for _ in range(n - 1):
             assert adapter._get_channel_lock(channel_id) is first
+
+
+class TestShardWebhookName:
+    """Sharded instances look up and create webhooks under their own name."""
+
+    def test_unsharded_name(self) -> None:
+        from bridge.adapters.discord.webhook import WEBHOOK_NAME, webhook_name
+
+        assert webhook_name(None) == WEBHOOK_NAME
+
+    @pytest.mark.asyncio
+    async def test_skips_other_instances_webhook_and_creates_own(self) -> None:
+        from bridge.adapters.discord.webhook import get_or_create_webhook, webhook_name
+
+        other = MagicMock()
+        other.name = webhook_name("a")
+        created = MagicMock()
+        channel = MagicMock(spec=discord.TextChannel)
+        channel.webhooks = AsyncMock(return_value=[other])
+        channel.create_webhook = AsyncMock(return_value=created)
+        bot = MagicMock()
+        bot.get_channel.return_value = channel
+        cache: dict = {}
+
+        webhook = await get_or_create_webhook(bot, "123", cache, name=webhook_name("b"))
+
+        assert webhook is created
+        channel.create_webhook.assert_awaited_once()
+        assert channel.create_webhook.call_args.kwargs["name"] == "ATL Bridge (b)"
+        assert cache["123"] is created
+
+    @pytest.mark.asyncio
+    async def test_adapter_uses_shard_instance(self, monkeypatch) -> None:
+        from bridge.adapters.discord import DiscordAdapter
+
+        monkeypatch.setenv("BRIDGE_SHARD_INSTANCE", "b")
+        router = ChannelRouter()
+        adapter = DiscordAdapter(Bus(), router, identity_resolver=None)
+        adapter._bot = MagicMock()
+        with patch("bridge.adapters.discord.webhook.get_or_create_webhook", new=AsyncMock()) as get:
+            await adapter._get_or_create_webhook("123")
+        assert get.call_args.kwargs["name"] == "ATL Bridge (b)"
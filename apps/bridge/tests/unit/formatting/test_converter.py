@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import pytest
-from bridge.formatting.converter import ProtocolName, convert, strip_formatting
+from bridge.formatting.converter import ProtocolName, convert, has_markup, strip_formatting
 
 # ---------------------------------------------------------------------------
 # Same-protocol identity (Requirement 1.2)
@@ -102,6 +102,39 @@ class TestStripFormatting:
         assert strip_formatting("", "discord") == ""
 
 
+# ---------------------------------------------------------------------------
+# Plain-text fast path
+# ---------------------------------------------------------------------------
+
+
+class TestHasMarkup:
+    """has_markup gates the fast path: False only when no parser input could style the text."""
+
+    @pytest.mark.parametrize("protocol", ["discord", "irc", "xmpp"])
+    def test_plain_chat_has_no_markup(self, protocol: ProtocolName) -> None:
+        assert has_markup("hey, see https://example.com/page?id=3 :) 👍", protocol) is False
+
+    @pytest.mark.parametrize("content", ["**b**", "_i_", "~~s~~", "`c`", "||spoiler||", "> quote", "a\\b", "\ue001"])
+    def test_discord_markers(self, content: str) -> None:
+        assert has_markup(content, "discord") is True
+
+    @pytest.mark.parametrize("content", ["\x02b", "\x0304red", "\x0f", "\x11", "\x16", "\x1d", "\x1e", "\x1f"])
+    def test_irc_control_codes(self, content: str) -> None:
+        assert has_markup(content, "irc") is True
+
+    def test_irc_ignores_markdown_characters(self) -> None:
+        assert has_markup("*not* _styled_ on IRC", "irc") is False
+
+    def test_xmpp_quote_is_not_markup(self) -> None:
+        assert has_markup("> quoted", "xmpp") is False
+        assert has_markup("*bold*", "xmpp") is True
+
+    def test_fast_path_returns_same_object(self) -> None:
+        content = "just a normal message"
+        assert convert(content, "irc", "discord") is content
+        assert strip_formatting(content, "xmpp") is content
+
+
 # ---------------------------------------------------------------------------
 # Registry coverage
 # ---------------------------------------------------------------------------
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from bridge.formatting.discord_to_xmpp import MarkupSpan, discord_to_xmpp
+from bridge.formatting.markdown import parse_discord_markdown, resolve_discord_entities
 from bridge.formatting.splitter import extract_code_blocks, split_irc_message
+from bridge.formatting.xmpp_styling import emit_xep0393
 
 # ---------------------------------------------------------------------------
 # discord_to_xmpp
@@ -126,6 +128,34 @@ class TestDiscordToXmpp:
         r = discord_to_xmpp("plain")
         assert r.has_markup is False
 
+    def test_styled_body_and_spans_share_one_parse(self):
+        content = "<@1> says **hi** [here](https://x.io) ~~no~~"
+        r = discord_to_xmpp(content)
+        ft = parse_discord_markdown(resolve_discord_entities(content))
+        assert r.body == ft.plain == "@1 says hi here (https://x.io) no"
+        assert r.styled_body == emit_xep0393(ft) == "@1 says *hi* here (https://x.io) ~no~"
+        assert [(s.start, s.end, s.types) for s in r.spans] == [(8, 10, ["strong"]), (31, 33, ["deleted"])]
+
+    def test_span_offsets_after_fence(self):
+        r = discord_to_xmpp("```\nx\n``` **b**")
+        assert r.body == "```\nx\n``` b"
+        assert r.spans == [MarkupSpan(start=10, end=11, types=["strong"])]
+
+    def test_escapes_kept_in_styled_body_only(self):
+        r = discord_to_xmpp(r"\*not italic\* but **bold**")
+        assert r.body == "*not italic* but bold"
+        assert r.styled_body == r"\*not italic\* but *bold*"
+
+    def test_url_underscores_not_styled(self):
+        r = discord_to_xmpp("see https://example.com/a__b__c and _this_")
+        assert r.body == "see https://example.com/a__b__c and this"
+        assert r.spans == [MarkupSpan(start=36, end=40, types=["emphasis"])]
+
+    def test_spoiler_markers_stripped_before_parse(self):
+        r = discord_to_xmpp("||**x**||")
+        assert r.body == "x"
+        assert r.styled_body == "*x*"
+
 
 # ---------------------------------------------------------------------------
 # extract_code_blocks
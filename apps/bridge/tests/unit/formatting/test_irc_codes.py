@@ -101,6 +101,10 @@ class TestParseColorCodes:
         ft = parse_irc_codes(f"hello {COLOR}world")
         assert ft.plain == "hello world"
 
+    def test_non_ascii_digits_are_text(self):
+        ft = parse_irc_codes(f"x{COLOR}\u00b2,\u0663")
+        assert ft.plain == "x\u00b2,\u0663"
+
     def test_color_with_formatting(self):
         ft = parse_irc_codes(f"{BOLD}bold {COLOR}4colored{COLOR}{BOLD}")
         assert ft.plain == "bold colored"
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import pytest
-from bridge.formatting.markdown import emit_discord_markdown, parse_discord_markdown
+from bridge.formatting.markdown import emit_discord_markdown, parse_discord_markdown, resolve_discord_entities
 from bridge.formatting.primitives import CodeBlock, FormattedText, Span, Style
 
 # ---------------------------------------------------------------------------
@@ -74,6 +74,50 @@ class TestParseNestedStyles:
         assert ft.spans[0].style == Style.BOLD
         assert ft.spans[1].style == Style.ITALIC
 
+    @pytest.mark.parametrize(
+        ("text", "style"),
+        [
+            ("__**x**__", Style.UNDERLINE | Style.BOLD),
+            ("__*x*__", Style.UNDERLINE | Style.ITALIC),
+            ("__***x***__", Style.UNDERLINE | Style.BOLD | Style.ITALIC),
+        ],
+    )
+    def test_underline_around_bold_or_italic(self, text, style):
+        ft = parse_discord_markdown(text)
+        assert ft.plain == "x"
+        assert ft.spans == [Span(0, 1, style)]
+        assert emit_discord_markdown(ft) == text
+
+
+# ---------------------------------------------------------------------------
+# Discord entities
+# ---------------------------------------------------------------------------
+
+
+class TestResolveDiscordEntities:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("hi <@123> and <@!456>", "hi @123 and @456"),
+            ("in <#789>, ping <@&42>", "in #789, ping @42"),
+            ("nice <:pog:111> <a:wave:222>", "nice :pog: :wave:"),
+            ("at <t:1700000000:R>!", "at !"),
+            ("[docs](https://example.com/x)", "docs (https://example.com/x)"),
+            ("<https://example.com>", "https://example.com"),
+            ("# Title\n-# small print", "Title\nsmall print"),
+            ("a\u200bb", "ab"),
+        ],
+    )
+    def test_resolves(self, text, expected):
+        assert resolve_discord_entities(text) == expected
+
+    def test_markdown_untouched(self):
+        assert resolve_discord_entities("**bold** _it_ # not a header") == "**bold** _it_ # not a header"
+
+    def test_fenced_code_untouched(self):
+        text = "<@1> ```\n<@2> # x\n``` <@3>"
+        assert resolve_discord_entities(text) == "@1 ```\n<@2> # x\n``` @3"
+
 
 # ---------------------------------------------------------------------------
 # Parser — fenced code blocks
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from bridge.formatting.splitter import split_irc_message
+from bridge.formatting.splitter import split_irc_line_groups, split_irc_lines, split_irc_message
 
 
 class TestSplitIrcMessageBasic:
@@ -121,3 +121,40 @@ class TestSplitIrcMessageEdgeCases:
         for chunk in chunks:
             # Each chunk is valid UTF-8
             chunk.encode("utf-8")
+
+
+class TestWordBoundarySplit:
+    def test_breaks_after_last_space_in_budget(self):
+        text = "alpha beta gamma delta"
+        chunks = split_irc_message(text, max_bytes=12)
+        assert chunks == ["alpha beta ", "gamma delta"]
+
+    def test_hard_split_when_space_wastes_over_half_budget(self):
+        text = "ab " + "x" * 30
+        chunks = split_irc_message(text, max_bytes=20)
+        assert chunks[0] == text[:20]
+        assert "".join(chunks) == text
+
+    def test_first_max_bytes_bounds_only_first_chunk(self):
+        text = "x" * 25
+        chunks = split_irc_message(text, max_bytes=10, first_max_bytes=5)
+        assert [len(c) for c in chunks] == [5, 10, 10]
+
+    def test_split_irc_lines_first_max_bytes_applies_once(self):
+        chunks = split_irc_lines("x" * 12 + "\n" + "y" * 12, max_bytes=10, first_max_bytes=4)
+        assert [len(c) for c in chunks] == [4, 8, 10, 2]
+
+
+class TestSplitLineGroups:
+    def test_groups_chunks_per_source_line(self):
+        groups = split_irc_line_groups("a" * 10 + "\n\nshort", max_bytes=4)
+        assert groups == [["aaaa", "aaaa", "aa"], ["shor", "t"]]
+
+    def test_flattened_matches_split_irc_lines(self):
+        text = "hello world\nsecond line here"
+        groups = split_irc_line_groups(text, max_bytes=8, first_max_bytes=5)
+        assert [c for g in groups for c in g] == split_irc_lines(text, max_bytes=8, first_max_bytes=5)
+
+    def test_blank_content(self):
+        assert split_irc_line_groups(" \n") == []
+        assert split_irc_lines(" \n") == [""]
@@ -7,6 +7,7 @@ from bridge.formatting.xmpp_styling import (
     emit_xep0393,
     emit_xep0394,
     parse_xep0393,
+    xep0394_types,
 )
 
 # ===================================================================
@@ -233,6 +234,10 @@ class TestEmitXEP0393:
 
 
 class TestEmitXEP0394:
+    def test_types_for_combined_style(self):
+        assert xep0394_types(Style.UNDERLINE | Style.BOLD | Style.ITALIC) == ["strong", "emphasis"]
+        assert xep0394_types(Style.UNDERLINE) == []
+
     def test_empty(self):
         ft = FormattedText(plain="hello")
         markup = emit_xep0394(ft)
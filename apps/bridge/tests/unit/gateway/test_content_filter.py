@@ -1,7 +1,7 @@
 """Unit tests for pre-compiled content filter functions.
 
-Tests _build_content_filters(), rebuild_content_filters(), and _content_matches_filter()
-from bridge.gateway.relay.
+Tests _build_content_filters(), rebuild_content_filters(), _content_matches_filter(),
+ContentFilterMatcher and _message_matches_filter() from bridge.gateway.relay.
 
 Requirements: 6.1, 6.2, 6.3, 6.4
 """
@@ -11,9 +11,12 @@ from __future__ import annotations
 import re
 from unittest.mock import patch
 
+from bridge.events import message_in
 from bridge.gateway.relay import (
+    ContentFilterMatcher,
     _build_content_filters,
     _content_matches_filter,
+    _message_matches_filter,
     rebuild_content_filters,
 )
 
@@ -145,6 +148,85 @@ class TestContentMatchesFilter:
             assert _content_matches_filter("no match here") is False
 
 
+class TestContentFilterMatcher:
+    """ContentFilterMatcher folds patterns into one regex without changing results."""
+
+    def test_literals_share_one_trie_regex(self):
+        matcher = ContentFilterMatcher(_build_content_filters(["spam", "spammer", "scam", "ads"]))
+        assert matcher.search("a scammer") is True
+        assert matcher.search("buy ads now") is True
+        assert matcher.search("clean") is False
+        assert matcher._fallback == []
+
+    def test_backreference_pattern_searched_individually(self):
+        patterns = _build_content_filters([r"(a)\1", r"x+"])
+        matcher = ContentFilterMatcher(patterns)
+        assert [p.pattern for p in matcher._fallback] == [r"(a)\1"]
+        assert matcher.search("baab") is True
+        assert matcher.search("abab") is False
+
+    def test_leading_inline_flags_are_scoped(self):
+        matcher = ContentFilterMatcher(_build_content_filters([r"(?i)spam", r"^ham$"]))
+        assert matcher.search("SPAM!") is True
+        # (?i) must not leak into the other branch
+        assert matcher.search("HAM") is False
+        assert matcher.search("ham") is True
+
+    def test_uncompilable_merge_falls_back_to_all_patterns(self):
+        patterns = _build_content_filters([r"(?P<w>foo)", r"(?P<w>bar)"])
+        matcher = ContentFilterMatcher(patterns)
+        assert matcher._fallback == patterns
+        assert matcher.search("a bar") is True
+
+    def test_empty_literal_matches_everything(self):
+        matcher = ContentFilterMatcher(_build_content_filters(["", "spam"]))
+        assert matcher.search("anything") is True
+
+
+class TestMessageMatchesFilter:
+    """_message_matches_filter() runs once per MessageIn, before fan-out."""
+
+    def test_evaluated_once_for_all_targets(self):
+        from bridge.gateway import Bus, ChannelRouter, Relay
+
+        bus = Bus()
+        router = ChannelRouter()
+        router.load_from_config(
+            {
+                "mappings": [
+                    {
+                        "discord_channel_id": "123",
+                        "irc": {"server": "irc.example.com", "channel": "#test"},
+                        "xmpp": {"muc_jid": "room@muc.example.com"},
+                    }
+                ]
+            }
+        )
+        bus.register(Relay(bus, router))
+        _, evt = message_in("discord", "123", "u1", "User", "hello", "m1")
+        with (
+            patch("bridge.gateway.relay._compiled_filters", _build_content_filters([r"spam"])),
+            patch.object(ContentFilterMatcher, "search", autospec=True, return_value=False) as search,
+        ):
+            bus.publish("discord", evt)
+        assert search.call_count == 1
+
+    def test_matches_formatting_stripped_text(self):
+        _, evt = message_in("discord", "123", "u1", "User", "**sp**am", "m1")
+        with patch("bridge.gateway.relay._compiled_filters", _build_content_filters([r"spam"])):
+            assert _message_matches_filter(evt) is True
+
+    def test_irc_color_codes_do_not_hide_match(self):
+        _, evt = message_in("irc", "s/#c", "u1", "User", "sp\x0304am\x03", "m1")
+        with patch("bridge.gateway.relay._compiled_filters", _build_content_filters([r"spam"])):
+            assert _message_matches_filter(evt) is True
+
+    def test_empty_content_never_filtered(self):
+        _, evt = message_in("discord", "123", "u1", "User", "", "m1")
+        with patch("bridge.gateway.relay._compiled_filters", _build_content_filters([r".*"])):
+            assert _message_matches_filter(evt) is False
+
+
 # ---------------------------------------------------------------------------
 # Property-based tests
 # ---------------------------------------------------------------------------
@@ -0,0 +1,165 @@
+"""Tests for edit coalescing in the relay: latest edit wins, delete drops held edits, sends saved."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bridge.events import (
+    MessageBulkDelete,
+    MessageBulkDeleteOut,
+    MessageDeleteOut,
+    MessageOut,
+    message_delete,
+    message_in,
+)
+from bridge.gateway.bus import Bus
+from bridge.gateway.edits import EditCoalescer
+from bridge.gateway.relay import Relay
+from bridge.gateway.router import ChannelRouter
+
+_WINDOW = 0.05
+
+
+class _Capture:
+    def __init__(self) -> None:
+        self.events: list[object] = []
+
+    def accept_event(self, source: str, evt: object) -> bool:
+        return isinstance(evt, (MessageOut, MessageDeleteOut, MessageBulkDeleteOut))
+
+    def push_event(self, source: str, evt: object) -> None:
+        self.events.append(evt)
+
+
+def _setup() -> tuple[Bus, Relay, _Capture]:
+    bus = Bus()
+    router = ChannelRouter()
+    router.load_from_config(
+        {
+            "mappings": [
+                {
+                    "discord_channel_id": "123",
+                    "irc": {"server": "irc.libera.chat", "channel": "#test"},
+                    "xmpp": {"muc_jid": "room@conf.example.com"},
+                }
+            ]
+        }
+    )
+    relay = Relay(bus, router)
+    relay.edits = EditCoalescer(relay._push_message, window=_WINDOW)
+    bus.register(relay)
+    out = _Capture()
+    bus.register(out)
+    return bus, relay, out
+
+
+def _edit(content: str, message_id: str = "m1"):
+    return message_in(
+        "discord", "123", "u1", "alice", content, message_id, is_edit=True, raw={"replace_id": message_id}
+    )[1]
+
+
+class TestEditCoalescing:
+    @pytest.mark.asyncio
+    async def test_burst_relays_only_latest_edit_per_target(self):
+        bus, relay, out = _setup()
+
+        for content in ("helo", "hell", "hello"):
+            bus.publish("discord", _edit(content))
+        assert out.events == []
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert sorted((e.target_origin, e.content) for e in out.events) == [
+            ("irc", "hello (edited)"),
+            ("xmpp", "hello"),
+        ]
+        assert relay.edits.stats() == {
+            "delivered": 1,
+            "superseded": 2,
+            "dropped_by_delete": 0,
+            "sends_saved": 4,
+            "held": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_edit_then_delete_relays_only_the_delete(self):
+        bus, relay, out = _setup()
+
+        bus.publish("discord", _edit("typo"))
+        bus.publish("discord", message_delete("discord", "123", "m1")[1])
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert {type(e) for e in out.events} == {MessageDeleteOut}
+        assert relay.edits.sends_saved == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_drops_held_edits_and_relays_one_batch_per_target(self):
+        bus, relay, out = _setup()
+
+        bus.publish("discord", _edit("typo", "m1"))
+        bus.publish("discord", MessageBulkDelete("discord", "123", (("m1", "u1", "alice"), ("m2", "", ""))))
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert sorted(e.target_origin for e in out.events) == ["irc", "xmpp"]
+        assert all(isinstance(e, MessageBulkDeleteOut) and len(e.messages) == 2 for e in out.events)
+        assert relay.edits.dropped_by_delete == 1
+
+    @pytest.mark.asyncio
+    async def test_messages_are_coalesced_independently(self):
+        bus, relay, out = _setup()
+
+        bus.publish("discord", _edit("first", "m1"))
+        bus.publish("discord", _edit("second", "m2"))
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert sorted(e.message_id for e in out.events) == ["m1", "m1", "m2", "m2"]
+        assert relay.edits.sends_saved == 0
+
+    @pytest.mark.asyncio
+    async def test_continuous_edits_are_flushed_after_max_hold(self):
+        bus, _, out = _setup()
+
+        for i in range(12):
+            bus.publish("discord", _edit(f"v{i}"))
+            await asyncio.sleep(_WINDOW / 2)
+
+        assert out.events  # not held for the whole burst
+
+    @pytest.mark.asyncio
+    async def test_new_messages_are_not_held(self):
+        bus, _, out = _setup()
+
+        bus.publish("discord", message_in("discord", "123", "u1", "alice", "hi", "m1")[1])
+
+        assert len(out.events) == 2
+
+    def test_off_by_default(self):
+        bus = Bus()
+        router = ChannelRouter()
+        router.load_from_config({"mappings": [{"discord_channel_id": "123", "irc": {"server": "s", "channel": "#c"}}]})
+        bus.register(Relay(bus, router))
+        out = _Capture()
+        bus.register(out)
+
+        bus.publish("discord", _edit("fixed"))
+
+        assert [e.content for e in out.events] == ["fixed (edited)"]
+
+    @pytest.mark.asyncio
+    async def test_flush_delivers_held_edits_and_logs_counters(self):
+        from loguru import logger
+
+        bus, relay, out = _setup()
+        messages: list[str] = []
+        sink = logger.add(messages.append, level="INFO", format="{message}")
+        try:
+            bus.publish("discord", _edit("typo"))
+            bus.publish("discord", _edit("fixed"))
+            relay.edits.flush()
+        finally:
+            logger.remove(sink)
+
+        assert sorted(e.content for e in out.events) == ["fixed", "fixed (edited)"]
+        assert relay.edits.stats()["held"] == 0
+        assert any("edit coalescing" in m and "'superseded': 1" in m for m in messages)
@@ -0,0 +1,136 @@
+"""Tests for the deadline-bounded enrichment stage (gateway/enrichment.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bridge.adapters.irc.handlers import handle_ctcp_action
+from bridge.gateway import Bus, ChannelRouter
+from bridge.gateway.enrichment import Enricher, enricher_for
+from bridge.tracking.echo import EchoCorrelator
+
+
+class TestEnricher:
+    @pytest.mark.asyncio
+    async def test_fast_lookup_returned_within_deadline(self):
+        enricher = Enricher(deadline=1.0)
+        fetch = AsyncMock(return_value="alice")
+
+        assert await enricher.resolve(("irc", "al"), fetch) == "alice"
+        assert enricher.lookups == 1
+        assert enricher.deadline_misses == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_lookup_misses_deadline_and_finishes_in_background(self):
+        enricher = Enricher(deadline=0.01)
+        release = asyncio.Event()
+        resolver_cache: dict[str, str] = {}
+
+        async def slow() -> str:
+            if "k" not in resolver_cache:
+                await release.wait()
+                resolver_cache["k"] = "alice"
+            return resolver_cache["k"]
+
+        assert await enricher.resolve("k", slow) is None
+        assert enricher.deadline_misses == 1
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert enricher.background_fills == 1
+        assert await enricher.resolve("k", slow) == "alice"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_fetch(self):
+        enricher = Enricher(deadline=0.5)
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "v"
+
+        results = await asyncio.gather(*(enricher.resolve("k", fetch) for _ in range(5)))
+
+        assert results == ["v"] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_deadline_returns_only_immediate_results(self):
+        enricher = Enricher(deadline=0)
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "v"
+
+        assert await enricher.resolve("cached", AsyncMock(return_value="v")) == "v"
+        assert await enricher.resolve("k", slow) is None
+        assert enricher.deadline_misses == 1
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_lookup_error_yields_none(self):
+        enricher = Enricher(deadline=0.5)
+        fetch = AsyncMock(side_effect=[RuntimeError("portal down"), "v"])
+
+        assert await enricher.resolve("k", fetch) is None
+        assert await enricher.resolve("k", fetch) == "v"
+
+    @pytest.mark.asyncio
+    async def test_none_and_stale_values_are_not_kept(self):
+        """A user who links an account later, or whose identity the resolver drops, is seen next time."""
+        enricher = Enricher(deadline=0.5)
+        fetch = AsyncMock(side_effect=[None, "alice", "alice2"])
+
+        assert await enricher.resolve("k", fetch) is None
+        assert await enricher.resolve("k", fetch) == "alice"
+        assert await enricher.resolve("k", fetch) == "alice2"
+
+    def test_enricher_for_is_per_owner(self):
+        a, b = MagicMock(), MagicMock()
+        assert enricher_for(a) is enricher_for(a)
+        assert enricher_for(a) is not enricher_for(b)
+
+
+class TestInboundHandlerDeadline:
+    """A slow identity service no longer delays publishing."""
+
+    @pytest.mark.asyncio
+    async def test_irc_action_published_before_slow_identity_returns(self):
+        bus = Bus()
+        router = ChannelRouter()
+        router.load_from_config(
+            {"mappings": [{"discord_channel_id": "123", "irc": {"server": "irc.example.com", "channel": "#test"}}]}
+        )
+        published = []
+        bus.publish = lambda source, evt: published.append(evt)  # type: ignore[method-assign]
+        release = asyncio.Event()
+
+        async def slow_username(nick, server=None):
+            await release.wait()
+            return "portal_alice"
+
+        client = MagicMock()
+        client.nickname = "bridge"
+        client._bus = bus
+        client._router = router
+        client._server = "irc.example.com"
+        client._ready = True
+        client._puppet_nick_check = None
+        client._message_tags = {}
+        client._echoes = EchoCorrelator(ttl=120)
+        client._identity = MagicMock(username_for_irc=slow_username)
+        enricher_for(client._identity)._deadline = 0.01
+
+        await handle_ctcp_action(client, "alice", "#test", "waves")
+        release.set()
+        await asyncio.sleep(0)
+        await handle_ctcp_action(client, "alice", "#test", "waves again")
+
+        assert [e.author_display for e in published] == ["alice", "portal_alice"]
@@ -0,0 +1,218 @@
+"""Tests for the multi-process event bus: wire encoding, BusHub/IPCBus routing, remote resolver."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+from bridge.events import (
+    ConfigReload,
+    MessageBulkDeleteOut,
+    MessageDelete,
+    MessageMeta,
+    MessageOut,
+    ReactionIn,
+    TypingOut,
+    message_in,
+    message_out,
+)
+from bridge.gateway.ipc import BusHub, IPCBus, ResolverCall, decode_event, encode_event
+from bridge.gateway.msgid_resolver import RemoteMessageIDResolver
+
+
+class _Recorder:
+    def __init__(self, accept=lambda s, e: True):
+        self.events: list[tuple[str, object]] = []
+        self._accept = accept
+
+    def accept_event(self, source: str, evt: object) -> bool:
+        return self._accept(source, evt)
+
+    def push_event(self, source: str, evt: object) -> None:
+        self.events.append((source, evt))
+
+
+class TestEncoding:
+    def test_message_in_round_trip(self):
+        meta = MessageMeta(reply_quoted_content="earlier", spoiler=True, media_width=640, xmpp_id_aliases=("a", "b"))
+        _, evt = message_in(
+            "irc", "#c", "u1", "alice", "héllo 👋", "m1",
+            reply_to_id="m0", is_action=True, meta=meta,
+            raw={"tags": {"msgid": "m1", "time": None}, "n": -3, "ratio": 0.5, "ids": [1, 2], "b": b"\x00"},
+        )  # fmt: skip
+
+        source, decoded = decode_event(encode_event("irc", evt))
+
+        assert source == "irc"
+        assert decoded == evt
+        assert decoded.meta.xmpp_id_aliases == ("a", "b")
+        assert decoded.raw["ids"] == [1, 2]
+
+    @pytest.mark.parametrize(
+        "evt",
+        [
+            message_out("discord", "123", "u", "bob", "hi", "m", origin="xmpp", is_edit=True)[1],
+            MessageDelete("discord", "123", "m", author_id="u"),
+            ReactionIn("xmpp", "r@muc", "m", "👍", "u", "bob", raw={"is_remove": True}),
+            TypingOut("irc", "#c", "done"),
+            MessageBulkDeleteOut("irc", "123", (("m1", "u", "bob"), ("m2", "", ""))),
+            ResolverCall("store_irc", ("m", "42")),
+        ],
+    )
+    def test_other_events_round_trip(self, evt):
+        assert decode_event(encode_event("x", evt)) == ("x", evt)
+
+    def test_plain_message_is_compact(self):
+        _, evt = message_out("irc", "#c", "u1", "alice", "hello", "m1")
+        assert len(encode_event("relay", evt)) < 50
+
+    def test_local_events_are_not_encoded(self):
+        assert encode_event("main", ConfigReload()) is None
+
+    def test_unencodable_raw_raises_type_error(self):
+        _, evt = message_in("discord", "1", "u", "a", "hi", "m", raw={"obj": object()})
+        with pytest.raises(TypeError):
+            encode_event("discord", evt)
+
+    def test_truncated_frame_raises_value_error(self):
+        _, evt = message_out("irc", "#c", "u1", "alice", "hello", "m1")
+        with pytest.raises(ValueError, match="malformed"):
+            decode_event(encode_event("relay", evt)[:-3])
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@contextlib.asynccontextmanager
+async def _connected(tmp_path, *names: str):
+    hub = BusHub()
+    path = str(tmp_path / "bus.sock")
+    await hub.start(path)
+    buses = [IPCBus(name) for name in names]
+    for bus in buses:
+        await bus.connect(path)
+    await _until(lambda: len(hub.peers) == len(names))
+    try:
+        yield hub, buses
+    finally:
+        for bus in buses:
+            bus.close()
+        await hub.close()
+
+
+class TestBusHub:
+    @pytest.mark.asyncio
+    async def test_inbound_event_reaches_only_the_hub_relay(self, tmp_path):
+        async with _connected(tmp_path, "irc", "discord") as (hub, (irc, discord)):
+            relay, on_irc, on_discord = _Recorder(), _Recorder(), _Recorder()
+            hub.register(relay)
+            irc.register(on_irc)
+            discord.register(on_discord)
+            _, evt = message_in("irc", "#c", "u1", "alice", "hello", "m1")
+
+            irc.publish("irc", evt)
+            await _until(lambda: relay.events)
+            await asyncio.sleep(0.05)
+
+            assert relay.events == [("irc", evt)]
+            assert on_discord.events == []  # nothing in another adapter process consumes it
+            assert on_irc.events == [("irc", evt)]  # local dispatch only, not echoed back
+
+    @pytest.mark.asyncio
+    async def test_resolver_calls_reach_the_other_processes(self, tmp_path):
+        async with _connected(tmp_path, "irc", "discord", "xmpp") as (hub, (irc, discord, xmpp)):
+            relay, on_irc, on_discord, on_xmpp = _Recorder(), _Recorder(), _Recorder(), _Recorder()
+            hub.register(relay)
+            irc.register(on_irc)
+            discord.register(on_discord)
+            xmpp.register(on_xmpp)
+            call = ResolverCall("store_irc", ("irc-1", "42"))
+
+            discord.publish("resolver", call)
+            await _until(lambda: on_irc.events and on_xmpp.events and relay.events)
+
+            assert on_irc.events == on_xmpp.events == [("resolver", call)]
+            assert on_discord.events == [("resolver", call)]  # local dispatch only
+
+    @pytest.mark.asyncio
+    async def test_relay_output_goes_only_to_target_process(self, tmp_path):
+        async with _connected(tmp_path, "irc", "discord", "xmpp") as (hub, (irc, discord, xmpp)):
+            recorders = {bus.name: _Recorder() for bus in (irc, discord, xmpp)}
+            for bus in (irc, discord, xmpp):
+                bus.register(recorders[bus.name])
+            _, to_discord = message_out("discord", "123", "u1", "alice", "hello", "m1")
+
+            hub.publish("relay", to_discord)
+            await _until(lambda: recorders["discord"].events)
+            await asyncio.sleep(0.05)
+
+            assert recorders["discord"].events == [("relay", to_discord)]
+            assert recorders["irc"].events == []
+            assert recorders["xmpp"].events == []
+
+    @pytest.mark.asyncio
+    async def test_local_only_events_stay_in_process(self, tmp_path):
+        async with _connected(tmp_path, "irc") as (hub, (irc,)):
+            relay = _Recorder()
+            hub.register(relay)
+
+            irc.publish("main", ConfigReload())
+            _, evt = message_in("irc", "#c", "u1", "alice", "after", "m2")
+            irc.publish("irc", evt)
+            await _until(lambda: relay.events)
+
+            assert relay.events == [("irc", evt)]
+
+    @pytest.mark.asyncio
+    async def test_closed_set_when_hub_goes_away(self, tmp_path):
+        async with _connected(tmp_path, "irc") as (hub, (irc,)):
+            await hub.close()
+            await _until(irc.closed.is_set)
+
+    @pytest.mark.asyncio
+    async def test_stalled_process_does_not_delay_others(self, tmp_path):
+        """A peer whose writes stay buffered doesn't block delivery to the others."""
+        async with _connected(tmp_path, "irc", "discord") as (hub, (irc, discord)):
+            on_irc = _Recorder(lambda s, e: isinstance(e, MessageOut))
+            irc.register(on_irc)
+            discord._reader_task.cancel()  # discord process stops reading
+
+            for i in range(200):
+                hub.publish("relay", message_out("discord", "123", "u", "a", "x" * 1000, f"d{i}")[1])
+            _, to_irc = message_out("irc", "#c", "u1", "alice", "hello", "m1")
+            hub.publish("relay", to_irc)
+
+            await _until(lambda: on_irc.events)
+            assert on_irc.events == [("relay", to_irc)]
+
+
+class TestRemoteMessageIDResolver:
+    @pytest.mark.asyncio
+    async def test_writes_replay_on_the_process_holding_the_tracker(self, tmp_path):
+        from bridge.adapters.irc.msgid import MessageIDTracker
+
+        async with _connected(tmp_path, "discord", "irc") as (_hub, (discord_bus, irc_bus)):
+            on_discord = RemoteMessageIDResolver(discord_bus)
+            on_irc = RemoteMessageIDResolver(irc_bus)
+            tracker = MessageIDTracker()
+            on_irc.register_irc(tracker)
+
+            on_discord.store_irc("irc-1", "42")
+            await _until(lambda: tracker.get_discord_id("irc-1") == "42")
+
+            assert on_discord.get_discord_id("irc", "irc-1") == "42"  # answered from this process's copy
+            assert on_irc.get_discord_id("irc", "irc-1") == "42"
+
+    @pytest.mark.asyncio
+    async def test_xmpp_alias_resolves_locally(self, tmp_path):
+        async with _connected(tmp_path, "discord") as (_hub, (discord_bus,)):
+            resolver = RemoteMessageIDResolver(discord_bus)
+
+            resolver.store_xmpp("x-1", "42", "room@muc.example.com")
+            resolver.add_xmpp_alias("stanza-1", "x-1")
+
+            assert resolver.get_discord_id("xmpp", "stanza-1") == "42"
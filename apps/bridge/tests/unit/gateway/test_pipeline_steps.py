@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 
+from bridge.events import MessageMeta
 from bridge.formatting.irc_codes import COLOR, RESET
 from bridge.gateway.pipeline import TransformContext
 from bridge.gateway.steps import (
@@ -95,11 +96,11 @@ class TestUnwrapSpoiler:
         unwrap_spoiler("plain text", ctx)
         assert ctx.spoiler is False
 
-    def test_xmpp_spoiler_from_raw(self) -> None:
+    def test_xmpp_spoiler_from_meta(self) -> None:
         ctx = TransformContext(
             origin="xmpp",
             target="discord",
-            raw={"spoiler": True, "spoiler_reason": "plot twist"},
+            meta=MessageMeta(spoiler=True, spoiler_reason="plot twist"),
         )
         result = unwrap_spoiler("the ending is...", ctx)
         assert result == "the ending is..."
@@ -168,11 +169,11 @@ class TestWrapSpoiler:
         assert result.endswith(RESET)
         assert "secret" in result
 
-    def test_xmpp_target_sets_raw(self) -> None:
+    def test_xmpp_target_keeps_flag(self) -> None:
         ctx = TransformContext(origin="discord", target="xmpp", spoiler=True)
         result = wrap_spoiler("secret", ctx)
-        assert result == "secret"  # content unchanged
-        assert ctx.raw["spoiler"] is True
+        assert result == "secret"  # content unchanged; adapter emits XEP-0382
+        assert ctx.spoiler is True
 
     def test_xmpp_target_with_reason(self) -> None:
         ctx = TransformContext(
@@ -181,8 +182,8 @@ class TestWrapSpoiler:
             spoiler=True,
             spoiler_reason="plot twist",
         )
-        wrap_spoiler("secret", ctx)
-        assert ctx.raw["spoiler_reason"] == "plot twist"
+        assert wrap_spoiler("secret", ctx) == "secret"
+        assert ctx.spoiler_reason == "plot twist"
 
 
 # ── add_reply_fallback ────────────────────────────────────────────────────
@@ -202,10 +203,10 @@ class TestAddReplyFallback:
             origin="discord",
             target="irc",
             reply_to_id="msg-1",
-            raw={"reply_quoted_content": "original message"},
+            meta=MessageMeta(reply_quoted_content="original message"),
         )
         assert add_reply_fallback("my reply", ctx) == "> original message | my reply"
-        assert ctx.raw.get("reply_fallback_added") is True
+        assert ctx.reply_fallback_added is True
 
     def test_irc_target_with_reply_and_author(self) -> None:
         """With reply_quoted_author, prepend author: prefix."""
@@ -213,7 +214,7 @@ class TestAddReplyFallback:
             origin="discord",
             target="irc",
             reply_to_id="msg-1",
-            raw={"reply_quoted_content": "hi", "reply_quoted_author": "kaizen"},
+            meta=MessageMeta(reply_quoted_content="hi", reply_quoted_author="kaizen"),
         )
         assert add_reply_fallback("ok", ctx) == "kaizen: > hi | ok"
 
@@ -0,0 +1,126 @@
+"""Tests for reaction aggregation in the relay: net change per (message, user), cancelled pairs."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bridge.events import ReactionIn, ReactionOut
+from bridge.gateway.bus import Bus
+from bridge.gateway.reactions import ReactionAggregator
+from bridge.gateway.relay import Relay
+from bridge.gateway.router import ChannelRouter
+
+_WINDOW = 0.05
+
+
+class _Capture:
+    def __init__(self) -> None:
+        self.events: list[ReactionOut] = []
+
+    def accept_event(self, source: str, evt: object) -> bool:
+        return isinstance(evt, ReactionOut)
+
+    def push_event(self, source: str, evt: object) -> None:
+        self.events.append(evt)
+
+
+def _setup(*, window: float | None = _WINDOW) -> tuple[Bus, Relay, _Capture]:
+    bus = Bus()
+    router = ChannelRouter()
+    router.load_from_config(
+        {
+            "mappings": [
+                {
+                    "discord_channel_id": "123",
+                    "irc": {"server": "irc.libera.chat", "channel": "#test"},
+                    "xmpp": {"muc_jid": "room@conf.example.com"},
+                }
+            ]
+        }
+    )
+    relay = Relay(bus, router)
+    if window is not None:
+        relay.reactions = ReactionAggregator(relay._emit_reaction, window=window)
+    bus.register(relay)
+    out = _Capture()
+    bus.register(out)
+    return bus, relay, out
+
+
+def _reaction(emoji: str, *, author_id: str = "u1", remove: bool = False) -> ReactionIn:
+    return ReactionIn("discord", "123", "m1", emoji, author_id, "alice", raw={"is_remove": True} if remove else {})
+
+
+def _sent(out: _Capture) -> list[tuple[str, str, str, bool]]:
+    return [(e.target_origin, e.author_id, e.emoji, bool(e.raw.get("is_remove"))) for e in out.events]
+
+
+class TestReactionAggregation:
+    @pytest.mark.asyncio
+    async def test_add_then_remove_cancels_out(self):
+        bus, relay, out = _setup()
+
+        bus.publish("discord", _reaction("👍"))
+        bus.publish("discord", _reaction("❤️"))
+        bus.publish("discord", _reaction("👍", remove=True))
+        assert out.events == []
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert _sent(out) == [("irc", "u1", "❤️", False), ("xmpp", "u1", "❤️", False)]
+        assert relay.reactions.stats() == {
+            "delivered": 1,
+            "cancelled": 2,
+            "repeated": 0,
+            "sends_saved": 4,
+            "held": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_repeated_reaction_is_sent_once(self):
+        bus, relay, out = _setup()
+
+        bus.publish("discord", _reaction("👍"))
+        bus.publish("discord", _reaction("👍"))
+        await asyncio.sleep(_WINDOW * 2)
+
+        assert len(out.events) == 2
+        assert relay.reactions.repeated == 1
+
+    @pytest.mark.asyncio
+    async def test_users_are_aggregated_separately_and_sent_back_to_back(self):
+        bus, _, out = _setup()
+
+        bus.publish("discord", _reaction("👍", author_id="u1"))
+        bus.publish("discord", _reaction("🎉", author_id="u2"))
+        bus.publish("discord", _reaction("❤️", author_id="u1"))
+        await asyncio.sleep(_WINDOW * 2)
+
+        xmpp = [(author, emoji) for target, author, emoji, _ in _sent(out) if target == "xmpp"]
+        assert xmpp == [("u1", "👍"), ("u1", "❤️"), ("u2", "🎉")]
+
+    def test_off_by_default(self):
+        bus, _, out = _setup(window=None)
+
+        bus.publish("discord", _reaction("👍"))
+        bus.publish("discord", _reaction("👍", remove=True))
+
+        assert len(out.events) == 4
+
+    @pytest.mark.asyncio
+    async def test_relay_flush_delivers_held_reactions_and_logs_counters(self):
+        from loguru import logger
+
+        bus, relay, out = _setup()
+        messages: list[str] = []
+        sink = logger.add(messages.append, level="INFO", format="{message}")
+        try:
+            bus.publish("discord", _reaction("👍"))
+            bus.publish("discord", _reaction("👍"))
+            relay.flush()
+        finally:
+            logger.remove(sink)
+
+        assert _sent(out) == [("irc", "u1", "👍", False), ("xmpp", "u1", "👍", False)]
+        assert relay.reactions.stats()["held"] == 0
+        assert any("reaction aggregation" in m and "'repeated': 1" in m for m in messages)
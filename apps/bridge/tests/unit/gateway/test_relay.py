@@ -6,6 +6,7 @@ from bridge.events import (
     MessageDelete,
     MessageDeleteOut,
     MessageIn,
+    MessageMeta,
     MessageOut,
     ReactionIn,
     ReactionOut,
@@ -353,17 +354,18 @@ class TestRelay:
             "reply from discord",
             "msg2",
             reply_to_id="msg1",
-            raw={"reply_quoted_content": "test from irc"},
+            meta=MessageMeta(reply_quoted_content="test from irc"),
         )
         bus.publish("discord", evt)
 
         _, out_evt = irc_adapter.received_events[0]
         assert "> test from irc" in out_evt.content
         assert "| reply from discord" in out_evt.content
-        assert out_evt.raw.get("reply_fallback_added") is True
+        assert out_evt.meta.reply_fallback_added is True
+        assert evt.meta.reply_fallback_added is False  # copy-on-write: inbound meta untouched
 
     def test_relay_adds_quote_with_author_for_discord_to_irc_reply(self):
-        """Discord -> IRC reply: nick: > quoted | reply when reply_quoted_author in raw."""
+        """Discord -> IRC reply: nick: > quoted | reply when reply_quoted_author in meta."""
         bus = Bus()
         router = ChannelRouter()
         config = {
@@ -388,7 +390,7 @@ class TestRelay:
             "ok",
             "msg2",
             reply_to_id="msg1",
-            raw={"reply_quoted_content": "hi", "reply_quoted_author": "kaizen"},
+            meta=MessageMeta(reply_quoted_content="hi", reply_quoted_author="kaizen"),
         )
         bus.publish("discord", evt)
 
@@ -423,7 +425,7 @@ class TestRelay:
             "> reply from discord to xmpp msg\nreply from gajim",
             "msg2",
             reply_to_id="msg1",
-            raw={"reply_quoted_content": "reply from discord to xmpp msg"},
+            meta=MessageMeta(reply_quoted_content="reply from discord to xmpp msg"),
         )
         bus.publish("xmpp", evt)
 
@@ -693,6 +695,6 @@ class TestRelay:
 
         msgs = [e for _, e in discord_adapter.received_events if isinstance(e, MessageOut)]
         assert len(msgs) == 1
-        assert msgs[0].raw.get("is_edit") is True
+        assert msgs[0].is_edit is True
         assert msgs[0].raw.get("replace_id") == "orig-1"
-        assert msgs[0].raw.get("origin") == "xmpp"
+        assert msgs[0].origin == "xmpp"
@@ -7,6 +7,7 @@ from unittest.mock import patch
 from bridge.events import (
     MessageDeleteOut,
     MessageIn,
+    MessageMeta,
     MessageOut,
     ReactionOut,
     TypingOut,
@@ -278,20 +279,37 @@ class TestNoMappingRouting:
 
 
 class TestOutboundFields:
-    def test_message_out_raw_contains_origin(self):
+    def test_message_out_carries_origin(self):
         bus, _discord, irc, xmpp = _setup()
         _, evt = message_in("discord", "123", "u1", "User", "hi", "m1")
         bus.publish("discord", evt)
-        assert irc.events[0].raw.get("origin") == "discord"
-        assert xmpp.events[0].raw.get("origin") == "discord"
+        assert irc.events[0].origin == "discord"
+        assert xmpp.events[0].origin == "discord"
 
-    def test_message_out_raw_is_edit_false_for_normal_message(self):
+    def test_message_out_is_edit_false_for_normal_message(self):
         bus, _discord, irc, _xmpp = _setup()
         _, evt = message_in("discord", "123", "u1", "User", "hi", "m1")
         bus.publish("discord", evt)
-        assert irc.events[0].raw.get("is_edit") is False
+        assert irc.events[0].is_edit is False
 
-    def test_message_out_raw_is_edit_true_for_edit(self):
+    def test_message_out_shares_inbound_meta_and_raw(self):
+        bus, _discord, irc, xmpp = _setup()
+        meta = MessageMeta(media_width=640, media_height=480)
+        _, evt = message_in("discord", "123", "u1", "User", "hi", "m1", meta=meta, raw={"k": "v"})
+        bus.publish("discord", evt)
+        assert irc.events[0].meta is meta and xmpp.events[0].meta is meta
+        assert irc.events[0].raw is evt.raw and xmpp.events[0].raw is evt.raw
+
+    def test_message_out_meta_copied_when_pipeline_changes_it(self):
+        bus, _discord, _irc, xmpp = _setup()
+        meta = MessageMeta(media_width=640, media_height=480)
+        _, evt = message_in("discord", "123", "u1", "User", "||boo||", "m1", meta=meta)
+        bus.publish("discord", evt)
+        assert xmpp.events[0].meta is not meta
+        assert (xmpp.events[0].meta.spoiler, xmpp.events[0].meta.media_width) == (True, 640)
+        assert meta.spoiler is False
+
+    def test_message_out_is_edit_true_for_edit(self):
         bus, _discord, irc, _xmpp = _setup()
         evt = MessageIn(
             "discord",
@@ -304,7 +322,7 @@ class TestOutboundFields:
             raw={"replace_id": "orig-1"},
         )
         bus.publish("discord", evt)
-        assert irc.events[0].raw.get("is_edit") is True
+        assert irc.events[0].is_edit is True
         assert irc.events[0].raw.get("replace_id") == "orig-1"
 
     def test_avatar_url_preserved_in_message_out(self):
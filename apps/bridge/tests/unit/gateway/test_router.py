@@ -472,23 +472,23 @@ class TestChannelRouterDictIndexes:
     def test_empty_config_produces_empty_indexes(self):
         router = ChannelRouter()
         router.load_from_config({})
-        assert router._by_discord == {}
-        assert router._by_irc == {}
-        assert router._by_xmpp == {}
+        assert router._index.by_discord == {}
+        assert router._index.by_irc == {}
+        assert router._index.by_xmpp == {}
 
     def test_empty_mappings_list_produces_empty_indexes(self):
         router = ChannelRouter()
         router.load_from_config({"mappings": []})
-        assert router._by_discord == {}
-        assert router._by_irc == {}
-        assert router._by_xmpp == {}
+        assert router._index.by_discord == {}
+        assert router._index.by_irc == {}
+        assert router._index.by_xmpp == {}
 
     def test_non_list_mappings_produces_empty_indexes(self):
         router = ChannelRouter()
         router.load_from_config({"mappings": "not a list"})
-        assert router._by_discord == {}
-        assert router._by_irc == {}
-        assert router._by_xmpp == {}
+        assert router._index.by_discord == {}
+        assert router._index.by_irc == {}
+        assert router._index.by_xmpp == {}
 
 
 # ---------------------------------------------------------------------------
@@ -569,7 +569,7 @@ class TestRouterLookupEquivalenceProperty:
         router.load_from_config({"mappings": entries})
 
         dict_result = router.get_mapping_for_discord(query_discord_id)
-        linear_result = _linear_scan_discord(router._mappings, query_discord_id)
+        linear_result = _linear_scan_discord(router.all_mappings(), query_discord_id)
 
         assert dict_result is linear_result
 
@@ -590,7 +590,7 @@ class TestRouterLookupEquivalenceProperty:
         router.load_from_config({"mappings": entries})
 
         dict_result = router.get_mapping_for_irc(query_server, query_channel)
-        linear_result = _linear_scan_irc(router._mappings, query_server, query_channel)
+        linear_result = _linear_scan_irc(router.all_mappings(), query_server, query_channel)
 
         assert dict_result is linear_result
 
@@ -605,6 +605,90 @@ class TestRouterLookupEquivalenceProperty:
         router.load_from_config({"mappings": entries})
 
         dict_result = router.get_mapping_for_xmpp(query_muc_jid)
-        linear_result = _linear_scan_xmpp(router._mappings, query_muc_jid)
+        linear_result = _linear_scan_xmpp(router.all_mappings(), query_muc_jid)
 
         assert dict_result is linear_result
+
+
+def _cfg(*entries: tuple[str, str | None, str | None]) -> dict:
+    """Config from (discord_id, irc_channel, muc_jid) tuples on one IRC server."""
+    mappings = []
+    for dc_id, channel, muc in entries:
+        item: dict = {"discord_channel_id": dc_id}
+        if channel:
+            item["irc"] = {"server": "irc.example.com", "channel": channel}
+        if muc:
+            item["xmpp"] = {"muc_jid": muc}
+        mappings.append(item)
+    return {"mappings": mappings}
+
+
+class TestMappingReload:
+    """Reload returns a MappingDiff and patches only the affected index entries."""
+
+    def test_initial_load_reports_everything_added(self):
+        router = ChannelRouter()
+        diff = router.load_from_config(_cfg(("1", "#a", "a@muc"), ("2", "#b", None)))
+        assert [m.discord_channel_id for m in diff.added] == ["1", "2"]
+        assert diff.removed == diff.changed == ()
+        assert diff.seconds >= 0
+
+    def test_unchanged_reload_is_empty_and_keeps_index(self):
+        router = ChannelRouter()
+        cfg = _cfg(("1", "#a", "a@muc"))
+        router.load_from_config(cfg)
+        index = router._index
+        diff = router.load_from_config(cfg)
+        assert not diff
+        assert router._index is index
+
+    def test_added_removed_and_changed(self):
+        router = ChannelRouter()
+        router.load_from_config(_cfg(("1", "#a", "a@muc"), ("2", "#b", None), ("3", None, "c@muc")))
+        kept = router.get_mapping_for_discord("1")
+        diff = router.load_from_config(_cfg(("1", "#a", "a@muc"), ("2", "#b2", None), ("4", "#d", None)))
+
+        assert [m.discord_channel_id for m in diff.added] == ["4"]
+        assert [m.discord_channel_id for m in diff.removed] == ["3"]
+        assert [(old.irc.channel, new.irc.channel) for old, new in diff.changed] == [("#b", "#b2")]
+        assert diff.irc_changes() == (
+            {("irc.example.com", "#b")},
+            {("irc.example.com", "#b2"), ("irc.example.com", "#d")},
+        )
+        assert diff.xmpp_changes() == ({"c@muc"}, set())
+        # Unchanged mapping keeps its entries (same object); removed keys are gone
+        assert router.get_mapping_for_irc("irc.example.com", "#a") is kept
+        assert router.get_mapping_for_irc("irc.example.com", "#b") is None
+        assert router.get_mapping_for_xmpp("c@muc") is None
+        assert router.get_mapping_for_irc("irc.example.com", "#d").discord_channel_id == "4"
+
+    def test_endpoint_moving_between_mappings_is_not_reported(self):
+        router = ChannelRouter()
+        router.load_from_config(_cfg(("1", "#a", None), ("2", None, None)))
+        diff = router.load_from_config(_cfg(("1", None, None), ("2", "#a", None)))
+        assert diff.irc_changes() == (set(), set())
+        assert router.get_mapping_for_irc("irc.example.com", "#a").discord_channel_id == "2"
+
+    @given(
+        before=st.lists(_mapping_entry_st, min_size=0, max_size=12),
+        after=st.lists(_mapping_entry_st, min_size=0, max_size=12),
+        query_discord_id=_discord_ids,
+        query_channel=_irc_channels,
+        query_muc_jid=_muc_jids,
+    )
+    @settings(max_examples=300)
+    def test_reload_matches_fresh_load(self, before, after, query_discord_id, query_channel, query_muc_jid):
+        """Lookups after reloading *before* -> *after* equal those of a router loaded with *after* only."""
+        reloaded = ChannelRouter()
+        reloaded.load_from_config({"mappings": before})
+        reloaded.load_from_config({"mappings": after})
+        fresh = ChannelRouter()
+        fresh.load_from_config({"mappings": after})
+
+        assert reloaded.all_mappings() == fresh.all_mappings()
+        assert reloaded.get_mapping_for_discord(query_discord_id) == fresh.get_mapping_for_discord(query_discord_id)
+        for server in ("irc.libera.chat", "irc.example.com", "irc.freenode.net"):
+            assert reloaded.get_mapping_for_irc(server, query_channel) == fresh.get_mapping_for_irc(
+                server, query_channel
+            )
+        assert reloaded.get_mapping_for_xmpp(query_muc_jid) == fresh.get_mapping_for_xmpp(query_muc_jid)
@@ -0,0 +1,109 @@
+"""Tests for mapping sharding: hash ring ownership, shard config, sharded router loads."""
+
+from __future__ import annotations
+
+import pytest
+from bridge.core.errors import BridgeConfigurationError
+from bridge.gateway.router import ChannelRouter
+from bridge.gateway.sharding import HashRing, shard_from_config
+
+_IDS = [str(100000000000000000 + i * 7919) for i in range(2000)]
+
+
+def _config(members: list[str] | None = None, **extra) -> dict:
+    mappings = [
+        {"discord_channel_id": dc_id, "irc": {"server": "irc.example.com", "channel": f"#c{dc_id}"}}
+        for dc_id in _IDS[:60]
+    ]
+    cfg: dict = {"mappings": mappings, **extra}
+    if members is not None:
+        cfg["shard_members"] = members
+    return cfg
+
+
+class TestHashRing:
+    def test_owner_is_deterministic_and_order_independent(self):
+        a = HashRing(["a", "b", "c"])
+        b = HashRing(["c", "a", "b"])
+        assert [a.owner(k) for k in _IDS] == [b.owner(k) for k in _IDS]
+
+    def test_keys_spread_over_members(self):
+        ring = HashRing(["a", "b", "c", "d"])
+        counts = {m: 0 for m in ring.members}
+        for key in _IDS:
+            counts[ring.owner(key)] += 1
+        assert min(counts.values()) > len(_IDS) / 4 * 0.6
+
+    def test_adding_a_member_moves_only_its_share(self):
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+        moved = [k for k in _IDS if before.owner(k) != after.owner(k)]
+        assert all(after.owner(k) == "d" for k in moved)
+        assert len(moved) < len(_IDS) / 4 * 1.5
+
+    def test_needs_a_member(self):
+        with pytest.raises(ValueError):
+            HashRing([])
+
+
+class TestShardFromConfig:
+    def test_off_without_instance(self, monkeypatch):
+        monkeypatch.delenv("BRIDGE_SHARD_INSTANCE", raising=False)
+        assert shard_from_config({"shard_members": ["a", "b"]}) is None
+
+    def test_env_instance_overrides_config(self, monkeypatch):
+        monkeypatch.setenv("BRIDGE_SHARD_INSTANCE", "b")
+        shard = shard_from_config({"shard_instance": "a", "shard_members": ["a", "b"]})
+        assert shard is not None
+        assert shard.instance == "b"
+
+    def test_members_file_takes_precedence(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("BRIDGE_SHARD_INSTANCE", raising=False)
+        members = tmp_path / "members"
+        members.write_text("# bridge instances\na\n\nb  # second host\nc\n")
+        shard = shard_from_config({"shard_instance": "a", "shard_members": ["a"], "shard_members_file": str(members)})
+        assert shard is not None
+        assert shard.ring.members == ("a", "b", "c")
+
+    def test_unreadable_members_file_is_a_config_error(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("BRIDGE_SHARD_INSTANCE", raising=False)
+        with pytest.raises(BridgeConfigurationError):
+            shard_from_config({"shard_instance": "a", "shard_members_file": str(tmp_path / "missing")})
+
+    def test_no_members_owns_everything(self, monkeypatch):
+        monkeypatch.delenv("BRIDGE_SHARD_INSTANCE", raising=False)
+        shard = shard_from_config({"shard_instance": "a"})
+        assert shard is not None
+        assert all(shard.owns(k) for k in _IDS[:50])
+
+
+class TestShardedRouter:
+    def test_instances_partition_the_mappings(self, monkeypatch):
+        owned: dict[str, set[str]] = {}
+        for instance in ("a", "b", "c"):
+            monkeypatch.setenv("BRIDGE_SHARD_INSTANCE", instance)
+            router = ChannelRouter()
+            router.load_from_config(_config(["a", "b", "c"]))
+            owned[instance] = {m.discord_channel_id for m in router.all_mappings()}
+        assert set().union(*owned.values()) == set(_IDS[:60])
+        assert sum(len(ids) for ids in owned.values()) == 60
+
+    def test_instance_outside_members_owns_nothing(self, monkeypatch):
+        monkeypatch.setenv("BRIDGE_SHARD_INSTANCE", "z")
+        router = ChannelRouter()
+        router.load_from_config(_config(["a", "b"]))
+        assert router.all_mappings() == []
+
+    def test_rebalance_reports_moved_mappings_as_removed(self, monkeypatch):
+        monkeypatch.setenv("BRIDGE_SHARD_INSTANCE", "a")
+        router = ChannelRouter()
+        router.load_from_config(_config(["a", "b"]))
+        before = {m.discord_channel_id for m in router.all_mappings()}
+
+        diff = router.load_from_config(_config(["a", "b", "c"]))
+
+        after = {m.discord_channel_id for m in router.all_mappings()}
+        assert not diff.added
+        assert not diff.changed
+        assert {m.discord_channel_id for m in diff.removed} == before - after
+        assert after <= before
@@ -8,8 +8,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from bridge.adapters.irc import IRCAdapter
-from bridge.events import MessageDeleteOut, MessageOut, ReactionOut, TypingOut
-from bridge.gateway import Bus, ChannelRouter
+from bridge.events import ConfigReload, MessageBulkDeleteOut, MessageDeleteOut, MessageOut, ReactionOut, TypingOut
+from bridge.gateway import Bus, ChannelRouter, MappingDiff
 from bridge.gateway.router import ChannelMapping, IrcTarget
 
 # ---------------------------------------------------------------------------
@@ -53,6 +53,7 @@ def _mock_client() -> MagicMock:
     c = MagicMock()
     c.rawmsg = AsyncMock()
     c.queue_message = MagicMock()
+    c.pending_sends.return_value = 0
     c._typing_last = 0
     c._capabilities = {"draft/message-redaction": True}  # REDACT support
     return c
@@ -400,6 +401,19 @@ class TestSendRedact:
             await adapter._send_redact(evt)
         adapter._client.rawmsg.assert_awaited_once_with("REDACT", "#test", "irc-id")
 
+    @pytest.mark.asyncio
+    async def test_deleting_one_message_of_a_coalesced_line_does_not_redact_it(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._msgid_tracker.store("irc-id", "d1")
+        adapter._msgid_tracker.store_aliases("irc-id", ["d2", "d3"])
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageDeleteOut(target_origin="irc", channel_id="111", message_id="d2")
+        with patch("bridge.adapters.irc.adapter.cfg") as mock_cfg:
+            mock_cfg.irc_redact_enabled = True
+            await adapter._send_redact(evt)
+        adapter._client.rawmsg.assert_not_called()  # d1 and d3 are still on that line
+
     @pytest.mark.asyncio
     async def test_skips_redact_when_disabled(self):
         """REDACT is skipped when irc_redact_enabled is false (UnrealIRCd workaround)."""
@@ -428,6 +442,67 @@ class TestSendRedact:
         adapter._client.rawmsg.assert_not_called()
 
 
+class TestSendRedactBatch:
+    @pytest.mark.asyncio
+    async def test_redacts_known_messages_under_the_flood_budget(self):
+        from bridge.adapters.irc.throttle import TokenBucket
+
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._client._throttle = TokenBucket(limit=2, refill_rate=2.0)
+        for i in range(4):
+            adapter._msgid_tracker.store(f"irc-{i}", f"d{i}")
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageBulkDeleteOut("irc", "111", tuple((f"d{i}", "", "") for i in range(5)))
+
+        with (
+            patch("bridge.adapters.irc.adapter.cfg") as mock_cfg,
+            patch("bridge.adapters.irc.throttle.asyncio.sleep", new=AsyncMock()) as sleep,
+        ):
+            mock_cfg.irc_redact_enabled = True
+            await adapter._send_redact_batch(evt)
+
+        assert [c.args for c in adapter._client.rawmsg.await_args_list] == [
+            ("REDACT", "#test", f"irc-{i}") for i in range(4)
+        ]
+        assert sleep.await_count >= 2  # the two lines past the burst waited for tokens
+
+    @pytest.mark.asyncio
+    async def test_coalesced_line_is_redacted_once_and_only_when_all_its_messages_go(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._client._throttle = None
+        tracker = adapter._msgid_tracker
+        tracker.store("irc-a", "d1")
+        tracker.store_aliases("irc-a", ["d2"])
+        tracker.store("irc-b", "d3")
+        tracker.store_aliases("irc-b", ["d4"])
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageBulkDeleteOut("irc", "111", (("d1", "", ""), ("d2", "", ""), ("d3", "", "")))
+
+        with (
+            patch("bridge.adapters.irc.adapter.cfg") as mock_cfg,
+            patch("bridge.adapters.irc.adapter.take_tokens", new=AsyncMock()),
+        ):
+            mock_cfg.irc_redact_enabled = True
+            await adapter._send_redact_batch(evt)
+
+        # irc-b also carries d4, which was not deleted
+        assert [c.args for c in adapter._client.rawmsg.await_args_list] == [("REDACT", "#test", "irc-a")]
+
+    @pytest.mark.asyncio
+    async def test_skips_batch_when_disabled(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._msgid_tracker.store("irc-id", "discord-id")
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageBulkDeleteOut("irc", "111", (("discord-id", "", ""),))
+        with patch("bridge.adapters.irc.adapter.cfg") as mock_cfg:
+            mock_cfg.irc_redact_enabled = False
+            await adapter._send_redact_batch(evt)
+        adapter._client.rawmsg.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # _send_via_puppet
 # ---------------------------------------------------------------------------
@@ -515,7 +590,8 @@ class TestSendViaPuppet:
             author_display="kaizen",
             content="hi",
             message_id="m1",
-            raw={"origin": "xmpp", "real_jid": "kaizen@xmpp.localhost"},
+            origin="xmpp",
+            raw={"real_jid": "kaizen@xmpp.localhost"},
         )
         await adapter._send_via_puppet(evt)
         cast(MagicMock, adapter._client).queue_message.assert_called_once_with(evt)
@@ -523,6 +599,136 @@ class TestSendViaPuppet:
         cast(AsyncMock, adapter._identity.has_irc).assert_not_awaited()
 
 
+class TestPuppetPendingFallback:
+    @pytest.mark.asyncio
+    async def test_pending_puppet_uses_main_connection_and_starts_connect(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._puppet_manager = MagicMock()
+        adapter._puppet_manager.has_puppet.return_value = False
+        adapter._puppet_manager.send_message = AsyncMock()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageOut(
+            target_origin="irc",
+            channel_id="111",
+            author_id="u",
+            author_display="U",
+            content="hi",
+            message_id="m1",
+        )
+
+        await adapter._send_via_puppet(evt)
+
+        cast(MagicMock, adapter._client).queue_message.assert_called_once_with(evt)
+        adapter._puppet_manager.start_puppet.assert_called_once_with("u")
+        adapter._puppet_manager.send_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_connected_puppet_is_used(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._puppet_manager = MagicMock()
+        adapter._puppet_manager.has_puppet.return_value = True
+        adapter._puppet_manager.send_message = AsyncMock()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageOut(
+            target_origin="irc",
+            channel_id="111",
+            author_id="u",
+            author_display="U",
+            content="hi",
+            message_id="m1",
+        )
+
+        await adapter._send_via_puppet(evt)
+
+        adapter._puppet_manager.send_message.assert_awaited_once_with("u", "#test", "hi", avatar_url=None)
+        cast(MagicMock, adapter._client).queue_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connected_puppet_waits_for_fallback_sends_to_drain(self):
+        adapter, _, router = _make_adapter()
+        adapter._client = _mock_client()
+        adapter._client.pending_sends.return_value = 1  # previous message still on the main queue
+        adapter._puppet_manager = MagicMock()
+        adapter._puppet_manager.has_puppet.return_value = True
+        adapter._puppet_manager.send_message = AsyncMock()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        evt = MessageOut(
+            target_origin="irc",
+            channel_id="111",
+            author_id="u",
+            author_display="U",
+            content="second",
+            message_id="m2",
+        )
+
+        await adapter._send_via_puppet(evt)
+
+        cast(MagicMock, adapter._client).queue_message.assert_called_once_with(evt)
+        adapter._puppet_manager.send_message.assert_not_awaited()
+
+
+class TestPuppetSendQueue:
+    @staticmethod
+    def _evt(message_id: str, author: str = "u") -> MessageOut:
+        return MessageOut(
+            target_origin="irc",
+            channel_id="111",
+            author_id=author,
+            author_display=author,
+            content=message_id,
+            message_id=message_id,
+        )
+
+    @pytest.mark.asyncio
+    async def test_same_author_sends_in_order(self):
+        adapter, _, router = _make_adapter()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        sent: list[str] = []
+
+        async def slow_first(discord_id, channel, content, avatar_url=None):
+            if content == "m1":
+                await asyncio.sleep(0.02)  # e.g. puppet connect + JOIN
+            sent.append(content)
+
+        adapter._puppet_manager = AsyncMock()
+        adapter._puppet_manager.send_message = AsyncMock(side_effect=slow_first)
+        for mid in ("m1", "m2", "m3"):
+            adapter.push_event("discord", self._evt(mid))
+        await asyncio.gather(*adapter._puppet_tasks)
+
+        assert sent == ["m1", "m2", "m3"]
+        assert adapter._puppet_queues == {}
+
+    @pytest.mark.asyncio
+    async def test_one_drain_task_per_author(self):
+        adapter, _, router = _make_adapter()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        adapter._puppet_manager = AsyncMock()
+        adapter.push_event("discord", self._evt("m1", "a"))
+        adapter.push_event("discord", self._evt("m2", "a"))
+        adapter.push_event("discord", self._evt("m3", "b"))
+
+        assert len(adapter._puppet_tasks) == 2
+        assert len(adapter._puppet_queues["a"]) == 2
+        await asyncio.gather(*adapter._puppet_tasks)
+        assert adapter._puppet_manager.send_message.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_send_does_not_block_the_queue(self):
+        adapter, _, router = _make_adapter()
+        router.get_mapping_for_discord.return_value = _irc_mapping()
+        adapter._puppet_manager = AsyncMock()
+        adapter._puppet_manager.send_message = AsyncMock(side_effect=[RuntimeError("boom"), None])
+        adapter.push_event("discord", self._evt("m1"))
+        adapter.push_event("discord", self._evt("m2"))
+        await asyncio.gather(*adapter._puppet_tasks)
+
+        assert adapter._puppet_manager.send_message.await_count == 2
+        assert adapter._puppet_queues == {}
+
+
 # ---------------------------------------------------------------------------
 # start
 # ---------------------------------------------------------------------------
@@ -596,6 +802,73 @@ class TestStop:
         bus.unregister.assert_called_once_with(adapter)
 
 
+# ---------------------------------------------------------------------------
+# Mapping reload
+# ---------------------------------------------------------------------------
+
+
+class TestMappingReload:
+    def _reloaded(self, before: dict, after: dict) -> tuple[IRCAdapter, MagicMock, MappingDiff]:
+        router = ChannelRouter()
+        router.load_from_config(before)
+        adapter = IRCAdapter(MagicMock(spec=Bus), router, identity_resolver=None)
+        client = _mock_client()
+        client.connected = True
+        client.join = AsyncMock()
+        client.part = AsyncMock()
+        client._channels = [m.irc.channel for m in router.all_mappings() if m.irc]
+        adapter._client = client
+        adapter._puppet_manager = MagicMock(part_channel=AsyncMock())
+        return adapter, client, router.load_from_config(after)
+
+    @staticmethod
+    def _cfg(*channels: tuple[str, str]) -> dict:
+        return {
+            "mappings": [
+                {"discord_channel_id": dc, "irc": {"server": "irc.libera.chat", "channel": ch}} for dc, ch in channels
+            ]
+        }
+
+    def test_accepts_only_non_empty_reload(self):
+        adapter, _, _ = _make_adapter()
+        assert adapter.accept_event("main", ConfigReload(MappingDiff(added=(_irc_mapping(),))))
+        assert not adapter.accept_event("main", ConfigReload(MappingDiff()))
+        assert not adapter.accept_event("main", ConfigReload())
+
+    @pytest.mark.asyncio
+    async def test_joins_added_and_parts_removed_channels_only(self):
+        adapter, client, diff = self._reloaded(
+            self._cfg(("1", "#keep"), ("2", "#old")), self._cfg(("1", "#keep"), ("3", "#new"))
+        )
+
+        await adapter._apply_mapping_diff(diff)
+
+        client.join.assert_awaited_once_with("#new")
+        client.part.assert_awaited_once_with("#old")
+        adapter._puppet_manager.part_channel.assert_awaited_once_with("#old")
+        assert client._channels == ["#keep", "#new"]
+
+    @pytest.mark.asyncio
+    async def test_changed_mapping_moves_channel(self):
+        adapter, client, diff = self._reloaded(self._cfg(("1", "#a")), self._cfg(("1", "#b")))
+
+        await adapter._apply_mapping_diff(diff)
+
+        client.part.assert_awaited_once_with("#a")
+        client.join.assert_awaited_once_with("#b")
+
+    @pytest.mark.asyncio
+    async def test_disconnected_client_only_updates_channel_list(self):
+        adapter, client, diff = self._reloaded(self._cfg(("1", "#a")), self._cfg(("2", "#b")))
+        client.connected = False
+
+        await adapter._apply_mapping_diff(diff)
+
+        client.join.assert_not_awaited()
+        client.part.assert_not_awaited()
+        assert client._channels == ["#b"]  # joined by on_connect
+
+
 # ---------------------------------------------------------------------------
 # Edge cases / race conditions
 # ---------------------------------------------------------------------------
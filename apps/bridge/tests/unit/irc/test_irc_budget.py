@@ -0,0 +1,124 @@
+"""Tests for the exact per-target IRC payload budget (ISUPPORT LINELEN, observed hostmask)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pydle
+import pytest
+from bridge.adapters.irc import payload_budget
+from bridge.adapters.irc.budget import observe_displayed_host, observe_userhost, observed_hostmask
+from pydle.features.rfc1459.protocol import MESSAGE_LENGTH_LIMIT
+
+
+def _client(nick: str = "bridge", **isupport: str) -> pydle.Client:
+    client = pydle.Client(nick)
+    client._isupport.update(isupport)
+    return client
+
+
+def _reply(command: str, *params: str) -> Any:
+    return SimpleNamespace(command=command, params=list(params))
+
+
+def _registered() -> pydle.Client:
+    client = _client()
+    client.nickname = "bridge"  # as after RPL_WELCOME
+    return client
+
+
+def _seen_as(client: pydle.Client, user: str, host: str) -> None:
+    client.users[client.nickname] = {"nickname": client.nickname, "username": user, "hostname": host}
+
+
+def _seen_client() -> pydle.Client:
+    client = _client()
+    _seen_as(client, "bridge", "host")
+    return client
+
+
+class TestPayloadBudget:
+    def test_observed_hostmask_gives_exact_relayed_overhead(self):
+        client = _client()
+        _seen_as(client, "~bridge", "atl.chat")
+        # ":alice/d!~bridge@atl.chat PRIVMSG #dev :" + CRLF
+        overhead = len(":alice/d!~bridge@atl.chat PRIVMSG #dev :") + 2
+        assert payload_budget(client, "#dev", "alice/d", command="RELAYMSG") == 512 - overhead
+
+    def test_unobserved_hostmask_assumes_isupport_maxima(self):
+        client = _client(USERLEN="12", HOSTLEN="40")
+        overhead = len(":bridge!") + 13 + 1 + 40 + len(" PRIVMSG #dev :") + 2
+        assert observed_hostmask(client) is None
+        assert payload_budget(client, "#dev", "bridge") == 512 - overhead
+
+    def test_linelen_lowers_budget(self):
+        client = _client(LINELEN="400")
+        _seen_as(client, "bridge", "host")
+        assert payload_budget(client, "#dev", "bridge") == 400 - len(":bridge!bridge@host PRIVMSG #dev :") - 2
+
+    def test_linelen_above_pydle_limit_is_capped(self):
+        client = _client(LINELEN="1024")
+        _seen_as(client, "bridge", "host")
+        assert payload_budget(client, "#dev", "bridge") == payload_budget(_seen_client(), "#dev", "bridge")
+
+    @pytest.mark.parametrize("linelen", ["512", "1024", "8191"])
+    @pytest.mark.parametrize("command", ["PRIVMSG", "RELAYMSG"])
+    def test_full_budget_line_is_constructible_by_pydle(self, linelen, command):
+        client = _client(LINELEN=linelen)
+        _seen_as(client, "bridge", "host")
+        budget = payload_budget(client, "#dev", "alice/d", command=command)
+        params = ["#dev", "alice/d"] if command == "RELAYMSG" else ["#dev"]
+        message = client._create_message(command, *params, "x" * budget)
+        assert len(message.construct()) <= MESSAGE_LENGTH_LIMIT
+
+    def test_longer_channel_and_nick_shrink_budget(self):
+        client = _client()
+        _seen_as(client, "bridge", "host")
+        short = payload_budget(client, "#a", "bob/d", command="RELAYMSG")
+        long = payload_budget(client, "#a-much-longer-channel", "bob_with_long_name/d", command="RELAYMSG")
+        assert short - long == len("-much-longer-channel") + len("_with_long_name")
+
+    def test_tags_count_only_without_message_tags(self):
+        client = _client()
+        _seen_as(client, "b", "h")
+        tags = {"+draft/reply": "x" * 600}
+        assert payload_budget(client, "#dev", "bridge", tags=tags) == 64  # floor
+        client._capabilities["message-tags"] = True
+        assert payload_budget(client, "#dev", "bridge", tags=tags) > 400
+
+    def test_mock_client_falls_back_to_defaults(self):
+        class Bare:
+            nickname = "bridge"
+
+        assert payload_budget(Bare(), "#dev", "bridge") == 512 - (
+            len(":bridge!") + 11 + 1 + 63 + len(" PRIVMSG #dev :") + 2
+        )
+
+
+class TestOwnHostmask:
+    @pytest.mark.asyncio
+    async def test_userhost_reply_records_our_hostmask(self):
+        client = _registered()
+        await observe_userhost(client, _reply("302", "bridge", "other=+x@y bridge*=+~bridge@irc.atl.chat"))
+        assert observed_hostmask(client) == ("~bridge", "irc.atl.chat")
+
+    @pytest.mark.asyncio
+    async def test_userhost_reply_for_other_nicks_is_ignored(self):
+        client = _registered()
+        await observe_userhost(client, _reply("302", "bridge", "other=+x@y"))
+        assert observed_hostmask(client) is None
+
+    @pytest.mark.asyncio
+    async def test_displayed_host_replaces_the_observed_host(self):
+        client = _registered()
+        _seen_as(client, "~bridge", "1.2.3.4")
+        await observe_displayed_host(client, _reply("396", "bridge", "atl/bridge", "is now your displayed host"))
+        assert observed_hostmask(client) == ("~bridge", "atl/bridge")
+
+    @pytest.mark.asyncio
+    async def test_observed_hostmask_beats_the_legacy_450_cut(self):
+        """Once USERHOST has answered, an ordinary hostmask leaves more than the old fixed 450 bytes."""
+        client = _registered()
+        await observe_userhost(client, _reply("302", "bridge", "bridge=+~bridge@irc.atl.chat"))
+        assert payload_budget(client, "#general", "someuser/d", command="RELAYMSG") >= 450
@@ -7,6 +7,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from bridge.adapters.irc import IRCClient, MessageIDTracker, ReactionTracker
+from bridge.adapters.irc.budget import payload_budget
+from bridge.adapters.irc.handlers import claim_echo, expect_echo
+from pydle.features.ircv3.tags import TaggedMessage
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -186,7 +189,7 @@ class TestOnMessage:
         client, _bus, router = _make_client()
         router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="111")
         client.nickname = "bot"
-        client._pending_sends.put_nowait("discord-123")
+        expect_echo(client, "#test", "bot", "echoed msg", "discord-123")
         client._message_tags = {"msgid": "irc-echo"}
         with patch.object(type(client).__mro__[1], "on_message", AsyncMock()):
             await client.on_message("#test", "bot", "echoed msg")
@@ -418,6 +421,39 @@ class TestSendMessage:
         args = client.rawmsg.call_args
         assert args[1]["tags"]["+draft/reply"] == "irc-orig"
 
+    @pytest.mark.asyncio
+    async def test_lines_fit_pydle_even_when_linelen_is_larger(self):
+        client, _, router = _make_client()
+        client._capabilities = {"draft/relaymsg": True}
+        client._isupport["LINELEN"] = "1024"
+        router.get_mapping_for_discord.return_value = MagicMock(irc=MagicMock(channel="#test"))
+        client.rawmsg = AsyncMock()
+        evt = MagicMock(channel_id="111", content="word " * 160, message_id="d-1", reply_to_id=None, is_action=False)
+        evt.author_display = evt.author_id = "testuser"
+
+        await client._send_message(evt)
+
+        relays = [c for c in client.rawmsg.await_args_list if c.args[0] == "RELAYMSG"]
+        assert len(relays) == 2  # pydle caps lines at 512 whatever LINELEN says
+        for call in relays:
+            TaggedMessage(command=call.args[0], params=list(call.args[1:]), tags=call.kwargs.get("tags")).construct()
+
+    @pytest.mark.asyncio
+    async def test_privmsg_first_chunk_leaves_room_for_nick_prefix(self):
+        client, _, router = _make_client()
+        client._capabilities = {}
+        router.get_mapping_for_discord.return_value = MagicMock(irc=MagicMock(channel="#test"))
+        client.rawmsg = AsyncMock()
+        evt = MagicMock(channel_id="111", content="x" * 1200, message_id="d-1", reply_to_id=None, is_action=False)
+        evt.author_display = evt.author_id = "testuser"
+
+        await client._send_message(evt)
+
+        sent = [c.args[2] for c in client.rawmsg.await_args_list if c.args[0] == "PRIVMSG"]
+        budget = payload_budget(client, "#test", client.nickname)
+        assert all(len(line.encode()) <= budget for line in sent)
+        assert "".join(sent).endswith("x" * 1200)
+
     @pytest.mark.asyncio
     async def test_sends_without_reply_tag(self):
         client, _, router = _make_client()
@@ -455,9 +491,10 @@ class TestSendMessage:
         evt.reply_to_id = None
         evt.author_display = "testuser"
         evt.author_id = "testuser"
+        evt.is_action = False
 
         await client._send_message(evt)
-        assert client._pending_sends.get_nowait() == "discord-1"
+        assert claim_echo(client, "#test", "testuser/d", "hello", None) == "discord-1"
 
     @pytest.mark.asyncio
     async def test_sends_relaymsg_when_capability_negotiated(self):
@@ -670,12 +707,52 @@ class TestEchoMessageCorrelation:
         client, _bus, router = _make_client(nick="bot")
         client.nickname = "bot"  # pydle sets this on connect; set manually for tests
         router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="111")
-        client._pending_sends.put_nowait("discord-msg-1")
+        expect_echo(client, "#test", "bot", "hello", "discord-msg-1")
         client._message_tags = {"msgid": "irc-abc"}
         with patch.object(type(client).__mro__[1], "on_message", AsyncMock()):
             await client.on_message("#test", "bot", "hello")
         assert client._msgid_tracker.get_discord_id("irc-abc") == "discord-msg-1"
 
+    @pytest.mark.asyncio
+    async def test_out_of_order_echoes_map_to_their_own_sends(self):
+        client, _bus, router = _make_client(nick="bot")
+        client.nickname = "bot"
+        router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="111")
+        expect_echo(client, "#test", "alice/d", "first", "discord-1")
+        expect_echo(client, "#test", "alice/d", "second", "discord-2")
+        with patch.object(type(client).__mro__[1], "on_message", AsyncMock()):
+            client._message_tags = {"msgid": "irc-2", "draft/relaymsg": "bot"}
+            await client.on_message("#test", "alice/d", "second")
+            client._message_tags = {"msgid": "irc-1", "draft/relaymsg": "bot"}
+            await client.on_message("#test", "alice/d", "first")
+        assert client._msgid_tracker.get_discord_id("irc-1") == "discord-1"
+        assert client._msgid_tracker.get_discord_id("irc-2") == "discord-2"
+
+    @pytest.mark.asyncio
+    async def test_label_echo_correlates_by_label(self):
+        client, _bus, router = _make_client(nick="bot")
+        client.nickname = "bot"
+        router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="111")
+        expect_echo(client, "#test", "bot", "hello", "discord-1", label="L1")
+        expect_echo(client, "#test", "bot", "hello", "discord-2", label="L2")
+        client._message_tags = {"msgid": "irc-2", "label": "L2"}
+        with patch.object(type(client).__mro__[1], "on_message", AsyncMock()):
+            await client.on_message("#test", "bot", "hello")
+        assert client._msgid_tracker.get_discord_id("irc-2") == "discord-2"
+
+    @pytest.mark.asyncio
+    async def test_puppet_echo_does_not_consume_pending_send(self):
+        client, _bus, router = _make_client(nick="bot")
+        client.nickname = "bot"
+        client._puppet_nick_check = lambda n: n == "alice"
+        router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="111")
+        expect_echo(client, "#test", "bot", "hello", "discord-1")
+        client._message_tags = {"msgid": "irc-puppet"}
+        with patch.object(type(client).__mro__[1], "on_message", AsyncMock()):
+            await client.on_message("#test", "alice", "hello")
+        assert client._msgid_tracker.get_discord_id("irc-puppet") is None
+        assert client._echoes.claim(("#test", "bot"), group=("#test", "bot")) == "discord-1"
+
     @pytest.mark.asyncio
     async def test_echo_with_empty_pending_queue_does_not_crash(self):
         client, _bus, router = _make_client(nick="bot")
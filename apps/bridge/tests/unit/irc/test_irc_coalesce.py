@@ -0,0 +1,222 @@
+"""Tests for IRC outbound burst coalescing (outbound.coalesce_burst)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bridge.adapters.irc import IRCClient, MessageIDTracker, ReactionTracker
+from bridge.adapters.irc.handlers import handle_message
+from bridge.adapters.irc.outbound import coalesce_burst, consume_outbound, send_message
+from bridge.events import MessageOut
+
+
+def _make_client(window_ms: int = 200, caps: dict | None = None) -> IRCClient:
+    router = MagicMock()
+    router.get_mapping_for_discord.return_value = MagicMock(irc=MagicMock(channel="#test"))
+    client = IRCClient(
+        bus=MagicMock(),
+        router=router,
+        server="irc.libera.chat",
+        nick="bot",
+        channels=["#test"],
+        msgid_tracker=MessageIDTracker(),
+        reaction_tracker=ReactionTracker(),
+        coalesce_window_ms=window_ms,
+    )
+    client._capabilities = caps if caps is not None else {"draft/relaymsg": True}
+    client._ready = True
+    return client
+
+
+def _msg(content: str, message_id: str, author: str = "alice", channel: str = "111", **kw) -> MessageOut:
+    return MessageOut(
+        target_origin="irc",
+        channel_id=channel,
+        author_id=author,
+        author_display=author,
+        content=content,
+        message_id=message_id,
+        **kw,
+    )
+
+
+class TestCoalesceBurst:
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        client = _make_client(window_ms=0)
+        client.queue_message(_msg("two", "d-2"))
+        evt, held = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one"
+        assert held is None
+        assert client._outbound.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_merges_queued_messages_into_joined_line_without_multiline(self):
+        client = _make_client()
+        client.queue_message(_msg("two", "d-2"))
+        client.queue_message(_msg("three", "d-3"))
+        evt, held = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one | two | three"
+        assert evt.message_id == "d-1"
+        assert client._coalesced_ids["d-1"] == ("d-2", "d-3")
+        assert held is None
+
+    @pytest.mark.asyncio
+    async def test_merges_as_lines_with_multiline(self):
+        client = _make_client(caps={"draft/relaymsg": True, "draft/multiline": "max-bytes=4096,max-lines=2"})
+        client.queue_message(_msg("two", "d-2"))
+        client.queue_message(_msg("three", "d-3"))
+        evt, held = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one\ntwo"  # max-lines=2
+        assert held is None
+        assert client._outbound.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_other_author_is_held_not_merged(self):
+        client = _make_client()
+        client.queue_message(_msg("hi", "d-2", author="bob"))
+        client.queue_message(_msg("two", "d-3"))
+        evt, held = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one"
+        assert held is not None and held.author_id == "bob"
+        assert client._outbound.qsize() == 1  # order kept: bob's message goes first
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "kw",
+        [{"is_action": True}, {"reply_to_id": "d-0"}, {"is_edit": True}],
+    )
+    async def test_actions_replies_and_edits_are_not_merged(self, kw):
+        client = _make_client()
+        client.queue_message(_msg("two", "d-2", **kw))
+        evt, held = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one"
+        assert held is not None and held.message_id == "d-2"
+
+    @pytest.mark.asyncio
+    async def test_joined_line_respects_line_budget(self):
+        client = _make_client()
+        client.queue_message(_msg("y" * 300, "d-2"))
+        evt, held = await coalesce_burst(client, _msg("x" * 300, "d-1"))
+        assert evt.content == "x" * 300
+        assert held is not None and held.message_id == "d-2"
+
+    @pytest.mark.asyncio
+    async def test_first_message_is_not_delayed(self):
+        client = _make_client(window_ms=5000)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        evt, _ = await coalesce_burst(client, _msg("one", "d-1"))
+        assert evt.content == "one"
+        assert loop.time() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_burst_waits_within_window_for_more(self):
+        client = _make_client(window_ms=300)
+        await coalesce_burst(client, _msg("one", "d-1"))  # marks the author as active
+
+        async def later() -> None:
+            await asyncio.sleep(0.05)
+            client.queue_message(_msg("three", "d-3"))
+
+        task = asyncio.create_task(later())
+        evt, held = await coalesce_burst(client, _msg("two", "d-2"))
+        await task
+        assert evt.content == "two | three"
+        assert held is None
+
+    @pytest.mark.asyncio
+    async def test_burst_wait_is_bounded_by_window(self):
+        client = _make_client(window_ms=50)
+        await coalesce_burst(client, _msg("one", "d-1"))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        evt, held = await coalesce_burst(client, _msg("two", "d-2"))
+        assert evt.content == "two"
+        assert held is None
+        assert loop.time() - start < 0.5
+
+
+class TestCoalescedEcho:
+    @pytest.mark.asyncio
+    async def test_echo_msgid_maps_every_merged_message(self):
+        client = _make_client()
+        client.rawmsg = AsyncMock()
+        client.queue_message(_msg("two", "d-2"))
+        client.queue_message(_msg("three", "d-3"))
+        evt, _ = await coalesce_burst(client, _msg("one", "d-1"))
+        await send_message(client, evt)
+        relay = next(c for c in client.rawmsg.await_args_list if c.args[0] == "RELAYMSG")
+
+        client._message_tags = {"msgid": "irc-1", "draft/relaymsg": "bot"}
+        await handle_message(client, "#test", relay.args[2], relay.args[3])
+
+        tracker = client._msgid_tracker
+        assert [tracker.get_irc_msgid(d) for d in ("d-1", "d-2", "d-3")] == ["irc-1"] * 3
+        assert tracker.get_discord_id("irc-1") == "d-1"
+        assert tracker.discord_ids_on_line("irc-1") == {"d-1", "d-2", "d-3"}
+        assert "d-1" not in client._coalesced_ids
+
+
+class TestPendingSends:
+    @pytest.mark.asyncio
+    async def test_counted_until_the_consumer_sends_them(self):
+        client = _make_client()
+        sent = asyncio.Event()
+
+        async def _send(_client, _evt):
+            sent.set()
+
+        client.queue_message(_msg("one", "d-1"))
+        client.queue_message(_msg("two", "d-2"))
+        client.queue_message(_msg("hi", "d-3", author="bob"))
+        assert client.pending_sends("alice") == 2
+
+        with patch("bridge.adapters.irc.outbound.send_message", side_effect=_send):
+            consumer = asyncio.create_task(consume_outbound(client))
+            await sent.wait()
+            await asyncio.sleep(0.3)
+            consumer.cancel()
+
+        assert client.pending_sends("alice") == 0  # merged send counts for both
+        assert client.pending_sends("bob") == 0
+
+
+class TestMultilineSend:
+    @pytest.mark.asyncio
+    async def test_merged_lines_are_not_concatenated(self):
+        client = _make_client(caps={"draft/relaymsg": True, "draft/multiline": True})
+        client.rawmsg = AsyncMock()
+        client.queue_message(_msg("two", "d-2"))
+        evt, _ = await coalesce_burst(client, _msg("one", "d-1"))
+
+        await send_message(client, evt)
+
+        relays = [c for c in client.rawmsg.await_args_list if c.args[0] == "RELAYMSG"]
+        assert [c.args[3] for c in relays] == ["one", "two"]
+        assert all("draft/multiline-concat" not in c.kwargs["tags"] for c in relays)
+        batches = [c.args[1] for c in client.rawmsg.await_args_list if c.args[0] == "BATCH"]
+        assert batches[0].startswith("+") and batches[1].startswith("-")
+
+    @pytest.mark.asyncio
+    async def test_only_continuation_chunks_are_concatenated(self):
+        client = _make_client(caps={"draft/relaymsg": True, "draft/multiline": True})
+        client.rawmsg = AsyncMock()
+
+        await send_message(client, _msg("x" * 600 + "\nshort", "d-1"))
+
+        relays = [c for c in client.rawmsg.await_args_list if c.args[0] == "RELAYMSG"]
+        concat = ["draft/multiline-concat" in c.kwargs["tags"] for c in relays]
+        assert concat == [False, True, False]
+
+
+class TestMultilineLimits:
+    def test_parses_advertised_limits(self):
+        client = _make_client(caps={"draft/multiline": "max-bytes=4096,max-lines=24"})
+        assert client._multiline_limits() == (4096, 24)
+
+    def test_missing_values(self):
+        client = _make_client(caps={"draft/multiline": True})
+        assert client._multiline_limits() == (None, None)
@@ -6,11 +6,16 @@ is_action=True and the expected content format.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from bridge.adapters.irc.client import IRCClient
 from bridge.adapters.irc.handlers import handle_ctcp_action
+from bridge.adapters.irc.msgid import MessageIDTracker, ReactionTracker
+from bridge.adapters.irc.outbound import send_message
+from bridge.events import MessageOut
 from bridge.gateway import Bus, ChannelRouter
+from bridge.tracking.echo import EchoCorrelator
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -48,7 +53,8 @@ def _make_client(bus: Bus, router: ChannelRouter, nickname: str = "bridge") -> M
     client._ready = True
     client._puppet_nick_check = None
     client._message_tags = {}
-    client._recent_relaymsg_sends = {}
+    client._server_casemapping = "rfc1459"
+    client._echoes = EchoCorrelator(ttl=120)
     return client
 
 
@@ -129,3 +135,47 @@ class TestHandleCtcpAction:
         await handle_ctcp_action(client, "alice", "#unmapped", "waves")
 
         assert len(published) == 0
+
+    @pytest.mark.asyncio
+    async def test_own_action_echo_claims_pending_send(self, bus: Bus, router: ChannelRouter) -> None:
+        """The echo of a relayed /me maps its msgid back to the Discord message."""
+        from bridge.adapters.irc.handlers import expect_echo
+
+        client = _make_client(bus, router, nickname="bridge")
+        expect_echo(client, "#test", "bridge", "\x01ACTION does something\x01", "d1")
+        client._message_tags = {"msgid": "m1"}
+
+        await handle_ctcp_action(client, "bridge", "#test", "does something")
+
+        client._msgid_tracker.store.assert_called_once_with("m1", "d1")
+        assert len(client._echoes) == 0
+
+    @pytest.mark.asyncio
+    async def test_echo_of_a_sent_action_matches_what_was_sent(self) -> None:
+        """The /me line send_message writes is a CTCP whose echo claims its own pending send."""
+        router = MagicMock()
+        router.get_mapping_for_discord.return_value = MagicMock(irc=MagicMock(channel="#test"))
+        client = IRCClient(
+            bus=MagicMock(),
+            router=router,
+            server="irc.libera.chat",
+            nick="bot",
+            channels=["#test"],
+            msgid_tracker=MessageIDTracker(),
+            reaction_tracker=ReactionTracker(),
+        )
+        client.nickname = "bot"
+        client._capabilities = {"draft/relaymsg": True}
+        client._ready = True
+        client.rawmsg = AsyncMock()
+        evt = MessageOut("irc", "111", "alice", "alice", "waves", "d1", is_action=True)
+
+        await send_message(client, evt)
+        ((command, target, line), _) = client.rawmsg.await_args
+        assert (command, target) == ("PRIVMSG", "#test")
+        assert line.startswith("\x01ACTION ") and line.endswith("\x01")  # a CTCP, nick prefix inside
+        client._message_tags = {"msgid": "m1"}
+        await handle_ctcp_action(client, "bot", "#test", line[len("\x01ACTION ") : -1])
+
+        assert client._msgid_tracker.get_discord_id("m1") == "d1"
+        assert client._echoes.stats()["mismatched"] == 0
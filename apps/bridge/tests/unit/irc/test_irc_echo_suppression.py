@@ -12,8 +12,9 @@ from bridge.adapters.irc.handlers import (
     is_own_echo,
     is_puppet_echo,
     is_relaymsg_echo,
+    relaymsg_marker_key,
 )
-from cachetools import TTLCache
+from bridge.tracking.echo import EchoCorrelator
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -25,7 +26,7 @@ def _make_client(nickname: str = "bridge") -> MagicMock:
     client = MagicMock()
     client.nickname = nickname
     client._puppet_nick_check = None
-    client._recent_relaymsg_sends = TTLCache(maxsize=100, ttl=5)
+    client._echoes = EchoCorrelator(ttl=120)
     return client
 
 
@@ -95,11 +96,11 @@ class TestIsPuppetEcho:
 
 
 class TestIsRelaymsgEcho:
-    """Unit tests for the RELAYMSG TTLCache fallback echo detection."""
+    """Unit tests for the RELAYMSG marker fallback echo detection."""
 
     def test_recent_send_is_echo(self) -> None:
         client = _make_client("bridge")
-        client._recent_relaymsg_sends[("irc.example.com", "#test", "alice/d")] = None
+        client._echoes.mark(relaymsg_marker_key("irc.example.com", "#test", "alice/d"))
         assert is_relaymsg_echo(client, "irc.example.com", "#test", "alice/d", {}) is True
 
     def test_no_recent_send_not_echo(self) -> None:
@@ -108,10 +109,10 @@ class TestIsRelaymsgEcho:
 
     def test_different_channel_not_echo(self) -> None:
         client = _make_client("bridge")
-        client._recent_relaymsg_sends[("irc.example.com", "#test", "alice/d")] = None
+        client._echoes.mark(relaymsg_marker_key("irc.example.com", "#test", "alice/d"))
         assert is_relaymsg_echo(client, "irc.example.com", "#other", "alice/d", {}) is False
 
     def test_different_server_not_echo(self) -> None:
         client = _make_client("bridge")
-        client._recent_relaymsg_sends[("irc.example.com", "#test", "alice/d")] = None
+        client._echoes.mark(relaymsg_marker_key("irc.example.com", "#test", "alice/d"))
         assert is_relaymsg_echo(client, "other.example.com", "#test", "alice/d", {}) is False
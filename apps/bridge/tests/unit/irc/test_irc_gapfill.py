@@ -0,0 +1,164 @@
+"""Tests for the reconnect CHATHISTORY gap-filler (paging, dedup, paced replay, reports)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bridge.adapters.irc import IRCClient, MessageIDTracker, ReactionTracker
+from bridge.adapters.irc.gapfill import GapFiller
+from bridge.adapters.irc.handlers import handle_message
+
+OLD = "2026-01-01T00:00:00.000Z"
+
+
+def _make_client(channels=("#a", "#b")) -> tuple[IRCClient, MagicMock]:
+    bus = MagicMock()
+    router = MagicMock()
+    router.get_mapping_for_irc.return_value = MagicMock(discord_channel_id="123")
+    client = IRCClient(
+        bus=bus,
+        router=router,
+        server="irc.example.com",
+        nick="bot",
+        channels=list(channels),
+        msgid_tracker=MessageIDTracker(),
+        reaction_tracker=ReactionTracker(),
+    )
+    client._ready = True
+    client._identity = None
+    client.rawmsg = AsyncMock()
+    return client, bus
+
+
+def _batch(ref: str, *target: str) -> MagicMock:
+    msg = MagicMock()
+    msg.params = [ref, "chathistory", *target] if ref.startswith("+") else [ref]
+    return msg
+
+
+async def _deliver(client: IRCClient, ref: str, target: str, lines: list[tuple[str, str]]) -> None:
+    """Deliver one chathistory batch of (msgid, text) lines to *target*."""
+    await client.on_raw_batch(_batch(f"+{ref}", target))
+    for i, (msgid, text) in enumerate(lines):
+        client._message_tags = {"batch": ref, "msgid": msgid, "time": f"2026-01-01T00:00:{i:02d}.000Z"}
+        await handle_message(client, target, "alice", text)
+    await client.on_raw_batch(_batch(f"-{ref}"))
+
+
+async def _until_requests(client: IRCClient, count: int) -> None:
+    while client.rawmsg.await_count < count:
+        await asyncio.sleep(0)
+
+
+class TestRequests:
+    @pytest.mark.asyncio
+    async def test_all_channels_requested_before_any_reply(self):
+        client, _ = _make_client()
+        fill = asyncio.create_task(
+            client._gapfill.fill({"#a": OLD, "#b": OLD}, limit=50, max_pages=5, replay_rate=1000)
+        )
+        await _until_requests(client, 2)
+        sent = {call.args[2] for call in client.rawmsg.await_args_list}
+        assert sent == {"#a", "#b"}
+        assert client.rawmsg.await_args_list[0].args[3] == f"timestamp={OLD}"
+        await _deliver(client, "r1", "#a", [])
+        await _deliver(client, "r2", "#b", [])
+        reports = await fill
+        assert [r.pages for r in reports] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_pages_from_last_msgid_while_pages_are_full(self):
+        client, bus = _make_client(channels=("#a",))
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=2, max_pages=5, replay_rate=1000))
+        await _until_requests(client, 1)
+        await _deliver(client, "p1", "#a", [("m1", "one"), ("m2", "two")])
+        await _until_requests(client, 2)
+        assert client.rawmsg.await_args_list[1].args[3] == "msgid=m2"
+        await _deliver(client, "p2", "#a", [("m3", "three")])
+        (report,) = await fill
+        assert (report.pages, report.received, report.replayed, report.complete) == (2, 3, 3, True)
+        assert [c.args[1].content for c in bus.publish.call_args_list] == ["one", "two", "three"]
+        assert client._gapfill.reports["#a"] is report
+
+    @pytest.mark.asyncio
+    async def test_server_limit_caps_page_size(self):
+        client, _ = _make_client(channels=("#a",))
+        client._isupport = {"CHATHISTORY": "20"}
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=50, max_pages=5, replay_rate=1000))
+        await _until_requests(client, 1)
+        assert client.rawmsg.await_args_list[0].args[4] == "20"
+        await _deliver(client, "p1", "#a", [])
+        await fill
+
+    @pytest.mark.asyncio
+    async def test_max_pages_marks_incomplete(self):
+        client, _ = _make_client(channels=("#a",))
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=1, max_pages=2, replay_rate=1000))
+        await _until_requests(client, 1)
+        await _deliver(client, "p1", "#a", [("m1", "one")])
+        await _until_requests(client, 2)
+        await _deliver(client, "p2", "#a", [("m2", "two")])
+        (report,) = await fill
+        assert client.rawmsg.await_count == 2
+        assert (report.pages, report.complete) == (2, False)
+
+    @pytest.mark.asyncio
+    async def test_missing_reply_times_out(self):
+        client, _ = _make_client(channels=("#a",))
+        client._gapfill = GapFiller(client, page_timeout=0.01)
+        (report,) = await client._gapfill.fill({"#a": OLD}, limit=10, max_pages=5, replay_rate=1000)
+        assert (report.pages, report.complete) == (1, False)
+
+
+class TestDedup:
+    @pytest.mark.asyncio
+    async def test_already_relayed_msgids_are_dropped(self):
+        client, bus = _make_client(channels=("#a",))
+        client._msgid_tracker.store("m1", "111111111111111111")  # relayed before the disconnect
+        client._relayed_msgids["m2"] = None
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=10, max_pages=5, replay_rate=1000))
+        await _until_requests(client, 1)
+        await _deliver(client, "p1", "#a", [("m1", "one"), ("m2", "two"), ("m3", "three")])
+        (report,) = await fill
+        assert (report.received, report.duplicates, report.replayed) == (3, 2, 1)
+        assert [c.args[1].content for c in bus.publish.call_args_list] == ["three"]
+        assert "m3" in client._relayed_msgids
+
+    @pytest.mark.asyncio
+    async def test_live_messages_are_recorded_for_dedup(self):
+        client, _ = _make_client(channels=("#a",))
+        client._message_tags = {"msgid": "live1"}
+        await handle_message(client, "#a", "alice", "hi")
+        assert "live1" in client._relayed_msgids
+
+
+class TestPacedReplay:
+    @pytest.mark.asyncio
+    async def test_replay_is_rate_limited_and_live_traffic_is_not(self):
+        client, bus = _make_client(channels=("#a",))
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=50, max_pages=1, replay_rate=20))
+        await _until_requests(client, 1)
+        await _deliver(client, "p1", "#a", [(f"m{i}", f"old {i}") for i in range(25)])
+        client._message_tags = {"msgid": "live"}
+        await handle_message(client, "#a", "bob", "live")
+        # Live message goes straight out while most of the backlog is still queued
+        contents = [c.args[1].content for c in bus.publish.call_args_list]
+        assert "live" in contents
+        assert len(contents) < 10
+        (report,) = await fill
+        assert report.replayed == 25
+        assert report.seconds > 0.1
+        assert client._last_message_times["#a"] == "2026-01-01T00:00:24.000Z"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_abandons_fill(self):
+        client, _ = _make_client(channels=("#a",))
+        fill = asyncio.create_task(client._gapfill.fill({"#a": OLD}, limit=50, max_pages=1, replay_rate=0.1))
+        await _until_requests(client, 1)
+        await _deliver(client, "p1", "#a", [("m1", "one"), ("m2", "two"), ("m3", "three")])
+        client._gapfill.reset()
+        (report,) = await asyncio.wait_for(fill, 1)
+        assert report.complete is False
+        assert report.replayed < 3
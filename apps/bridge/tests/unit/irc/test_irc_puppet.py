@@ -6,8 +6,10 @@ import asyncio
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pydle
 import pytest
-from bridge.adapters.irc import IRCPuppet, IRCPuppetManager, MessageIDTracker
+from bridge.adapters.irc import IRCPuppet, IRCPuppetManager, MessageIDTracker, TokenBucket
+from bridge.adapters.irc.throttle import take_tokens
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -44,7 +46,7 @@ def _mock_puppet(discord_id: str = "d1", nick: str = "nick") -> MagicMock:
     p.touch = MagicMock()
     p.connect = AsyncMock()
     p.disconnect = AsyncMock()
-    p.message = AsyncMock()
+    p.rawmsg = AsyncMock()
     p.join = AsyncMock()
     p.channels = {}
     return p
@@ -90,36 +92,25 @@ class TestIRCPuppet:
         puppet.rawmsg = AsyncMock()
         with patch.object(type(puppet).__bases__[0], "on_connect", new=AsyncMock()):
             await puppet.on_connect()
-        assert puppet.rawmsg.await_count == 2
         calls = [c.args for c in puppet.rawmsg.await_args_list]
-        assert calls[0] == ("MODE", "mynick +D")
-        assert calls[1] == ("PRIVMSG", "NickServ IDENTIFY pass")
+        assert calls == [("USERHOST", puppet.nickname), ("MODE", "mynick +D"), ("PRIVMSG", "NickServ IDENTIFY pass")]
 
     @pytest.mark.asyncio
-    async def test_on_connect_no_prejoin_commands_sends_nothing(self):
+    async def test_on_connect_no_prejoin_commands_only_asks_for_its_hostmask(self):
         puppet = IRCPuppet("mynick", "d1")
         puppet.rawmsg = AsyncMock()
         with patch.object(type(puppet).__bases__[0], "on_connect", new=AsyncMock()):
             await puppet.on_connect()
-        puppet.rawmsg.assert_not_called()
+        puppet.rawmsg.assert_awaited_once_with("USERHOST", puppet.nickname)
 
     @pytest.mark.asyncio
-    async def test_on_connect_starts_pinger_task(self):
+    async def test_on_connect_does_not_start_a_pinger_task(self):
         puppet = IRCPuppet("mynick", "d1", ping_interval=120)
         puppet.rawmsg = AsyncMock()
+        tasks_before = len(asyncio.all_tasks())
         with patch.object(type(puppet).__bases__[0], "on_connect", new=AsyncMock()):
             await puppet.on_connect()
-        assert puppet._pinger_task is not None
-        puppet._pinger_task.cancel()
-
-    @pytest.mark.asyncio
-    async def test_pinger_sends_ping_after_interval(self):
-        puppet = IRCPuppet("mynick", "d1", ping_interval=1)
-        puppet.rawmsg = MagicMock()
-        pinger = asyncio.create_task(puppet._pinger())
-        await asyncio.sleep(1.1)
-        pinger.cancel()
-        puppet.rawmsg.assert_called_with("PING", "keep-alive")
+        assert len(asyncio.all_tasks()) == tasks_before  # keepalives come from the manager's scheduler
 
 
 # ---------------------------------------------------------------------------
@@ -164,7 +155,7 @@ class TestGetOrCreatePuppet:
         with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=mock_puppet) as mock_cls:
             await manager.get_or_create_puppet("d1")
 
-        mock_cls.assert_called_once_with("mynick", "d1", ping_interval=60, prejoin_commands=cmds)
+        mock_cls.assert_called_once_with("mynick", "d1", ping_interval=60, prejoin_commands=cmds, throttle_limit=3)
 
     @pytest.mark.asyncio
     async def test_removes_puppet_on_connect_failure(self):
@@ -276,7 +267,7 @@ class TestSendMessage:
 
         await manager.send_message("d1", "#test", "hello")
 
-        mock_puppet.message.assert_awaited_once_with("#test", "hello")
+        mock_puppet.rawmsg.assert_awaited_once_with("PRIVMSG", "#test", "hello")
         mock_puppet.touch.assert_called()
 
     @pytest.mark.asyncio
@@ -288,18 +279,18 @@ class TestSendMessage:
         long_msg = "x" * 1000
         await manager.send_message("d1", "#test", long_msg)
 
-        assert mock_puppet.message.await_count > 1
+        assert mock_puppet.rawmsg.await_count > 1
 
     @pytest.mark.asyncio
     async def test_handles_send_exception_gracefully(self):
         manager = _make_manager()
         mock_puppet = _mock_puppet()
-        mock_puppet.message = AsyncMock(side_effect=OSError("send failed"))
+        mock_puppet.rawmsg = AsyncMock(side_effect=OSError("send failed"))
         manager._puppets["d1"] = mock_puppet
 
         await manager.send_message("d1", "#test", "hello")
         # message was attempted (exception swallowed, not silently skipped)
-        mock_puppet.message.assert_awaited_once()
+        mock_puppet.rawmsg.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_send_message_with_avatar_url_sets_metadata_when_cap_available(self):
@@ -319,7 +310,7 @@ class TestSendMessage:
         )
 
         mock_puppet.set_metadata.assert_awaited_once_with("*", "avatar", "https://cdn.discord.com/avatars/123/abc.png")
-        mock_puppet.message.assert_awaited()
+        mock_puppet.rawmsg.assert_awaited()
 
     @pytest.mark.asyncio
     async def test_send_message_with_avatar_url_skips_metadata_when_hash_unchanged(self):
@@ -337,7 +328,129 @@ class TestSendMessage:
         await manager.send_message("d1", "#test", "hello", avatar_url=url)
 
         mock_puppet.set_metadata.assert_not_awaited()
-        mock_puppet.message.assert_awaited()
+        mock_puppet.rawmsg.assert_awaited()
+
+
+class TestPuppetFloodControl:
+    def test_puppet_has_own_bucket(self):
+        puppet = IRCPuppet("nick", "d1", throttle_limit=2)
+        assert puppet._throttle.acquire() == 0
+        puppet._throttle.use_token()
+        puppet._throttle.use_token()
+        assert puppet._throttle.acquire() > 0
+
+    @pytest.mark.asyncio
+    async def test_each_line_draws_from_global_bucket(self):
+        manager = _make_manager()
+        mock_puppet = _mock_puppet()
+        manager._puppets["d1"] = mock_puppet
+        manager._global_throttle = TokenBucket(limit=10, refill_rate=0.001)
+
+        await manager.send_message("d1", "#test", "x" * 1000)  # JOIN + several chunks
+
+        lines = mock_puppet.join.await_count + mock_puppet.rawmsg.await_count
+        assert manager._global_throttle._tokens == pytest.approx(10 - lines, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_take_tokens_waits_for_the_emptiest_bucket(self):
+        own = TokenBucket(limit=5, refill_rate=5.0)
+        shared = TokenBucket(limit=1, refill_rate=50.0)
+        shared.use_token()
+
+        waited = await take_tokens(own, shared)
+
+        assert waited > 0
+        assert own._tokens < 5
+        assert shared._tokens < 1
+
+
+class TestConnectAdmission:
+    @pytest.mark.asyncio
+    async def test_concurrent_connects_are_bounded(self):
+        manager = _make_manager()
+        manager._connect_slots = asyncio.Semaphore(2)
+        manager._connect_rate = TokenBucket(limit=100, refill_rate=100.0)
+        in_flight = peak = 0
+
+        async def _connect(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        def _new_puppet(nick, discord_id, **kwargs):
+            p = _mock_puppet(discord_id, f"n{discord_id}")
+            p.connect = AsyncMock(side_effect=_connect)
+            return p
+
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", side_effect=_new_puppet):
+            for i in range(8):
+                manager.start_puppet(f"d{i}")
+            await asyncio.gather(*manager._connecting.values())
+
+        assert peak == 2
+        assert len(manager._puppets) == 8
+        assert manager._connecting == {}
+
+    @pytest.mark.asyncio
+    async def test_connect_rate_spaces_new_connections(self):
+        manager = _make_manager()
+        manager._connect_rate = TokenBucket(limit=1, refill_rate=50.0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", side_effect=lambda n, d, **kw: _mock_puppet(d, f"n{d}")):
+            for i in range(4):
+                manager.start_puppet(f"d{i}")
+            await asyncio.gather(*manager._connecting.values())
+
+        assert loop.time() - start >= 0.05  # 3 connects past the burst of 1, at 50/s
+        assert len(manager._puppets) == 4
+
+    @pytest.mark.asyncio
+    async def test_zero_connect_rate_means_unlimited(self):
+        manager = IRCPuppetManager(
+            bus=MagicMock(),
+            router=MagicMock(),
+            identity=AsyncMock(discord_to_irc=AsyncMock(return_value="nick")),
+            server="irc.libera.chat",
+            port=6697,
+            tls=True,
+            connect_rate=0,
+        )
+        assert manager._connect_rate is None
+
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", side_effect=lambda n, d, **kw: _mock_puppet(d, f"n{d}")):
+            for i in range(4):
+                manager.start_puppet(f"d{i}")
+            await asyncio.gather(*manager._connecting.values())
+
+        assert len(manager._puppets) == 4
+
+    @pytest.mark.asyncio
+    async def test_start_puppet_is_noop_when_pending_or_connected(self):
+        manager = _make_manager()
+        manager._puppets["d1"] = _mock_puppet("d1")
+        manager.start_puppet("d1")
+        assert manager._connecting == {}
+
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=_mock_puppet("d2")) as mock_cls:
+            manager.start_puppet("d2")
+            manager.start_puppet("d2")
+            await asyncio.gather(*manager._connecting.values())
+        assert mock_cls.call_count == 1
+        assert manager.has_puppet("d2")
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pending_connects(self):
+        manager = _make_manager()
+        manager._connecting["d1"] = asyncio.create_task(asyncio.sleep(9999))
+        task = manager._connecting["d1"]
+        await manager.stop()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert manager._connecting == {}
 
 
 # ---------------------------------------------------------------------------
@@ -375,54 +488,195 @@ class TestJoinChannel:
 
         mock_puppet.join.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_part_channel_parts_only_puppets_in_it(self):
+        manager = _make_manager()
+        inside, outside = _mock_puppet("d1", "a"), _mock_puppet("d2", "b")
+        inside.channels = {"#gone": {}}
+        inside.part = AsyncMock()
+        outside.part = AsyncMock()
+        manager._puppets.update(d1=inside, d2=outside)
+
+        await manager.part_channel("#gone")
+
+        inside.part.assert_awaited_once_with("#gone")
+        outside.part.assert_not_awaited()
+
 
 # ---------------------------------------------------------------------------
-# _cleanup_idle_puppets
+# keepalive / idle eviction scheduler
 # ---------------------------------------------------------------------------
 
 
-class TestCleanupIdlePuppets:
+class TestPuppetTimers:
     @pytest.mark.asyncio
-    async def test_disconnects_idle_puppets(self):
+    async def test_idle_deadline_disconnects_idle_puppet(self):
         manager = _make_manager()
         mock_puppet = _mock_puppet()
         mock_puppet.last_activity = time.time() - 7200  # 2h ago, timeout is 1h
         manager._puppets["d1"] = mock_puppet
 
-        calls = 0
-
-        async def _sleep_once(_):
-            nonlocal calls
-            calls += 1
-            if calls >= 2:
-                raise asyncio.CancelledError()
-
-        with patch("asyncio.sleep", side_effect=_sleep_once):
-            await manager._cleanup_idle_puppets()
+        await manager._on_deadline(("idle", "d1"), time.time())
 
         mock_puppet.disconnect.assert_awaited_once()
         assert "d1" not in manager._puppets
 
     @pytest.mark.asyncio
-    async def test_keeps_active_puppets(self):
+    async def test_idle_deadline_rearms_for_active_puppet(self):
         manager = _make_manager()
         mock_puppet = _mock_puppet()
         mock_puppet.last_activity = time.time()  # just active
         manager._puppets["d1"] = mock_puppet
 
-        calls = 0
-
-        async def _sleep_once(_):
-            nonlocal calls
-            calls += 1
-            if calls >= 2:
-                raise asyncio.CancelledError()
-
-        with patch("asyncio.sleep", side_effect=_sleep_once):
-            await manager._cleanup_idle_puppets()
+        await manager._on_deadline(("idle", "d1"), time.time())
 
         mock_puppet.disconnect.assert_not_called()
         assert "d1" in manager._puppets
+        assert manager._scheduler.due(("idle", "d1")) == pytest.approx(mock_puppet.last_activity + 3600)
+
+    @pytest.mark.asyncio
+    async def test_ping_deadline_pings_quiet_puppet(self):
+        manager = _make_manager(ping_interval=60)
+        mock_puppet = _mock_puppet()
+        mock_puppet._ping_interval = 60
+        mock_puppet.rawmsg = AsyncMock()
+        mock_puppet.last_activity = time.time() - 120
+        manager._puppets["d1"] = mock_puppet
+        now = time.time()
+
+        await manager._on_deadline(("ping", "d1"), now)
+
+        mock_puppet.rawmsg.assert_awaited_once_with("PING", "keep-alive")
+        assert manager._scheduler.due(("ping", "d1")) == pytest.approx(now + 60)
+
+    @pytest.mark.asyncio
+    async def test_ping_deadline_skips_recently_active_puppet(self):
+        manager = _make_manager(ping_interval=60)
+        mock_puppet = _mock_puppet()
+        mock_puppet._ping_interval = 60
+        mock_puppet.rawmsg = AsyncMock()
+        mock_puppet.last_activity = time.time() - 10
+        manager._puppets["d1"] = mock_puppet
+
+        await manager._on_deadline(("ping", "d1"), time.time())
+
+        mock_puppet.rawmsg.assert_not_called()
+        assert manager._scheduler.due(("ping", "d1")) == pytest.approx(mock_puppet.last_activity + 60)
+
+    @pytest.mark.asyncio
+    async def test_created_puppet_is_scheduled_and_eviction_cancels(self):
+        manager = _make_manager()
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=_mock_puppet()):
+            await manager.get_or_create_puppet("d1")
+        assert ("ping", "d1") in manager._scheduler
+        assert ("idle", "d1") in manager._scheduler
+
+        manager._evict("d1")
+        assert len(manager._scheduler) == 0
+
+    @pytest.mark.asyncio
+    async def test_deadline_for_evicted_puppet_is_noop(self):
+        manager = _make_manager()
+        await manager._on_deadline(("idle", "gone"), time.time())
+        await manager._on_deadline(("ping", "gone"), time.time())
+
+
+class TestMaxPuppets:
+    @pytest.mark.asyncio
+    async def test_least_recently_used_puppet_is_disconnected(self):
+        manager = _make_manager()
+        manager._max_puppets = 2
+        puppets = {d: _mock_puppet(d, f"n{d}") for d in ("d1", "d2", "d3")}
+
+        for d in ("d1", "d2"):
+            with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=puppets[d]):
+                await manager.get_or_create_puppet(d)
+        await manager.get_or_create_puppet("d1")  # d1 is now most recently used
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=puppets["d3"]):
+            await manager.get_or_create_puppet("d3")
+
+        assert list(manager._puppets) == ["d1", "d3"]
+        puppets["d2"].disconnect.assert_awaited_once()
+        assert ("idle", "d2") not in manager._scheduler
+
+    @pytest.mark.asyncio
+    async def test_unlimited_by_default(self):
+        manager = _make_manager()
+        for i in range(5):
+            with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=_mock_puppet(f"d{i}", f"n{i}")):
+                await manager.get_or_create_puppet(f"d{i}")
+        assert len(manager._puppets) == 5
+
+
+# ---------------------------------------------------------------------------
+# Puppet nick index (echo detection)
+# ---------------------------------------------------------------------------
+
+
+class TestPuppetNickIndex:
+    async def _create(self, manager: IRCPuppetManager, discord_id: str, nick: str) -> MagicMock:
+        puppet = _mock_puppet(discord_id, nick)
+        with patch("bridge.adapters.irc.puppet.IRCPuppet", return_value=puppet):
+            await manager.get_or_create_puppet(discord_id)
+        return puppet
+
+    @pytest.mark.asyncio
+    async def test_connected_puppet_is_indexed_casefolded(self):
+        manager = _make_manager()
+        await self._create(manager, "d1", "Alice[d]")
+        assert manager.is_puppet_nick("Alice[d]")
+        assert manager.is_puppet_nick("alice{d}")  # rfc1459: [] fold to {}
+        assert not manager.is_puppet_nick("bob")
+
+    @pytest.mark.asyncio
+    async def test_casemapping_change_rebuilds_index(self):
+        manager = _make_manager()
+        await self._create(manager, "d1", "Alice[d]")
+        assert not manager.is_puppet_nick("alice{d}", "ascii")
+        assert manager.is_puppet_nick("ALICE[D]", "ascii")
+
+    @pytest.mark.asyncio
+    async def test_nick_change_reindexes(self):
+        manager = _make_manager()
+        puppet = await self._create(manager, "d1", "alice")
+        puppet.nickname = "Guest123"
+        puppet._nick_listener(puppet)
+        assert manager.is_puppet_nick("guest123")
+        assert not manager.is_puppet_nick("alice")
+        # Revert restores the original entry
+        puppet.nickname = "alice"
+        puppet._nick_listener(puppet)
+        assert manager.is_puppet_nick("alice")
+        assert not manager.is_puppet_nick("guest123")
+
+    @pytest.mark.asyncio
+    async def test_eviction_removes_from_index(self):
+        manager = _make_manager()
+        puppet = await self._create(manager, "d1", "alice")
+        puppet.rawmsg = AsyncMock(side_effect=ConnectionError("gone"))
+        puppet.channels = {"#test": True}
+        await manager.send_message("d1", "#test", "hi")
+        assert not manager.is_puppet_nick("alice")
+        assert puppet._nick_listener is None
+
+    @pytest.mark.asyncio
+    async def test_stop_clears_index(self):
+        manager = _make_manager()
+        await self._create(manager, "d1", "alice")
+        await manager.stop()
+        assert not manager.is_puppet_nick("alice")
+
+    @pytest.mark.asyncio
+    async def test_real_puppet_rename_notifies_listener(self):
+        puppet = IRCPuppet("alice", "d1")
+        seen: list[str] = []
+        puppet._nick_listener = lambda p: seen.append(p.nickname)
+        puppet.nickname = "Guest1"
+        puppet.set_nick = AsyncMock()
+        with patch.object(pydle.Client, "on_nick_change", new=AsyncMock()):
+            await puppet.on_nick_change("alice", "Guest1")
+        assert seen == ["Guest1"]
+        puppet.set_nick.assert_awaited_once_with("alice")
 
 
 # ---------------------------------------------------------------------------
@@ -432,20 +686,20 @@ class TestCleanupIdlePuppets:
 
 class TestStartStop:
     @pytest.mark.asyncio
-    async def test_start_creates_cleanup_task(self):
+    async def test_start_creates_scheduler_task(self):
         manager = _make_manager()
         await manager.start()
-        assert manager._cleanup_task is not None
-        manager._cleanup_task.cancel()
+        assert manager._scheduler_task is not None
+        manager._scheduler_task.cancel()
         with pytest.raises(asyncio.CancelledError):
-            await manager._cleanup_task
+            await manager._scheduler_task
 
     @pytest.mark.asyncio
     async def test_stop_cancels_task_and_disconnects_all(self):
         manager = _make_manager()
         p1, p2 = _mock_puppet("d1"), _mock_puppet("d2")
         manager._puppets = {"d1": p1, "d2": p2}
-        manager._cleanup_task = asyncio.create_task(asyncio.sleep(9999))
+        manager._scheduler_task = asyncio.create_task(asyncio.sleep(9999))
 
         await manager.stop()
 
@@ -458,7 +712,7 @@ class TestStartStop:
         manager = _make_manager()
         await manager.stop()
         assert manager._puppets == {}
-        assert manager._cleanup_task is None
+        assert manager._scheduler_task is None
 
 
 # ---------------------------------------------------------------------------
@@ -499,29 +753,25 @@ class TestPuppetEdgeCases:
         assert result2 is mock_puppet
         assert mock_puppet.connect.await_count == 1  # only connected once
 
-    # --- _cleanup_idle_puppets: non-CancelledError exception continues loop ---
+    # --- scheduler: a failing callback does not stop later deadlines ---
 
     @pytest.mark.asyncio
-    async def test_cleanup_exception_continues_loop(self):
+    async def test_idle_disconnect_failure_does_not_stop_scheduler(self):
         manager = _make_manager()
-        mock_puppet = _mock_puppet()
-        mock_puppet.last_activity = time.time() - 7200
-        mock_puppet.disconnect = AsyncMock(side_effect=OSError("disconnect failed"))
-        manager._puppets["d1"] = mock_puppet
-
-        calls = 0
-
-        async def _sleep_twice(_):
-            nonlocal calls
-            calls += 1
-            if calls >= 3:
-                raise asyncio.CancelledError()
-
-        with patch("asyncio.sleep", side_effect=_sleep_twice):
-            await manager._cleanup_idle_puppets()
+        for d in ("d1", "d2"):
+            p = _mock_puppet(d, f"n{d}")
+            p.last_activity = time.time() - 7200
+            p.disconnect = AsyncMock(side_effect=OSError("disconnect failed"))
+            manager._puppets[d] = p
+            manager._scheduler.schedule(("idle", d), time.time() - 1)
+
+        task = asyncio.create_task(manager._scheduler.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
 
-        # Loop ran at least twice despite exception on first cleanup
-        assert calls >= 2
+        assert manager._puppets == {}
 
     # --- stop() while send_message is in progress ---
 
@@ -530,12 +780,12 @@ class TestPuppetEdgeCases:
         manager = _make_manager()
         send_started = asyncio.Event()
 
-        async def _slow_message(channel, content):
+        async def _slow_message(command, channel, content):
             send_started.set()
             await asyncio.sleep(9999)
 
         mock_puppet = _mock_puppet()
-        mock_puppet.message = AsyncMock(side_effect=_slow_message)
+        mock_puppet.rawmsg = AsyncMock(side_effect=_slow_message)
         manager._puppets["d1"] = mock_puppet
 
         send_task = asyncio.create_task(manager.send_message("d1", "#test", "hello"))
@@ -0,0 +1,158 @@
+"""Tests for DeadlineScheduler (heap-based puppet keepalive/idle timers)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from bridge.adapters.irc.scheduler import DeadlineScheduler
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _noop(key, now) -> None:
+    return None
+
+
+def _scheduler(timer: FakeTimer | None = None) -> DeadlineScheduler:
+    return DeadlineScheduler(_noop, timer=timer or FakeTimer())
+
+
+class TestPopDue:
+    def test_fires_in_deadline_order(self):
+        s = _scheduler()
+        s.schedule("b", 2)
+        s.schedule("a", 1)
+        s.schedule("c", 5)
+        assert s.pop_due(3) == ["a", "b"]
+        assert s.pop_due(10) == ["c"]
+        assert len(s) == 0
+
+    def test_reschedule_replaces_old_deadline(self):
+        s = _scheduler()
+        s.schedule("a", 1)
+        s.schedule("a", 10)
+        assert s.pop_due(5) == []
+        assert s.due("a") == 10
+        assert s.pop_due(10) == ["a"]
+
+    def test_cancel(self):
+        s = _scheduler()
+        s.schedule("a", 1)
+        s.cancel("a")
+        s.cancel("missing")
+        assert "a" not in s
+        assert s.pop_due(5) == []
+
+    def test_stale_entries_are_compacted(self):
+        s = _scheduler()
+        for i in range(1000):
+            s.schedule("a", float(i))
+        assert len(s) == 1
+        assert len(s._heap) <= 2 * len(s) + 64
+
+
+class TestRun:
+    @pytest.mark.asyncio
+    async def test_fires_callback_after_deadline(self):
+        fired: list[str] = []
+
+        async def callback(key, now) -> None:
+            fired.append(key)
+
+        s = DeadlineScheduler(callback)
+        s.schedule("a", time.time() + 0.02)
+        task = asyncio.create_task(s.run())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert fired == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_earlier_deadline_wakes_sleeping_scheduler(self):
+        fired: list[str] = []
+
+        async def callback(key, now) -> None:
+            fired.append(key)
+
+        s = DeadlineScheduler(callback)
+        s.schedule("late", time.time() + 3600)
+        task = asyncio.create_task(s.run())
+        await asyncio.sleep(0.01)
+        s.schedule("soon", time.time() + 0.01)
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert fired == ["soon"]
+
+    @pytest.mark.asyncio
+    async def test_callback_error_is_logged_and_loop_continues(self):
+        fired: list[str] = []
+
+        async def callback(key, now) -> None:
+            fired.append(key)
+            if key == "a":
+                raise RuntimeError("boom")
+
+        s = DeadlineScheduler(callback)
+        s.schedule("a", time.time() - 1)
+        s.schedule("b", time.time() - 1)
+        task = asyncio.create_task(s.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert fired == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_delay_other_deadlines(self):
+        fired: dict[str, float] = {}
+        release = asyncio.Event()
+
+        async def callback(key, now) -> None:
+            if key == "stuck":
+                await release.wait()  # e.g. a disconnect waiting on its socket
+            fired[key] = time.time()
+
+        s = DeadlineScheduler(callback)
+        start = time.time()
+        s.schedule("stuck", start)
+        s.schedule("ping", start + 0.02)
+        task = asyncio.create_task(s.run())
+        await asyncio.sleep(0.1)
+
+        assert "ping" in fired and fired["ping"] - start < 0.1
+        release.set()
+        await asyncio.sleep(0.01)
+        assert "stuck" in fired
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_cancelling_run_cancels_running_callbacks(self):
+        started = asyncio.Event()
+
+        async def callback(key, now) -> None:
+            started.set()
+            await asyncio.sleep(3600)
+
+        s = DeadlineScheduler(callback)
+        s.schedule("a", time.time() - 1)
+        task = asyncio.create_task(s.run())
+        await started.wait()
+        (running,) = s._running
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        assert running.cancelled()
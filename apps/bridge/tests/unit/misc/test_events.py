@@ -169,6 +169,14 @@ class TestConfigReloadEvent:
         event_type, evt = config_reload()
         assert event_type == "config_reload"
         assert isinstance(evt, ConfigReload)
+        assert evt.mappings is None
+
+    def test_config_reload_carries_mapping_diff(self):
+        from bridge.gateway import MappingDiff
+
+        diff = MappingDiff()
+        _, evt = config_reload(diff)
+        assert evt.mappings is diff
 
 
 class TestMessageDeleteEvent:
@@ -4,6 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import os
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -58,6 +62,180 @@ class TestSetupLogging:
             assert "{level:" in fmt
             assert "{message}" in fmt
 
+    def test_production_profile_uses_json_writer_thread_sink(self):
+        """profile='production' adds the JSON writer-thread sink with the call-site sampler; no pickling queue."""
+        # Arrange
+        from bridge.__main__ import _CallSiteSampler, _JSONLineWriter, setup_logging
+
+        # Act
+        with patch("bridge.__main__.logger") as mock_logger:
+            setup_logging(profile="production")
+
+            # Assert
+            (sink,), kwargs = mock_logger.add.call_args
+            assert isinstance(sink, _JSONLineWriter)
+            assert "enqueue" not in kwargs
+            assert isinstance(kwargs["filter"], _CallSiteSampler)
+            sink.stop()
+
+    def test_production_sink_writes_json_lines_from_its_thread(self, tmp_path):
+        """The writer thread serializes records (exceptions included); logger.remove drains it."""
+        import json
+
+        from bridge.__main__ import _add_log_sink
+        from loguru import logger
+
+        path = tmp_path / "out.jsonl"
+        handler_id = _add_log_sink(str(path), "INFO", "production")
+        try:
+            logger.info("hello world")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            logger.remove(handler_id)
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["record"]["message"] for line in lines] == ["hello world", "failed"]
+        assert lines[1]["record"]["exception"]["type"] == "ValueError"
+        assert "boom" in lines[1]["text"]
+        assert lines[0]["record"]["thread"]["name"] == "MainThread"
+
+    def test_log_profile_env_selects_production(self):
+        """LOG_PROFILE=production is honoured when no explicit profile is passed."""
+        # Arrange
+        from bridge.__main__ import setup_logging
+
+        # Act
+        with (
+            patch("bridge.__main__.logger") as mock_logger,
+            patch.dict("os.environ", {"LOG_PROFILE": "production"}, clear=False),
+        ):
+            setup_logging()
+
+            # Assert
+            sink = mock_logger.add.call_args[0][0]
+            assert type(sink).__name__ == "_JSONLineWriter"
+            sink.stop()
+
+    def test_unknown_profile_falls_back_to_dev(self):
+        # Arrange
+        from bridge.__main__ import _resolve_log_profile
+
+        # Act / Assert
+        with patch.dict("os.environ", {"LOG_PROFILE": "verbose-json"}, clear=False):
+            assert _resolve_log_profile(None) == "dev"
+        assert _resolve_log_profile("PRODUCTION") == "production"
+
+
+class TestFastInterceptHandler:
+    @pytest.fixture
+    def production_handler(self):
+        """FastInterceptHandler from the production profile; logging and loguru restored afterwards."""
+        import logging
+
+        from bridge.__main__ import _INTERCEPTED_LIBRARIES, _intercept_logging, _patcher_add_prefix
+        from loguru import logger
+
+        root = logging.getLogger()
+        saved_root = (root.handlers[:], root.level)
+        saved_libs = {name: logging.getLogger(name).__dict__.copy() for name in _INTERCEPTED_LIBRARIES}
+        logger.configure(patcher=_patcher_add_prefix)
+        _intercept_logging("INFO", "production")
+        try:
+            yield logging.getLogger("pydle").handlers[0]
+        finally:
+            root.handlers[:], root.level = saved_root
+            for name, state in saved_libs.items():
+                logging.getLogger(name).__dict__.update(state)
+            logger.configure(patcher=None)
+
+    @staticmethod
+    def _stdlib_record(func: str, line: int):
+        import logging
+
+        return logging.LogRecord("pydle.client", logging.INFO, "client.py", line, "connected", None, None, func=func)
+
+    def test_records_keep_library_call_site(self, production_handler, tmp_path):
+        """Forwarded records carry the library's module, function and line, so sampling is per site."""
+        import json
+
+        from bridge.__main__ import _add_log_sink
+        from loguru import logger
+
+        path = tmp_path / "out.jsonl"
+        with patch.dict("os.environ", {"LOG_SAMPLE_RATE": "1"}, clear=False):
+            handler_id = _add_log_sink(str(path), "INFO", "production")
+        try:
+            production_handler.emit(self._stdlib_record("on_connect", 10))
+            production_handler.emit(self._stdlib_record("on_raw_001", 20))
+        finally:
+            logger.remove(handler_id)
+
+        records = [json.loads(line)["record"] for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [(r["name"], r["function"], r["line"]) for r in records] == [
+            ("pydle.client", "on_connect", 10),
+            ("pydle.client", "on_raw_001", 20),
+        ]
+
+
+class TestCallSiteSampler:
+    @staticmethod
+    def _record(line: int = 1, level_no: int = 20) -> dict:
+        from types import SimpleNamespace
+
+        return {
+            "level": SimpleNamespace(no=level_no),
+            "name": "bridge.gateway.relay",
+            "function": "push_event",
+            "line": line,
+            "extra": {},
+        }
+
+    def test_drops_records_over_rate_and_reports_suppressed(self):
+        """Records beyond the per-site burst are dropped; the next passing one carries the count."""
+        # Arrange
+        from bridge.__main__ import _CallSiteSampler
+
+        sampler = _CallSiteSampler(rate=2)
+
+        # Act
+        with patch("bridge.__main__.time.monotonic", return_value=100.0):
+            results = [sampler(self._record()) for _ in range(5)]
+        later = self._record()
+        with patch("bridge.__main__.time.monotonic", return_value=101.0):
+            passed = sampler(later)
+
+        # Assert
+        assert results == [True, True, False, False, False]
+        assert passed is True
+        assert later["extra"]["suppressed"] == 3
+
+    def test_call_sites_are_independent(self):
+        # Arrange
+        from bridge.__main__ import _CallSiteSampler
+
+        sampler = _CallSiteSampler(rate=1)
+
+        # Act
+        with patch("bridge.__main__.time.monotonic", return_value=5.0):
+            first = [sampler(self._record(line=1)) for _ in range(2)]
+            second = sampler(self._record(line=2))
+
+        # Assert
+        assert first == [True, False]
+        assert second is True
+
+    def test_warnings_are_never_sampled(self):
+        # Arrange
+        from bridge.__main__ import _CallSiteSampler
+
+        sampler = _CallSiteSampler(rate=1)
+
+        # Act / Assert
+        assert all(sampler(self._record(level_no=30)) for _ in range(10))
+
 
 # ---------------------------------------------------------------------------
 # reload_config
@@ -220,7 +398,9 @@ class TestMain:
         mock_config.identity_cache_ttl_seconds = 3600
         captured_identity: list = []
 
-        async def _capture_run(bus, router, identity, portal_client=None, config_path=None):
+        async def _capture_run(
+            bus, router, identity, portal_client=None, config_path=None, *, profile=None, relay=None
+        ):
             captured_identity.append(identity)
 
         loop = asyncio.new_event_loop()
@@ -262,7 +442,9 @@ class TestMain:
         mock_config.identity_cache_ttl_seconds = 3600
         captured_args: list = []
 
-        async def _capture_run(bus, router, identity, portal_client=None, config_path=None):
+        async def _capture_run(
+            bus, router, identity, portal_client=None, config_path=None, *, profile=None, relay=None
+        ):
             captured_args.append((identity, portal_client))
 
         loop = asyncio.new_event_loop()
@@ -311,7 +493,9 @@ class TestMain:
         mock_config.identity_cache_ttl_seconds = 3600
         captured_identity: list = []
 
-        async def _capture_run(bus, router, identity, portal_client=None, config_path=None):
+        async def _capture_run(
+            bus, router, identity, portal_client=None, config_path=None, *, profile=None, relay=None
+        ):
             captured_identity.append(identity)
 
         loop = asyncio.new_event_loop()
@@ -347,6 +531,18 @@ class TestMain:
 # ---------------------------------------------------------------------------
 
 
+@contextlib.contextmanager
+def _all_adapters(discord_adapter, irc_adapter, xmpp_adapter):
+    """Patch _run's adapter loading: all three protocols configured, classes returning these mocks."""
+    classes = {"DiscordAdapter": discord_adapter, "IRCAdapter": irc_adapter, "XMPPAdapter": xmpp_adapter}
+    specs = [("discord", "m", "DiscordAdapter"), ("irc", "m", "IRCAdapter"), ("xmpp", "m", "XMPPAdapter")]
+    with (
+        patch("bridge.__main__._configured_adapters", return_value=specs),
+        patch("bridge.__main__._load_adapter_class", side_effect=lambda _m, cls: MagicMock(return_value=classes[cls])),
+    ):
+        yield
+
+
 class TestRun:
     @pytest.mark.asyncio
     async def test_run_starts_all_adapters(self):
@@ -361,11 +557,7 @@ class TestRun:
         xmpp_adapter = MagicMock(start=AsyncMock(), stop=AsyncMock())
 
         # Act — cancel the infinite sleep immediately after adapters start
-        with (
-            patch("bridge.__main__.DiscordAdapter", return_value=discord_adapter),
-            patch("bridge.__main__.IRCAdapter", return_value=irc_adapter),
-            patch("bridge.__main__.XMPPAdapter", return_value=xmpp_adapter),
-        ):
+        with _all_adapters(discord_adapter, irc_adapter, xmpp_adapter):
             task = asyncio.create_task(_run(bus, router, None))
             await asyncio.sleep(0)
             task.cancel()
@@ -390,11 +582,7 @@ class TestRun:
         xmpp_adapter = MagicMock(start=AsyncMock(), stop=AsyncMock())
 
         # Act
-        with (
-            patch("bridge.__main__.DiscordAdapter", return_value=discord_adapter),
-            patch("bridge.__main__.IRCAdapter", return_value=irc_adapter),
-            patch("bridge.__main__.XMPPAdapter", return_value=xmpp_adapter),
-        ):
+        with _all_adapters(discord_adapter, irc_adapter, xmpp_adapter):
             task = asyncio.create_task(_run(bus, router, None))
             await asyncio.sleep(0)
             task.cancel()
@@ -405,3 +593,375 @@ class TestRun:
         discord_adapter.stop.assert_awaited_once()
         irc_adapter.stop.assert_awaited_once()
         xmpp_adapter.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_flushes_held_events_before_stopping_adapters(self):
+        """Edits and reactions held by the relay go out while the adapters can still send them."""
+        from bridge.__main__ import _run
+
+        calls: list[str] = []
+        irc_adapter = MagicMock(start=AsyncMock(), stop=AsyncMock(side_effect=lambda: calls.append("stop")))
+        relay = MagicMock()
+        relay.flush.side_effect = lambda: calls.append("flush")
+
+        with (
+            patch("bridge.__main__._configured_adapters", return_value=[("irc", "m", "IRCAdapter")]),
+            patch("bridge.__main__._load_adapter_class", return_value=MagicMock(return_value=irc_adapter)),
+        ):
+            task = asyncio.create_task(_run(MagicMock(), MagicMock(), None, relay=relay))
+            await asyncio.sleep(0)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert calls == ["flush", "stop"]
+
+    @pytest.mark.asyncio
+    async def test_run_imports_only_configured_adapters(self):
+        """Protocols without config are never imported or constructed."""
+        # Arrange
+        from bridge.__main__ import _run
+
+        irc_adapter = MagicMock(start=AsyncMock(), stop=AsyncMock())
+        irc_cls = MagicMock(return_value=irc_adapter)
+
+        # Act
+        with (
+            patch("bridge.__main__._configured_adapters", return_value=[("irc", "bridge.adapters.irc", "IRCAdapter")]),
+            patch("bridge.__main__._load_adapter_class", return_value=irc_cls) as load,
+        ):
+            task = asyncio.create_task(_run(MagicMock(), MagicMock(), None))
+            await asyncio.sleep(0)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        # Assert
+        load.assert_called_once_with("bridge.adapters.irc", "IRCAdapter")
+        irc_adapter.start.assert_awaited_once()
+        irc_adapter.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_profiles_adapter_import_and_start(self):
+        """With a startup profile, each adapter's import and start are timed."""
+        # Arrange
+        from bridge.__main__ import _run, _StartupProfile
+
+        profile = _StartupProfile()
+        with _all_adapters(*(MagicMock(start=AsyncMock(), stop=AsyncMock()) for _ in range(3))):
+            task = asyncio.create_task(_run(MagicMock(), MagicMock(), None, profile=profile))
+            await asyncio.sleep(0)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        # Assert
+        assert [name for name, _ in profile.phases] == [
+            "discord import",
+            "irc import",
+            "xmpp import",
+            "discord start",
+            "irc start",
+            "xmpp start",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_only_starts_the_named_adapter(self):
+        """An adapter process (only=...) constructs and starts just its own adapter."""
+        from bridge.__main__ import _run
+
+        adapters = [MagicMock(start=AsyncMock(), stop=AsyncMock()) for _ in range(3)]
+        with _all_adapters(*adapters):
+            task = asyncio.create_task(_run(MagicMock(), MagicMock(), None, only="irc"))
+            await asyncio.sleep(0)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        discord_adapter, irc_adapter, xmpp_adapter = adapters
+        irc_adapter.start.assert_awaited_once()
+        discord_adapter.start.assert_not_awaited()
+        xmpp_adapter.start.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_run_stops_adapters_when_until_is_set(self):
+        """_run returns, stopping its adapters, once *until* is set (hub connection lost)."""
+        from bridge.__main__ import _run
+
+        adapters = [MagicMock(start=AsyncMock(), stop=AsyncMock()) for _ in range(3)]
+        until = asyncio.Event()
+        with _all_adapters(*adapters):
+            task = asyncio.create_task(_run(MagicMock(), MagicMock(), None, until=until))
+            await asyncio.sleep(0)
+            until.set()
+            await asyncio.wait_for(task, 1.0)
+
+        for adapter in adapters:
+            adapter.stop.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# Adapter selection and lazy imports
+# ---------------------------------------------------------------------------
+
+
+def _router(*, irc: bool, xmpp: bool) -> MagicMock:
+    router = MagicMock()
+    router.all_mappings.return_value = [MagicMock(irc=MagicMock() if irc else None, xmpp=MagicMock() if xmpp else None)]
+    return router
+
+
+_XMPP_ENV = {
+    "BRIDGE_XMPP_COMPONENT_JID": "bridge.example.com",
+    "BRIDGE_XMPP_COMPONENT_SECRET": "s3cret",
+    "BRIDGE_XMPP_COMPONENT_SERVER": "xmpp.example.com",
+}
+
+
+class TestConfiguredAdapters:
+    def test_irc_only(self):
+        from bridge.__main__ import _configured_adapters
+
+        with patch.dict("os.environ", {}, clear=True):
+            assert [a[0] for a in _configured_adapters(_router(irc=True, xmpp=True))] == ["irc"]
+
+    def test_discord_needs_token(self):
+        from bridge.__main__ import _configured_adapters
+
+        with patch.dict("os.environ", {"BRIDGE_DISCORD_TOKEN": "tok"}, clear=True):
+            assert [a[0] for a in _configured_adapters(_router(irc=False, xmpp=False))] == ["discord"]
+
+    def test_xmpp_needs_component_credentials_and_muc_mapping(self):
+        from bridge.__main__ import _configured_adapters
+
+        with patch.dict("os.environ", _XMPP_ENV, clear=True):
+            assert [a[0] for a in _configured_adapters(_router(irc=False, xmpp=True))] == ["xmpp"]
+            assert _configured_adapters(_router(irc=False, xmpp=False)) == []
+        with patch.dict("os.environ", {**_XMPP_ENV, "BRIDGE_XMPP_COMPONENT_SECRET": ""}, clear=True):
+            assert _configured_adapters(_router(irc=False, xmpp=True)) == []
+
+    def test_protocol_libraries_not_imported_by_entrypoint(self):
+        """Importing the entrypoint and one adapter leaves the other protocols' libraries unloaded."""
+        import bridge
+
+        code = (
+            "import sys, bridge.__main__, bridge.adapters.irc; "
+            "print(sorted(m for m in ('discord', 'slixmpp', 'pydle') if m in sys.modules))"
+        )
+        src = str(Path(bridge.__file__).parents[1])
+        env = {**os.environ, "PYTHONPATH": src}
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+        assert out.stdout.strip() == "['pydle']"
+
+
+class TestStartupProfile:
+    def test_first_message_out_recorded_once(self):
+        from bridge.__main__ import _StartupProfile
+        from bridge.events import message_out
+
+        profile = _StartupProfile(started=0.0)
+        _, evt = message_out("irc", "#c", "u1", "alice", "hi", "m1")
+        assert profile.accept_event("relay", evt)
+        profile.push_event("relay", evt)
+        assert profile.first_relay is not None
+        assert not profile.accept_event("relay", evt)
+
+    def test_ignores_non_relay_events(self):
+        from bridge.__main__ import _StartupProfile
+        from bridge.events import message_in
+
+        _, evt = message_in("irc", "#c", "u1", "alice", "hi", "m1")
+        assert not _StartupProfile().accept_event("irc", evt)
+
+    def test_main_passes_profile_to_run(self, tmp_path):
+        """--profile-startup creates a profile, times config load and registers it on the bus."""
+        from bridge.__main__ import _StartupProfile, main
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("mappings: []\n")
+        captured: list = []
+
+        async def _capture_run(
+            bus, router, identity, portal_client=None, config_path=None, *, profile=None, relay=None
+        ):
+            captured.append(profile)
+
+        loop = asyncio.new_event_loop()
+        fake_uvloop = MagicMock()
+        fake_uvloop.run.side_effect = lambda coro, **kw: loop.run_until_complete(coro)
+        try:
+            with (
+                patch.dict("sys.modules", {"uvloop": fake_uvloop}),
+                patch("sys.argv", ["bridge", "--config", str(config_file), "--profile-startup"]),
+                patch("bridge.__main__.setup_logging"),
+                patch("bridge.__main__.reload_config", return_value=MagicMock(raw={})),
+                patch("bridge.__main__.ChannelRouter"),
+                patch("bridge.__main__.Bus") as mock_bus,
+                patch("bridge.__main__.Relay"),
+                patch("bridge.__main__._get_portal_url", return_value=None),
+                patch("bridge.__main__._dev_irc_puppets_enabled", return_value=False),
+                patch("bridge.__main__._run", side_effect=_capture_run),
+            ):
+                main()
+        finally:
+            loop.close()
+
+        (profile,) = captured
+        assert isinstance(profile, _StartupProfile)
+        assert [name for name, _ in profile.phases] == ["imports", "config load"]
+        mock_bus.return_value.register.assert_any_call(profile)
+
+
+# ---------------------------------------------------------------------------
+# --processes: adapter processes around a bus hub
+# ---------------------------------------------------------------------------
+
+
+def _run_main(argv: list[str], **patches) -> None:
+    loop = asyncio.new_event_loop()
+    fake_uvloop = MagicMock()
+    fake_uvloop.run.side_effect = lambda coro, **kw: loop.run_until_complete(coro)
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(patch.dict("sys.modules", {"uvloop": fake_uvloop}))
+            stack.enter_context(patch("sys.argv", ["bridge", *argv]))
+            stack.enter_context(patch("bridge.__main__.setup_logging"))
+            stack.enter_context(patch("bridge.__main__.reload_config", return_value=MagicMock(raw={})))
+            stack.enter_context(patch("bridge.__main__.ChannelRouter"))
+            stack.enter_context(patch("bridge.__main__.Relay"))
+            stack.enter_context(patch("bridge.__main__._get_portal_url", return_value=None))
+            stack.enter_context(patch("bridge.__main__._dev_irc_puppets_enabled", return_value=False))
+            for target, value in patches.items():
+                stack.enter_context(patch(f"bridge.__main__.{target}", value))
+            from bridge.__main__ import main
+
+            main()
+    finally:
+        loop.close()
+
+
+class TestProcesses:
+    def test_processes_flag_runs_relay_on_a_bus_hub(self, tmp_path):
+        """--processes puts the relay on a BusHub and hands adapter startup to _run_processes."""
+        from bridge.gateway import BusHub
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("mappings: []\n")
+        captured: list = []
+
+        async def _capture(hub, router, config_path, argv, *, profile=None, relay=None):
+            captured.append((hub, config_path, argv))
+
+        _run_main(["--config", str(config_file), "--processes", "-v"], _run_processes=_capture)
+
+        ((hub, config_path, argv),) = captured
+        assert isinstance(hub, BusHub)
+        assert config_path == config_file
+        assert argv == [sys.executable, "-m", "bridge", "--config", str(config_file), "--verbose"]
+
+    def test_adapter_flag_runs_one_adapter_process(self, tmp_path):
+        """--adapter NAME --bus-socket PATH (set by the parent) runs that adapter against the socket."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("mappings: []\n")
+        captured: list = []
+
+        async def _capture(name, socket_path, router, identity, portal_client, *, config_path, profile=None):
+            captured.append((name, socket_path, config_path))
+
+        _run_main(
+            ["--config", str(config_file), "--adapter", "irc", "--bus-socket", "/tmp/x.sock"],
+            _run_adapter_process=_capture,
+            _run=MagicMock(side_effect=AssertionError("single-process run")),
+        )
+
+        assert captured == [("irc", "/tmp/x.sock", config_file)]
+
+    @pytest.mark.asyncio
+    async def test_adapter_process_restarts_after_exit(self):
+        from bridge.__main__ import _AdapterProcess
+
+        child = _AdapterProcess("irc", [sys.executable, "-c", "pass"], restart_delay=0)
+        started = []
+        spawn = asyncio.create_subprocess_exec
+
+        async def _counting(*argv):
+            started.append(argv)
+            return await spawn(*argv)
+
+        with patch("asyncio.create_subprocess_exec", _counting):
+            task = asyncio.create_task(child.run())
+            async with asyncio.timeout(10):
+                while len(started) < 2:
+                    await asyncio.sleep(0.01)
+            await child.stop()
+            await asyncio.wait_for(task, 10)
+
+        assert len(started) >= 2
+
+    @pytest.mark.asyncio
+    async def test_adapter_process_stop_terminates_child(self):
+        from bridge.__main__ import _AdapterProcess
+
+        child = _AdapterProcess("irc", [sys.executable, "-c", "import time; time.sleep(30)"])
+        task = asyncio.create_task(child.run())
+        async with asyncio.timeout(10):
+            while child.proc is None:
+                await asyncio.sleep(0.01)
+
+        await child.stop(timeout=5)
+        await asyncio.wait_for(task, 5)
+
+        assert child.proc.returncode is not None
+
+
+class TestWatchShardMembers:
+    @pytest.mark.asyncio
+    async def test_reloads_when_members_file_changes(self, tmp_path):
+        from bridge.__main__ import _watch_shard_members
+
+        members = tmp_path / "members"
+        members.write_text("a\n")
+        reloads: list[int] = []
+        with patch("bridge.__main__.cfg", MagicMock(get=MagicMock(return_value=str(members)))):
+            task = asyncio.create_task(_watch_shard_members(lambda: reloads.append(1), interval=0.01))
+            await asyncio.sleep(0.05)
+            assert reloads == []
+            members.write_text("a\nb\n")
+            os.utime(members, (1, 1))
+            async with asyncio.timeout(2):
+                while not reloads:
+                    await asyncio.sleep(0.01)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert reloads == [1]
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_members_file_appears_and_is_replaced(self, tmp_path):
+        from bridge.__main__ import _watch_shard_members
+
+        members = tmp_path / "members"
+        reloads: list[int] = []
+
+        async def wait_for(count: int) -> None:
+            async with asyncio.timeout(2):
+                while len(reloads) < count:
+                    await asyncio.sleep(0.01)
+
+        with patch("bridge.__main__.cfg", MagicMock(get=MagicMock(return_value=str(members)))):
+            task = asyncio.create_task(_watch_shard_members(lambda: reloads.append(1), interval=0.01))
+            await asyncio.sleep(0.05)
+            assert reloads == []  # missing at startup is not a change
+            members.write_text("a\n")
+            await wait_for(1)
+            replacement = tmp_path / "members.new"
+            replacement.write_text("a\nb\n")
+            os.utime(replacement, (members.stat().st_atime, members.stat().st_mtime))
+            replacement.replace(members)  # same mtime, new inode
+            await wait_for(2)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert reloads == [1, 1]
@@ -135,7 +135,7 @@ class TestMessageEditing:
         # Assert - is_edit flag is preserved in the outbound event
         assert len(harness.irc.sent_messages) == 1
         out = harness.irc.sent_messages[0]
-        assert out.raw.get("is_edit") is True
+        assert out.is_edit is True
         assert out.content == "Edited content (edited)"
         await harness.stop()
 
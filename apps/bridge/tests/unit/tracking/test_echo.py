@@ -0,0 +1,151 @@
+"""Unit tests for EchoCorrelator (send/echo pairing for IRC and XMPP)."""
+
+from bridge.tracking.echo import EchoCorrelator, content_digest
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _correlator(ttl: float = 60.0, **kwargs) -> tuple[EchoCorrelator, FakeTimer]:
+    timer = FakeTimer()
+    return EchoCorrelator(ttl, timer=timer, **kwargs), timer
+
+
+class TestClaim:
+    def test_out_of_order_echoes_pair_by_key(self):
+        c, _ = _correlator()
+        c.expect(("#a", "alice", content_digest("one")), "d1", group=("#a", "alice"))
+        c.expect(("#a", "alice", content_digest("two")), "d2", group=("#a", "alice"))
+
+        assert c.claim(("#a", "alice", content_digest("two")), group=("#a", "alice")) == "d2"
+        assert c.claim(("#a", "alice", content_digest("one")), group=("#a", "alice")) == "d1"
+        assert c.matched == 2
+        assert len(c) == 0
+
+    def test_identical_sends_claim_oldest_first(self):
+        c, _ = _correlator()
+        c.expect("k", "d1")
+        c.expect("k", "d2")
+        assert c.claim("k") == "d1"
+        assert c.claim("k") == "d2"
+
+    def test_group_fallback_when_content_differs(self):
+        c, _ = _correlator()
+        c.expect(("#a", "alice", content_digest("\x0304colored")), "d1", group=("#a", "alice"))
+        assert c.claim(("#a", "alice", content_digest("colored")), group=("#a", "alice")) == "d1"
+
+    def test_group_fallback_does_not_cross_targets(self):
+        c, _ = _correlator()
+        c.expect(("#a", "alice", b"x"), "d1", group=("#a", "alice"))
+        assert c.claim(("#b", "alice", b"x"), group=("#b", "alice")) is None
+        assert c.mismatched == 1
+
+    def test_claimed_by_key_is_gone_from_group(self):
+        c, _ = _correlator()
+        c.expect("k1", "d1", group="g")
+        assert c.claim("k1") == "d1"
+        assert c.claim("other", group="g") is None
+
+    def test_lost_echo_does_not_shift_later_pairings(self):
+        c, _ = _correlator()
+        c.expect(("label", "1"), "d1")
+        c.expect(("label", "2"), "d2")
+        # echo for label 1 is lost
+        assert c.claim(("label", "2")) == "d2"
+
+
+class TestMarkers:
+    def test_mark_is_not_consumed_by_seen(self):
+        c, _ = _correlator()
+        c.mark(("room", "alice"))
+        assert c.seen(("room", "alice"))
+        assert c.seen(("room", "alice"))
+        assert not c.seen(("room", "bob"))
+
+    def test_mark_refresh_keeps_single_entry(self):
+        c, timer = _correlator(ttl=10)
+        c.mark("m")
+        timer.now += 8
+        c.mark("m")
+        timer.now += 8
+        assert c.seen("m")
+        assert len(c) == 1
+
+    def test_marker_ttl_override(self):
+        c, timer = _correlator(ttl=120)
+        c.mark("relay", ttl=5)
+        timer.now += 6
+        assert not c.seen("relay")
+
+
+class TestExpiryAndCapacity:
+    def test_expired_entries_are_not_claimed(self):
+        c, timer = _correlator(ttl=10)
+        c.expect("k", "d1")
+        timer.now += 11
+        assert c.claim("k") is None
+        assert c.expired == 1
+        assert c.mismatched == 1
+
+    def test_capacity_follows_send_rate(self):
+        c, timer = _correlator(ttl=5, min_capacity=100)
+        assert c.capacity == 100
+        for i in range(2000):
+            timer.now += 0.001  # ~1000 sends/s
+            c.expect(f"k{i}", i)
+        assert c.capacity >= 2000
+        assert c.overflowed == 0
+        assert c.claim("k0") == 0
+
+    def test_overflow_counted_at_max_capacity(self):
+        c, _ = _correlator(ttl=60, min_capacity=10, max_capacity=10)
+        for i in range(15):
+            c.expect(f"k{i}", i)
+        assert len(c) == 10
+        assert c.overflowed == 5
+        assert c.claim("k0") is None
+        assert c.claim("k14") == 14
+
+    def test_rate_decays_after_quiet_windows(self):
+        c, timer = _correlator(ttl=5, min_capacity=10)
+        for i in range(500):
+            timer.now += 0.001
+            c.expect(f"k{i}", i)
+        burst = c.capacity
+        for _ in range(6):
+            timer.now += 6
+            c.expect("tick", None)
+        assert c.capacity < burst
+
+    def test_clear_and_stats(self):
+        c, _ = _correlator()
+        c.expect("k", "d")
+        c.clear()
+        assert len(c) == 0
+        stats = c.stats()
+        assert stats["pending"] == 0
+        assert {"matched", "mismatched", "overflowed", "expired", "capacity", "send_rate"} <= stats.keys()
+
+
+class TestStatsLog:
+    def test_counters_are_logged_periodically_while_echoes_flow(self):
+        from loguru import logger
+
+        c, timer = _correlator(name="IRC echo")
+        messages: list[str] = []
+        sink = logger.add(messages.append, level="INFO", format="{message}")
+        try:
+            c.claim("missing")
+            assert messages == []
+            timer.now += 301
+            c.claim("missing")
+        finally:
+            logger.remove(sink)
+
+        assert len(messages) == 1
+        assert messages[0].startswith("IRC echo correlation:") and "'mismatched': 1" in messages[0]
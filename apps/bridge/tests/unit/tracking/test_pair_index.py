@@ -0,0 +1,124 @@
+"""Unit tests for PairIndexedTTLCache (indexed (muc_jid, user_jid) presence state)."""
+
+from bridge.tracking import PairIndexedTTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(maxsize: int = 100, ttl: float = 60.0, timer: FakeTimer | None = None) -> PairIndexedTTLCache[str, str]:
+    return PairIndexedTTLCache(maxsize=maxsize, ttl=ttl, timer=timer or FakeTimer())
+
+
+class TestIndexedQueries:
+    def test_keys_by_first_and_second(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c[("room1", "bob")] = None
+        c[("room2", "alice")] = None
+
+        assert sorted(c.keys_with_first("room1")) == [("room1", "alice"), ("room1", "bob")]
+        assert sorted(c.keys_with_second("alice")) == [("room1", "alice"), ("room2", "alice")]
+        assert c.keys_with_first("room3") == []
+        assert c.keys_with_second("carol") == []
+
+    def test_behaves_as_ttlcache(self):
+        c = _cache()
+        c[("room1", "alice")] = "v"
+        assert ("room1", "alice") in c
+        assert c[("room1", "alice")] == "v"
+        assert len(c) == 1
+
+    def test_overwrite_does_not_duplicate(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c[("room1", "alice")] = None
+        assert c.keys_with_first("room1") == [("room1", "alice")]
+
+    def test_del_and_pop_update_indexes(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c[("room1", "bob")] = None
+        del c[("room1", "alice")]
+        c.pop(("room1", "bob"))
+        assert c.keys_with_first("room1") == []
+        assert c._by_first == {}
+        assert c._by_second == {}
+
+
+class TestDiscard:
+    def test_discard_first_removes_only_that_room(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c[("room1", "bob")] = None
+        c[("room2", "alice")] = None
+
+        assert c.discard_first("room1") == 2
+        assert ("room1", "alice") not in c
+        assert ("room1", "bob") not in c
+        assert ("room2", "alice") in c
+        assert c.keys_with_second("alice") == [("room2", "alice")]
+
+    def test_discard_second_removes_only_that_user(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c[("room2", "alice")] = None
+        c[("room1", "bob")] = None
+
+        assert c.discard_second("alice") == 2
+        assert list(c) == [("room1", "bob")]
+
+    def test_discard_missing_is_noop(self):
+        c = _cache()
+        assert c.discard_first("nope") == 0
+        assert c.discard_second("nope") == 0
+
+
+class TestExpiryAndEviction:
+    def test_expired_pairs_are_not_returned(self):
+        timer = FakeTimer()
+        c = _cache(ttl=10, timer=timer)
+        c[("room1", "alice")] = None
+        timer.now = 11
+        assert c.keys_with_first("room1") == []
+        assert c.keys_with_second("alice") == []
+
+    def test_expire_purges_indexes(self):
+        timer = FakeTimer()
+        c = _cache(ttl=10, timer=timer)
+        c[("room1", "alice")] = None
+        timer.now = 11
+        c.expire()
+        assert c._by_first == {}
+        assert c._by_second == {}
+
+    def test_discard_cleans_expired_unpurged_pairs(self):
+        timer = FakeTimer()
+        c = _cache(ttl=10, timer=timer)
+        c[("room1", "alice")] = None
+        timer.now = 11
+        c.discard_first("room1")
+        assert c._by_second == {}
+
+    def test_lru_eviction_updates_indexes(self):
+        c = _cache(maxsize=2)
+        c[("room1", "alice")] = None
+        c[("room1", "bob")] = None
+        c[("room1", "carol")] = None
+        assert len(c) == 2
+        assert ("room1", "alice") not in c
+        assert sorted(c.keys_with_first("room1")) == [("room1", "bob"), ("room1", "carol")]
+        assert "alice" not in c._by_second
+
+    def test_clear_resets_indexes(self):
+        c = _cache()
+        c[("room1", "alice")] = None
+        c.clear()
+        assert len(c) == 0
+        assert c.keys_with_first("room1") == []
+        assert c._by_first == {}
@@ -257,3 +257,62 @@ class TestXMPPMessageIDTracking:
         # After: both xmpp_id and stanza_id resolve to real Discord ID
         assert tracker.get_discord_id("origin-id-e5f0704a") == "1481357671809548308"
         assert tracker.get_discord_id("stanza-id-019cde26") == "1481357671809548308"
+
+
+class TestXMPPAliasGroups:
+    """Alias groups keep update/re-key/expiry scoped to one message's keys."""
+
+    def test_update_discord_id_leaves_other_messages_untouched(self) -> None:
+        tracker = XMPPMessageIDTracker()
+        tracker.store("origin-a", "irc-a", "room@muc.example.com")
+        tracker.add_stanza_id_alias("origin-a", "stanza-a")
+        tracker.store("origin-b", "irc-b", "room@muc.example.com")
+        tracker.add_stanza_id_alias("origin-b", "stanza-b")
+
+        assert tracker.update_discord_id("stanza-a", "discord-a") is True
+
+        assert tracker.get_discord_id("origin-a") == "discord-a"
+        assert tracker.get_discord_id("stanza-a") == "discord-a"
+        assert tracker.get_discord_id("stanza-b") == "irc-b"
+        assert tracker.get_xmpp_id_for_reaction("discord-a") == "stanza-a"
+        assert tracker._discord_groups["discord-a"].xmpp_ids == {"origin-a", "stanza-a"}
+        assert "irc-a" not in tracker._discord_groups
+
+    def test_update_xmpp_id_rekeys_group(self) -> None:
+        tracker = XMPPMessageIDTracker()
+        tracker.store("client-id", "discord-1", "room@muc.example.com")
+        tracker.add_alias("origin-id", "client-id")
+        tracker.update_xmpp_id("client-id", "stanza-id")
+        group = tracker._xmpp_groups["stanza-id"]
+        assert group.xmpp_ids == {"origin-id", "stanza-id"}
+        assert "client-id" not in tracker._xmpp_groups
+
+    def test_expiry_removes_all_aliases(self) -> None:
+        with patch("bridge.adapters.xmpp.msgid.time") as mock_time:
+            mock_time.time.side_effect = [1000.0, 1005.0, 1010.0]
+            mock_time.monotonic.side_effect = [0.0, 0.0, 999999.0]
+            tracker = XMPPMessageIDTracker(ttl_seconds=8)
+            tracker.store("origin-old", "irc-old", "room@muc.example.com")
+            tracker.add_stanza_id_alias("origin-old", "stanza-old")  # throttled cleanup
+            tracker.add_discord_id_alias("discord-old", "irc-old")  # throttled cleanup
+            tracker.store("origin-new", "irc-new", "room@muc.example.com")
+            tracker._cleanup()
+
+        assert tracker._xmpp_to_discord.keys() == {"origin-new"}
+        assert tracker._discord_to_xmpp.keys() == {"irc-new"}
+        assert tracker._discord_to_stanza_id == {}
+        assert tracker._xmpp_groups.keys() == {"origin-new"}
+        assert tracker._discord_groups.keys() == {"irc-new"}
+        assert len(tracker._expiry) == 1
+
+    def test_restored_xmpp_id_survives_old_group_expiry(self) -> None:
+        with patch("bridge.adapters.xmpp.msgid.time") as mock_time:
+            mock_time.time.side_effect = [1000.0, 1009.0, 1010.0]
+            mock_time.monotonic.return_value = 999999.0
+            tracker = XMPPMessageIDTracker(ttl_seconds=5)
+            tracker.store("xmpp-1", "discord-old", "room@muc.example.com")
+            tracker.store("xmpp-1", "discord-new", "room@muc.example.com")
+            tracker._cleanup()
+
+        assert tracker.get_discord_id("xmpp-1") == "discord-new"
+        assert tracker.get_xmpp_id("discord-old") is None
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from bridge.adapters.xmpp import XMPPAdapter
-from bridge.events import MessageDeleteOut, MessageOut, ReactionOut
+from bridge.events import ConfigReload, MessageBulkDeleteOut, MessageDeleteOut, MessageOut, ReactionOut
 from bridge.gateway import Bus, ChannelRouter
 from bridge.gateway.router import ChannelMapping, XmppTarget
 
@@ -55,6 +56,7 @@ def _mock_component(xmpp_id_for: str | None = "xmpp-msg-1") -> MagicMock:
     comp.send_retraction_as_user = AsyncMock()
     comp.send_retraction_as_bridge = AsyncMock()
     comp.send_reaction_as_user = AsyncMock()
+    comp.send_reactions_as_user = AsyncMock()
     comp.set_avatar_for_user = AsyncMock()
     comp.disconnect = MagicMock()
     return comp
@@ -243,9 +245,32 @@ class TestHandleDeleteOut:
         comp.send_retraction_as_user.assert_not_called()
 
 
-# ---------------------------------------------------------------------------
-# _handle_reaction_out
-# ---------------------------------------------------------------------------
+class TestHandleBulkDeleteOut:
+    @pytest.mark.asyncio
+    async def test_retracts_every_known_message(self):
+        adapter, _, router = _make_adapter(identity_nick="xmpp_nick")
+        comp = _mock_component()
+        comp._msgid_tracker.get_xmpp_id_for_reaction.side_effect = lambda mid: None if mid == "m3" else f"x-{mid}"
+        comp._msgid_tracker.get_xmpp_id.return_value = None
+        adapter._component = comp
+        router.get_mapping_for_discord.return_value = _xmpp_mapping()
+        evt = MessageBulkDeleteOut("xmpp", "111", (("m1", "u1", "Alice"), ("m2", "", ""), ("m3", "u1", "Alice")))
+
+        await adapter._handle_bulk_delete_out(evt)
+
+        comp.send_retraction_as_user.assert_awaited_once_with("u1", "room@conf.example.com", "x-m1", "xmpp_nick")
+        comp.send_retraction_as_bridge.assert_awaited_once_with("room@conf.example.com", "x-m2")
+
+    @pytest.mark.asyncio
+    async def test_consumer_runs_the_batch(self):
+        adapter, _, router = _make_adapter(identity_nick="xmpp_nick")
+        comp = _mock_component()
+        adapter._component = comp
+        router.get_mapping_for_discord.return_value = _xmpp_mapping()
+
+        await _run_consumer_once(adapter, MessageBulkDeleteOut("xmpp", "111", (("m1", "", ""), ("m2", "", ""))))
+
+        assert comp.send_retraction_as_bridge.await_count == 2
 
 
 class TestHandleReactionOut:
@@ -392,7 +417,7 @@ class TestOutboundConsumer:
             author_display="U",
             content="hello",
             message_id="m1",
-            raw={"origin": "discord"},
+            origin="discord",
         )
         await _run_consumer_once(adapter, evt)
 
@@ -450,7 +475,7 @@ class TestOutboundConsumer:
             author_display="U",
             content="hi",
             message_id="m1",
-            raw={"origin": "discord"},
+            origin="discord",
         )
         await _run_consumer_once(adapter, evt)
 
@@ -485,7 +510,7 @@ class TestOutboundConsumer:
             author_display="U",
             content="edited",
             message_id="m1",
-            raw={"is_edit": True},
+            is_edit=True,
         )
         await _run_consumer_once(adapter, evt)
 
@@ -508,7 +533,7 @@ class TestOutboundConsumer:
             author_display="U",
             content="edited",
             message_id="m1",
-            raw={"is_edit": True},
+            is_edit=True,
         )
         await _run_consumer_once(adapter, evt)
 
@@ -530,7 +555,7 @@ class TestOutboundConsumer:
             content="reply",
             message_id="m2",
             reply_to_id="m1",
-            raw={"origin": "discord"},
+            origin="discord",
         )
         await _run_consumer_once(adapter, evt)
 
@@ -601,6 +626,77 @@ class TestOutboundConsumer:
 
         comp.send_reaction_as_user.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_queued_reactions_of_one_user_on_one_message_share_a_stanza(self):
+        adapter, _, router = _make_adapter(identity_nick="xmpp_nick")
+        comp = _mock_component()
+        adapter._component = comp
+        router.get_mapping_for_discord.return_value = _xmpp_mapping()
+
+        def reaction(emoji: str, author_id: str = "u1", **raw) -> ReactionOut:
+            return ReactionOut("xmpp", "111", "m1", emoji, author_id, "U", raw=raw)
+
+        adapter.push_event("relay", reaction("👍"))
+        adapter.push_event("relay", reaction("❤️"))
+        adapter.push_event("relay", reaction("👍", is_remove=True))
+        adapter.push_event("relay", reaction("🎉", author_id="u2"))
+        assert adapter._outbound.qsize() == 2
+
+        await _run_consumer_once(adapter, reaction("👀", author_id="u3"))
+
+        comp.send_reactions_as_user.assert_awaited_once_with(
+            "u1",
+            "room@conf.example.com",
+            "xmpp-msg-1",
+            [("👍", False), ("❤️", False), ("👍", True)],
+            nick="xmpp_nick",
+        )
+        assert comp.send_reaction_as_user.await_count == 2  # u2 and u3: one reaction each
+        assert adapter._queued_reactions == {}
+
+    @pytest.mark.asyncio
+    async def test_full_queue_defers_reaction_batch_until_drained(self):
+        adapter, _, router = _make_adapter(identity_nick="xmpp_nick")
+        comp = _mock_component()
+        adapter._component = comp
+        router.get_mapping_for_discord.return_value = _xmpp_mapping()
+        adapter._outbound = asyncio.Queue(maxsize=2)
+
+        def reaction(emoji: str, **raw) -> ReactionOut:
+            return ReactionOut("xmpp", "111", "m1", emoji, "u1", "U", raw=raw)
+
+        def delete(message_id: str) -> MessageDeleteOut:
+            return MessageDeleteOut(target_origin="xmpp", channel_id="111", message_id=message_id, author_id="u2")
+
+        adapter.push_event("relay", reaction("👍"))
+        adapter.push_event("relay", reaction("❤️"))
+        adapter.push_event("relay", delete("d1"))
+        adapter.push_event("relay", delete("d2"))  # evicts the queued reaction
+        adapter.push_event("relay", reaction("👍", is_remove=True))  # joins the deferred batch
+
+        assert adapter._outbound.qsize() == 2
+        assert adapter._queued_reactions == {}
+        assert adapter.reactions_deferred == 2
+
+        task = asyncio.create_task(adapter._outbound_consumer())
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            if comp.send_reactions_as_user.await_count:
+                break
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+        assert comp.send_retraction_as_user.await_count == 2
+        comp.send_reactions_as_user.assert_awaited_once_with(
+            "u1",
+            "room@conf.example.com",
+            "xmpp-msg-1",
+            [("👍", False), ("❤️", False), ("👍", True)],
+            nick="xmpp_nick",
+        )
+        assert adapter._deferred_reactions == {}
+
 
 # ---------------------------------------------------------------------------
 # start
@@ -737,6 +833,43 @@ class TestStop:
         bus.unregister.assert_called_once_with(adapter)
 
 
+# ---------------------------------------------------------------------------
+# Mapping reload
+# ---------------------------------------------------------------------------
+
+
+def _muc_cfg(*pairs: tuple[str, str]) -> dict:
+    return {"mappings": [{"discord_channel_id": dc, "xmpp": {"muc_jid": muc}} for dc, muc in pairs]}
+
+
+class TestMappingReload:
+    @pytest.mark.asyncio
+    async def test_joins_added_and_leaves_removed_mucs_only(self):
+        router = ChannelRouter()
+        router.load_from_config(_muc_cfg(("1", "keep@muc"), ("2", "old@muc")))
+        adapter = XMPPAdapter(MagicMock(spec=Bus), router, None)
+        comp = MagicMock(is_connected=MagicMock(return_value=True), join_muc_as_listener=AsyncMock())
+        adapter._component = comp
+        diff = router.load_from_config(_muc_cfg(("1", "keep@muc"), ("3", "new@muc")))
+
+        assert adapter.accept_event("main", ConfigReload(diff))
+        await adapter._apply_mapping_diff(diff)
+
+        comp.leave_muc.assert_called_once_with("old@muc")
+        comp.join_muc_as_listener.assert_awaited_once_with("new@muc")
+
+    @pytest.mark.asyncio
+    async def test_disconnected_component_waits_for_session_start(self):
+        router = ChannelRouter()
+        adapter = XMPPAdapter(MagicMock(spec=Bus), router, None)
+        comp = MagicMock(is_connected=MagicMock(return_value=False), join_muc_as_listener=AsyncMock())
+        adapter._component = comp
+
+        await adapter._apply_mapping_diff(router.load_from_config(_muc_cfg(("1", "new@muc"))))
+
+        comp.join_muc_as_listener.assert_not_awaited()
+
+
 # ---------------------------------------------------------------------------
 # Edge cases / race conditions
 # ---------------------------------------------------------------------------
@@ -966,7 +1099,7 @@ class TestConsumerGuardConditions:
             author_display="U",
             content="hi",
             message_id="m1",
-            raw={"origin": "discord"},
+            origin="discord",
         )
         await _run_consumer_once(adapter, evt)
         comp.send_message_as_user.assert_awaited_once_with(
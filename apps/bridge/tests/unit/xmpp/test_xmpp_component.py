@@ -8,6 +8,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from bridge.adapters.xmpp import XMPPComponent, XMPPMessageIDTracker
 from bridge.events import MessageDelete, MessageIn, ReactionIn
+from bridge.tracking import PairIndexedTTLCache
+from bridge.tracking.echo import EchoCorrelator
 from cachetools import TTLCache
 
 pytestmark = pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
@@ -28,9 +30,9 @@ def make_component(router=None, bus=None):
     comp._avatar_cache = TTLCache(maxsize=10, ttl=60)
     comp._ibb_streams = {}
     comp._msgid_tracker = XMPPMessageIDTracker()
-    comp._puppets_joined = TTLCache(maxsize=10000, ttl=86400)
+    comp._puppets_joined = PairIndexedTTLCache(maxsize=10000, ttl=86400)
     comp._seen_msg_ids = TTLCache(maxsize=500, ttl=60)
-    comp._recent_sent_nicks = TTLCache(maxsize=200, ttl=10)
+    comp._echoes = EchoCorrelator(ttl=10)
     comp._reactions_by_user = TTLCache(maxsize=2000, ttl=3600)
     comp._seen_moderation_ids = TTLCache(maxsize=200, ttl=60)
     comp._seen_retraction_ids = TTLCache(maxsize=200, ttl=60)
@@ -166,7 +168,7 @@ class TestOnGroupchatMessage:
 
         _, evt = bus.publish.call_args[0]
         assert evt.content == "secret"
-        assert evt.raw.get("spoiler") is True
+        assert evt.meta.spoiler is True
 
     def test_spoiler_with_hint(self):
         """XEP-0382: hint stored in raw spoiler_reason; body unchanged."""
@@ -184,8 +186,8 @@ class TestOnGroupchatMessage:
 
         _, evt = bus.publish.call_args[0]
         assert evt.content == "they all die"
-        assert evt.raw.get("spoiler") is True
-        assert evt.raw.get("spoiler_reason") == "Plot twist"
+        assert evt.meta.spoiler is True
+        assert evt.meta.spoiler_reason == "Plot twist"
 
     def test_oob_url_used_as_content_when_body_empty(self):
         """XEP-0066 OOB: when body is empty, OOB URL becomes content."""
@@ -16,6 +16,8 @@ from bridge.adapters.xmpp import (
     _unescape_jid_node,
 )
 from bridge.adapters.xmpp.outbound import RETRACTION_FALLBACK_BODY
+from bridge.tracking import PairIndexedTTLCache
+from bridge.tracking.echo import EchoCorrelator
 from cachetools import TTLCache
 from slixmpp import JID
 
@@ -85,9 +87,9 @@ def make_component(router=None, bus=None) -> Any:
     comp._avatar_cache = TTLCache(maxsize=100, ttl=86400)
     comp._ibb_streams = {}
     comp._msgid_tracker = XMPPMessageIDTracker()
-    comp._puppets_joined = TTLCache(maxsize=10000, ttl=86400)
-    comp._avatar_broadcast_done = TTLCache(maxsize=10000, ttl=86400)
-    comp._recent_sent_nicks = TTLCache(maxsize=200, ttl=10)
+    comp._puppets_joined = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+    comp._avatar_broadcast_done = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+    comp._echoes = EchoCorrelator(ttl=10)
     comp._reactions_by_user = TTLCache(maxsize=2000, ttl=3600)
     comp._banned_rooms = set()
     comp._auto_rejoin = True
@@ -185,6 +187,39 @@ class TestSessionLifecycle:
         await comp._on_disconnected(None)
 
 
+class TestMappedMucMembership:
+    @pytest.mark.asyncio
+    async def test_join_as_listener(self):
+        comp = make_component()
+        comp.plugin = _make_plugin_registry()
+        muc = comp.plugin.get("xep_0045")
+
+        assert await comp.join_muc_as_listener("new@muc.example.com") is True
+
+        args, kwargs = muc.join_muc_wait.call_args
+        assert (str(args[0]), args[1]) == ("new@muc.example.com", "bridge")
+        assert str(kwargs["presence_options"]["pfrom"]) == "bridge@bridge.example.com"
+
+    def test_leave_muc_leaves_listener_and_puppets(self):
+        comp = make_component()
+        comp.plugin = _make_plugin_registry()
+        muc = comp.plugin.get("xep_0045")
+        comp._puppets_joined[("gone@muc.example.com", "alice@bridge.example.com")] = "alice"
+        comp._puppets_joined[("kept@muc.example.com", "alice@bridge.example.com")] = "alice"
+        comp._confirmed_mucs.add("gone@muc.example.com")
+
+        comp.leave_muc("gone@muc.example.com")
+
+        left = {(str(c.args[0]), c.args[1], str(c.kwargs["pfrom"])) for c in muc.leave_muc.call_args_list}
+        assert left == {
+            ("gone@muc.example.com", "bridge", "bridge@bridge.example.com"),
+            ("gone@muc.example.com", "alice", "alice@bridge.example.com"),
+        }
+        assert comp._puppets_joined.keys_with_first("gone@muc.example.com") == []
+        assert ("kept@muc.example.com", "alice@bridge.example.com") in comp._puppets_joined
+        assert "gone@muc.example.com" not in comp._confirmed_mucs
+
+
 # ---------------------------------------------------------------------------
 # send_message_as_user
 # ---------------------------------------------------------------------------
@@ -316,6 +351,29 @@ class TestSendReactionAsUser:
         # Act / Assert — must not raise
         await comp.send_reaction_as_user("d1", "room@conf.example.com", "msg-1", "👍", "Nick")
 
+    @pytest.mark.asyncio
+    async def test_several_changes_send_one_stanza_with_final_set(self):
+        # Arrange
+        comp = make_component()
+        comp._reactions_by_user[("msg-1", "Nick")] = frozenset({"👀"})
+        reactions_plugin = MagicMock()
+        mock_msg = MagicMock()
+        comp.make_message.return_value = mock_msg
+        comp.plugin = _make_plugin_registry(
+            xep_0106=_mock_jid_escape_plugin(),
+            xep_0444=reactions_plugin,
+        )
+
+        # Act
+        await comp.send_reactions_as_user(
+            "d1", "room@conf.example.com", "msg-1", [("👍", False), ("❤️", False), ("👀", True)], nick="Nick"
+        )
+
+        # Assert
+        reactions_plugin.set_reactions.assert_called_once_with(mock_msg, "msg-1", {"👍", "❤️"})
+        mock_msg.send.assert_called_once()
+        assert comp._reactions_by_user[("msg-1", "Nick")] == frozenset({"👍", "❤️"})
+
 
 # ---------------------------------------------------------------------------
 # send_retraction_as_user
@@ -456,7 +514,7 @@ class TestJoinMucAsUser:
 
     @pytest.mark.asyncio
     async def test_successful_join_registers_nick_for_echo_suppression(self):
-        """After join, _recent_sent_nicks must include (muc, occupant nick) for echo detection."""
+        """After join, a (muc, occupant nick) echo marker must be set for echo detection."""
         comp = make_component()
         muc_plugin = AsyncMock()
         muc_plugin.join_muc_wait.return_value = None
@@ -467,7 +525,7 @@ class TestJoinMucAsUser:
 
         await comp.join_muc_as_user("room@conf.example.com", "kaizen")
 
-        assert ("room@conf.example.com", "kaizen") in comp._recent_sent_nicks
+        assert comp._echoes.seen(("room@conf.example.com", "kaizen"))
 
     @pytest.mark.asyncio
     async def test_join_with_puppet_suffix_sets_xep0172_pnick(self, monkeypatch):
@@ -14,6 +14,7 @@ from bridge.adapters.xmpp.handlers import (
     is_xmpp_echo,
     should_suppress_echo,
 )
+from bridge.tracking.echo import EchoCorrelator
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -24,8 +25,8 @@ def _make_comp(component_jid: str = "bridge.example.com") -> MagicMock:
     """Create a minimal mock XMPPComponent with the fields echo checks need."""
     comp = MagicMock()
     comp._component_jid = component_jid
-    # _recent_sent_nicks behaves like a dict/TTLCache — support `in` operator
-    comp._recent_sent_nicks = {}
+    # (room_jid, nick) markers for the recent-send fallback
+    comp._echoes = EchoCorrelator(ttl=90)
     return comp
 
 
@@ -125,7 +126,7 @@ class TestIsRecentEcho:
 
     def test_recent_nick_is_echo(self) -> None:
         comp = _make_comp()
-        comp._recent_sent_nicks[("room@muc.example.com", "alice")] = None
+        comp._echoes.mark(("room@muc.example.com", "alice"))
         assert is_recent_echo(comp, "room@muc.example.com", "alice") is True
 
     def test_unknown_nick_not_echo(self) -> None:
@@ -134,7 +135,7 @@ class TestIsRecentEcho:
 
     def test_different_room_not_echo(self) -> None:
         comp = _make_comp()
-        comp._recent_sent_nicks[("room@muc.example.com", "alice")] = None
+        comp._echoes.mark(("room@muc.example.com", "alice"))
         assert is_recent_echo(comp, "other@muc.example.com", "alice") is False
 
 
@@ -182,7 +183,7 @@ class TestShouldSuppressEcho:
                 ("room@muc.example.com", "puppet"): None,  # JID not exposed
             },
         )
-        comp._recent_sent_nicks[("room@muc.example.com", "puppet")] = None
+        comp._echoes.mark(("room@muc.example.com", "puppet"))
         assert should_suppress_echo(comp, "room@muc.example.com", "puppet") is True
 
     def test_suppresses_listener_nick(self) -> None:
@@ -208,5 +209,5 @@ class TestShouldSuppressEcho:
                 ("room@muc.example.com", "alice"): None,
             },
         )
-        # Not in _recent_sent_nicks either
+        # No recent-send marker either
         assert should_suppress_echo(comp, "room@muc.example.com", "alice") is False
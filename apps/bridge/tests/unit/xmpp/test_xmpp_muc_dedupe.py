@@ -0,0 +1,106 @@
+"""Tests for the early MUC duplicate-delivery filter (adapters/xmpp/dedupe.py)."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+from xml.etree import ElementTree as ET
+
+from bridge.adapters.xmpp.component import XMPPComponent
+from bridge.adapters.xmpp.dedupe import MUCDeliveryDeduper, delivery_key
+from slixmpp import Message
+
+ROOM = "room@muc.example.com"
+SID = "{urn:xmpp:sid:0}"
+
+
+def _groupchat(
+    *,
+    to: str,
+    sender: str = f"{ROOM}/alice",
+    msg_id: str | None = "m1",
+    stanza_id: str | None = "s1",
+    origin_id: str | None = None,
+    mtype: str = "groupchat",
+) -> Message:
+    msg = Message()
+    msg["type"] = mtype
+    msg["from"] = sender
+    msg["to"] = to
+    if msg_id:
+        msg["id"] = msg_id
+    msg["body"] = "hello"
+    if stanza_id:
+        ET.SubElement(msg.xml, f"{SID}stanza-id", {"id": stanza_id, "by": ROOM})
+    if origin_id:
+        ET.SubElement(msg.xml, f"{SID}origin-id", {"id": origin_id})
+    return msg
+
+
+class TestDeliveryKey:
+    def test_prefers_room_stanza_id(self):
+        msg = _groupchat(to="bridge@c", stanza_id="s1", origin_id="o1")
+        assert delivery_key(msg.xml) == (ROOM, "sid", "s1")
+
+    def test_ignores_stanza_id_by_other_entity(self):
+        msg = _groupchat(to="bridge@c", stanza_id=None, origin_id="o1")
+        ET.SubElement(msg.xml, f"{SID}stanza-id", {"id": "x", "by": "someone@else"})
+        assert delivery_key(msg.xml) == (f"{ROOM}/alice", "oid", "o1")
+
+    def test_falls_back_to_message_id_then_none(self):
+        assert delivery_key(_groupchat(to="a@c", stanza_id=None).xml) == (f"{ROOM}/alice", "id", "m1")
+        assert delivery_key(_groupchat(to="a@c", stanza_id=None, msg_id=None).xml) is None
+
+
+class TestMUCDeliveryDeduper:
+    def test_collapses_copies_for_each_occupant(self):
+        dedupe = MUCDeliveryDeduper(lambda: 3)
+        copies = [_groupchat(to=f"puppet{i}@bridge.example.com") for i in range(4)]
+
+        passed = [dedupe(m) for m in copies]
+
+        assert passed[0] is copies[0]
+        assert passed[1:] == [None, None, None]
+        assert dedupe.stats() == {"collapsed": 3, "unique": 1, "capacity": 500}
+
+    def test_distinct_messages_pass(self):
+        dedupe = MUCDeliveryDeduper(lambda: 1)
+        assert dedupe(_groupchat(to="a@c", stanza_id="s1")) is not None
+        assert dedupe(_groupchat(to="a@c", stanza_id="s2")) is not None
+
+    def test_non_groupchat_and_idless_pass_through(self):
+        dedupe = MUCDeliveryDeduper(lambda: 1)
+        chat = _groupchat(to="a@c", mtype="chat")
+        assert dedupe(chat) is chat
+        assert dedupe(chat) is chat
+        idless = _groupchat(to="a@c", stanza_id=None, msg_id=None)
+        assert dedupe(idless) is idless
+        assert dedupe(idless) is idless
+
+    def test_capacity_follows_occupants_with_hysteresis(self):
+        occupants = [10]
+        dedupe = MUCDeliveryDeduper(lambda: occupants[0])
+        dedupe(_groupchat(to="a@c", stanza_id="s0"))
+        assert dedupe.capacity == 500
+
+        occupants[0] = 1000
+        dedupe(_groupchat(to="a@c", stanza_id="s1"))
+        assert dedupe.capacity == 4000
+        # Keys seen before the resize are kept.
+        assert dedupe(_groupchat(to="b@c", stanza_id="s0")) is None
+
+        occupants[0] = 600  # 2400 < 4000 but not 4x smaller: keep capacity
+        dedupe(_groupchat(to="a@c", stanza_id="s2"))
+        assert dedupe.capacity == 4000
+
+        occupants[0] = 10
+        dedupe(_groupchat(to="a@c", stanza_id="s3"))
+        assert dedupe.capacity == 500
+
+    def test_installed_as_last_incoming_filter(self):
+        """Plugin 'in' filters (e.g. stream-management counters) run before the dedupe drops a copy."""
+        comp = XMPPComponent("bridge.example.com", "secret", "localhost", 5347, MagicMock(), MagicMock(), None)
+        try:
+            in_filters = comp._XMLStream__filters["in"]
+            assert in_filters[-1] is comp._muc_dedupe
+        finally:
+            comp._run_out_filters = None
@@ -19,7 +19,7 @@ from bridge.adapters.xmpp.handlers import (
     _remove_puppet_entries,
     on_muc_presence,
 )
-from cachetools import TTLCache
+from bridge.tracking import PairIndexedTTLCache
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -30,7 +30,7 @@ def _make_comp(component_jid: str = "bridge.example.com", auto_rejoin: bool = Tr
     """Create a minimal mock XMPPComponent for MUC status code tests."""
     comp = MagicMock()
     comp._component_jid = component_jid
-    comp._puppets_joined = TTLCache(maxsize=10000, ttl=86400)
+    comp._puppets_joined = PairIndexedTTLCache(maxsize=10000, ttl=86400)
     comp._banned_rooms = set()
     comp._auto_rejoin = auto_rejoin
     comp._confirmed_mucs = set()
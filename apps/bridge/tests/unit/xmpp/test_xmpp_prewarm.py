@@ -0,0 +1,327 @@
+"""Tests for puppet MUC pre-warm (OccupancyRecord, prewarm_puppets, shared in-flight joins)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+from xml.etree.ElementTree import Element, SubElement
+
+import pytest
+from bridge.adapters.xmpp import XMPPComponent
+from bridge.adapters.xmpp.handlers import MUC_USER_NS, on_muc_presence
+from bridge.adapters.xmpp.prewarm import OccupancyRecord, prewarm_puppets
+from bridge.tracking import EchoCorrelator, PairIndexedTTLCache
+from slixmpp import JID
+
+pytestmark = pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+
+ROOM = "room@muc.example.com"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_component(*, mapped=(ROOM,), concurrency: int = 8, record: OccupancyRecord | None = None) -> Any:
+    comp: Any = object.__new__(XMPPComponent)
+    comp._component_jid = "bridge.example.com"
+    comp._puppets_joined = PairIndexedTTLCache(maxsize=100, ttl=86400)
+    comp._pending_joins = {}
+    comp._occupancy = record or OccupancyRecord()
+    comp._prewarm_concurrency = concurrency
+    comp._prewarm_task = None
+    comp._background_tasks = set()
+    comp._banned_rooms = set()
+    comp._confirmed_mucs = set()
+    comp._router = MagicMock()
+    comp._router.all_mappings.return_value = [MagicMock(xmpp=MagicMock(muc_jid=m)) for m in mapped]
+    comp._run_out_filters = None
+    comp._echoes = EchoCorrelator(ttl=90)
+    comp.sent_presences = []
+    comp._send_join_presence = lambda muc_jid, user_jid, nick: comp.sent_presences.append((muc_jid, nick)) or True
+    return comp
+
+
+def self_presence(room: str, nick: str, user_jid: str) -> MagicMock:
+    """MUC self-presence (status 110) for *nick* in *room*, addressed to *user_jid*."""
+    presence = MagicMock()
+    addresses = {"from": f"{room}/{nick}", "to": f"{user_jid}/bridge"}
+    presence.get = MagicMock(side_effect=lambda key, default="": addresses.get(key, default))
+    root = Element("presence")
+    x_elem = SubElement(root, f"{{{MUC_USER_NS}}}x")
+    SubElement(x_elem, f"{{{MUC_USER_NS}}}status").set("code", "110")
+    presence.xml = root
+    return presence
+
+
+class TestOccupancyRecord:
+    def test_recent_is_most_recent_first(self):
+        clock = FakeClock()
+        record = OccupancyRecord(timer=clock)
+        record.touch(ROOM, "alice")
+        clock.now += 1
+        record.touch(ROOM, "bob")
+        clock.now += 1
+        record.touch(ROOM, "alice")
+        assert record.recent() == [(ROOM, "alice"), (ROOM, "bob")]
+
+    def test_bounded_by_count_and_age(self):
+        clock = FakeClock()
+        record = OccupancyRecord(timer=clock, max_entries=2, max_age=60)
+        record.touch(ROOM, "a")
+        record.touch(ROOM, "b")
+        record.touch(ROOM, "c")
+        assert len(record) == 2
+        assert (ROOM, "a") not in record
+        clock.now += 30
+        record.touch(ROOM, "d")
+        clock.now += 40
+        assert record.recent() == [(ROOM, "d")]
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        path = tmp_path / "occupancy.json"
+        record = OccupancyRecord(path)
+        record.touch(ROOM, "alice")
+        record.touch("other@muc.example.com", "bob")
+        record.save()
+
+        restored = OccupancyRecord(path)
+        restored.load()
+        assert restored.recent() == [("other@muc.example.com", "bob"), (ROOM, "alice")]
+
+    def test_load_ignores_missing_and_corrupt_files(self, tmp_path):
+        OccupancyRecord(tmp_path / "missing.json").load()
+        path = tmp_path / "bad.json"
+        path.write_text("{not json")
+        record = OccupancyRecord(path)
+        record.load()
+        path.write_text(json.dumps([["room", 5], "junk", [ROOM, "ok", 1.0]]))
+        record.load()
+        assert list(record._entries) == [(ROOM, "ok")]
+
+    @pytest.mark.asyncio
+    async def test_maybe_save_is_rate_limited(self, tmp_path):
+        clock = FakeClock()
+        path = tmp_path / "occupancy.json"
+        record = OccupancyRecord(path, timer=clock)
+        record.touch(ROOM, "alice")
+        await record.maybe_save()
+        assert not path.exists()
+        clock.now += 61
+        await record.maybe_save()
+        assert path.exists()
+
+    @pytest.mark.asyncio
+    async def test_save_async_writes_from_a_worker_thread(self, tmp_path):
+        path = tmp_path / "occupancy.json"
+        record = OccupancyRecord(path)
+        record.touch(ROOM, "alice")
+        with patch("bridge.adapters.xmpp.prewarm.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await record.save_async()
+        to_thread.assert_awaited_once()
+        assert json.loads(path.read_text())[0][:2] == [ROOM, "alice"]
+        await record.save_async()  # unchanged: nothing to write
+        to_thread.assert_awaited_once()
+
+
+class TestSharedJoins:
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_share_one_join(self):
+        comp = make_component()
+        release = asyncio.Event()
+
+        async def slow_join(muc_jid, nick):
+            await release.wait()
+            return True
+
+        comp.join_muc_as_user = AsyncMock(side_effect=slow_join)
+        first = asyncio.create_task(comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice"))
+        second = asyncio.create_task(comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice"))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first is True
+        assert await second is True
+        comp.join_muc_as_user.assert_awaited_once_with(ROOM, "alice")
+        assert (ROOM, "alice@bridge.example.com") in comp._puppets_joined
+        assert comp._pending_joins == {}
+        assert comp._occupancy.recent() == [(ROOM, "alice")]
+
+    @pytest.mark.asyncio
+    async def test_failed_join_is_not_recorded(self):
+        comp = make_component()
+        comp.join_muc_as_user = AsyncMock(return_value=False)
+        assert await comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice") is False
+        assert len(comp._occupancy) == 0
+        assert (ROOM, "alice@bridge.example.com") not in comp._puppets_joined
+
+    @pytest.mark.asyncio
+    async def test_hit_refreshes_ttl(self):
+        comp = make_component()
+        clock = FakeClock()
+        comp._puppets_joined = PairIndexedTTLCache(maxsize=100, ttl=100, timer=clock)
+        comp._puppets_joined[(ROOM, "alice@bridge.example.com")] = None
+        comp.join_muc_as_user = AsyncMock(return_value=True)
+        for _ in range(3):
+            clock.now += 60
+            assert await comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice") is True
+        comp.join_muc_as_user.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_join_cancelled_by_disconnect_returns_false(self):
+        comp = make_component()
+        started = asyncio.Event()
+
+        async def hang(muc_jid, nick):
+            started.set()
+            await asyncio.Event().wait()
+
+        comp.join_muc_as_user = AsyncMock(side_effect=hang)
+        send = asyncio.create_task(comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice"))
+        await started.wait()
+        for task in comp._pending_joins.values():
+            task.cancel()
+        assert await send is False
+
+
+class TestPrewarm:
+    @pytest.mark.asyncio
+    async def test_presences_are_sent_without_waiting_and_confirmed_by_self_presence(self, monkeypatch):
+        monkeypatch.setattr("bridge.adapters.xmpp.component.MUC_JOIN_WAIT_S", 0.05)
+        comp = make_component()
+        comp.join_muc_as_user = AsyncMock()
+        pairs = [(ROOM, f"n{i}") for i in range(10)]
+
+        prewarm = asyncio.create_task(prewarm_puppets(comp, pairs, concurrency=3))
+        confirmed = 0
+        while not prewarm.done():
+            await asyncio.sleep(0)
+            for _, nick in comp.sent_presences[confirmed:]:
+                if nick != "n3":  # n3's room never answers
+                    on_muc_presence(comp, self_presence(ROOM, nick, f"{nick}@bridge.example.com"))
+            confirmed = len(comp.sent_presences)
+
+        assert await prewarm == 9
+        assert len(comp.sent_presences) == 10
+        assert len(comp._puppets_joined) == 9
+        assert comp._pending_joins == {}
+        comp.join_muc_as_user.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pending_joins_never_exceed_concurrency(self, monkeypatch):
+        monkeypatch.setattr("bridge.adapters.xmpp.component.MUC_JOIN_WAIT_S", 0.02)
+        comp = make_component()
+        pairs = [(ROOM, f"n{i}") for i in range(12)]
+        peak = 0
+        send = comp._send_join_presence
+
+        def counting_send(muc_jid, user_jid, nick):
+            nonlocal peak
+            peak = max(peak, len(comp._pending_joins) + 1)
+            return send(muc_jid, user_jid, nick)
+
+        comp._send_join_presence = counting_send
+        prewarm = asyncio.create_task(prewarm_puppets(comp, pairs, concurrency=3))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(comp.sent_presences) == 3  # the rest wait for a slot
+        for _, nick in comp.sent_presences[:2]:
+            comp._confirm_puppet_join(ROOM, f"{nick}@bridge.example.com", nick)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(comp.sent_presences) == 5  # two confirmations, two new joins
+
+        assert await prewarm == 2  # the others time out, three at a time
+        assert len(comp.sent_presences) == 12
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_skips_already_joined(self):
+        comp = make_component()
+        comp._puppets_joined[(ROOM, "alice@bridge.example.com")] = None
+        prewarm = asyncio.create_task(prewarm_puppets(comp, [(ROOM, "alice"), (ROOM, "bob")], concurrency=2))
+        await asyncio.sleep(0)
+        comp._confirm_puppet_join(ROOM, "bob@bridge.example.com", "bob")
+        assert await prewarm == 2
+        assert comp.sent_presences == [(ROOM, "bob")]
+
+    @pytest.mark.asyncio
+    async def test_send_during_prewarm_awaits_inflight_join(self):
+        comp = make_component()
+        comp.join_muc_as_user = AsyncMock(return_value=True)
+        prewarm = asyncio.create_task(prewarm_puppets(comp, [(ROOM, "alice")], concurrency=1))
+        await asyncio.sleep(0)
+        send = asyncio.create_task(comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice"))
+        await asyncio.sleep(0)
+        comp._confirm_puppet_join(ROOM, "alice@bridge.example.com", "alice")
+        assert await send is True
+        assert await prewarm == 1
+        comp.join_muc_as_user.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_self_presence_does_not_resolve_lazy_joins(self):
+        comp = make_component()
+        release = asyncio.Event()
+
+        async def slow_join(muc_jid, nick):
+            await release.wait()
+            return True
+
+        comp.join_muc_as_user = AsyncMock(side_effect=slow_join)
+        send = asyncio.create_task(comp._ensure_puppet_joined(ROOM, "alice@bridge.example.com", "alice"))
+        await asyncio.sleep(0)
+        comp._confirm_puppet_join(ROOM, "alice@bridge.example.com", "alice")  # join_muc_wait owns it
+        assert not send.done()
+        release.set()
+        assert await send is True
+
+    @pytest.mark.asyncio
+    async def test_start_prewarm_filters_unmapped_and_banned_rooms(self):
+        record = OccupancyRecord()
+        record.touch(ROOM, "alice")
+        record.touch("gone@muc.example.com", "bob")
+        record.touch("banned@muc.example.com", "carol")
+        comp = make_component(mapped=(ROOM, "banned@muc.example.com"), record=record)
+        comp._banned_rooms.add("banned@muc.example.com")
+
+        def answer(muc_jid, user_jid, nick):
+            comp.sent_presences.append((muc_jid, nick))
+            asyncio.get_running_loop().call_soon(comp._confirm_puppet_join, muc_jid, user_jid, nick)
+            return True
+
+        comp._send_join_presence = answer
+
+        comp._start_prewarm()
+        assert comp._prewarm_task in comp._background_tasks
+        assert await comp._prewarm_task == 1
+        assert comp.sent_presences == [(ROOM, "alice")]
+
+    def test_join_presence_skips_history_and_registers_room(self):
+        comp = make_component()
+        del comp._send_join_presence
+        muc = MagicMock()
+        muc.rooms = defaultdict(dict)
+        muc.our_nicks = defaultdict(dict)
+        comp.plugin = {"xep_0045": muc}
+
+        assert comp._send_join_presence(ROOM, "alice@bridge.example.com", "alice") is True
+
+        args, kwargs = muc.make_join_stanza.call_args
+        assert (str(args[0]), args[1], kwargs["maxchars"]) == (ROOM, "alice", 0)
+        assert str(kwargs["presence_options"]["pfrom"]) == "alice@bridge.example.com"
+        muc.make_join_stanza.return_value.send.assert_called_once()
+        assert muc.our_nicks[JID("alice@bridge.example.com")][JID(ROOM)] == "alice"
+
+    def test_start_prewarm_disabled(self):
+        record = OccupancyRecord()
+        record.touch(ROOM, "alice")
+        comp = make_component(concurrency=0, record=record)
+        comp._start_prewarm()
+        assert comp._prewarm_task is None
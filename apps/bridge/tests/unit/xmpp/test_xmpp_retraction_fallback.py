@@ -19,6 +19,8 @@ from bridge.adapters.xmpp.outbound import (
     send_retraction_as_bridge,
     send_retraction_as_user,
 )
+from bridge.tracking import PairIndexedTTLCache
+from bridge.tracking.echo import EchoCorrelator
 from cachetools import TTLCache
 
 # ---------------------------------------------------------------------------
@@ -37,9 +39,9 @@ def _make_component() -> Any:
     comp._avatar_cache = TTLCache(maxsize=100, ttl=86400)
     comp._ibb_streams = {}
     comp._msgid_tracker = XMPPMessageIDTracker()
-    comp._puppets_joined = TTLCache(maxsize=10000, ttl=86400)
-    comp._avatar_broadcast_done = TTLCache(maxsize=10000, ttl=86400)
-    comp._recent_sent_nicks = TTLCache(maxsize=200, ttl=10)
+    comp._puppets_joined = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+    comp._avatar_broadcast_done = PairIndexedTTLCache(maxsize=10000, ttl=86400)
+    comp._echoes = EchoCorrelator(ttl=10)
     comp.plugin = MagicMock()
     comp._run_out_filters = None
     return comp